@@ -1,24 +1,185 @@
-from flask import Flask, jsonify
-import mysql.connector
+# api/app.py
+# OTP feed API – dashboards साठी read-only
+#
+#   GET /api/otps?limit=50[&cursor=...]   नवीनतम आधी; पुढचं page Link / X-Next-Cursor header मध्ये
+#   GET /api/otps/stream                   Server-Sent Events: नवीन OTP rows (Last-Event-ID ने resume)
+#   GET /metrics                           METRICS_HOST loopback (default) असेल तर फक्त localhost
+#
+# पहिलं page memory मधील tail मधून (feed.py), जुनी pages PageCache मधून; दोन्हीला
+# ETag – If-None-Match जुळला तर 304, DB ला हातही लागत नाही.
+import hashlib
+import json
+import threading
+
+from flask import Flask, Response, request, stream_with_context
+
+import db  # noqa: F401  (रूट sys.path वर – खालचे config / telemetry तिथूनच)
+import telemetry
+from config import (
+    API_FEED_BUFFER,
+    API_FEED_POLL_INTERVAL,
+    API_MAX_PAGE_SIZE,
+    API_PAGE_CACHE_TTL,
+    API_PAGE_SIZE,
+    API_SSE_HEARTBEAT,
+    API_SSE_MAX_CLIENTS,
+    METRICS_HOST
+)
+from feed import OtpFeed, PageCache
 
 app = Flask(__name__)
 
-def get_db():
-    return mysql.connector.connect(
-        host="localhost",
-        user="root",
-        password="",
-        database="db_24hoursotp"
-    )
+REQUESTS = telemetry.counter("api_requests_total", "OTP feed API requests", ("endpoint", "status"))
+SSE_CLIENTS = telemetry.gauge("api_sse_clients", "Open /api/otps/stream connections")
+
+feed = OtpFeed(size=API_FEED_BUFFER, poll_interval=API_FEED_POLL_INTERVAL)
+pages = PageCache(ttl=API_PAGE_CACHE_TTL)
+_first_pages = {}  # limit -> (feed version, etag, body, next cursor)
+_start_lock = threading.Lock()
+_sse_lock = threading.Lock()
+_sse_clients = 0
+
+SSE_CLIENTS.set_function(lambda: _sse_clients)
+
+
+class _SseSlot:
+    """एका stream चा API_SSE_MAX_CLIENTS मधला slot – कुठूनही (generator / close / error) एकदाच परत."""
+
+    def __init__(self):
+        self._held = True
+
+    def release(self):
+        global _sse_clients
+        with _sse_lock:
+            if self._held:
+                self._held = False
+                _sse_clients -= 1
+
+
+def _feed():
+    if feed._thread is None:
+        with _start_lock:
+            feed.start()
+    return feed
+
+
+def _encode_cursor(row):
+    return f"{row['ts']}_{row['id']}"
+
+
+def _decode_cursor(cursor):
+    ts, _, row_id = cursor.partition("_")
+    return int(ts), int(row_id)
+
+
+def _render(rows, limit):
+    body = app.json.dumps(rows)
+    etag = 'W/"' + hashlib.sha1(body.encode()).hexdigest()[:20] + '"'
+    next_cursor = _encode_cursor(rows[-1]) if len(rows) == limit else None
+    return etag, body, next_cursor
+
+
+def _first_page(limit):
+    version, rows = _feed().latest(limit)
+    cached = _first_pages.get(limit)
+    if cached and cached[0] == version:
+        return cached[1:]
+    etag, body, next_cursor = _render(rows, limit)
+    _first_pages[limit] = (version, etag, body, next_cursor)
+    return etag, body, next_cursor
+
+
+def _older_page(cursor, limit):
+    key = (cursor, limit)
+    hit = pages.get(key)
+    if hit is None:
+        before_ts, before_id = _decode_cursor(cursor)
+        hit = _render(db.get_otp_feed(before_ts, before_id, limit), limit)
+        pages.put(key, hit)
+    return hit
+
 
 @app.route("/api/otps")
 def otps():
-    conn = get_db()
-    cursor = conn.cursor(dictionary=True)
-    cursor.execute("SELECT * FROM otp_logs ORDER BY created_at DESC LIMIT 50")
-    data = cursor.fetchall()
-    conn.close()
-    return jsonify(data)
+    try:
+        limit = min(max(int(request.args.get("limit", API_PAGE_SIZE)), 1), API_MAX_PAGE_SIZE)
+        cursor = request.args.get("cursor")
+        if cursor:
+            etag, body, next_cursor = _older_page(cursor, limit)
+        elif limit <= feed.size:
+            etag, body, next_cursor = _first_page(limit)
+        else:
+            etag, body, next_cursor = _render(db.get_otp_feed(limit=limit), limit)
+    except ValueError:
+        REQUESTS.inc(endpoint="otps", status="400")
+        return Response(json.dumps({"error": "bad limit or cursor"}), 400, content_type="application/json")
+
+    # पहिलं page दर poll interval ला बदलू शकतं; जुनी pages जवळजवळ immutable
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={int(API_PAGE_CACHE_TTL)}" if cursor else "no-cache",
+    }
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
+        headers["Link"] = f'</api/otps?limit={limit}&cursor={next_cursor}>; rel="next"'
+    if etag in request.headers.get("If-None-Match", ""):
+        REQUESTS.inc(endpoint="otps", status="304")
+        return Response(status=304, headers=headers)
+    REQUESTS.inc(endpoint="otps", status="200")
+    return Response(body, 200, headers=headers, content_type="application/json")
+
+
+@app.route("/api/otps/stream")
+def stream():
+    global _sse_clients
+    with _sse_lock:
+        if _sse_clients >= API_SSE_MAX_CLIENTS:
+            REQUESTS.inc(endpoint="stream", status="503")
+            return Response("too many stream clients", 503, headers={"Retry-After": "30"})
+        _sse_clients += 1
+    slot = _SseSlot()
+    try:
+        last_id = request.headers.get("Last-Event-ID") or request.args.get("after")
+        try:
+            seq = _feed().position(int(last_id) if last_id else None)
+        except ValueError:
+            seq = feed.position()
+
+        def events():
+            nonlocal seq
+            try:
+                yield "retry: 3000\n\n"
+                while True:
+                    rows = feed.wait(seq, API_SSE_HEARTBEAT)
+                    if not rows:
+                        yield ": keep-alive\n\n"  # proxies / load balancers connection बंद करू नयेत
+                        continue
+                    for seq, row in rows:
+                        yield f"id: {row['id']}\nevent: otp\ndata: {app.json.dumps(row)}\n\n"
+            finally:
+                slot.release()
+
+        response = Response(stream_with_context(events()), content_type="text/event-stream", headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",  # nginx buffering बंद
+        })
+        # पहिला chunk जाण्याआधीच client गेला तर generator सुरूच होत नाही (finally नाही) – close वर release
+        response.call_on_close(slot.release)
+    except BaseException:
+        slot.release()
+        raise
+    REQUESTS.inc(endpoint="stream", status="200")
+    return response
+
+
+@app.route("/metrics")
+def metrics():
+    # webhook.py सारखेच: METRICS_HOST loopback असेल (default) तर फक्त localhost scrape
+    if METRICS_HOST in ("127.0.0.1", "localhost", "::1") and request.remote_addr not in ("127.0.0.1", "::1"):
+        return Response(status=404)
+    return Response(telemetry.render(), content_type=telemetry.CONTENT_TYPE)
+
 
 if __name__ == "__main__":
-    app.run(port=5000)
\ No newline at end of file
+    # SSE प्रत्येक client साठी एक thread धरतो – threaded server हवा
+    app.run(port=5000, threaded=True)
@@ -0,0 +1,10 @@
+# api/db.py
+# Data layer रूट फोल्डरमधील storage/ package मध्ये आहे (bot / webhook सोबत एकच)
+import os
+import sys
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _ROOT not in sys.path:
+    sys.path.append(_ROOT)
+
+from storage import *  # noqa: E402,F401,F403
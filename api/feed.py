@@ -0,0 +1,126 @@
+# api/feed.py
+# OTP feed चा in-memory tail: एकच background thread DB वर `id > head` poll करतो;
+# पहिलं page आणि SSE clients इथूनच – dashboards कितीही असले तरी DB वर एकच query/interval
+import logging
+import threading
+import time
+from collections import OrderedDict, deque
+
+import db
+
+logger = logging.getLogger(__name__)
+
+# Concurrent inserts मध्ये लहान id नंतर commit होऊ शकतो – प्रत्येक poll थोडं मागून वाचतो
+OVERLAP_IDS = 50
+
+
+class OtpFeed:
+    """
+    Newest `size` otp_logs rows, refreshed every `poll_interval` seconds.
+    Every newly seen row gets a local sequence number; SSE connections
+    follow that sequence instead of row ids, so a row that commits late with
+    a smaller id is still pushed. `version` changes whenever the tail does
+    and is what the first-page ETag is built from.
+    """
+
+    def __init__(self, size=1000, poll_interval=1.0):
+        self.size = size
+        self.poll_interval = poll_interval
+        self._rows = deque(maxlen=size)  # (seq, row), जुने आधी
+        self._ids = set()
+        self._seq = 0
+        self._head_id = 0
+        self._cond = threading.Condition()
+        self._thread = None
+        self._stop = threading.Event()
+
+    @property
+    def version(self):
+        return self._seq
+
+    def start(self):
+        if self._thread is None:
+            self._load()
+            self._thread = threading.Thread(target=self._run, name="otp-feed", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def _load(self):
+        rows = db.get_otp_feed(limit=self.size)
+        self._add(list(reversed(rows)))
+
+    def _run(self):
+        while not self._stop.wait(self.poll_interval):
+            try:
+                self.poll()
+            except Exception as e:
+                logger.error(f"OTP feed poll failed: {e}")
+
+    def poll(self):
+        rows = db.get_otp_feed_since(max(0, self._head_id - OVERLAP_IDS), self.size + OVERLAP_IDS)
+        return self._add([r for r in rows if r["id"] not in self._ids])
+
+    def _add(self, rows):
+        if not rows:
+            return 0
+        with self._cond:
+            for row in rows:
+                if len(self._rows) == self._rows.maxlen:
+                    self._ids.discard(self._rows[0][1]["id"])
+                self._seq += 1
+                self._rows.append((self._seq, row))
+                self._ids.add(row["id"])
+                self._head_id = max(self._head_id, row["id"])
+            self._cond.notify_all()
+        return len(rows)
+
+    def latest(self, limit):
+        """(version, newest `limit` rows) – (created_at, id) DESC, DB page सारखंच."""
+        with self._cond:
+            version, rows = self._seq, [r for _, r in self._rows]
+        rows.sort(key=lambda r: (r["ts"], r["id"]), reverse=True)
+        return version, rows[:limit]
+
+    def position(self, last_id=None):
+        """SSE start: last_id नसेल तर आत्ताचा शेवट; असेल तर त्यानंतरच्या rows पासून."""
+        with self._cond:
+            if last_id is None:
+                return self._seq
+            for seq, row in self._rows:
+                if row["id"] > last_id:
+                    return seq - 1
+            return self._seq
+
+    def wait(self, seq, timeout):
+        """seq नंतरच्या rows (जुने आधी); timeout पर्यंत काही नसेल तर []."""
+        with self._cond:
+            self._cond.wait_for(lambda: self._seq > seq or self._stop.is_set(), timeout)
+            return [(s, r) for s, r in self._rows if s > seq]
+
+
+class PageCache:
+    """Cursor pages (पहिलं सोडून): key -> (etag, body), TTL + LRU."""
+
+    def __init__(self, ttl=60.0, maxsize=512):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._pages = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            hit = self._pages.get(key)
+            if hit is None or hit[0] < time.monotonic():
+                return None
+            self._pages.move_to_end(key)
+            return hit[1]
+
+    def put(self, key, value):
+        with self._lock:
+            self._pages[key] = (time.monotonic() + self.ttl, value)
+            self._pages.move_to_end(key)
+            while len(self._pages) > self.maxsize:
+                self._pages.popitem(last=False)
@@ -0,0 +1,166 @@
+# bench/bench_admin_stats.py
+# 👥 Users panel: base tables वर live aggregates (जुनी पद्धत) vs rollups (db.get_admin_stats),
+# orders / transactions / users वाढत असताना. Rollups नंतर seal_stats() ने base tables शी जुळतात का ते तपासतो.
+#
+#   DB_TYPE=sqlite DB_PATH=/tmp/stats.sqlite3 python bench/bench_admin_stats.py --rows 20000 100000 300000
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import db  # noqa: E402
+import migrations  # noqa: E402
+
+BENCH_USER_BASE = 970000000
+DAYS = 60
+
+
+def live_aggregates():
+    """Rollups नसताना panel ला लागणारे aggregates – प्रत्येक tap वर full scans."""
+    conn = db.get_db_connection()
+    try:
+        cur = conn.cursor()
+        cur.execute("SELECT COUNT(*), COALESCE(SUM(balance), 0) FROM users")
+        users = cur.fetchone()
+        out = {"users": users[0]}
+        for name, days in (("today", 1), ("7d", 7), ("30d", 30), ("all", 100000)):
+            cur.execute(f"""
+                SELECT service_id, server_id, COUNT(*), COALESCE(SUM(price), 0) FROM orders
+                WHERE created_at >= {db.dialect.days_ago('%s')} GROUP BY service_id, server_id
+            """, (days,))
+            orders = cur.fetchall()
+            cur.execute(f"""
+                SELECT type, COALESCE(SUM(amount), 0) FROM transactions
+                WHERE created_at >= {db.dialect.days_ago('%s')} GROUP BY type
+            """, (days,))
+            out[name] = (orders, cur.fetchall())
+        return out
+    finally:
+        conn.close()
+
+
+def grow(total, service_id, server_id):
+    """orders / transactions / users total पर्यंत – मागच्या DAYS दिवसांत पसरलेले."""
+    conn = db.get_db_connection()
+    try:
+        cur = conn.cursor()
+        cur.execute("SELECT COUNT(*) FROM orders")
+        have = cur.fetchone()[0]
+        rnd = random.Random(have)
+        now = int(time.time())
+        while have < total:
+            n = min(5000, total - have)
+            when = [now - rnd.randrange(DAYS * 86400) for _ in range(n)]
+            users = [(BENCH_USER_BASE + have + i, ts) for i, ts in enumerate(when) if i % 10 == 0]
+            cur.executemany(
+                f"INSERT INTO users (user_id, created_at) VALUES (%s, {db.dialect.from_unix('%s')})", users
+            )
+            owners = [uid for uid, _ in users] or [BENCH_USER_BASE]
+            cur.executemany(f"""
+                INSERT INTO orders (user_id, service_id, server_id, price, status, created_at)
+                VALUES (%s, %s, %s, 12.5, 'OTP_RECEIVED', {db.dialect.from_unix('%s')})
+            """, [(rnd.choice(owners), service_id, server_id, ts) for ts in when])
+            cur.executemany(f"""
+                INSERT INTO transactions (user_id, amount, type, description, created_at)
+                VALUES (%s, 12.5, 'DEBIT', 'Number Purchase', {db.dialect.from_unix('%s')})
+            """, [(rnd.choice(owners), ts) for ts in when])
+            conn.commit()
+            have += n
+    finally:
+        conn.close()
+
+
+def reset_rollups():
+    """Bench मधले rows भूतकाळात जातात – seal झालेले तास परत उघडून पूर्ण backfill."""
+    conn = db.get_db_connection()
+    try:
+        cur = conn.cursor()
+        for table in ("stats_hourly", "stats_daily", "stats_totals", "stats_state"):
+            cur.execute(f"DELETE FROM {table}")
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        t = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t) * 1000)
+    return statistics.median(samples)
+
+
+def seed_catalog():
+    conn = db.get_db_connection()
+    try:
+        cur = conn.cursor()
+        cur.execute("SELECT id FROM services WHERE service_name = 'Stats Bench'")
+        row = cur.fetchone()
+        if row is None:
+            service_id = cur.insert(
+                "INSERT INTO services (service_name, provider_service_code) VALUES ('Stats Bench', 'sb')"
+            )
+            server_id = cur.insert("""
+                INSERT INTO servers (service_id, server_number, price, provider, provider_service_code)
+                VALUES (%s, 1, 12.5, 'herosms', 'sb')
+            """, (service_id,))
+            conn.commit()
+        else:
+            service_id = row[0]
+            cur.execute("SELECT id FROM servers WHERE service_id = %s", (service_id,))
+            server_id = cur.fetchone()[0]
+        return service_id, server_id
+    finally:
+        conn.close()
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, nargs="+", default=[20000, 100000, 300000], help="orders count steps")
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    migrations.migrate()
+    service_id, server_id = seed_catalog()
+    print(f"admin panel read, median of {args.repeat} ({db.DB_TYPE})")
+    for total in args.rows:
+        grow(total, service_id, server_id)
+        reset_rollups()
+        t = time.perf_counter()
+        while db.seal_stats(max_hours=500) == 500:
+            pass
+        seal_s = time.perf_counter() - t
+        live_ms = timed(live_aggregates, args.repeat)
+        panel_ms = timed(db.get_admin_stats, args.repeat)
+        print(f"  orders={total:8}: live aggregates {live_ms:8.1f}ms   rollups {panel_ms:6.2f}ms   "
+              f"(full backfill {seal_s:5.1f}s)")
+
+    # Sealed तासांची rollups base tables शी जुळतात का
+    sealed = db.get_admin_stats()["sealed_until"]
+    conn = db.get_db_connection()
+    try:
+        cur = conn.cursor()
+        cur.execute(f"SELECT COUNT(*) FROM orders WHERE created_at < {db.dialect.from_unix('%s')}", (sealed,))
+        base = cur.fetchone()[0]
+        cur.execute("SELECT COALESCE(SUM(orders), 0) FROM stats_totals")
+        rolled = cur.fetchone()[0]
+        cur.execute("SELECT value FROM stats_state WHERE name = 'daily_until'")
+        daily = cur.fetchone()[0]
+        cur.execute("SELECT COALESCE(SUM(orders), 0) FROM stats_hourly WHERE bucket >= %s AND bucket < %s",
+                    (daily, sealed))
+        rolled += cur.fetchone()[0]
+    finally:
+        conn.close()
+    until = time.strftime("%d %b %H:%M", time.localtime(sealed))
+    print(f"  orders before {until}: base tables {base}, rollups {rolled} ({'match' if base == rolled else 'MISMATCH'})")
+    db.stats_writes.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+# bench/bench_api.py
+# /api/otps load test: जुना handler (प्रत्येक hit ला SELECT * ... LIMIT 50) vs नवीन
+# feed API (memory tail + ETag) – req/s आणि DB queries/s, dashboards poll करत असताना
+# नवीन OTPs येत राहतात. शेवटी एक SSE client किती rows push झाल्या ते तपासतो.
+# Local DB लागतो (DB_TYPE नुसार); synthetic rows BENCH_ORDER_BASE पासून (--cleanup ने काढा)
+#
+#   python bench/bench_api.py --rows 200000 --clients 32 --duration 10
+#   python bench/bench_api.py --cleanup
+import argparse
+import http.client
+import json
+import logging
+import os
+import statistics
+import sys
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "api"))
+
+from flask import Flask, jsonify  # noqa: E402
+from werkzeug.serving import make_server  # noqa: E402
+
+import db  # noqa: E402
+from storage.instrument import DB_SECONDS  # noqa: E402
+
+BENCH_ORDER_BASE = 990000000
+BENCH_USER_BASE = 998000000
+
+
+def db_calls():
+    return sum(state[2] for state in DB_SECONDS._values.values())
+
+
+def seed(rows, batch=5000):
+    conn = db.get_db_connection()
+    try:
+        cur = conn.cursor()
+        cur.execute("SELECT COUNT(*) FROM otp_logs WHERE order_id >= %s", (BENCH_ORDER_BASE,))
+        have = cur.fetchone()[0]
+        now = int(time.time()) - 3600
+        for start in range(have, rows, batch):
+            n = min(batch, rows - start)
+            cur.executemany(
+                "INSERT INTO otp_logs (order_id, user_id, service_name, phone_number, otp, created_at) "
+                f"VALUES (%s, %s, %s, %s, %s, {db.dialect.from_unix('%s')})",
+                [(BENCH_ORDER_BASE + i, BENCH_USER_BASE + i % 500, "WhatsApp", f"9198{i:08d}",
+                  f"{i % 1000000:06d}", now - rows + i) for i in range(start, start + n)]
+            )
+            conn.commit()
+    finally:
+        conn.close()
+
+
+def cleanup():
+    conn = db.get_db_connection()
+    try:
+        cur = conn.cursor()
+        cur.execute("DELETE FROM otp_logs WHERE order_id >= %s", (BENCH_ORDER_BASE,))
+        conn.commit()
+    finally:
+        conn.close()
+
+
+class Writer(threading.Thread):
+    """नवीन OTPs rate/s ने – पहिलं page सतत बदलत राहतं."""
+
+    def __init__(self, rate):
+        super().__init__(daemon=True)
+        self.rate = rate
+        conn = db.get_db_connection()
+        try:
+            cur = conn.cursor()
+            cur.execute("SELECT MAX(order_id) FROM otp_logs")
+            self.next_order = max(cur.fetchone()[0] or 0, BENCH_ORDER_BASE + 50000000) + 1
+        finally:
+            conn.close()
+        self.written = 0
+        self.stop = threading.Event()
+
+    def run(self):
+        while not self.stop.wait(1 / self.rate):
+            conn = db.get_db_connection()
+            try:
+                conn.cursor().execute(
+                    "INSERT INTO otp_logs (order_id, user_id, service_name, phone_number, otp) "
+                    "VALUES (%s, %s, %s, %s, %s)",
+                    (self.next_order, BENCH_USER_BASE, "Telegram", "919800000000", "123456")
+                )
+                conn.commit()
+            finally:
+                conn.close()
+            self.next_order += 1
+            self.written += 1
+
+
+def legacy_app():
+    """Baseline: जुन्या api/app.py सारखं – प्रत्येक request ला SELECT *, idx_created वापरत नाही."""
+    app = Flask("legacy")
+    app.queries = 0
+    hint = "IGNORE INDEX (idx_created)" if db.dialect.name == "mysql" else ""
+    order = "created_at" if db.dialect.name == "mysql" else "created_at || ''"  # sqlite/pg: index skip
+
+    if db.dialect.name == "postgres":
+        order = "created_at + INTERVAL '0 second'"
+
+    @app.route("/api/otps")
+    def otps():
+        conn = db.get_db_connection()
+        try:
+            cur = conn.cursor(dictionary=True)
+            cur.execute(f"SELECT * FROM otp_logs {hint} ORDER BY {order} DESC LIMIT 50")
+            data = cur.fetchall()
+        finally:
+            conn.close()
+        app.queries += 1
+        return jsonify(data)
+
+    return app
+
+
+def serve(app):
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, server.server_port
+
+
+def hammer(port, clients, duration, conditional):
+    """clients threads, प्रत्येक सतत /api/otps (conditional असेल तर If-None-Match सह)."""
+    stop = time.monotonic() + duration
+    lock = threading.Lock()
+    codes = {}
+    latencies = []
+
+    def client():
+        etag = None
+        local = []
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+        while time.monotonic() < stop:
+            headers = {"If-None-Match": etag} if conditional and etag else {}
+            t = time.perf_counter()
+            try:
+                conn.request("GET", "/api/otps", headers=headers)
+                resp = conn.getresponse()
+                resp.read()
+            except (http.client.HTTPException, OSError):
+                conn.close()
+                conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+                continue
+            local.append((resp.status, time.perf_counter() - t))
+            etag = resp.getheader("ETag") or etag
+            if resp.getheader("Connection", "").lower() == "close" or resp.version == 10:
+                conn.close()
+                conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+        conn.close()
+        with lock:
+            for status, seconds in local:
+                codes[status] = codes.get(status, 0) + 1
+                latencies.append(seconds)
+
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    started = time.monotonic()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return codes, latencies, time.monotonic() - started
+
+
+def report(label, codes, latencies, elapsed, queries):
+    total = sum(codes.values())
+    latencies.sort()
+    p99 = latencies[int(len(latencies) * 0.99) - 1] if latencies else 0
+    print(f"  {label:8}: {total / elapsed:8.0f} req/s  {queries / elapsed:8.1f} DB queries/s  "
+          f"p50 {statistics.median(latencies) * 1000 if latencies else 0:6.1f}ms  p99 {p99 * 1000:6.1f}ms  "
+          f"status {dict(sorted(codes.items()))}")
+
+
+def sse_check(port, writer, seconds, settle):
+    """एक SSE client: writer ने (stream उघडल्यानंतर) लिहिलेल्या सर्व rows push झाल्या का."""
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=seconds + settle + 30)
+    conn.request("GET", "/api/otps/stream")
+    sock = conn.sock
+    resp = conn.getresponse()
+    received = []
+
+    def read():
+        try:
+            for raw in resp.fp:
+                line = raw.decode()
+                if line.startswith("data: ") and json.loads(line[6:])["order_id"] >= BENCH_ORDER_BASE + 50000000:
+                    received.append(line)
+        except (OSError, ValueError):
+            pass  # खाली conn बंद केल्यावर
+
+    reader = threading.Thread(target=read, daemon=True)
+    reader.start()
+    first = writer.written
+    time.sleep(seconds)
+    writer.stop.set()
+    writer.join()
+    time.sleep(settle)  # शेवटच्या rows feed poll मधून यायला
+    sock.shutdown(2)
+    conn.close()
+    return len(received), writer.written - first
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=200000)
+    ap.add_argument("--clients", type=int, default=32)
+    ap.add_argument("--duration", type=float, default=10)
+    ap.add_argument("--insert-rate", type=float, default=5, help="new OTPs per second during the run")
+    ap.add_argument("--cleanup", action="store_true")
+    args = ap.parse_args()
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)  # प्रत्येक request log नको
+
+    if args.cleanup:
+        cleanup()
+        return
+    seed(args.rows)
+    writer = Writer(args.insert_rate)
+    writer.start()
+
+    print(f"otp_logs bench rows={args.rows} clients={args.clients} duration={args.duration:.0f}s "
+          f"inserts={args.insert_rate:.0f}/s ({db.dialect.name})")
+
+    old = legacy_app()
+    server, port = serve(old)
+    codes, latencies, elapsed = hammer(port, args.clients, args.duration, conditional=False)
+    server.shutdown()
+    report("before", codes, latencies, elapsed, old.queries)
+
+    import app as api  # noqa: E402
+    server, port = serve(api.app)
+    api._feed()
+    calls = db_calls()
+    codes, latencies, elapsed = hammer(port, args.clients, args.duration, conditional=True)
+    report("after", codes, latencies, elapsed, db_calls() - calls)
+
+    received, written = sse_check(port, writer, min(args.duration, 5), api.feed.poll_interval + 1)
+    print(f"  SSE     : {received} of {written} new rows pushed")
+    api.feed.stop()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
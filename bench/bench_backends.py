@@ -0,0 +1,156 @@
+# bench/bench_backends.py
+# एकच bot workload (storage/ functions) MySQL / PostgreSQL / SQLite वर – production backend निवडायला
+# प्रत्येक backend वेगळ्या process मध्ये (DB_TYPE import वेळी ठरतो); DB settings .env / env मधून
+#
+#   python bench/bench_backends.py --backends sqlite
+#   python bench/bench_backends.py --backends mysql,postgres,sqlite --orders 5000 --threads 16
+import argparse
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+BENCH_USER_BASE = 997000000
+OPS = ("upsert_user", "place_order", "mark_number_received", "otp_or_refund",
+       "order_history", "payment_event", "apply_payments")
+
+
+def _timed(samples, name, fn, *args, **kwargs):
+    t = time.perf_counter()
+    result = fn(*args, **kwargs)
+    samples[name].append((time.perf_counter() - t) * 1000)
+    return result
+
+
+def _seed(db, users):
+    conn = db.get_db_connection()
+    try:
+        cur = conn.cursor()
+        cur.execute("SELECT id FROM services WHERE service_name = %s", ("Bench",))
+        row = cur.fetchone()
+        if row:
+            service_id = row[0]
+        else:
+            service_id = cur.insert(
+                "INSERT INTO services (service_name, provider_service_code) VALUES (%s, %s)", ("Bench", "bn")
+            )
+            cur.insert("INSERT INTO servers (service_id, server_number, price) VALUES (%s, 1, 10)", (service_id,))
+        cur.execute("SELECT id FROM servers WHERE service_id = %s", (service_id,))
+        server_id = cur.fetchone()[0]
+        conn.commit()
+    finally:
+        conn.close()
+    for i in range(users):
+        db.upsert_user(BENCH_USER_BASE + i)
+        db.update_balance(BENCH_USER_BASE + i, 1000000, "CREDIT", "bench seed")
+    return service_id, server_id
+
+
+def worker(args):
+    """Child process: DB_TYPE आधीच env मध्ये; JSON result stdout वर."""
+    import migrations
+    import db
+
+    migrations.migrate()
+    service_id, server_id = _seed(db, args.users)
+
+    samples = defaultdict(list)
+    lock = threading.Lock()
+    counter = iter(range(args.orders))
+    run_id = f"{db.DB_TYPE}{int(time.time())}"
+
+    def loop(seed):
+        rnd = random.Random(seed)
+        local = defaultdict(list)
+        while True:
+            with lock:
+                i = next(counter, None)
+            if i is None:
+                break
+            uid = BENCH_USER_BASE + rnd.randrange(args.users)
+            _timed(local, "upsert_user", db.upsert_user, uid)
+            order_id = _timed(local, "place_order", db.place_order, uid, service_id, server_id, 12.5)
+            _timed(local, "mark_number_received", db.mark_number_received, order_id, f"b{i}", "+910000000000", 120,
+                   "herosms", server_id)
+            if rnd.random() < 0.7:
+                _timed(local, "otp_or_refund", db.transition_order, order_id, db.OTP_RECEIVED, otp="123456", otp_seconds=15)
+            else:
+                _timed(local, "otp_or_refund", db.refund_order, order_id, db.TIMEOUT, "Refund - Timeout")
+            _timed(local, "order_history", db.get_order_history, uid, None, None, 11)
+            if i % 10 == 0:
+                _timed(local, "payment_event", db.record_payment_event,
+                       f"pay_{run_id}_{i}", "payment.captured", uid, 100, "{}")
+            if i % 100 == 0:
+                _timed(local, "apply_payments", db.apply_payment_events, 500)
+        with lock:
+            for k, v in local.items():
+                samples[k] += v
+
+    t = time.perf_counter()
+    threads = [threading.Thread(target=loop, args=(n,)) for n in range(args.threads)]
+    for th in threads:
+        th.start()
+    for th in threads:
+        th.join()
+    wall = time.perf_counter() - t
+
+    result = {"backend": db.DB_TYPE, "orders_per_s": args.orders / wall, "ops": {}}
+    for name, values in samples.items():
+        values.sort()
+        result["ops"][name] = {
+            "p50": statistics.median(values),
+            "p99": values[max(0, int(len(values) * 0.99) - 1)],
+        }
+    print(json.dumps(result))
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--backends", default="sqlite", help="mysql,postgres,sqlite")
+    ap.add_argument("--orders", type=int, default=2000)
+    ap.add_argument("--threads", type=int, default=8)
+    ap.add_argument("--users", type=int, default=500)
+    ap.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.worker:
+        return worker(args)
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for backend in args.backends.split(","):
+            env = dict(os.environ, DB_TYPE=backend, DB_POOL_SIZE=str(max(args.threads, 1)))
+            if backend == "sqlite":
+                env.setdefault("DB_PATH", os.path.join(tmp, "bench.sqlite3"))
+            cmd = [sys.executable, os.path.abspath(__file__), "--worker", "--orders", str(args.orders),
+                   "--threads", str(args.threads), "--users", str(args.users)]
+            r = subprocess.run(cmd, env=env, capture_output=True, text=True)
+            if r.returncode != 0:
+                print(f"{backend}: FAILED\n{r.stderr.strip()[-2000:]}\n")
+                continue
+            results.append(json.loads(r.stdout.strip().splitlines()[-1]))
+
+    if not results:
+        return
+    print(f"orders={args.orders} threads={args.threads} users={args.users}   (ms: p50 / p99)")
+    print(f"{'op':22s}" + "".join(f"{r['backend']:>20s}" for r in results))
+    for op in OPS:
+        cells = []
+        for r in results:
+            s = r["ops"].get(op)
+            cells.append(f"{s['p50']:8.2f} / {s['p99']:8.2f}" if s else f"{'-':>19s}")
+        print(f"{op:22s}" + "".join(f"{c:>20s}" for c in cells))
+    print(f"{'orders/s':22s}" + "".join(f"{r['orders_per_s']:20.1f}" for r in results))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+# bench/bench_breaker.py
+# Provider outage simulation: breaker + admission gate नसताना vs असताना
+# (किती debits / refunds, handlers किती वेळ अडकले, एका वेळी किती getNumber)
+#
+#   python bench/bench_breaker.py --purchases 300 --rate 100 --timeout 0.5
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "bot"))
+sys.path.append(ROOT)  # telemetry/, storage/
+os.environ.setdefault("ADMIN_USER_ID", "0")
+
+from admission import AdmissionGate, Overloaded  # noqa: E402
+from fake_herosms import start_fake_server  # noqa: E402
+from providers import registry  # noqa: E402
+from providers.breaker import BreakerBoard, CircuitBreaker  # noqa: E402
+from providers.router import ProviderRouter  # noqa: E402
+from providers.sms_activate import SmsActivateClient  # noqa: E402
+
+
+async def run(routes, purchases, rate, breaker, gate):
+    breakers = BreakerBoard(lambda: CircuitBreaker(min_calls=10 if breaker else 10 ** 9, open_for=60))
+    router = ProviderRouter(breakers=breakers, max_attempts=1)
+    counts = {"debits": 0, "refunds": 0, "fast_reject": 0, "shed": 0}
+    inflight = peak = 0
+    busy = 0.0
+
+    async def one():
+        nonlocal inflight, peak, busy
+        t = time.perf_counter()
+        try:
+            if not router.usable(routes):
+                counts["fast_reject"] += 1
+                return
+            try:
+                async with gate:
+                    counts["debits"] += 1
+                    inflight += 1
+                    peak = max(peak, inflight)
+                    try:
+                        purchase, _ = await router.get_number(routes)
+                    finally:
+                        inflight -= 1
+                    if not purchase:
+                        counts["refunds"] += 1
+            except Overloaded:
+                counts["shed"] += 1
+        finally:
+            busy += time.perf_counter() - t
+
+    tasks = []
+    for _ in range(purchases):
+        tasks.append(asyncio.create_task(one()))
+        await asyncio.sleep(1 / rate)
+    await asyncio.gather(*tasks)
+    return counts, peak, busy
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--purchases", type=int, default=300)
+    ap.add_argument("--rate", type=float, default=100, help="purchases per second")
+    ap.add_argument("--timeout", type=float, default=0.5, help="client timeout; provider hangs 4x longer")
+    ap.add_argument("--inflight", type=int, default=16)
+    ap.add_argument("--queue", type=int, default=16)
+    args = ap.parse_args()
+    logging.basicConfig(level=logging.CRITICAL)
+
+    server, _, url = start_fake_server(latency=args.timeout * 4)  # outage: प्रत्येक call timeout
+    registry.register(SmsActivateClient("down", "x", url, timeout=args.timeout, retries=0, max_connections=1000))
+    routes = [{"id": 1, "provider": "down", "price": 10.0, "service_code": "wa", "country": 22}]
+
+    async def both():
+        unbounded = AdmissionGate(max_inflight=10 ** 6, max_queue=10 ** 6, max_wait=3600)
+        gated = AdmissionGate(max_inflight=args.inflight, max_queue=args.queue, max_wait=args.timeout)
+        before = await run(routes, args.purchases, args.rate, False, unbounded)
+        after = await run(routes, args.purchases, args.rate, True, gated)
+        await registry.aclose_all()
+        return before, after
+
+    before, after = asyncio.run(both())
+    server.shutdown()
+
+    print(f"outage: purchases={args.purchases} at {args.rate:.0f}/s, provider timeout {args.timeout}s")
+    for label, (c, peak, busy) in (("no breaker, no gate", before), ("breaker + gate", after)):
+        print(f"  {label:20}: debits {c['debits']:4}  refunds {c['refunds']:4}  fast rejects {c['fast_reject']:4}  "
+              f"shed {c['shed']:4}  peak getNumber {peak:4}  handler time {busy:7.1f}s")
+
+
+if __name__ == "__main__":
+    main()
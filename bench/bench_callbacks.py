@@ -0,0 +1,91 @@
+# bench/bench_callbacks.py
+# callback_data: जुने text format (startswith chain + split + float, client ची किंमत) vs
+# signed binary codec (callbacks.decode, catalog किंमत). Parse वेळ, payload size, tampering.
+#
+#   python bench/bench_callbacks.py --taps 200000
+import argparse
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "bot"))
+sys.path.append(ROOT)
+os.environ.setdefault("ADMIN_USER_ID", "0")
+os.environ.setdefault("BOT_TOKEN", "0:bench")
+
+import callbacks  # noqa: E402
+
+
+def legacy_parse(data):
+    """bot.py मधला जुना if / startswith chain."""
+    if data == "recharge_start":
+        return "recharge", ()
+    if data.startswith("hist:"):
+        parts = data.split(":")
+        return "hist", (parts[1], int(parts[2]), int(parts[3])) if len(parts) == 4 else (parts[1],)
+    if data.startswith("svc_"):
+        return "svc", (int(data.split("_")[1]),)
+    if data.startswith("buy_"):
+        _, srv_id, price = data.split("_")
+        return "buy", (int(srv_id), float(price))
+    return None
+
+
+def corpus(n, servers, users):
+    """Tap mix: बहुतेक svc / buy (सगळ्यांसाठी सारखे buttons), काही history cursors (user नुसार)."""
+    rnd = random.Random(1)
+    legacy, signed = [], []
+    for _ in range(n):
+        r = rnd.random()
+        srv = rnd.randrange(1, servers + 1)
+        price = round(10 + srv * 1.5, 2)
+        if r < 0.35:
+            legacy.append(f"svc_{srv % 20 + 1}")
+            signed.append(callbacks.encode(callbacks.SERVICE, srv % 20 + 1))
+        elif r < 0.8:
+            legacy.append(f"buy_{srv}_{price}")
+            signed.append(callbacks.encode(callbacks.BUY, srv, callbacks.paise(price)))
+        else:
+            ts, oid = 1760000000 + rnd.randrange(10 ** 6), rnd.randrange(users * 10)
+            legacy.append(f"hist:o:{ts}:{oid}")
+            signed.append(callbacks.encode(callbacks.HISTORY, 0, ts, oid))
+    return legacy, signed
+
+
+def timed(fn, items):
+    started = time.perf_counter()
+    for item in items:
+        fn(item)
+    return (time.perf_counter() - started) / len(items) * 1e9
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--taps", type=int, default=200000)
+    ap.add_argument("--servers", type=int, default=200)
+    ap.add_argument("--users", type=int, default=5000)
+    args = ap.parse_args()
+
+    legacy, signed = corpus(args.taps, args.servers, args.users)
+    callbacks.decode.cache_clear()
+    print(f"{args.taps} taps, {args.servers} servers")
+    print(f"  legacy text  : {timed(legacy_parse, legacy):6.0f} ns/tap  "
+          f"max {max(map(len, legacy))} bytes, avg {sum(map(len, legacy)) / len(legacy):.1f}")
+    print(f"  signed (cold): {timed(callbacks.decode.__wrapped__, signed):6.0f} ns/tap  "
+          f"max {max(map(len, signed))} bytes, avg {sum(map(len, signed)) / len(signed):.1f}")
+    print(f"  signed (LRU) : {timed(callbacks.decode, signed):6.0f} ns/tap  "
+          f"(hit rate {callbacks.decode.cache_info().hits / len(signed):.0%})")
+
+    # Tampering: किंमत ₹0.01 केलेला buy button
+    forged_legacy = "buy_7_0.01"
+    real = callbacks.encode(callbacks.BUY, 7, 2050)
+    body = bytearray(callbacks.base64.urlsafe_b64decode(real + "=" * (-len(real) % 4)))
+    body[3] = 1  # price varint चा पहिला byte
+    forged = callbacks.base64.urlsafe_b64encode(bytes(body)).rstrip(b"=").decode()
+    print(f"  forged price : legacy parses as {legacy_parse(forged_legacy)}, signed decodes as {callbacks.decode(forged)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+# bench/bench_db.py
+# Per-operation latency: connect-per-call (जुना) vs pooled connection
+# Local MySQL लागतो (bot/config.py मधील DB settings)
+#
+#   python bench/bench_db.py --ops 500
+import argparse
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "bot"))
+os.environ.setdefault("ADMIN_USER_ID", "0")
+
+import mysql.connector  # noqa: E402
+import db  # noqa: E402
+from storage.pool import DB_HOST, DB_PORT, DB_USER, DB_PASSWORD, DB_NAME  # noqa: E402
+
+BENCH_USER = 999000001
+
+
+def legacy_get_user_balance(user_id):
+    # baseline: प्रत्येक call ला नवीन TCP + auth handshake
+    conn = mysql.connector.connect(
+        host=DB_HOST, port=int(DB_PORT), user=DB_USER, password=DB_PASSWORD, database=DB_NAME, raise_on_warnings=True
+    )
+    cur = conn.cursor(dictionary=True)
+    cur.execute("SELECT balance FROM users WHERE user_id = %s", (user_id,))
+    row = cur.fetchone()
+    conn.close()
+    return float(row["balance"]) if row else 0.0
+
+
+def measure(fn, ops):
+    samples = []
+    for _ in range(ops):
+        t = time.perf_counter()
+        fn(BENCH_USER)
+        samples.append((time.perf_counter() - t) * 1000)
+    samples.sort()
+    return {
+        "p50": statistics.median(samples),
+        "p99": samples[int(len(samples) * 0.99) - 1],
+        "mean": statistics.fmean(samples),
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--ops", type=int, default=500)
+    args = ap.parse_args()
+
+    db.add_or_get_user(BENCH_USER)
+    db.get_user_balance(BENCH_USER)  # warm-up pool
+
+    rows = [
+        ("connect-per-call", measure(legacy_get_user_balance, args.ops)),
+        ("pooled", measure(db.get_user_balance, args.ops)),
+    ]
+    print(f"get_user_balance x {args.ops} (ms)")
+    for name, r in rows:
+        print(f"  {name:18s} p50={r['p50']:.3f} p99={r['p99']:.3f} mean={r['mean']:.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+# bench/bench_herosms.py
+# जुना requests.get (session नाही) vs async pooled client – requests/sec
+#
+#   python bench/bench_herosms.py --requests 500 --concurrency 50 --latency 0.02
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+import requests
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "bot"))
+sys.path.append(ROOT)  # telemetry/, storage/
+os.environ.setdefault("ADMIN_USER_ID", "0")
+
+from fake_herosms import start_fake_server  # noqa: E402
+from providers.herosms import HeroSMSClient  # noqa: E402
+
+
+def legacy_get_status(base_url, order_id):
+    # baseline implementation: नवीन connection, timeout नाही, blocking
+    r = requests.get(base_url, params={"api_key": "x", "action": "getStatus", "id": order_id})
+    return r.text.strip()
+
+
+def bench_legacy(base_url, act_id, n):
+    t = time.perf_counter()
+    for _ in range(n):
+        legacy_get_status(base_url, act_id)
+    return n / (time.perf_counter() - t)
+
+
+async def bench_async(base_url, act_id, n, concurrency):
+    client = HeroSMSClient(api_key="x", base_url=base_url, max_connections=concurrency)
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with sem:
+            return await client.get_status(act_id)
+
+    await client.get_balance()  # warm-up connection
+    t = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(n)))
+    rps = n / (time.perf_counter() - t)
+    await client.aclose()
+    return rps
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--requests", type=int, default=500)
+    ap.add_argument("--concurrency", type=int, default=50)
+    ap.add_argument("--latency", type=float, default=0.02, help="fake provider latency (s)")
+    args = ap.parse_args()
+
+    server, _, url = start_fake_server(latency=args.latency)
+    act_id = requests.get(url, params={"action": "getNumber", "service": "wa"}).text.split(":")[1]
+
+    legacy = bench_legacy(url, act_id, args.requests)
+    pooled = asyncio.run(bench_async(url, act_id, args.requests, args.concurrency))
+    server.shutdown()
+
+    print(f"requests={args.requests} latency={args.latency * 1000:.0f}ms concurrency={args.concurrency}")
+    print(f"  legacy requests.get : {legacy:8.1f} req/s")
+    print(f"  async pooled client : {pooled:8.1f} req/s  ({pooled / legacy:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
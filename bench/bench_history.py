@@ -0,0 +1,156 @@
+# bench/bench_history.py
+# 📜 History page latency vs transactions table size:
+#   no index (IGNORE INDEX, जुनी स्थिती) / OFFSET paging / keyset (db.get_transaction_history)
+# Local MySQL लागतो; synthetic rows BENCH_USER_BASE पासूनच्या user ids वर (--cleanup ने काढा)
+#
+#   python bench/bench_history.py --sizes 100000,1000000,5000000 --users 20000
+#   python bench/bench_history.py --cleanup
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "bot"))
+os.environ.setdefault("ADMIN_USER_ID", "0")
+
+import db  # noqa: E402
+
+BENCH_USER_BASE = 998000000
+PAGE = 10
+DEEP_PAGE = 20  # user ने "Older ➡️" इतक्या वेळा दाबले
+
+
+def ensure_users(users):
+    conn = db.get_db_connection()
+    try:
+        cur = conn.cursor()
+        for start in range(0, users, 1000):
+            ids = [(BENCH_USER_BASE + i,) for i in range(start, min(users, start + 1000))]
+            cur.executemany(
+                "INSERT INTO users (user_id) VALUES (%s) ON DUPLICATE KEY UPDATE user_id = user_id", ids
+            )
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def table_rows():
+    conn = db.get_db_connection()
+    try:
+        cur = conn.cursor()
+        cur.execute("SELECT COUNT(*) FROM transactions")
+        return cur.fetchone()[0]
+    finally:
+        conn.close()
+
+
+def grow(target, users, rnd, batch=5000):
+    """transactions मध्ये target rows होईपर्यंत synthetic rows (गेल्या ~1 वर्षातील)."""
+    missing = target - table_rows()
+    conn = db.get_db_connection()
+    try:
+        cur = conn.cursor()
+        now = int(time.time())
+        while missing > 0:
+            n = min(batch, missing)
+            rows = [
+                (BENCH_USER_BASE + rnd.randrange(users), rnd.choice((10, 25, 50, 100)),
+                 rnd.choice(("CREDIT", "DEBIT")), "bench", now - rnd.randrange(365 * 86400))
+                for _ in range(n)
+            ]
+            cur.executemany(
+                "INSERT INTO transactions (user_id, amount, type, description, created_at) "
+                "VALUES (%s, %s, %s, %s, FROM_UNIXTIME(%s))", rows
+            )
+            conn.commit()
+            missing -= n
+    finally:
+        conn.close()
+
+
+def naive_page(user_id, page, index_hint=""):
+    conn = db.get_db_connection()
+    try:
+        cur = conn.cursor(dictionary=True)
+        cur.execute(f"""
+            SELECT id, UNIX_TIMESTAMP(created_at) AS ts, amount, type, description
+            FROM transactions {index_hint}
+            WHERE user_id = %s
+            ORDER BY created_at DESC, id DESC LIMIT %s OFFSET %s
+        """, (user_id, PAGE, page * PAGE))
+        return cur.fetchall()
+    finally:
+        conn.close()
+
+
+def keyset_walk(user_id, pages):
+    """पहिल्यापासून pages वेळा Older – शेवटच्या page ची latency परत."""
+    before_ts = before_id = None
+    elapsed = 0.0
+    for _ in range(pages + 1):
+        t = time.perf_counter()
+        rows = db.get_transaction_history(user_id, before_ts, before_id, PAGE)
+        elapsed = time.perf_counter() - t
+        if not rows:
+            break
+        before_ts, before_id = int(rows[-1]["ts"]), rows[-1]["id"]
+    return elapsed
+
+
+def p50(fn, samples):
+    times = []
+    for user_id in samples:
+        t = time.perf_counter()
+        fn(user_id)
+        times.append((time.perf_counter() - t) * 1000)
+    return statistics.median(times)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", default="100000,1000000", help="transactions table sizes (comma separated)")
+    ap.add_argument("--users", type=int, default=10000, help="synthetic users")
+    ap.add_argument("--samples", type=int, default=50, help="measured users per size")
+    ap.add_argument("--skip-naive-above", type=int, default=5000000,
+                    help="इतक्या rows नंतर IGNORE INDEX full scan मोजू नका")
+    ap.add_argument("--cleanup", action="store_true")
+    args = ap.parse_args()
+
+    if args.cleanup:
+        conn = db.get_db_connection()
+        try:
+            cur = conn.cursor()
+            cur.execute("DELETE FROM transactions WHERE user_id >= %s AND user_id < %s",
+                        (BENCH_USER_BASE, BENCH_USER_BASE + 10000000))
+            conn.commit()
+        finally:
+            conn.close()
+        return
+
+    rnd = random.Random(12)
+    ensure_users(args.users)
+
+    print(f"{'rows':>10} {'no index p1':>12} {'offset p1':>10} {'keyset p1':>10} "
+          f"{'offset p' + str(DEEP_PAGE):>11} {'keyset p' + str(DEEP_PAGE):>11}   (p50 ms)")
+    for size in (int(s) for s in args.sizes.split(",")):
+        grow(size, args.users, rnd)
+        rows = table_rows()
+        sample = [BENCH_USER_BASE + rnd.randrange(args.users) for _ in range(args.samples)]
+
+        if rows <= args.skip_naive_above:
+            no_index = f"{p50(lambda u: naive_page(u, 0, 'IGNORE INDEX (idx_user_created)'), sample):12.2f}"
+        else:
+            no_index = f"{'skipped':>12}"
+        offset1 = p50(lambda u: naive_page(u, 0), sample)
+        keyset1 = p50(lambda u: db.get_transaction_history(u, None, None, PAGE), sample)
+        offset_deep = p50(lambda u: naive_page(u, DEEP_PAGE), sample)
+        keyset_deep = statistics.median(keyset_walk(u, DEEP_PAGE) * 1000 for u in sample)
+
+        print(f"{rows:>10} {no_index} {offset1:10.2f} {keyset1:10.2f} {offset_deep:11.2f} {keyset_deep:11.2f}")
+
+
+if __name__ == "__main__":
+    main()
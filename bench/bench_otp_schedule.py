@@ -0,0 +1,103 @@
+# bench/bench_otp_schedule.py
+# Simulation: fixed 5s x 24 polling vs adaptive schedule, recorded arrival times वर
+#
+#   # orders मधून export: SELECT s.provider_service_code, o.server_id, o.otp_seconds ...
+#   python bench/bench_otp_schedule.py --samples arrivals.csv
+#   python bench/bench_otp_schedule.py            # synthetic distributions
+import argparse
+import csv
+import os
+import random
+import statistics
+import sys
+from collections import defaultdict
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "bot"))
+os.environ.setdefault("ADMIN_USER_ID", "0")
+
+from otp_schedule import ArrivalStats, PollSchedule  # noqa: E402
+
+# (service_code, server_id) -> (lognormal mu, sigma, never-arrives ratio)
+SYNTHETIC = {
+    ("wa", 1): (2.6, 0.35, 0.05),   # ~14s
+    ("tg", 2): (2.8, 0.30, 0.05),   # ~16s
+    ("ig", 3): (3.9, 0.50, 0.15),   # ~50s
+    ("fb", 4): (4.3, 0.40, 0.20),   # ~75s
+}
+
+
+class FixedSchedule:
+    """Baseline wait_for_otp: 5s interval, 24 polls."""
+
+    def next_delay(self, service_code, server_id, elapsed):
+        return 5.0
+
+    def give_up_after(self, service_code, server_id):
+        return 120.0
+
+
+def simulate(schedule, key, arrival):
+    """(provider calls, detect latency or None, timed out?)"""
+    t = schedule.next_delay(*key, 0)
+    give_up = schedule.give_up_after(*key)
+    calls = 0
+    while True:
+        calls += 1
+        if arrival is not None and arrival <= t:
+            return calls, t - arrival, False
+        if t >= give_up:
+            return calls, None, True
+        t += schedule.next_delay(*key, t)
+
+
+def load_samples(path):
+    samples = defaultdict(list)
+    with open(path) as f:
+        for row in csv.reader(f):
+            if row and row[0] != "provider_service_code":
+                samples[(row[0], int(row[1]))].append(float(row[2]))
+    return samples
+
+
+def synthetic_samples(n, rnd):
+    samples = defaultdict(list)
+    for key, (mu, sigma, never) in SYNTHETIC.items():
+        for _ in range(n):
+            samples[key].append(None if rnd.random() < never else rnd.lognormvariate(mu, sigma))
+    return samples
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--samples", help="CSV: provider_service_code,server_id,otp_seconds")
+    ap.add_argument("--orders", type=int, default=2000, help="synthetic orders per service")
+    args = ap.parse_args()
+
+    rnd = random.Random(7)
+    samples = load_samples(args.samples) if args.samples else synthetic_samples(args.orders, rnd)
+
+    # पहिल्या अर्ध्यावर शिकवा, उरलेल्यावर मोजा
+    stats = ArrivalStats()
+    test = []
+    for key, values in samples.items():
+        half = len(values) // 2
+        stats.load((key[0], key[1], v) for v in values[:half] if v is not None)
+        test += [(key, v) for v in values[half:]]
+
+    print(f"orders={len(test)}")
+    for name, schedule in (("fixed 5s x 24", FixedSchedule()), ("adaptive", PollSchedule(stats))):
+        calls, latency, lost = [], [], 0
+        for key, arrival in test:
+            c, lat, timed_out = simulate(schedule, key, arrival)
+            calls.append(c)
+            if lat is not None:
+                latency.append(lat)
+            elif arrival is not None and arrival <= 120:
+                lost += 1  # baseline ने पकडले असते, पण आपण आधी सोडले
+        print(f"  {name:14s} calls/order={statistics.fmean(calls):5.2f} "
+              f"median OTP latency={statistics.median(latency):5.2f}s lost={lost}")
+
+
+if __name__ == "__main__":
+    main()
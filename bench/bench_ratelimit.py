@@ -0,0 +1,83 @@
+# bench/bench_ratelimit.py
+# Per-user limiter + buy_ de-dup: एका tap ची किंमत, 1M users नंतर memory मधील buckets,
+# आणि double-tap / scripted storm मध्ये प्रत्यक्ष किती purchases चालतात
+#
+#   python bench/bench_ratelimit.py --users 1000000 --storm-users 2000 --taps 6
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "bot"))
+sys.path.append(ROOT)  # telemetry/
+os.environ.setdefault("ADMIN_USER_ID", "0")
+
+import ratelimit  # noqa: E402
+from ratelimit import BUY, CALLBACK, CallbackResults, RateLimiter  # noqa: E402
+
+
+def bench_limiter(users, maxsize):
+    limiter = RateLimiter(dict(ratelimit.limiter.limits), maxsize=maxsize)
+    started = time.perf_counter()
+    for uid in range(users):
+        limiter.allow(uid, CALLBACK)
+    per_call = (time.perf_counter() - started) / users * 1e9
+    print(f"  limiter: {users} distinct users, {per_call:.0f} ns/allow(), buckets kept {len(limiter)} (cap {maxsize})")
+
+
+async def storm(users, taps, purchase_seconds, dedup):
+    """प्रत्येक user एकाच buy_ button वर `taps` वेळा (10-150ms अंतराने) – purchases किती चालले."""
+    limiter = RateLimiter(dict(ratelimit.limiter.limits))
+    results = CallbackResults(ttl=60)
+    counts = {"purchases": 0, "cached": 0, "limited": 0}
+
+    async def purchase():
+        counts["purchases"] += 1
+        await asyncio.sleep(purchase_seconds)  # debit + getNumber
+        return "📞 Number already issued"
+
+    async def tap(uid):
+        if limiter.allow(uid, BUY):
+            counts["limited"] += 1
+            return
+        key = (uid, 1, "buy_1_12.5")
+        if dedup:
+            answer = results.begin(key)
+            if answer is not None:
+                counts["cached"] += 1
+                return
+        results.finish(key, await purchase())
+
+    async def user(uid):
+        rnd = random.Random(uid)
+        pending = []
+        for _ in range(taps):
+            pending.append(asyncio.create_task(tap(uid)))
+            await asyncio.sleep(rnd.uniform(0.01, 0.15))
+        await asyncio.gather(*pending)
+
+    await asyncio.gather(*(user(uid) for uid in range(users)))
+    return counts
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--users", type=int, default=1000000)
+    ap.add_argument("--maxsize", type=int, default=100000)
+    ap.add_argument("--storm-users", type=int, default=2000)
+    ap.add_argument("--taps", type=int, default=6)
+    ap.add_argument("--purchase-seconds", type=float, default=0.5)
+    args = ap.parse_args()
+
+    bench_limiter(args.users, args.maxsize)
+    for label, dedup in (("limiter only", False), ("limiter + de-dup", True)):
+        c = asyncio.run(storm(args.storm_users, args.taps, args.purchase_seconds, dedup))
+        print(f"  {label:17}: {args.storm_users} users x {args.taps} taps -> purchases {c['purchases']:6}  "
+              f"answered from cache {c['cached']:6}  rate limited {c['limited']:6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+# bench/bench_router.py
+# एकच provider vs router (scoring + failover) – fake providers वर purchase success आणि ₹ per OTP
+#
+#   python bench/bench_router.py --purchases 400 --concurrency 20
+import argparse
+import asyncio
+import logging
+import os
+import random
+import sys
+import time
+from collections import Counter
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "bot"))
+sys.path.append(ROOT)  # telemetry/, storage/
+os.environ.setdefault("ADMIN_USER_ID", "0")
+
+from fake_herosms import start_fake_server  # noqa: E402
+from providers import registry  # noqa: E402
+from providers.router import ProviderRouter  # noqa: E402
+from providers.sms_activate import SmsActivateClient  # noqa: E402
+
+# name -> (cost ₹, getNumber latency s, NO_NUMBERS ratio, number -> OTP ratio)
+PROVIDERS = {
+    "cheap":  (8.0, 0.05, 0.60, 0.55),
+    "steady": (10.0, 0.02, 0.05, 0.95),
+    "slow":   (9.0, 0.40, 0.10, 0.85),
+}
+
+
+async def run(routes, otp_ratio, purchases, concurrency, failover):
+    router = ProviderRouter(max_attempts=len(routes) if failover else 1)
+    sem = asyncio.Semaphore(concurrency)
+    rnd = random.Random(7)
+    used, latencies = Counter(), []
+    delivered = spent = 0
+
+    async def one():
+        nonlocal delivered, spent
+        async with sem:
+            t = time.perf_counter()
+            purchase, _ = await router.get_number(routes)
+            latencies.append(time.perf_counter() - t)
+        if not purchase:
+            return
+        route = purchase.route
+        used[route["provider"]] += 1
+        spent += route["price"]
+        ok = rnd.random() < otp_ratio[route["provider"]]
+        router.record_otp(route["id"], ok)
+        delivered += ok
+
+    await asyncio.gather(*(one() for _ in range(purchases)))
+    latencies.sort()
+    return {
+        "numbers": sum(used.values()),
+        "delivered": delivered,
+        "cost_per_otp": spent / delivered if delivered else float("inf"),
+        "p50": latencies[len(latencies) // 2],
+        "p95": latencies[int(len(latencies) * 0.95)],
+        "used": dict(used),
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--purchases", type=int, default=400)
+    ap.add_argument("--concurrency", type=int, default=20)
+    args = ap.parse_args()
+    logging.basicConfig(level=logging.ERROR)  # failover warnings नकोत
+
+    servers, routes, otp_ratio = [], [], {}
+    for i, (name, (cost, latency, empty, otp)) in enumerate(PROVIDERS.items(), 1):
+        server, _, url = start_fake_server(latency=latency, no_numbers=empty)
+        servers.append(server)
+        registry.register(SmsActivateClient(name, "x", url, max_connections=args.concurrency))
+        routes.append({"id": i, "provider": name, "price": cost, "service_code": "wa", "country": 22})
+        otp_ratio[name] = otp
+
+    async def both():
+        baseline = await run(routes[:1], otp_ratio, args.purchases, args.concurrency, failover=False)
+        routed = await run(routes, otp_ratio, args.purchases, args.concurrency, failover=True)
+        await registry.aclose_all()
+        return baseline, routed
+
+    baseline, routed = asyncio.run(both())
+    for s in servers:
+        s.shutdown()
+
+    print(f"purchases={args.purchases} concurrency={args.concurrency}")
+    for label, r in (("single provider (cheap)", baseline), ("router + failover", routed)):
+        print(f"  {label:24}: numbers {r['numbers'] / args.purchases:6.1%}  "
+              f"OTPs {r['delivered'] / args.purchases:6.1%}  ₹/OTP {r['cost_per_otp']:6.2f}  "
+              f"p50 {r['p50'] * 1000:5.0f}ms  p95 {r['p95'] * 1000:5.0f}ms  {r['used']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+# bench/bench_shards.py
+# Multi-worker mode throughput: fake Telegram (वेगळा process) + shard_front.py + N bot.py workers.
+# Driver webhook POSTs पाठवतो (Wallet / History / Buy Number / Terms / svc callbacks),
+# fake Telegram कडे replies मोजतो. Front, workers, fake API आणि driver एकाच मशीनवर –
+# scaling CPU cores इतकीच दिसते (nproc पण print करतो).
+#
+#   DB_TYPE=sqlite DB_PATH=/tmp/shards.sqlite3 python bench/bench_shards.py --workers 1 2 4 8 --updates 4000
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+
+import httpx
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "bot"))
+sys.path.append(ROOT)
+os.environ.setdefault("ADMIN_USER_ID", "1")
+os.environ.setdefault("BOT_TOKEN", "123:fake")
+
+import callbacks  # noqa: E402
+import db  # noqa: E402
+import migrations  # noqa: E402
+from fake_telegram import make_update  # noqa: E402
+
+BENCH_USER_BASE = 960000000
+TEXTS = ("💰 Wallet", "📜 History", "🛒 Buy Number", "⚖️ Terms")
+REPLY_METHODS = ("sendMessage", "editMessageText", "answerCallbackQuery")
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def seed(users):
+    migrations.migrate()
+    for i in range(users):
+        db.add_or_get_user(BENCH_USER_BASE + i)
+    conn = db.get_db_connection()
+    try:
+        cur = conn.cursor()
+        cur.execute("SELECT id FROM services WHERE service_name = 'Shard Bench'")
+        row = cur.fetchone()
+        if row:
+            return row[0]
+        service_id = cur.insert(
+            "INSERT INTO services (service_name, provider_service_code) VALUES ('Shard Bench', 'shb')"
+        )
+        cur.execute("""
+            INSERT INTO servers (service_id, server_number, price, provider, provider_service_code)
+            VALUES (%s, 1, 12.5, 'herosms', 'shb')
+        """, (service_id,))
+        conn.commit()
+        return service_id
+    finally:
+        conn.close()
+
+
+def workload(n, users, service_id):
+    rnd = random.Random(n)
+    svc = callbacks.encode(callbacks.SERVICE, service_id)
+    for i in range(n):
+        uid = BENCH_USER_BASE + rnd.randrange(users)
+        if rnd.random() < 0.3:
+            yield make_update(i + 1, uid, callback_data=svc)
+        else:
+            yield make_update(i + 1, uid, rnd.choice(TEXTS))
+
+
+async def replies(client, tg_url):
+    r = await client.post(f"{tg_url}/getBenchStats")
+    calls = r.json()["result"]["calls"]
+    return sum(calls.get(m, 0) for m in REPLY_METHODS)
+
+
+async def post(reader, writer, path, body):
+    """Keep-alive connection वर एक POST (httpx pool 64 connections ला स्वतःच bottleneck होतो)."""
+    writer.write(f"POST {path} HTTP/1.1\r\nHost: front\r\nContent-Type: application/json\r\n"
+                 f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+    head = await reader.readuntil(b"\r\n\r\n")
+    length = 0
+    for line in head.split(b"\r\n")[1:]:
+        if line.lower().startswith(b"content-length:"):
+            length = int(line.split(b":")[1])
+    await reader.readexactly(length)
+    return int(head.split(b" ", 2)[1])
+
+
+async def drive(front_port, tg_url, bodies, concurrency):
+    """सगळे updates पाठवतो (503 → retry, Telegram सारखे) आणि प्रत्येकाचा reply येईपर्यंत थांबतो."""
+    async with httpx.AsyncClient(timeout=30) as client:
+        before = await replies(client, tg_url)
+        queue = list(reversed(bodies))
+        retries = 0
+
+        async def sender():
+            nonlocal retries
+            reader, writer = await asyncio.open_connection("127.0.0.1", front_port)
+            while queue:
+                body = queue.pop()
+                while await post(reader, writer, "/telegram", body) != 200:
+                    retries += 1
+                    await asyncio.sleep(0.05)
+            writer.close()
+
+        started = time.perf_counter()
+        await asyncio.gather(*(sender() for _ in range(concurrency)))
+        accepted = time.perf_counter() - started
+        while await replies(client, tg_url) - before < len(bodies):
+            await asyncio.sleep(0.02)
+        return accepted, time.perf_counter() - started, retries
+
+
+async def wait_ready(front_url, workers, users):
+    """प्रत्येक shard चा एक probe update 200 देईपर्यंत (workers startup)."""
+    async with httpx.AsyncClient(timeout=5) as client:
+        for shard in range(workers):
+            uid = next(BENCH_USER_BASE + i for i in range(users) if (BENCH_USER_BASE + i) % workers == shard)
+            body = json.dumps(make_update(10 ** 9 + shard, uid, "⚖️ Terms")).encode()
+            deadline = time.monotonic() + 60
+            while True:
+                try:
+                    if (await client.post(front_url, content=body)).status_code == 200:
+                        break
+                except httpx.TransportError:
+                    pass
+                if time.monotonic() > deadline:
+                    raise RuntimeError(f"shard {shard} did not come up")
+                await asyncio.sleep(0.2)
+    await asyncio.sleep(0.5)  # probes चे replies पोहोचू दे
+
+
+def run(workers, args, tg_url, bodies):
+    port, base = free_port(), free_port()
+    env = dict(
+        os.environ, TELEGRAM_BASE_URL=tg_url, WEBHOOK_PORT=str(port), WEBHOOK_LISTEN="127.0.0.1",
+        WEBHOOK_PATH="telegram", SHARD_BASE_PORT=str(base), METRICS_PORT="0",
+        RATE_MESSAGE_BURST="1000", RATE_CALLBACK_BURST="1000", TG_GLOBAL_RATE="100000", TG_CHAT_RATE="1000",
+    )
+    env.pop("WEBHOOK_SECRET", None)
+    env.pop("WEBHOOK_URL", None)
+    front = subprocess.Popen(
+        [sys.executable, os.path.join(ROOT, "bot", "shard_front.py"), "--workers", str(workers), "--no-set-webhook"],
+        env=env, stdout=subprocess.DEVNULL, stderr=None if args.verbose else subprocess.DEVNULL
+    )
+    front_url = f"http://127.0.0.1:{port}/telegram"
+    try:
+        asyncio.run(wait_ready(front_url, workers, args.users))
+        return asyncio.run(drive(port, tg_url, bodies, args.concurrency))
+    finally:
+        front.terminate()
+        front.wait(30)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    ap.add_argument("--updates", type=int, default=4000)
+    ap.add_argument("--users", type=int, default=2000)
+    ap.add_argument("--concurrency", type=int, default=64, help="Telegram max_connections सारखे")
+    ap.add_argument("--latency", type=float, default=0.02, help="fake Telegram प्रति call delay")
+    ap.add_argument("--verbose", action="store_true")
+    args = ap.parse_args()
+
+    service_id = seed(args.users)
+    bodies = [json.dumps(u).encode() for u in workload(args.updates, args.users, service_id)]
+    tg_port = free_port()
+    fake = subprocess.Popen([sys.executable, os.path.join(ROOT, "bench", "fake_telegram.py"),
+                             "--port", str(tg_port), "--latency", str(args.latency)], stdout=subprocess.DEVNULL)
+    tg_url = f"http://127.0.0.1:{tg_port}/bot"
+    time.sleep(1)
+
+    print(f"{args.updates} updates, {args.users} users, {args.concurrency} connections, "
+          f"Telegram latency {args.latency * 1000:.0f}ms, {os.cpu_count()} CPUs ({db.DB_TYPE})")
+    try:
+        base = None
+        for n in args.workers:
+            accepted, total, retries = run(n, args, tg_url, bodies)
+            rate = args.updates / total
+            base = base or rate / n
+            print(f"  workers={n}: {rate:7.0f} updates/s (accepted in {accepted:5.2f}s, done {total:5.2f}s, "
+                  f"503 retries {retries})  {rate / base / n:4.0%} of linear")
+    finally:
+        fake.terminate()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+# bench/bench_startup.py
+# Cold-start: प्रत्येक entry point नवीन interpreter मध्ये import करायला किती वेळ + सगळ्यात महाग imports
+# DB मुद्दाम unreachable ठेवतो – import वेळी DB connect / DDL झाले तर इथेच fail होईल
+#
+#   python bench/bench_startup.py --runs 10
+#   python bench/bench_startup.py --top 15
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# (name, cwd, module)
+ENTRY_POINTS = [
+    ("bot", os.path.join(ROOT, "bot"), "bot"),
+    ("webhook", ROOT, "webhook"),
+    ("payment_worker", ROOT, "payment_worker"),
+    ("migrations", ROOT, "migrations"),
+]
+
+
+def _env():
+    env = dict(os.environ)
+    env.setdefault("ADMIN_USER_ID", "0")
+    env.setdefault("BOT_TOKEN", "0:bench")
+    env["DB_HOST"] = "127.0.0.1"
+    env["DB_PORT"] = "9"  # discard port – connect केला तर लगेच error
+    return env
+
+
+def cold_import(cwd, module):
+    t = time.perf_counter()
+    r = subprocess.run([sys.executable, "-c", f"import {module}"], cwd=cwd, env=_env(),
+                       capture_output=True, text=True)
+    elapsed = (time.perf_counter() - t) * 1000
+    if r.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{r.stderr.strip()}")
+    return elapsed
+
+
+def import_profile(cwd, module, top):
+    """-X importtime मधून self-time नुसार top modules (ms)."""
+    r = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"], cwd=cwd, env=_env(),
+                       capture_output=True, text=True)
+    rows = []
+    for line in r.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = (p.strip() for p in line[len("import time:"):].split("|"))
+        rows.append((int(self_us) / 1000, int(cumulative_us) / 1000, name.strip()))
+    rows.sort(reverse=True)
+    return rows[:top]
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--runs", type=int, default=5)
+    ap.add_argument("--top", type=int, default=8, help="प्रत्येक entry point साठी महाग imports")
+    args = ap.parse_args()
+
+    baseline = statistics.median(cold_import(ROOT, "sys") for _ in range(args.runs))
+    print(f"interpreter baseline: {baseline:.1f} ms\n")
+
+    for name, cwd, module in ENTRY_POINTS:
+        try:
+            samples = sorted(cold_import(cwd, module) for _ in range(args.runs))
+        except RuntimeError as e:
+            print(f"{name:15s} FAILED – {e}\n")
+            continue
+        print(f"{name:15s} p50={statistics.median(samples):7.1f} ms  max={samples[-1]:7.1f} ms  "
+              f"(import cost {statistics.median(samples) - baseline:7.1f} ms)")
+        for self_ms, cumulative_ms, mod in import_profile(cwd, module, args.top):
+            print(f"    {self_ms:7.1f} ms self {cumulative_ms:8.1f} ms cum  {mod}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
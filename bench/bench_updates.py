@@ -0,0 +1,82 @@
+# bench/bench_updates.py
+# Handler latency p50/p99: sequential (जुना run_polling default) vs PerUserUpdateProcessor
+#
+#   python bench/bench_updates.py --rate 200 --seconds 5 --slow-ratio 0.05 --slow-time 2
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "bot"))
+sys.path.append(ROOT)  # telemetry/, storage/
+
+from telegram import Update  # noqa: E402
+from telegram.ext import ApplicationBuilder, MessageHandler, filters  # noqa: E402
+
+from fake_telegram import start_fake_server, make_update  # noqa: E402
+from update_processor import PerUserUpdateProcessor  # noqa: E402
+
+
+def percentile(samples, p):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * p))] * 1000 if samples else 0.0
+
+
+async def run(base_url, processor, args):
+    enqueued = {}
+    latencies = []
+
+    async def handler(update, context):
+        if update.message.text == "slow":
+            await asyncio.sleep(args.slow_time)  # उदा. HeroSMS getNumber ची वाट
+        await update.message.reply_text("ok")
+        latencies.append(time.perf_counter() - enqueued[update.update_id])
+
+    builder = ApplicationBuilder().token("123:fake").base_url(base_url).concurrent_updates(processor)
+    app = builder.build()
+    app.add_handler(MessageHandler(filters.TEXT, handler))
+
+    total = int(args.rate * args.seconds)
+    rnd = random.Random(1)
+    async with app:
+        await app.start()
+        for i in range(total):
+            text = "slow" if rnd.random() < args.slow_ratio else "fast"
+            update = Update.de_json(make_update(i + 1, rnd.randint(1, args.users), text), app.bot)
+            enqueued[update.update_id] = time.perf_counter()
+            await app.update_queue.put(update)
+            await asyncio.sleep(1 / args.rate)
+        deadline = time.perf_counter() + args.slow_time * total + 30
+        while len(latencies) < total and time.perf_counter() < deadline:
+            await asyncio.sleep(0.05)
+        await app.stop()
+    return latencies
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rate", type=float, default=100, help="updates/sec")
+    ap.add_argument("--seconds", type=float, default=5)
+    ap.add_argument("--users", type=int, default=1000)
+    ap.add_argument("--slow-ratio", type=float, default=0.05)
+    ap.add_argument("--slow-time", type=float, default=1.0)
+    ap.add_argument("--concurrency", type=int, default=64)
+    args = ap.parse_args()
+
+    server, _, url = start_fake_server()
+    modes = [
+        ("sequential (polling default)", False),
+        (f"per-user concurrent ({args.concurrency})", PerUserUpdateProcessor(args.concurrency)),
+    ]
+    print(f"rate={args.rate}/s for {args.seconds}s, {args.slow_ratio:.0%} slow handlers x {args.slow_time}s")
+    for name, processor in modes:
+        lat = asyncio.run(run(url, processor, args))
+        print(f"  {name:32s} n={len(lat):5d} p50={percentile(lat, 0.5):9.1f}ms p99={percentile(lat, 0.99):9.1f}ms")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+# bench/bench_webhook.py
+# Razorpay webhook burst replay: ingest req/s + worker credits/s (local DB लागतो)
+#
+#   python bench/bench_webhook.py --payloads captured.jsonl --repeat 3
+#   python bench/bench_webhook.py --synthetic 5000 --users 200
+import argparse
+import hashlib
+import hmac
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import db  # noqa: E402
+import webhook  # noqa: E402
+import payment_worker  # noqa: E402
+
+
+def synthetic(n, users):
+    base = 990000000
+    for i in range(n):
+        yield json.dumps({
+            "event": "payment.captured",
+            "payload": {"payment": {"entity": {
+                "id": f"pay_bench{i:08d}", "amount": 10000,
+                "notes": {"user_id": str(base + i % users)}
+            }}}
+        })
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--payloads", help="captured webhook bodies, one JSON per line")
+    ap.add_argument("--synthetic", type=int, default=2000)
+    ap.add_argument("--users", type=int, default=100)
+    ap.add_argument("--repeat", type=int, default=2, help="प्रत्येक payload किती वेळा (Razorpay retries)")
+    args = ap.parse_args()
+
+    if args.payloads:
+        with open(args.payloads) as f:
+            bodies = [line.strip() for line in f if line.strip()]
+    else:
+        bodies = list(synthetic(args.synthetic, args.users))
+        for i in range(args.users):
+            db.add_or_get_user(990000000 + i)
+
+    payment_worker.notify = lambda *a: None  # benchmark मध्ये Telegram call नको
+    secret = webhook.WEBHOOK_SECRET.encode()
+    client = webhook.app.test_client()
+
+    t = time.perf_counter()
+    for _ in range(args.repeat):
+        for body in bodies:
+            sig = hmac.new(secret, body.encode(), hashlib.sha256).hexdigest()
+            r = client.post("/webhook", data=body, headers={
+                "X-Razorpay-Signature": sig, "Content-Type": "application/json"
+            })
+            assert r.status_code == 200, r.data
+    ingest = time.perf_counter() - t
+    deliveries = len(bodies) * args.repeat
+
+    t = time.perf_counter()
+    credited = 0
+    while True:
+        n = payment_worker.run_once()
+        credited += n
+        if n == 0:
+            break
+    apply = time.perf_counter() - t
+
+    print(f"deliveries={deliveries} unique={len(bodies)}")
+    print(f"  ingest : {deliveries / ingest:8.1f} req/s ({ingest * 1000 / deliveries:.2f} ms/req)")
+    print(f"  worker : {credited / apply if apply else 0:8.1f} credits/s, credited={credited} (duplicates dropped: {deliveries - credited})")
+
+
+if __name__ == "__main__":
+    main()
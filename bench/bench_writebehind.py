@@ -0,0 +1,169 @@
+# bench/bench_writebehind.py
+# Order lifecycle load: OTP transitions synchronous (प्रत्येकी एक commit, जुनी पद्धत) vs
+# write-behind (db.queue_otp, batch flush).
+# Debit, NUMBER_RECEIVED आणि refund दोन्हीमध्ये synchronous. commits/s, handler मधला status-write वेळ आणि
+# lock waits (MySQL: Innodb_row_lock_*, Postgres: pg_locks sample, SQLite: n/a).
+#
+#   DB_TYPE=mysql python bench/bench_writebehind.py --orders 5000 --threads 32
+#   DB_TYPE=sqlite DB_PATH=/tmp/wb.sqlite3 python bench/bench_writebehind.py
+import argparse
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import db  # noqa: E402
+import migrations  # noqa: E402
+from bench_backends import BENCH_USER_BASE, _seed  # noqa: E402
+from storage import pool  # noqa: E402
+
+_commits = 0
+_commit_lock = threading.Lock()
+_real_commit = pool.Connection.commit
+
+
+def _counting_commit(self):
+    global _commits
+    _real_commit(self)
+    with _commit_lock:
+        _commits += 1
+
+
+pool.Connection.commit = _counting_commit
+
+
+def lock_waits():
+    """(waits, wait ms) cumulative – MySQL फक्त; बाकी None."""
+    if db.DB_TYPE != "mysql":
+        return None
+    conn = db.get_db_connection()
+    try:
+        cur = conn.cursor()
+        cur.execute("SHOW GLOBAL STATUS WHERE Variable_name IN ('Innodb_row_lock_waits', 'Innodb_row_lock_time')")
+        status = dict(cur.fetchall())
+        return int(status["Innodb_row_lock_waits"]), int(status["Innodb_row_lock_time"])
+    finally:
+        conn.close()
+
+
+class PgLockSampler(threading.Thread):
+    """Postgres: दर 10ms ला न मिळालेले locks मोजतो (cumulative counter नाही)."""
+
+    def __init__(self):
+        super().__init__(daemon=True)
+        self.samples = self.waiting = 0
+        self.stop = threading.Event()
+
+    def run(self):
+        while not self.stop.wait(0.01):
+            conn = db.get_db_connection()
+            try:
+                cur = conn.cursor()
+                cur.execute("SELECT COUNT(*) FROM pg_locks WHERE NOT granted")
+                self.waiting += cur.fetchone()[0]
+                self.samples += 1
+            finally:
+                conn.close()
+
+
+def run(mode, orders, threads, users, service_id, server_id):
+    global _commits
+    counter = iter(range(orders))
+    lock = threading.Lock()
+    write_ms = []
+
+    def loop(seed):
+        rnd = random.Random(seed)
+        local = []
+        while True:
+            with lock:
+                i = next(counter, None)
+            if i is None:
+                break
+            uid = BENCH_USER_BASE + rnd.randrange(users)
+            order_id = db.place_order(uid, service_id, server_id, 12.5)
+            db.mark_number_received(order_id, f"wb{i}", "+910000000000", 120, "herosms", server_id)
+            if rnd.random() < 0.7:
+                t = time.perf_counter()
+                if mode == "sync":
+                    db.record_otp(order_id, "123456", 15)
+                else:
+                    db.queue_otp(order_id, "123456", 15)
+                local.append((time.perf_counter() - t) * 1000)
+            else:
+                db.refund_order(order_id, db.TIMEOUT, "Refund - Timeout")  # flush barrier
+        with lock:
+            write_ms.extend(local)
+
+    waits_before = lock_waits()
+    sampler = PgLockSampler() if db.DB_TYPE == "postgres" else None
+    if sampler:
+        sampler.start()
+    _commits = 0
+    started = time.perf_counter()
+    workers = [threading.Thread(target=loop, args=(n,)) for n in range(threads)]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    db.order_writes.flush()  # शेवटचा batch – त्याचा commit सुद्धा मोजायचा
+    wall = time.perf_counter() - started
+    commits = _commits
+
+    if sampler:
+        sampler.stop.set()
+        sampler.join()
+        waits = f"avg waiting locks {sampler.waiting / max(sampler.samples, 1):.2f}"
+    elif waits_before:
+        after = lock_waits()
+        waits = f"row lock waits {after[0] - waits_before[0]} ({after[1] - waits_before[1]} ms)"
+    else:
+        waits = "lock waits n/a"
+
+    write_ms.sort()
+    print(f"  {mode:12}: {orders / wall:7.0f} orders/s  {commits / wall:7.0f} commits/s  "
+          f"{commits / orders:4.2f} commits/order  OTP write p50 {statistics.median(write_ms):6.2f}ms "
+          f"p99 {write_ms[int(len(write_ms) * 0.99) - 1]:6.2f}ms  {waits}")
+
+
+def check(service_id):
+    """Write-behind नंतर सगळे orders terminal / NUMBER_RECEIVED नाहीत आणि otp_logs पूर्ण."""
+    conn = db.get_db_connection()
+    try:
+        cur = conn.cursor()
+        cur.execute("SELECT status, COUNT(*) FROM orders WHERE service_id = %s GROUP BY status", (service_id,))
+        statuses = dict(cur.fetchall())
+        cur.execute("""
+            SELECT COUNT(*) FROM orders o LEFT JOIN otp_logs l ON l.order_id = o.id
+            WHERE o.service_id = %s AND o.status = 'OTP_RECEIVED' AND l.id IS NULL
+        """, (service_id,))
+        missing = cur.fetchone()[0]
+    finally:
+        conn.close()
+    print(f"  orders by status {statuses}, OTP orders without feed row: {missing}")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--orders", type=int, default=3000)
+    ap.add_argument("--threads", type=int, default=16)
+    ap.add_argument("--users", type=int, default=500)
+    args = ap.parse_args()
+
+    migrations.migrate()
+    service_id, server_id = _seed(db, args.users)
+    print(f"orders={args.orders} threads={args.threads} users={args.users} ({db.DB_TYPE}, "
+          f"batch {db.order_writes.max_batch}, delay {db.order_writes.max_delay}s)")
+    run("sync", args.orders, args.threads, args.users, service_id, server_id)
+    run("write-behind", args.orders, args.threads, args.users, service_id, server_id)
+    check(service_id)
+    db.order_writes.stop()
+
+
+if __name__ == "__main__":
+    main()
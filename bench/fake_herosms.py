@@ -0,0 +1,134 @@
+# bench/fake_herosms.py
+# लोकल fake HeroSMS server – benchmarks आणि manual testing साठी
+#
+#   python bench/fake_herosms.py --port 8765 --latency 0.02 --otp-after 10
+#   HEROSMS_BASE_URL=http://127.0.0.1:8765/stubs/handler_api.php python bot/bot.py
+import argparse
+import itertools
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+
+class FakeHeroSMS:
+    """In-memory SMS-activate compatible provider state."""
+
+    def __init__(self, latency=0.0, otp_after=10.0, balance="100.00", no_numbers=0.0):
+        self.latency = latency
+        self.no_numbers = no_numbers  # getNumber पैकी किती NO_NUMBERS (0..1)
+        self.otp_after = otp_after
+        self.balance = balance
+        self.activations = {}
+        self.calls = 0
+        self._ids = itertools.count(100000)
+        self._lock = threading.Lock()
+
+    def handle(self, q):
+        with self._lock:
+            self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+        action = q.get("action")
+        if action == "getBalance":
+            return f"ACCESS_BALANCE:{self.balance}"
+
+        if action == "getNumber":
+            if random.random() < self.no_numbers:
+                return "NO_NUMBERS"
+            with self._lock:
+                act_id = str(next(self._ids))
+                phone = f"91{int(act_id):010d}"
+                self.activations[act_id] = {"phone": phone, "started": time.monotonic(), "status": "ACTIVE"}
+            return f"ACCESS_NUMBER:{act_id}:{phone}"
+
+        if action == "getStatus":
+            return self._status(q.get("id"))
+
+        if action == "setStatus":
+            a = self.activations.get(q.get("id"))
+            if not a:
+                return "NO_ACTIVATION"
+            if q.get("status") == "8":
+                a["status"] = "CANCELLED"
+                return "ACCESS_CANCEL"
+            return "ACCESS_READY"
+
+        if action == "getActiveActivations":
+            active = [
+                {"activationId": i, "phoneNumber": a["phone"], "smsCode": [self._code(i)] if self._arrived(a) else None}
+                for i, a in self.activations.items() if a["status"] == "ACTIVE"
+            ]
+            if not active:
+                return json.dumps({"status": "error", "error": "NO_ACTIVATIONS"})
+            return json.dumps({"status": "success", "activeActivations": active})
+
+        return "BAD_ACTION"
+
+    def _arrived(self, a):
+        return time.monotonic() - a["started"] >= self.otp_after
+
+    def _code(self, act_id):
+        return act_id[-6:]
+
+    def _status(self, act_id):
+        a = self.activations.get(act_id)
+        if not a:
+            return "NO_ACTIVATION"
+        if a["status"] == "CANCELLED":
+            return "STATUS_CANCEL"
+        if self._arrived(a):
+            return f"STATUS_OK:{self._code(act_id)}"
+        return "STATUS_WAIT_CODE"
+
+
+def make_handler(state):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive
+
+        def do_GET(self):
+            q = {k: v[0] for k, v in parse_qs(urlparse(self.path).query).items()}
+            body = state.handle(q).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            try:
+                self.wfile.write(body)
+            except (BrokenPipeError, ConnectionResetError):
+                pass  # client timeout होऊन गेला (outage simulation)
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+def start_fake_server(host="127.0.0.1", port=0, **kwargs):
+    """Background thread मध्ये server चालू करतो, (server, state, base_url) परत करतो."""
+    state = FakeHeroSMS(**kwargs)
+    server = ThreadingHTTPServer((host, port), make_handler(state))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://{host}:{server.server_address[1]}/stubs/handler_api.php"
+    return server, state, url
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--latency", type=float, default=0.0)
+    ap.add_argument("--otp-after", type=float, default=10.0)
+    ap.add_argument("--no-numbers", type=float, default=0.0, help="NO_NUMBERS ratio for getNumber")
+    args = ap.parse_args()
+
+    server, _, url = start_fake_server(port=args.port, latency=args.latency, otp_after=args.otp_after,
+                                       no_numbers=args.no_numbers)
+    print(f"Fake HeroSMS on {url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
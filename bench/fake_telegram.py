@@ -0,0 +1,172 @@
+# bench/fake_telegram.py
+# लोकल fake Telegram Bot API – benchmarks साठी (python-telegram-bot base_url इथे point करा)
+#
+#   python bench/fake_telegram.py --port 8081 --latency 0.01
+#   ApplicationBuilder().base_url("http://127.0.0.1:8081/bot")
+import argparse
+import itertools
+import json
+import threading
+import time
+from collections import defaultdict, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+class FakeTelegram:
+    """
+    Minimal Bot API: getMe, sendMessage, editMessageText, answerCallbackQuery,
+    webhook calls. With `enforce_limits` it answers 429 + retry_after above
+    `global_rate` msg/s overall or `chat_rate` msg/s per chat, like Telegram.
+    """
+
+    def __init__(self, latency=0.0, enforce_limits=False, global_rate=30, chat_rate=1,
+                 blocked_chats=()):
+        self.latency = latency
+        self.enforce_limits = enforce_limits
+        self.global_rate = global_rate
+        self.chat_rate = chat_rate
+        self.blocked_chats = set(blocked_chats)
+        self.sent = []  # (monotonic time, chat_id, text)
+        self.calls = defaultdict(int)
+        self.rate_limited = 0
+        self._ids = itertools.count(1)
+        self._global = deque()
+        self._per_chat = defaultdict(deque)
+        self._lock = threading.Lock()
+
+    def _retry_after(self, chat_id, now):
+        g = self._global
+        while g and now - g[0] >= 1:
+            g.popleft()
+        c = self._per_chat[chat_id]
+        while c and now - c[0] >= 1:
+            c.popleft()
+        if len(g) >= self.global_rate:
+            return 1 - (now - g[0])
+        if len(c) >= self.chat_rate:
+            return 1 - (now - c[0])
+        g.append(now)
+        c.append(now)
+        return 0
+
+    def handle(self, method, params):
+        if self.latency:
+            time.sleep(self.latency)
+        with self._lock:
+            self.calls[method] += 1
+
+        if method == "getMe":
+            return {"id": 1, "is_bot": True, "first_name": "Fake", "username": "fake_otp_bot",
+                    "can_join_groups": False, "can_read_all_group_messages": False,
+                    "supports_inline_queries": False}
+
+        if method in ("sendMessage", "editMessageText"):
+            chat_id = int(params.get("chat_id", 0))
+            if chat_id in self.blocked_chats:
+                return _error(403, "Forbidden: bot was blocked by the user")
+            now = time.monotonic()
+            if self.enforce_limits:
+                with self._lock:
+                    wait = self._retry_after(chat_id, now)
+                    if wait > 0:
+                        self.rate_limited += 1
+                        retry = max(1, int(wait + 0.999))
+                        return _error(429, f"Too Many Requests: retry after {retry}", retry_after=retry)
+            with self._lock:
+                self.sent.append((now, chat_id, params.get("text")))
+            return {"message_id": next(self._ids), "date": int(time.time()),
+                    "chat": {"id": chat_id, "type": "private"}, "text": params.get("text", "")}
+
+        if method in ("answerCallbackQuery", "setWebhook", "deleteWebhook", "setMyCommands"):
+            return True
+
+        if method == "getUpdates":
+            return []
+
+        if method == "getBenchStats":  # अलग process मधून चालवल्यावर bench साठी counters
+            with self._lock:
+                return {"calls": dict(self.calls), "sent": len(self.sent)}
+
+        return _error(404, "Not Found: method not found")
+
+
+def _error(code, description, retry_after=None):
+    err = {"__error__": True, "ok": False, "error_code": code, "description": description}
+    if retry_after:
+        err["parameters"] = {"retry_after": retry_after}
+    return err
+
+
+def make_handler(state):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _params(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            raw = self.rfile.read(length).decode() if length else ""
+            if self.headers.get("Content-Type", "").startswith("application/json"):
+                return json.loads(raw or "{}")
+            params = {k: v[0] for k, v in parse_qs(raw).items()}
+            params.update({k: v[0] for k, v in parse_qs(urlparse(self.path).query).items()})
+            return params
+
+        def do_POST(self):
+            method = urlparse(self.path).path.rsplit("/", 1)[-1]
+            result = state.handle(method, self._params())
+            if isinstance(result, dict) and result.pop("__error__", False):
+                status, payload = result["error_code"], result
+            else:
+                status, payload = 200, {"ok": True, "result": result}
+            body = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        do_GET = do_POST
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+def start_fake_server(host="127.0.0.1", port=0, **kwargs):
+    """Background thread मध्ये server चालू करतो, (server, state, base_url) परत करतो."""
+    state = FakeTelegram(**kwargs)
+    server = ThreadingHTTPServer((host, port), make_handler(state))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, state, f"http://{host}:{server.server_address[1]}/bot"
+
+
+def make_update(update_id, user_id, text=None, callback_data=None):
+    """Bot API update JSON – Update.de_json साठी."""
+    user = {"id": user_id, "is_bot": False, "first_name": f"u{user_id}"}
+    chat = {"id": user_id, "type": "private"}
+    message = {"message_id": update_id, "date": int(time.time()), "chat": chat, "from": user,
+               "text": text or ""}
+    if callback_data is not None:
+        message["from"] = {"id": 1, "is_bot": True, "first_name": "Fake"}
+        return {"update_id": update_id, "callback_query": {
+            "id": str(update_id), "from": user, "chat_instance": str(user_id),
+            "message": message, "data": callback_data}}
+    return {"update_id": update_id, "message": message}
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--port", type=int, default=8081)
+    ap.add_argument("--latency", type=float, default=0.0)
+    ap.add_argument("--enforce-limits", action="store_true")
+    args = ap.parse_args()
+
+    server, _, url = start_fake_server(port=args.port, latency=args.latency,
+                                       enforce_limits=args.enforce_limits)
+    print(f"Fake Telegram Bot API on {url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,142 @@
+# bench/stress_wallet.py
+# Wallet concurrency stress: अनेक threads एकाच users वर debit / credit / settle, op_keys मुद्दाम
+# threads मध्ये replay – शेवटी invariants तपासतो (double-spend / double-apply झाले तर exit 1)
+#
+#   python bench/stress_wallet.py                       # SQLite temp DB (DB_TYPE नसेल तर)
+#   DB_TYPE=mysql python bench/stress_wallet.py --threads 32 --ops 20000
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+if "DB_TYPE" not in os.environ:
+    os.environ["DB_TYPE"] = "sqlite"
+    os.environ.setdefault("DB_PATH", os.path.join(tempfile.mkdtemp(), "stress.sqlite3"))
+
+import db  # noqa: E402
+import migrations  # noqa: E402
+
+STRESS_USER_BASE = 996000000
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--users", type=int, default=20, help="कमी users = जास्त hot-row contention")
+    ap.add_argument("--threads", type=int, default=16)
+    ap.add_argument("--ops", type=int, default=5000)
+    ap.add_argument("--fund", type=float, default=100.0, help="प्रत्येक user चा सुरुवातीचा credit")
+    args = ap.parse_args()
+
+    migrations.migrate()
+    run = f"{int(time.time() * 1000)}"
+    users = [STRESS_USER_BASE + i for i in range(args.users)]
+    for uid in users:
+        db.upsert_user(uid)
+        db.repair_snapshot(uid)  # मागच्या run चा balance ledger प्रमाणे
+    start_balance = {uid: db.get_user_balance(uid) for uid in users}
+    db.credit_many([(uid, args.fund, "stress fund", f"stress:{run}:fund:{uid}") for uid in users])
+
+    ok_keys = set()       # किमान एकदा True मिळालेल्या debit keys
+    tried_keys = set()
+    credited = defaultdict(float)
+    lock = threading.Lock()
+    counter = iter(range(args.ops))
+    errors = []
+
+    def worker(seed):
+        rnd = random.Random(seed)
+        try:
+            while True:
+                with lock:
+                    i = next(counter, None)
+                if i is None:
+                    return
+                uid = rnd.choice(users)
+                roll = rnd.random()
+                if roll < 0.75:
+                    # छोटा key space – तेच key अनेक threads मधून replay होतात
+                    key = f"stress:{run}:debit:{uid}:{rnd.randrange(args.ops // (4 * args.users) + 1)}"
+                    ok = db.debit(uid, rnd.choice((5, 10, 25)), "stress debit", key)
+                    with lock:
+                        tried_keys.add(key)
+                        if ok:
+                            ok_keys.add(key)
+                elif roll < 0.95:
+                    amount = rnd.choice((5, 10))
+                    if db.credit(uid, amount, "stress credit", f"stress:{run}:credit:{i}"):
+                        with lock:
+                            credited[uid] += amount
+                else:
+                    db.settle_credits(500)
+        except Exception as e:  # noqa: BLE001 – report करा, stress थांबवू नका
+            errors.append(repr(e))
+
+    t = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(args.threads)]
+    for th in threads:
+        th.start()
+    for th in threads:
+        th.join()
+    elapsed = time.perf_counter() - t
+    while db.settle_credits() > 0:
+        pass
+
+    # ---- invariants ----
+    failures = list(errors)
+    conn = db.get_db_connection()
+    try:
+        cur = conn.cursor()
+        marks = ", ".join(["%s"] * len(users))
+        cur.execute(f"""
+            SELECT op_key, COUNT(*) FROM transactions
+            WHERE user_id IN ({marks}) AND op_key LIKE %s AND type = 'DEBIT'
+            GROUP BY op_key
+        """, users + [f"stress:{run}:debit:%"])
+        ledger_keys = {}
+        for key, n in cur.fetchall():
+            ledger_keys[key] = n
+        cur.execute(f"""
+            SELECT user_id, COALESCE(SUM(amount), 0) FROM transactions
+            WHERE user_id IN ({marks}) AND op_key LIKE %s AND type = 'DEBIT'
+            GROUP BY user_id
+        """, users + [f"stress:{run}:debit:%"])
+        debited = {uid: float(total) for uid, total in cur.fetchall()}
+    finally:
+        conn.close()
+
+    doubled = [k for k, n in ledger_keys.items() if n != 1]
+    if doubled:
+        failures.append(f"{len(doubled)} op_keys applied more than once")
+    if set(ledger_keys) != ok_keys:
+        failures.append(f"ledger keys ({len(ledger_keys)}) != keys reported as applied ({len(ok_keys)})")
+    for uid in users:
+        balance = db.get_user_balance(uid)
+        expected = start_balance[uid] + args.fund + credited[uid] - debited.get(uid, 0)
+        if balance < -0.001:
+            failures.append(f"user {uid} negative balance {balance:.2f}")
+        if abs(balance - expected) >= 0.005:
+            failures.append(f"user {uid} balance {balance:.2f} != expected {expected:.2f}")
+    mismatches, _, _ = db.reconcile(STRESS_USER_BASE - 1, args.users)
+    if mismatches:
+        failures.append(f"reconcile mismatches: {mismatches[:5]}")
+
+    print(f"backend={db.DB_TYPE} threads={args.threads} users={args.users} ops={args.ops}")
+    print(f"  {args.ops / elapsed:8.1f} ops/s, debit keys tried={len(tried_keys)} applied={len(ledger_keys)}")
+    if failures:
+        print("FAIL")
+        for f in failures[:20]:
+            print(f"  - {f}")
+        return 1
+    print("OK – no double-spend, no double-apply, snapshots match ledger")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,59 @@
+# bot/admin_stats.py
+# 👥 Users admin panel – storage rollups (stats_hourly / stats_daily / stats_totals) मधून,
+# त्यामुळे users / orders / transactions कितीही मोठे असले तरी एकाच छोट्या read मध्ये
+import time
+
+import db
+
+TOP_SERVICES = 8
+_PERIOD_TITLES = (("today", "Today"), ("7d", "7 days"), ("30d", "30 days"), ("all", "All time"))
+
+
+def _date(ts):
+    return time.strftime("%d %b %H:%M", time.localtime(int(ts)))
+
+
+def _pct(part, whole):
+    return f"{part * 100 / whole:.0f}%" if whole else "–"
+
+
+async def get_panel() -> str:
+    stats = await db.run(db.get_admin_stats)
+    return render(stats)
+
+
+def render(stats) -> str:
+    p = stats["periods"]
+    total = p["all"]
+    lines = [
+        "👥 USERS & STATS",
+        "",
+        f"👤 Users: {total['new_users']} (+{p['today']['new_users']} today, +{p['7d']['new_users']} in 7 days)",
+        f"💰 Wallet balances: ₹{total['credits'] - total['debits']:.2f}",
+        "",
+    ]
+    for key, title in _PERIOD_TITLES:
+        s = p[key]
+        lines.append(
+            f"📦 {title}: {s['orders']} orders, {s['otps']} OTPs ({_pct(s['otps'], s['orders'])}), "
+            f"{s['refunds']} refunds ({_pct(s['refunds'], s['orders'])})\n"
+            f"   Revenue ₹{s['revenue'] - s['refunded']:.2f} net · Recharges ₹{s['recharges']:.2f}"
+        )
+
+    if stats["services"]:
+        lines += ["", "🛒 Services (7 days)"]
+        for s in stats["services"][:TOP_SERVICES]:
+            lines.append(
+                f"• {s['service_name']}: {s['orders']} orders, OTP {_pct(s['otps'], s['orders'])}, "
+                f"refund {_pct(s['refunds'], s['orders'])}, ₹{s['revenue'] - s['refunded']:.2f}"
+            )
+
+    sealed = stats["sealed_until"]
+    lines.append("")
+    if sealed is None:
+        lines.append("⏳ Stats backfill not started yet (payment worker).")
+    elif stats["generated_at"] - sealed > 2 * 86400:
+        lines.append(f"⏳ Backfilling history – verified up to {_date(sealed)}")
+    else:
+        lines.append(f"🕒 Live · verified up to {_date(sealed)}")
+    return "\n".join(lines)
@@ -0,0 +1,51 @@
+# bot/admission.py
+# Purchase path admission control – provider outage मध्ये unbounded काम जमा होऊ नये
+import asyncio
+
+from config import PURCHASE_MAX_INFLIGHT, PURCHASE_MAX_QUEUE, PURCHASE_MAX_WAIT
+
+
+class Overloaded(Exception):
+    """Gate full – request नाकारली (काहीही debit झालेले नाही)."""
+
+
+class AdmissionGate:
+    """
+    At most `max_inflight` holders at once, at most `max_queue` waiting,
+    and nobody waits longer than `max_wait` seconds. Anything beyond that
+    is refused immediately with Overloaded, so a slow provider turns into
+    fast "try again" answers instead of a growing pile of handlers,
+    debits and refunds.
+
+        async with gate:
+            ...
+    """
+
+    def __init__(self, max_inflight=PURCHASE_MAX_INFLIGHT, max_queue=PURCHASE_MAX_QUEUE,
+                 max_wait=PURCHASE_MAX_WAIT):
+        self.max_inflight = max_inflight
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self._sem = asyncio.Semaphore(max_inflight)
+        self.waiting = 0
+        self.inflight = 0
+        self.rejected = 0
+
+    async def __aenter__(self):
+        if self._sem.locked() and self.waiting >= self.max_queue:
+            self.rejected += 1
+            raise Overloaded()
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self._sem.acquire(), self.max_wait)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            raise Overloaded() from None
+        finally:
+            self.waiting -= 1
+        self.inflight += 1
+        return self
+
+    async def __aexit__(self, *exc):
+        self.inflight -= 1
+        self._sem.release()
@@ -1,5 +1,8 @@
-import logging
 import asyncio
+import logging
+import math
+import signal
+
 from telegram import (
     Update,
     ReplyKeyboardMarkup,
@@ -13,45 +16,114 @@ from telegram.ext import (
     ContextTypes,
     MessageHandler,
     CallbackQueryHandler,
+    TypeHandler,
+    ApplicationHandlerStop,
     filters
 )
 
-from config import BOT_TOKEN, ADMIN_USER_ID
+from config import (
+    BOT_TOKEN,
+    ADMIN_USER_ID,
+    BOT_MODE,
+    TELEGRAM_BASE_URL,
+    WEBHOOK_URL,
+    WEBHOOK_PATH,
+    WEBHOOK_LISTEN,
+    WEBHOOK_PORT,
+    WEBHOOK_SECRET,
+    MAX_CONCURRENT_UPDATES,
+    METRICS_PORT,
+    METRICS_HOST,
+    MINIMUM_RECHARGE,
+    TG_GLOBAL_RATE,
+    SHARD_COUNT,
+    SHARD_INDEX,
+    SHARD_HOST,
+    SHARD_BASE_PORT
+)
 import db
-from providers.herosms import get_number, get_status, cancel
-from payments.razorpay_gateway import create_order as razorpay_create_order
+import telemetry
+import users
+import history
+import admin_stats
+import callbacks
+import ratelimit
+import sharding
+from providers import registry
+from providers.router import router
+from payments.payment_links import payment_links, PaymentLinkError
+from otp_poller import OtpPoller, ORDERS_FINISHED
+from admission import AdmissionGate, Overloaded
+import dispatcher
+from dispatcher import MessageDispatcher
+from broadcast import BroadcastEngine
+from catalog import catalog
+from update_processor import PerUserUpdateProcessor
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# ================= OTP POLLING =================
-async def wait_for_otp(context: ContextTypes.DEFAULT_TYPE, user_id: int, activation_id: str, price: float, service_name: str):
-    for _ in range(24):  # 2 minutes
-        await asyncio.sleep(5)
-        status = get_status(activation_id)
-
-        if "STATUS_OK" in status:
-            otp = status.split(":")[1]
-            await context.bot.send_message(
-                user_id,
-                f"✅ OTP RECEIVED!\n🔢 `{otp}`\n📱 {service_name}",
-                parse_mode="Markdown"
-            )
-            db.update_order_status(activation_id, "OTP_RECEIVED", otp)
-            return
+PURCHASES = telemetry.counter("purchases_total", "buy_ callback outcomes", ("result",))
+
+# bot_handler_seconds labels – free text / unknown commands एकाच label मध्ये
+MENU_BUTTONS = {
+    "🛒 Buy Number", "💰 Wallet", "📜 History", "🤝 Refer & Earn", "🆘 Support", "⚖️ Terms",
+    "👥 Users", "🛠 Servers", "📢 Broadcast"
+}
+COMMANDS = {"/start"}
+
+def handler_label(update):
+    query = getattr(update, "callback_query", None)
+    if query and query.data:
+        cb = callbacks.decode(query.data)
+        return "cb:" + callbacks.NAMES[cb[0]] if cb else "cb:invalid"
+    message = getattr(update, "message", None)
+    if message and message.text:
+        if message.text.startswith("/"):
+            command = message.text.split()[0].split("@")[0]
+            return command if command in COMMANDS else "/other"
+        return message.text if message.text in MENU_BUTTONS else "text"
+    return "other"
+
+# ================= USER GATE =================
+async def user_gate(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """प्रत्येक update आधी: user तयार करा + blocked असेल तर इथेच थांबवा"""
+    user = update.effective_user
+    if not user:
+        return
 
-    cancel(activation_id)
-    db.update_balance(user_id, price, "CREDIT", "Refund - Timeout")
-    await context.bot.send_message(user_id, "⏳ OTP Timeout. Refunded.")
+    # Rate limit सगळ्यात आधी – flood ला upsert / DB trip सुद्धा नाही (admin ला limit नाही)
+    if user.id != ADMIN_USER_ID:
+        query = update.callback_query
+        if query:
+            cb = callbacks.decode(query.data)
+            action = ratelimit.BUY if cb and cb[0] == callbacks.BUY else ratelimit.CALLBACK
+        else:
+            action = ratelimit.MESSAGE
+        wait = ratelimit.limiter.allow(user.id, action)
+        if wait:
+            if query:
+                await query.answer(f"⏳ Too many taps. Try again in {math.ceil(wait)}s.")
+            raise ApplicationHandlerStop
+
+    referred_by = None
+    if update.message and update.message.text and update.message.text.startswith("/start ref_"):
+        try:
+            referred_by = int(update.message.text.split("ref_", 1)[1])
+        except ValueError:
+            pass
+
+    state = await users.get_state(user.id, referred_by)
+    if state["is_blocked"]:
+        if update.callback_query:
+            await update.callback_query.answer("🚫 You are blocked.", show_alert=True)
+        elif update.effective_message:
+            await update.effective_message.reply_text("🚫 You are blocked.")
+        raise ApplicationHandlerStop
 
 # ================= START =================
 async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
     uid = update.effective_user.id
-    db.add_or_get_user(uid)
-
-    if db.is_user_blocked(uid):
-        await update.message.reply_text("🚫 You are blocked.")
-        return
 
     if uid == ADMIN_USER_ID:
         kb = [
@@ -81,55 +153,59 @@ async def handle_text(update: Update, context: ContextTypes.DEFAULT_TYPE):
     # Recharge Mode Input
     if context.user_data.get("recharge_mode"):
         try:
-            amount = float(text)
-            if amount < db.MINIMUM_RECHARGE:
-                await update.message.reply_text(f"Minimum recharge ₹{db.MINIMUM_RECHARGE}")
-                return
+            amount = round(float(text), 2)
+        except (TypeError, ValueError):
+            amount = None
+        if amount is None or not math.isfinite(amount):
+            await update.message.reply_text("Enter valid amount.")
+            return
+        if amount < MINIMUM_RECHARGE:
+            await update.message.reply_text(f"Minimum recharge ₹{MINIMUM_RECHARGE}")
+            return
 
-            order = razorpay_create_order(amount)
-            payment_link = f"https://rzp.io/l/{order['id']}"
+        try:
+            link = await payment_links.get_link(uid, amount)
+        except PaymentLinkError as e:
+            # recharge_mode चालू राहतो – user परत amount टाकू शकतो
+            logger.error(f"Payment link for {uid} failed: {e}")
+            await update.message.reply_text("⚠️ Payment gateway is not responding. Please enter the amount again in a minute.")
+            return
 
-            context.user_data["recharge_mode"] = False
+        context.user_data["recharge_mode"] = False
 
-            await update.message.reply_text(
-                f"💳 Click below to pay ₹{amount}\n\n{payment_link}\n\nAfter payment, wallet will auto update."
-            )
-        except:
-            await update.message.reply_text("Enter valid amount.")
+        await update.message.reply_text(
+            f"💳 Click below to pay ₹{amount:g}\n\n{link['url']}\n\nAfter payment, wallet will auto update."
+        )
         return
 
     if uid == ADMIN_USER_ID:
-        await update.message.reply_text("Admin feature under development")
+        await handle_admin_text(update, context)
         return
 
     # USER PANEL
     if text == "🛒 Buy Number":
-        services = db.get_services()
-        if not services:
+        markup = await catalog.get_services_markup()
+        if not markup:
             await update.message.reply_text("⚠️ No services available.")
             return
 
-        btns = [
-            [InlineKeyboardButton(s["service_name"], callback_data=f"svc_{s['id']}")]
-            for s in services
-        ]
-
         await update.message.reply_text(
             "📱 Select Service",
-            reply_markup=InlineKeyboardMarkup(btns)
+            reply_markup=markup
         )
 
     elif text == "💰 Wallet":
-        bal = db.get_user_balance(uid)
-        kb = [[InlineKeyboardButton("Add Balance (Recharge)", callback_data="recharge_start")]]
+        bal = await users.get_balance(uid)
+        kb = [[InlineKeyboardButton("Add Balance (Recharge)", callback_data=callbacks.RECHARGE_DATA)]]
         await update.message.reply_text(
-            f"💰 Your Balance: ₹{bal:.2f}\n\nMinimum recharge: ₹{db.MINIMUM_RECHARGE}",
+            f"💰 Your Balance: ₹{bal:.2f}\n\nMinimum recharge: ₹{MINIMUM_RECHARGE}",
             reply_markup=InlineKeyboardMarkup(kb),
             parse_mode="Markdown"
         )
 
     elif text == "📜 History":
-        await update.message.reply_text("📜 History coming soon.")
+        text, markup = await history.get_page(update.effective_user.id)
+        await update.message.reply_text(text, reply_markup=markup)
 
     elif text == "🤝 Refer & Earn":
         bot_user = (await context.bot.get_me()).username
@@ -143,81 +219,319 @@ async def handle_text(update: Update, context: ContextTypes.DEFAULT_TYPE):
     elif text == "⚖️ Terms":
         await update.message.reply_text("⚖️ Terms: No refund after OTP delivered.")
 
+# ================= ADMIN =================
+async def handle_admin_text(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    text = update.message.text
+
+    # Broadcast message input
+    if context.user_data.pop("broadcast_mode", False):
+        if text == "❌ Cancel":
+            await update.message.reply_text("Broadcast cancelled.")
+            return
+        bid = await context.bot_data["broadcaster"].start_new(update.effective_user.id, text)
+        await update.message.reply_text(f"📢 Broadcast #{bid} started. Progress updates will follow.")
+        return
+
+    if text == "📢 Broadcast":
+        context.user_data["broadcast_mode"] = True
+        await update.message.reply_text("✍️ Send the message to broadcast (or ❌ Cancel).")
+        return
+
+    if text == "👥 Users":
+        await update.message.reply_text(await admin_stats.get_panel())
+        return
+
+    await update.message.reply_text("Admin feature under development")
+
 # ================= CALLBACK =================
+CALLBACKS_REJECTED = telemetry.counter(
+    "callbacks_rejected_total", "callback_data that failed to decode or verify (old keyboards, tampering)"
+)
+
+def _dedup_key(query):
+    return query.from_user.id, query.message.message_id if query.message else query.inline_message_id, query.data
+
 async def handle_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
     query = update.callback_query
-    await query.answer()
-    data = query.data
     uid = query.from_user.id
 
-    if data == "recharge_start":
-        context.user_data["recharge_mode"] = True
-        await query.edit_message_text("💳 Enter amount to recharge (e.g., 100):")
+    # Signed payload: बदललेला / जुना data इथेच नकार – handler, DB, provider काहीच नाही
+    cb = callbacks.decode(query.data)
+    if cb is None:
+        CALLBACKS_REJECTED.inc()
+        await query.answer("⚠️ This menu has expired. Please open it again.", show_alert=True)
         return
+    action, fields = cb
 
-    if data.startswith("svc_"):
-        sid = int(data.split("_")[1])
-        context.user_data["service_id"] = sid
-
-        servers = db.get_active_servers(sid)
-        btns = []
-        for s in servers:
-            final_price = float(s["price"]) + 5
-            btns.append([
-                InlineKeyboardButton(
-                    f"🟢 Server {s['server_number']} - ₹{final_price}",
-                    callback_data=f"buy_{s['id']}_{final_price}"
-                )
-            ])
-
-        await query.edit_message_text(
-            "⚡ Select Server",
-            reply_markup=InlineKeyboardMarkup(btns)
-        )
+    # buy double tap / scripted repeat: same (user, message, data) पुन्हा purchase चालवत नाही
+    if action == callbacks.BUY:
+        answer = ratelimit.callback_results.begin(_dedup_key(query))
+        if answer is not None:
+            await query.answer(answer)
+            return
+    await query.answer()
+    await CALLBACK_HANDLERS[action](query, context, uid, *fields)
 
-    elif data.startswith("buy_"):
-        _, srv_id, price = data.split("_")
-        price = float(price)
+async def on_recharge(query, context, uid):
+    context.user_data["recharge_mode"] = True
+    await query.edit_message_text("💳 Enter amount to recharge (e.g., 100):")
 
-        if not db.update_balance(uid, -price, "DEBIT", "Number Purchase"):
-            await query.answer("Low balance!", show_alert=True)
-            return
+async def on_history(query, context, uid, kind, before_ts, before_id):
+    kind, before_ts, before_id = history.parse_callback(kind, before_ts, before_id)
+    text, markup = await history.get_page(uid, kind, before_ts, before_id)
+    await query.edit_message_text(text, reply_markup=markup)
 
-        service_id = context.user_data.get("service_id")
-        service = db.get_service_by_id(service_id)
+async def on_service(query, context, uid, sid):
+    context.user_data["service_id"] = sid
 
-        res = get_number(service["provider_service_code"])
+    markup = await catalog.get_servers_markup(sid)
+    if not markup:
+        await query.edit_message_text("⚠️ No servers available.")
+        return
 
-        if "ACCESS_NUMBER" in res:
-            parts = res.split(":")
-            act_id = parts[1]
-            phone = parts[2]
+    await query.edit_message_text(
+        "⚡ Select Server",
+        reply_markup=markup
+    )
+
+async def on_buy(query, context, uid, srv_id, quoted):
+    key = _dedup_key(query)
+    try:
+        answer = await buy_number(query, context, uid, srv_id, quoted)
+    except Exception:
+        ratelimit.callback_results.forget(key)
+        raise
+    if answer:
+        ratelimit.callback_results.finish(key, answer)
+    else:
+        ratelimit.callback_results.forget(key)
+
+CALLBACK_HANDLERS = {
+    callbacks.RECHARGE: on_recharge,
+    callbacks.HISTORY: on_history,
+    callbacks.SERVICE: on_service,
+    callbacks.BUY: on_buy,
+}
+
+# ================= PURCHASE =================
+async def buy_number(query, context, uid, srv_id, quoted):
+    """
+    quoted = button वर दाखवलेली किंमत (paise); debit नेहमी catalog च्या किमतीने.
+    Repeat taps साठी उत्तर परत देतो; None = काहीच बदलले नाही (पुन्हा tap चालेल).
+    """
+    trace = telemetry.tracer.begin()  # tap -> debit -> number -> otp -> sent
+    server = await catalog.get_server(srv_id)
+    service = server and await catalog.get_service(server["service_id"])
+    if not service:
+        PURCHASES.inc(result="unavailable")
+        await query.edit_message_text("⚠️ Server unavailable.")
+        return
 
-            db.create_order(uid, service_id, int(srv_id), phone, act_id)
+    # Keyboard नंतर किंमत बदलली – जुन्या किमतीत विकत नाही, नवीन list दाखवा
+    price = server["final_price"]
+    if callbacks.paise(price) != quoted:
+        PURCHASES.inc(result="price_changed")
+        await query.edit_message_text(
+            "⚠️ Price updated. Please select again.",
+            reply_markup=await catalog.get_servers_markup(server["service_id"])
+        )
+        return
 
-            await query.edit_message_text(
-                f"📞 Number: `{phone}`\n⏳ Waiting for OTP...",
-                parse_mode="Markdown"
-            )
+    # Breaker: सगळे routes बंद असतील तर debit आधीच नकार (debit + refund + थांबणे नाही)
+    routes = await catalog.get_routes(srv_id)
+    if not router.usable(routes):
+        wait = max(1, round(router.retry_in(routes)))
+        PURCHASES.inc(result="breaker_open")
+        await query.edit_message_text(
+            f"⚠️ {service['service_name']} is temporarily unavailable. Please try again in {wait}s."
+        )
+        return
 
-            asyncio.create_task(
-                wait_for_otp(context, uid, act_id, price, service["service_name"])
+    try:
+        async with context.bot_data["purchase_gate"]:
+            return await _purchase(query, context, uid, srv_id, price, service, routes, trace)
+    except Overloaded:
+        PURCHASES.inc(result="overloaded")
+        await query.edit_message_text("⏳ Too many purchases right now. Please try again in a moment.")
+
+async def _purchase(query, context, uid, srv_id, price, service, routes, trace):
+    # Debit + PENDING order एकत्र, provider call आधी – crash झाला तरी restart ला refund होतो.
+    # op_key = हा message: double tap / Telegram retry दुसऱ्यांदा पैसे कापत नाही
+    op_key = f"buy:{uid}:{query.message.message_id}"
+    try:
+        order_id = await users.place_order(uid, service["id"], srv_id, price, op_key)
+    except db.DuplicateOperation:
+        PURCHASES.inc(result="duplicate")
+        return "✅ This purchase was already made."
+    if not order_id:
+        PURCHASES.inc(result="low_balance")
+        # handle_callback ने query आधीच answer केली – दुसरा answer Telegram नाकारतो, म्हणून message मध्येच
+        await query.edit_message_text(
+            f"❌ Low balance! {service['service_name']} costs ₹{price:.2f}.",
+            reply_markup=InlineKeyboardMarkup(
+                [[InlineKeyboardButton("Add Balance (Recharge)", callback_data=callbacks.RECHARGE_DATA)]]
             )
-
-        else:
-            db.update_balance(uid, price, "CREDIT", "Refund")
-            await query.edit_message_text("❌ Failed. Refunded.")
+        )
+        return
+    trace.mark("debit")
+    telemetry.tracer.attach(order_id, trace)
+
+    # Router: सगळ्यात चांगला route, नंबर नसेल / error असेल तर त्याच purchase मध्ये पुढचा.
+    # Debit आधीच झाले – provider client ने raise केले तरी इथेच refund (restart ची वाट नाही)
+    try:
+        purchase, _ = await router.get_number(routes)
+    except Exception:
+        logger.exception(f"getNumber for order {order_id} failed")
+        purchase = None
+
+    if not purchase:
+        PURCHASES.inc(result="no_number")
+        return await _refund_purchase(query, order_id, uid, price)
+
+    route = purchase.route
+    poller = context.bot_data["otp_poller"]
+    timeout = poller.timeout_for(route["service_code"], route["id"])
+    try:
+        # Synchronous (write-behind नाही): crash झाला तरी recover() ला activation_id दिसतो
+        await db.run(
+            db.mark_number_received, order_id, purchase.activation_id, purchase.phone, timeout,
+            route["provider"], route["id"]
+        )
+    except Exception:
+        # नंबर मिळाला पण order वर नोंद नाही – poller ला कळणार नाही, म्हणून activation cancel + refund
+        logger.exception(f"Order {order_id}: saving number {purchase.activation_id} failed, cancelling")
+        PURCHASES.inc(result="save_failed")
+        await registry.get(route["provider"]).cancel(purchase.activation_id)
+        # CANCELLED: PENDING आणि (commit होऊन error आला असेल तर) NUMBER_RECEIVED दोन्हीतून refund
+        return await _refund_purchase(query, order_id, uid, price, db.CANCELLED)
+    telemetry.tracer.mark(order_id, "number")
+    PURCHASES.inc(result="number")
+    history.invalidate(uid)
+
+    await query.edit_message_text(
+        f"📞 Number: `{purchase.phone}`\n⏳ Waiting for OTP...",
+        parse_mode="Markdown"
+    )
+
+    poller.register(
+        purchase.activation_id, uid, order_id, price, service["service_name"],
+        route["service_code"], route["id"], provider=route["provider"]
+    )
+    return f"📞 Number already issued: {purchase.phone}"
+
+async def _refund_purchase(query, order_id, uid, price, status=db.FAILED):
+    await users.refund_order(order_id, uid, price, status, "Refund")
+    ORDERS_FINISHED.inc(outcome="failed")
+    telemetry.tracer.finish(order_id, "failed", stage="refund")
+    await query.edit_message_text("❌ Failed. Refunded.")
+    return "❌ Failed. Refunded."
+
+# ================= LIFECYCLE =================
+async def post_init(app):
+    # Bot API global limit token नुसार आहे – N workers मध्ये वाटून
+    outbox = MessageDispatcher(app.bot, global_rate=TG_GLOBAL_RATE / SHARD_COUNT)
+    app.bot_data["dispatcher"] = outbox
+    outbox.start()
+
+    gate = AdmissionGate()
+    app.bot_data["purchase_gate"] = gate
+
+    poller = OtpPoller(outbox)
+    app.bot_data["otp_poller"] = poller
+    await poller.load_history()
+    await poller.recover()
+    poller.start()
+
+    broadcaster = BroadcastEngine(outbox)
+    app.bot_data["broadcaster"] = broadcaster
+    if sharding.owns(ADMIN_USER_ID):  # broadcasts admin च्या worker वरच चालतात
+        await broadcaster.resume_all()
+
+    # Queue depths – scrape वेळी वाचले जातात
+    depth = telemetry.gauge("dispatcher_queue_depth", "Outbound messages waiting, by priority", ("priority",))
+    for name, prio in (("otp", dispatcher.OTP), ("refund", dispatcher.REFUND), ("broadcast", dispatcher.BROADCAST)):
+        depth.set_function(lambda prio=prio: outbox.queue_depth(prio), priority=name)
+    telemetry.gauge("otp_active_activations", "Activations the OTP poller is tracking").set_function(
+        lambda: len(poller))
+    telemetry.gauge("purchase_gate_inflight", "Purchases holding an admission slot").set_function(
+        lambda: gate.inflight)
+    telemetry.gauge("purchase_gate_waiting", "Purchases queued for an admission slot").set_function(
+        lambda: gate.waiting)
+    telemetry.gauge("provider_breakers_open", "Open or half-open provider circuit breakers").set_function(
+        lambda: len(router.breakers.snapshot()))
+    if METRICS_PORT:
+        app.bot_data["metrics_server"] = telemetry.serve(METRICS_PORT + SHARD_INDEX, METRICS_HOST)
+
+async def post_shutdown(app):
+    await app.bot_data["broadcaster"].stop()
+    await app.bot_data["otp_poller"].stop()
+    await app.bot_data["dispatcher"].stop()
+    await db.run(db.order_writes.stop)  # buffered status transitions flush
+    await db.run(db.stats_writes.stop)  # order_writes flush चे OTP deltas सुद्धा
+    await registry.aclose_all()
+    await payment_links.aclose()
+    if "metrics_server" in app.bot_data:
+        app.bot_data["metrics_server"].shutdown()
 
 # ================= MAIN =================
-def main():
-    app = ApplicationBuilder().token(BOT_TOKEN).build()
-
+def build_application():
+    builder = (
+        ApplicationBuilder()
+        .token(BOT_TOKEN)
+        .base_url(TELEGRAM_BASE_URL)
+        .concurrent_updates(PerUserUpdateProcessor(MAX_CONCURRENT_UPDATES, label=handler_label))
+        .post_init(post_init)
+        .post_shutdown(post_shutdown)
+    )
+    if BOT_MODE == "worker":
+        builder = builder.updater(None)  # updates shard_front कडून येतात
+    app = builder.build()
+
+    app.add_handler(TypeHandler(Update, user_gate), group=-1)
     app.add_handler(CommandHandler("start", start))
     app.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, handle_text))
     app.add_handler(CallbackQueryHandler(handle_callback))
+    return app
+
+async def run_worker(app):
+    """BOT_MODE=worker: setWebhook / getUpdates नाही, फक्त front कडून आलेले updates."""
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    await app.initialize()
+    await post_init(app)
+    await app.start()
+    receiver = sharding.UpdateReceiver(app)
+    await receiver.start(SHARD_HOST, SHARD_BASE_PORT + SHARD_INDEX)
+    try:
+        await stop.wait()
+    finally:
+        receiver.close()
+        await app.stop()
+        await post_shutdown(app)  # app.shutdown() आधी – dispatcher ला OTP drain करायला bot लागतो
+        await app.shutdown()
 
-    print("🚀 24HoursOTP Production Running...")
-    app.run_polling()
+def main():
+    app = build_application()
+
+    if BOT_MODE == "worker":
+        print(f"🚀 24HoursOTP worker {SHARD_INDEX}/{SHARD_COUNT} :{SHARD_BASE_PORT + SHARD_INDEX}")
+        asyncio.run(run_worker(app))
+    elif BOT_MODE == "webhook":
+        print(f"🚀 24HoursOTP Production Running (webhook :{WEBHOOK_PORT}/{WEBHOOK_PATH})...")
+        app.run_webhook(
+            listen=WEBHOOK_LISTEN,
+            port=WEBHOOK_PORT,
+            url_path=WEBHOOK_PATH,
+            webhook_url=f"{WEBHOOK_URL.rstrip('/')}/{WEBHOOK_PATH}",
+            secret_token=WEBHOOK_SECRET,
+            allowed_updates=Update.ALL_TYPES
+        )
+    else:
+        print("🚀 24HoursOTP Production Running...")
+        app.run_polling()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
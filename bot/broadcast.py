@@ -0,0 +1,150 @@
+# bot/broadcast.py
+# Admin broadcast – keyset paging, resumable progress, throughput/ETA reports
+import asyncio
+import logging
+import time
+
+from telegram.error import Forbidden
+
+import db
+import dispatcher
+import users
+from config import BROADCAST_PAGE_SIZE, BROADCAST_FLUSH_EVERY, BROADCAST_REPORT_EVERY
+
+logger = logging.getLogger(__name__)
+
+
+class BroadcastEngine:
+    """
+    Streams recipients from `users` by keyset (user_id > last) and hands
+    them to the dispatcher's BROADCAST class, which sends at the highest
+    rate Telegram allows without delaying OTPs.
+
+    Results are written to broadcast_deliveries in small chunks and the
+    cursor advances per completed page, so a restart resumes where it
+    stopped instead of messaging everyone again. A cancelled or failing
+    page still records what it already sent before it exits.
+    """
+
+    def __init__(self, outbox, page_size=BROADCAST_PAGE_SIZE,
+                 flush_every=BROADCAST_FLUSH_EVERY, report_every=BROADCAST_REPORT_EVERY):
+        self.outbox = outbox
+        self.page_size = page_size
+        self.flush_every = flush_every
+        self.report_every = report_every
+        self._tasks = {}
+
+    async def start_new(self, admin_id, message):
+        broadcast_id = await db.run(db.create_broadcast, admin_id, message)
+        self._spawn(broadcast_id)
+        return broadcast_id
+
+    async def resume_all(self):
+        for b in await db.run(db.get_running_broadcasts):
+            logger.info(f"Resuming broadcast #{b['id']} after user {b['last_user_id']}")
+            self._spawn(b["id"])
+
+    def _spawn(self, broadcast_id):
+        if broadcast_id not in self._tasks:
+            task = asyncio.create_task(self._run(broadcast_id))
+            self._tasks[broadcast_id] = task
+            task.add_done_callback(lambda _: self._tasks.pop(broadcast_id, None))
+
+    async def stop(self):
+        # status RUNNING राहतो – पुढच्या start ला resume_all() उचलतो
+        for task in list(self._tasks.values()):
+            task.cancel()
+        await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+
+    # ================= WORKER =================
+    async def _run(self, broadcast_id):
+        b = await db.run(db.get_broadcast, broadcast_id)
+        cursor = b["last_user_id"]
+        done = await db.run(db.get_broadcast_done_after, broadcast_id, cursor)
+        stats = {"processed": b["sent"] + b["failed"] + b["skipped"], "started": time.monotonic(), "run": 0}
+        last_report = time.monotonic()
+
+        try:
+            while True:
+                page = await db.run(db.get_broadcast_recipients, cursor, self.page_size)
+                if not page:
+                    break
+
+                targets = [uid for uid in page if uid not in done]
+                await self._send_page(broadcast_id, b["message"], targets, page[-1])
+                stats["processed"] += len(targets)
+                stats["run"] += len(targets)
+                cursor = page[-1]
+                done.clear()
+
+                if time.monotonic() - last_report >= self.report_every:
+                    last_report = time.monotonic()
+                    self._report(b, stats)
+
+            await db.run(db.finish_broadcast, broadcast_id)
+            self._report(b, stats, final=True)
+        except Exception:
+            logger.exception(f"Broadcast #{broadcast_id} stopped")
+
+    async def _send_page(self, broadcast_id, message, targets, last_user_id):
+        pending = {
+            self.outbox.send(uid, message, priority=dispatcher.BROADCAST): uid
+            for uid in targets
+        }
+        rows = []
+        complete = False
+        try:
+            while pending:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for fut in done:
+                    rows.append((pending.pop(fut), _status(fut)))
+                if len(rows) >= self.flush_every:
+                    chunk, rows = rows, []  # flush मध्येच cancel झाला तरी हा chunk finally मध्ये दुसऱ्यांदा नाही
+                    await self._record(broadcast_id, chunk)
+            complete = True
+        finally:
+            # Cancel / crash: queue मधले अजून न गेलेले messages restart नंतर resume होतील; जे गेले
+            # त्यांचे results आणि पूर्ण झालेला prefix आत्ताच लिहा – नाहीतर resume ते परत पाठवतो
+            for fut in pending:
+                fut.cancel()
+            await self._record(broadcast_id, rows, last_user_id if complete else _done_prefix(targets, pending))
+
+    async def _record(self, broadcast_id, rows, last_user_id=None):
+        await db.run(db.record_broadcast_results, broadcast_id, rows, last_user_id)
+        # bot_blocked लागलेले: cached state काढा म्हणजे पुढच्या interaction ला upsert तो परत FALSE करतो
+        # (दुसऱ्या shard वरचा user असेल तर तिथला cache USER_CACHE_TTL नंतर)
+        for uid, status in rows:
+            if status == "BOT_BLOCKED":
+                users.forget(uid)
+
+    def _report(self, b, stats, final=False):
+        elapsed = max(time.monotonic() - stats["started"], 1e-6)
+        rate = stats["run"] / elapsed
+        remaining = max(b["total"] - stats["processed"], 0)
+        eta = f"{remaining / rate / 60:.1f} min" if rate and not final else "-"
+        head = "✅ Broadcast complete" if final else "📢 Broadcast running"
+        self.outbox.send(
+            b["admin_id"],
+            f"{head} #{b['id']}\n"
+            f"Processed: {stats['processed']}/{b['total']}\n"
+            f"Speed: {rate:.1f} msg/s\nETA: {eta}",
+            priority=dispatcher.REFUND
+        )
+
+
+def _done_prefix(targets, pending):
+    """Targets (user_id क्रमाने) पैकी सुरुवातीचे सगळे पूर्ण झाले तर त्यातला शेवटचा – cursor इथपर्यंत सुरक्षित."""
+    left = set(pending.values())
+    cursor = None
+    for uid in targets:
+        if uid in left:
+            break
+        cursor = uid
+    return cursor
+
+
+def _status(fut):
+    exc = fut.exception()
+    if exc is None:
+        return "SENT"
+    return "BOT_BLOCKED" if isinstance(exc, Forbidden) else "FAILED"
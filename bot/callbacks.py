@@ -0,0 +1,89 @@
+# bot/callbacks.py
+# Inline keyboard callback_data codec: version + action + unsigned varint fields + truncated HMAC,
+# base64url मध्ये (Telegram limit 64 bytes). Client ने बदललेला / जुना data decode() वर None –
+# handler, DB किंवा provider पर्यंत पोहोचत नाही. Price कधीच client कडून घेत नाही (catalog मधून).
+import base64
+import binascii
+import hashlib
+import hmac
+from functools import lru_cache
+
+from config import BOT_TOKEN, CALLBACK_SECRET
+
+VERSION = 1
+MAC_SIZE = 8  # bytes (64-bit tag)
+MAX_LEN = 64  # Telegram callback_data limit
+
+# action -> fields (सगळे unsigned ints)
+RECHARGE = 1
+HISTORY = 2   # kind, before_ts, before_id (0 = पहिला page)
+SERVICE = 3   # service_id
+BUY = 4       # server_id, quoted price in paise (button वर दाखवलेली किंमत)
+
+NAMES = {RECHARGE: "recharge", HISTORY: "hist", SERVICE: "svc", BUY: "buy"}
+_ARITY = {RECHARGE: 0, HISTORY: 3, SERVICE: 1, BUY: 2}
+
+_KEY = (CALLBACK_SECRET or "").encode() or hashlib.sha256(b"callback_data:" + (BOT_TOKEN or "").encode()).digest()
+
+
+def _mac(body: bytes) -> bytes:
+    return hmac.new(_KEY, body, hashlib.sha256).digest()[:MAC_SIZE]
+
+
+def _varint(n: int) -> bytes:
+    if n < 0:
+        raise ValueError("callback fields must be unsigned")
+    out = bytearray()
+    while True:
+        byte, n = n & 0x7F, n >> 7
+        if n:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+def encode(action: int, *fields: int) -> str:
+    if len(fields) != _ARITY[action]:
+        raise ValueError(f"{NAMES[action]} takes {_ARITY[action]} fields")
+    body = bytes((VERSION, action)) + b"".join(_varint(int(f)) for f in fields)
+    data = base64.urlsafe_b64encode(body + _mac(body)).rstrip(b"=").decode()
+    if len(data) > MAX_LEN:
+        raise ValueError("callback_data longer than 64 bytes")
+    return data
+
+
+@lru_cache(maxsize=4096)  # buy / svc buttons सगळ्या users साठी सारखेच – बहुतेक taps dict hit
+def decode(data):
+    """(action, fields) किंवा None (जुना format, चुकीचा signature, भलताच action)."""
+    if not data or len(data) > MAX_LEN:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+    except (binascii.Error, ValueError):
+        return None
+    if base64.urlsafe_b64encode(raw).rstrip(b"=").decode() != data:
+        return None  # non-canonical (padding bits बदललेले) – एकाच payload ला दोन strings नकोत
+    body, tag = raw[:-MAC_SIZE], raw[-MAC_SIZE:]
+    if len(body) < 2 or body[0] != VERSION or not hmac.compare_digest(tag, _mac(body)):
+        return None
+    action = body[1]
+    if action not in _ARITY:
+        return None
+    fields, n, shift = [], 0, 0
+    for byte in body[2:]:
+        n |= (byte & 0x7F) << shift
+        shift += 7
+        if not byte & 0x80:
+            fields.append(n)
+            n, shift = 0, 0
+    if shift or len(fields) != _ARITY[action]:
+        return None
+    return action, tuple(fields)
+
+
+def paise(amount: float) -> int:
+    return int(round(amount * 100))
+
+
+RECHARGE_DATA = encode(RECHARGE)
@@ -0,0 +1,143 @@
+# bot/catalog.py
+# Services / servers / final prices चा in-memory catalog
+import asyncio
+import time
+
+from telegram import InlineKeyboardButton, InlineKeyboardMarkup
+
+import callbacks
+import db
+from config import CATALOG_TTL, CATALOG_VERSION_CHECK, PRICE_MARKUP
+
+
+class Catalog:
+    """
+    Snapshot of active services and servers with ready-made keyboards.
+
+    Loaded with two queries and served from memory, so the Buy Number and
+    svc_ menus cost no DB round trip in steady state. Admin writes bump the
+    catalog_version row; every `check_every` seconds one primary-key read
+    compares it and reloads on change, so edits reach every process (shard
+    workers, API) within that interval. CATALOG_TTL still forces a full
+    reload for edits made without a bump.
+    """
+
+    def __init__(self, ttl=CATALOG_TTL, check_every=CATALOG_VERSION_CHECK):
+        self.ttl = ttl
+        self.check_every = check_every
+        self._loaded_at = None
+        self._checked_at = None
+        self._version = None
+        self._lock = asyncio.Lock()
+        self.services = {}
+        self.servers = {}
+        self.servers_by_service = {}
+        self.services_markup = None
+        self.servers_markup = {}
+
+    def invalidate(self):
+        self._loaded_at = None
+
+    def _loaded(self):
+        return self._loaded_at is not None and time.monotonic() - self._loaded_at < self.ttl
+
+    def _fresh(self):
+        return self._loaded() and time.monotonic() - self._checked_at < self.check_every
+
+    async def ensure(self):
+        if self._fresh():
+            return
+        async with self._lock:
+            if self._fresh():  # दुसऱ्या task ने आधीच check / refresh केले असेल
+                return
+            if self._loaded():
+                started = time.monotonic()
+                if await db.run(db.get_catalog_version) == self._version:
+                    self._checked_at = started
+                    return
+            await self.refresh()
+
+    async def refresh(self):
+        started = time.monotonic()
+        # version आधी: rows वाचताना bump झाला तर पुढच्या check ला परत reload
+        version = await db.run(db.get_catalog_version)
+        services = await db.run(db.get_services)
+        servers = await db.run(db.get_all_active_servers)
+        self._build(services, servers)
+        self._version = version
+        self._loaded_at = self._checked_at = started
+
+    def _build(self, services, servers):
+        svc_map = {s["id"]: s for s in services}
+        srv_map = {}
+        by_service = {sid: [] for sid in svc_map}
+        for s in servers:
+            if s["service_id"] not in svc_map:
+                continue
+            svc = svc_map[s["service_id"]]
+            # server = route: provider + (server override किंवा service चा) code / country
+            s = dict(
+                s,
+                final_price=float(s["price"]) + PRICE_MARKUP,
+                service_code=s.get("provider_service_code") or svc["provider_service_code"],
+                country=s["country_id"] if s.get("country_id") is not None else svc["country_id"]
+            )
+            srv_map[s["id"]] = s
+            by_service[s["service_id"]].append(s)
+
+        for rows in by_service.values():
+            rows.sort(key=lambda s: s["server_number"])
+
+        services_markup = None
+        if services:
+            services_markup = InlineKeyboardMarkup([
+                [InlineKeyboardButton(s["service_name"], callback_data=callbacks.encode(callbacks.SERVICE, s["id"]))]
+                for s in services
+            ])
+
+        servers_markup = {
+            sid: InlineKeyboardMarkup([
+                [InlineKeyboardButton(
+                    f"🟢 Server {s['server_number']} - ₹{s['final_price']}",
+                    callback_data=callbacks.encode(callbacks.BUY, s["id"], callbacks.paise(s["final_price"]))
+                )]
+                for s in rows
+            ])
+            for sid, rows in by_service.items()
+        }
+
+        # एकदम swap – readers ला अर्धवट catalog दिसत नाही
+        self.services, self.servers, self.servers_by_service = svc_map, srv_map, by_service
+        self.services_markup, self.servers_markup = services_markup, servers_markup
+
+    # ================= LOOKUPS =================
+    async def get_services_markup(self):
+        await self.ensure()
+        return self.services_markup
+
+    async def get_servers_markup(self, service_id):
+        await self.ensure()
+        return self.servers_markup.get(service_id)
+
+    async def get_service(self, service_id):
+        await self.ensure()
+        return self.services.get(service_id)
+
+    async def get_server(self, server_id):
+        await self.ensure()
+        return self.servers.get(server_id)
+
+    async def get_routes(self, server_id):
+        """
+        Purchase साठी failover routes: निवडलेला server + त्याच service चे
+        तेवढ्या किंवा कमी cost चे servers (user ने भरलेल्या किमतीत margin राहतो).
+        """
+        await self.ensure()
+        chosen = self.servers.get(server_id)
+        if not chosen:
+            return []
+        return [s for s in self.servers_by_service.get(chosen["service_id"], ())
+                if s["id"] == server_id or s["price"] <= chosen["price"]]
+
+
+catalog = Catalog()
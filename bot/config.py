@@ -9,11 +9,131 @@ ADMIN_USER_ID = int(os.getenv("ADMIN_USER_ID"))
 YOUR_CHANNEL_ID = os.getenv("YOUR_CHANNEL_ID")
 
 HEROSMS_API_KEY = os.getenv("HEROSMS_API_KEY")
+HEROSMS_BASE_URL = os.getenv("HEROSMS_BASE_URL", "https://hero-sms.com/stubs/handler_api.php")
+HEROSMS_TIMEOUT = float(os.getenv("HEROSMS_TIMEOUT", 10))
+HEROSMS_RETRIES = int(os.getenv("HEROSMS_RETRIES", 2))
+HEROSMS_MAX_CONNECTIONS = int(os.getenv("HEROSMS_MAX_CONNECTIONS", 20))
 
-DB_HOST = "localhost"
-DB_USER = "root"
-DB_PASSWORD = ""
-DB_NAME = os.getenv("DB_NAME", "db_24hoursotp")
+# Number providers: servers.provider याच नावांपैकी एक. प्रत्येकासाठी .env मध्ये
+# <NAME>_API_KEY, <NAME>_BASE_URL (+ _KIND, _TIMEOUT, _RETRIES, _MAX_CONNECTIONS)
+SMS_PROVIDERS = [p.strip().lower() for p in os.getenv("SMS_PROVIDERS", "herosms").split(",") if p.strip()]
+
+def provider_settings(name):
+    """एका provider चे .env settings (herosms साठी वरचे HEROSMS_* defaults)."""
+    env = name.upper()
+    herosms = name == "herosms"
+    return {
+        "kind": os.getenv(f"{env}_KIND", "sms_activate"),
+        "api_key": os.getenv(f"{env}_API_KEY"),
+        "base_url": HEROSMS_BASE_URL if herosms else os.getenv(f"{env}_BASE_URL"),
+        "timeout": HEROSMS_TIMEOUT if herosms else float(os.getenv(f"{env}_TIMEOUT", 10)),
+        "retries": HEROSMS_RETRIES if herosms else int(os.getenv(f"{env}_RETRIES", 2)),
+        "max_connections": HEROSMS_MAX_CONNECTIONS if herosms else int(os.getenv(f"{env}_MAX_CONNECTIONS", 20)),
+    }
+
+# getNumber routing (rolling stats, failover)
+ROUTER_ALPHA = float(os.getenv("ROUTER_ALPHA", 0.2))  # EWMA weight of the newest sample
+ROUTER_MAX_ATTEMPTS = int(os.getenv("ROUTER_MAX_ATTEMPTS", 3))  # एका purchase मध्ये किती routes
+ROUTER_EMPTY_COOLDOWN = float(os.getenv("ROUTER_EMPTY_COOLDOWN", 60))  # NO_NUMBERS नंतर route बाजूला
+ROUTER_DOWN_COOLDOWN = float(os.getenv("ROUTER_DOWN_COOLDOWN", 300))  # NO_BALANCE / BAD_KEY नंतर provider बाजूला
+ROUTER_LATENCY_COST = float(os.getenv("ROUTER_LATENCY_COST", 0.5))  # ₹ per second of getNumber latency
+
+# Circuit breakers (provider आणि provider + service code प्रति)
+BREAKER_WINDOW = float(os.getenv("BREAKER_WINDOW", 60))  # seconds of outcomes considered
+BREAKER_MIN_CALLS = int(os.getenv("BREAKER_MIN_CALLS", 10))
+BREAKER_ERROR_RATE = float(os.getenv("BREAKER_ERROR_RATE", 0.5))
+BREAKER_OPEN_FOR = float(os.getenv("BREAKER_OPEN_FOR", 30))
+BREAKER_HALF_OPEN_CALLS = int(os.getenv("BREAKER_HALF_OPEN_CALLS", 2))
+BREAKER_SLOW_CALL = float(os.getenv("BREAKER_SLOW_CALL", 8))  # यापेक्षा हळू getNumber = failure
+
+# Purchase admission control (concurrent getNumber)
+PURCHASE_MAX_INFLIGHT = int(os.getenv("PURCHASE_MAX_INFLIGHT", 32))
+PURCHASE_MAX_QUEUE = int(os.getenv("PURCHASE_MAX_QUEUE", 64))
+PURCHASE_MAX_WAIT = float(os.getenv("PURCHASE_MAX_WAIT", 5))
+
+# Per-user rate limits (token bucket: tokens/sec + burst) आणि buy_ callback de-dup
+RATE_BUY_PER_SEC = float(os.getenv("RATE_BUY_PER_SEC", 0.2))
+RATE_BUY_BURST = float(os.getenv("RATE_BUY_BURST", 3))
+RATE_CALLBACK_PER_SEC = float(os.getenv("RATE_CALLBACK_PER_SEC", 2))
+RATE_CALLBACK_BURST = float(os.getenv("RATE_CALLBACK_BURST", 10))
+RATE_MESSAGE_PER_SEC = float(os.getenv("RATE_MESSAGE_PER_SEC", 1))
+RATE_MESSAGE_BURST = float(os.getenv("RATE_MESSAGE_BURST", 8))
+RATE_LIMIT_KEYS = int(os.getenv("RATE_LIMIT_KEYS", 100000))  # memory मधील (user, action) buckets
+CALLBACK_DEDUP_TTL = float(os.getenv("CALLBACK_DEDUP_TTL", 60))
+
+# Database settings (DB_TYPE, DB_HOST, DB_POOL_SIZE ...) storage/pool.py .env मधून वाचते
 
 MINIMUM_RECHARGE = float(os.getenv("MINIMUM_RECHARGE", 30.0))
-REFERRAL_BONUS = float(os.getenv("REFERRAL_BONUS", 10.0))
\ No newline at end of file
+REFERRAL_BONUS = float(os.getenv("REFERRAL_BONUS", 10.0))
+
+# Razorpay payment links (wallet recharge)
+RAZORPAY_KEY_ID = os.getenv("RAZORPAY_KEY_ID")
+RAZORPAY_KEY_SECRET = os.getenv("RAZORPAY_KEY_SECRET")
+RAZORPAY_API_URL = os.getenv("RAZORPAY_API_URL", "https://api.razorpay.com/v1")
+PAYMENT_LINK_TIMEOUT = float(os.getenv("PAYMENT_LINK_TIMEOUT", 10))
+PAYMENT_LINK_TTL = int(os.getenv("PAYMENT_LINK_TTL", 1800))  # seconds (Razorpay किमान 15 मिनिटे)
+PAYMENT_LINK_REUSE_MIN = int(os.getenv("PAYMENT_LINK_REUSE_MIN", 300))  # इतका वेळ उरला असेल तरच reuse
+
+# OTP polling
+OTP_POLL_INTERVAL = float(os.getenv("OTP_POLL_INTERVAL", 5))  # history नसताना
+OTP_TIMEOUT = float(os.getenv("OTP_TIMEOUT", 120))
+OTP_POLL_CONCURRENCY = int(os.getenv("OTP_POLL_CONCURRENCY", 10))
+OTP_POLL_TICK = float(os.getenv("OTP_POLL_TICK", 1))
+OTP_POLL_DENSE = float(os.getenv("OTP_POLL_DENSE", 2))
+OTP_POLL_SPARSE = float(os.getenv("OTP_POLL_SPARSE", 15))
+OTP_POLL_WINDOW_STEPS = int(os.getenv("OTP_POLL_WINDOW_STEPS", 8))
+OTP_STATS_WINDOW = int(os.getenv("OTP_STATS_WINDOW", 200))
+OTP_STATS_MIN_SAMPLES = int(os.getenv("OTP_STATS_MIN_SAMPLES", 20))
+
+# Catalog (services / servers)
+PRICE_MARKUP = float(os.getenv("PRICE_MARKUP", 5))
+CATALOG_TTL = float(os.getenv("CATALOG_TTL", 300))
+CATALOG_VERSION_CHECK = float(os.getenv("CATALOG_VERSION_CHECK", 5))  # seconds, catalog_version row check
+
+# User state cache
+USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", 50000))
+USER_CACHE_TTL = float(os.getenv("USER_CACHE_TTL", 60))
+
+# History (📜) – page size + पहिल्या page चा cache
+HISTORY_PAGE_SIZE = int(os.getenv("HISTORY_PAGE_SIZE", 10))
+HISTORY_CACHE_TTL = float(os.getenv("HISTORY_CACHE_TTL", 30))
+
+# Run mode: "polling" (local), "webhook" (production) किंवा "worker" (shard_front.py मागे)
+BOT_MODE = os.getenv("BOT_MODE", "polling")
+TELEGRAM_BASE_URL = os.getenv("TELEGRAM_BASE_URL", "https://api.telegram.org/bot")  # local Bot API server / bench
+WEBHOOK_URL = os.getenv("WEBHOOK_URL")  # उदा. https://bot.example.com
+WEBHOOK_PATH = os.getenv("WEBHOOK_PATH", "telegram")
+WEBHOOK_LISTEN = os.getenv("WEBHOOK_LISTEN", "0.0.0.0")
+WEBHOOK_PORT = int(os.getenv("WEBHOOK_PORT", 8443))
+WEBHOOK_SECRET = os.getenv("WEBHOOK_SECRET")
+# Inline keyboard callback_data HMAC key (नसेल तर BOT_TOKEN मधून derive); बदलला की जुने keyboards expire
+CALLBACK_SECRET = os.getenv("CALLBACK_SECRET")
+MAX_CONCURRENT_UPDATES = int(os.getenv("MAX_CONCURRENT_UPDATES", 64))
+
+# Multi-worker mode: shard_front.py webhook घेतो, user_id % SHARD_COUNT नुसार worker ला पाठवतो.
+# Worker i: SHARD_HOST:SHARD_BASE_PORT + i (SHARD_WORKERS = "host:port,..." दिल्यास ते)
+SHARD_COUNT = int(os.getenv("SHARD_COUNT", 1))
+SHARD_INDEX = int(os.getenv("SHARD_INDEX", 0))
+SHARD_HOST = os.getenv("SHARD_HOST", "127.0.0.1")
+SHARD_BASE_PORT = int(os.getenv("SHARD_BASE_PORT", 8600))
+SHARD_WORKERS = os.getenv("SHARD_WORKERS")
+SHARD_FORWARD_TIMEOUT = float(os.getenv("SHARD_FORWARD_TIMEOUT", 10))
+# Front timeout / lost ack नंतर Telegram तोच update परत पाठवतो – worker update_id लक्षात ठेवतो
+SHARD_DEDUP_TTL = float(os.getenv("SHARD_DEDUP_TTL", 3600))
+SHARD_DEDUP_SIZE = int(os.getenv("SHARD_DEDUP_SIZE", 200000))
+
+# Prometheus scrape endpoint (GET /metrics, auth नाही – revenue / refunds series); 0 = बंद.
+# Default फक्त loopback; scraper दुसऱ्या host वर असेल तर METRICS_HOST=0.0.0.0 (firewall मागे)
+METRICS_PORT = int(os.getenv("METRICS_PORT", 0))
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+
+# Outbound Telegram messages (Bot API limits)
+TG_GLOBAL_RATE = float(os.getenv("TG_GLOBAL_RATE", 30))
+TG_CHAT_RATE = float(os.getenv("TG_CHAT_RATE", 1))
+TG_BROADCAST_SHARE = float(os.getenv("TG_BROADCAST_SHARE", 0.8))
+TG_MAX_INFLIGHT = int(os.getenv("TG_MAX_INFLIGHT", 32))
+
+# Admin broadcast
+BROADCAST_PAGE_SIZE = int(os.getenv("BROADCAST_PAGE_SIZE", 500))
+BROADCAST_FLUSH_EVERY = int(os.getenv("BROADCAST_FLUSH_EVERY", 50))
+BROADCAST_REPORT_EVERY = float(os.getenv("BROADCAST_REPORT_EVERY", 30))
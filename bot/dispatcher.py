@@ -0,0 +1,254 @@
+# bot/dispatcher.py
+# Outbound Telegram messages – priority queue + rate limits
+import asyncio
+import logging
+import time
+from collections import deque
+
+from telegram.error import Forbidden, BadRequest, RetryAfter, NetworkError
+
+from cache import TTLCache
+from config import (
+    TG_GLOBAL_RATE,
+    TG_CHAT_RATE,
+    TG_BROADCAST_SHARE,
+    TG_MAX_INFLIGHT
+)
+
+logger = logging.getLogger(__name__)
+
+# Priority classes – कमी नंबर आधी जातो
+OTP = 0
+REFUND = 1
+BROADCAST = 2
+
+MAX_TEXT = 4096
+MAX_RETRIES = 3
+
+
+class TokenBucket:
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, now):
+        """Token मिळायला किती सेकंद लागतील (0 = आत्ता)."""
+        if now < self.blocked_until:
+            return self.blocked_until - now
+        self._refill(now)
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def take(self, now):
+        self._refill(now)
+        self.tokens -= 1
+
+    def block(self, seconds):
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+
+class _Message:
+    __slots__ = ("chat_id", "text", "kwargs", "future", "attempts")
+
+    def __init__(self, chat_id, text, kwargs, future):
+        self.chat_id = chat_id
+        self.text = text
+        self.kwargs = kwargs
+        self.future = future
+        self.attempts = 0
+
+
+class MessageDispatcher:
+    """
+    Sends bot messages in priority order (OTP > REFUND > BROADCAST) under a
+    global token bucket (~30 msg/s) and per-chat buckets (~1 msg/s).
+
+    Broadcasts only get TG_BROADCAST_SHARE of the global rate and are the
+    class paused on a 429, so OTP deliveries never queue behind them.
+    Several pending plain-text messages for one chat are merged into a
+    single send. send() returns a future resolving to the sent Message.
+    """
+
+    def __init__(self, bot, global_rate=TG_GLOBAL_RATE, chat_rate=TG_CHAT_RATE,
+                 broadcast_share=TG_BROADCAST_SHARE, max_inflight=TG_MAX_INFLIGHT):
+        self.bot = bot
+        self.chat_rate = chat_rate
+        self._global = TokenBucket(global_rate)
+        self._broadcast = TokenBucket(global_rate * broadcast_share)
+        self._chats = TTLCache(maxsize=100000, ttl=max(10.0, 2 / chat_rate))
+        self._pending = {}  # (priority, chat_id) -> deque[_Message]
+        self._ready = {p: deque() for p in (OTP, REFUND, BROADCAST)}
+        self._inflight = asyncio.Semaphore(max_inflight)
+        self._wakeup = asyncio.Event()
+        self._tasks = set()
+        self._task = None
+        self.sent = 0
+        self.rate_limited = 0
+
+    # ================= PUBLIC =================
+    def send(self, chat_id, text, priority=OTP, **kwargs):
+        fut = asyncio.get_running_loop().create_future()
+        fut.add_done_callback(_log_failure)
+        self._push(priority, _Message(chat_id, text, kwargs, fut))
+        return fut
+
+    def queue_depth(self, priority=None):
+        prios = [priority] if priority is not None else list(self._ready)
+        return sum(len(q) for (p, _), q in self._pending.items() if p in prios)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self, drain_timeout=5.0):
+        # OTP / refunds पाठवून टाका, broadcast पुढच्या start ला resume होतो
+        deadline = time.monotonic() + drain_timeout
+        while (self.queue_depth(OTP) or self.queue_depth(REFUND)) and time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    # ================= SCHEDULER =================
+    def _push(self, priority, msg, front=False):
+        key = (priority, msg.chat_id)
+        q = self._pending.get(key)
+        if q is None:
+            q = self._pending[key] = deque()
+            self._ready[priority].append(msg.chat_id)
+        if front:
+            q.appendleft(msg)
+        else:
+            q.append(msg)
+        self._wakeup.set()
+
+    def _chat_bucket(self, chat_id):
+        bucket = self._chats.get(chat_id)
+        if bucket is None:
+            bucket = TokenBucket(self.chat_rate, capacity=1)
+            self._chats.set(chat_id, bucket)
+        return bucket
+
+    def _pick(self, now):
+        """पुढचा पाठवायचा (priority, chat_id) किंवा (None, किती थांबायचे)."""
+        soonest = 1.0
+        for priority, ready in self._ready.items():
+            if not ready:
+                continue
+            if priority == BROADCAST:
+                wait = self._broadcast.wait_time(now)
+                if wait:
+                    soonest = min(soonest, wait)
+                    continue
+            for _ in range(len(ready)):
+                chat_id = ready[0]
+                wait = self._chat_bucket(chat_id).wait_time(now)
+                if not wait:
+                    return (priority, chat_id), 0.0
+                soonest = min(soonest, wait)
+                ready.rotate(-1)
+        return None, soonest
+
+    async def _run(self):
+        while True:
+            now = time.monotonic()
+            wait = self._global.wait_time(now)
+            if wait:
+                await asyncio.sleep(wait)
+                continue
+
+            key, wait = self._pick(now)
+            if key is None:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=wait)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            priority, chat_id = key
+            msgs = self._take(priority, chat_id)
+            if not msgs:
+                continue
+            self._global.take(now)
+            self._chat_bucket(chat_id).take(now)
+            if priority == BROADCAST:
+                self._broadcast.take(now)
+
+            await self._inflight.acquire()
+            task = asyncio.create_task(self._send(priority, msgs))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    def _take(self, priority, chat_id):
+        """एका chat चे pending plain messages एकत्र करून एक send."""
+        q = self._pending[(priority, chat_id)]
+        while q and q[0].future.done():  # send आधीच cancel झालेले
+            q.popleft()
+        msgs = [q.popleft()] if q else []
+        if msgs and not msgs[0].kwargs:
+            size = len(msgs[0].text)
+            while q and not q[0].kwargs and size + len(q[0].text) + 2 <= MAX_TEXT:
+                size += len(q[0].text) + 2
+                msgs.append(q.popleft())
+        if not q:
+            del self._pending[(priority, chat_id)]
+            self._ready[priority].remove(chat_id)
+        return msgs
+
+    async def _send(self, priority, msgs):
+        first = msgs[0]
+        text = "\n\n".join(m.text for m in msgs)
+        try:
+            result = await self.bot.send_message(first.chat_id, text, **first.kwargs)
+        except RetryAfter as e:
+            retry_after = e.retry_after
+            retry_after = retry_after.total_seconds() if hasattr(retry_after, "total_seconds") else float(retry_after)
+            self.rate_limited += 1
+            logger.warning(f"429 for chat {first.chat_id}, retry after {retry_after}s")
+            bucket = self._chat_bucket(first.chat_id)
+            bucket.block(retry_after)
+            self._chats.set(first.chat_id, bucket, ttl=retry_after + 10)
+            self._broadcast.block(retry_after)
+            for m in reversed(msgs):
+                self._push(priority, m, front=True)
+        except (Forbidden, BadRequest) as e:
+            for m in msgs:
+                if not m.future.done():
+                    m.future.set_exception(e)
+        except NetworkError as e:
+            for m in reversed(msgs):
+                m.attempts += 1
+                if m.attempts >= MAX_RETRIES:
+                    if not m.future.done():
+                        m.future.set_exception(e)
+                else:
+                    self._push(priority, m, front=True)
+        except Exception as e:
+            for m in msgs:
+                if not m.future.done():
+                    m.future.set_exception(e)
+        else:
+            self.sent += 1
+            for m in msgs:
+                if not m.future.done():
+                    m.future.set_result(result)
+        finally:
+            self._inflight.release()
+
+
+def _log_failure(fut):
+    if not fut.cancelled() and fut.exception() is not None:
+        logger.warning(f"Message not delivered: {fut.exception()!r}")
@@ -0,0 +1,95 @@
+# bot/history.py
+# 📜 History – orders / wallet transactions, keyset pages (cursor signed callback_data मध्ये)
+import time
+
+from telegram import InlineKeyboardButton, InlineKeyboardMarkup
+
+import callbacks
+import db
+from cache import TTLCache
+from config import HISTORY_PAGE_SIZE, HISTORY_CACHE_TTL, USER_CACHE_SIZE
+
+ORDERS = "o"
+TRANSACTIONS = "t"
+_KINDS = (ORDERS, TRANSACTIONS)  # callback मध्ये index
+
+_TITLES = {ORDERS: "🧾 Orders", TRANSACTIONS: "💰 Wallet"}
+
+# फक्त पहिला page cache – "📜 History" सगळ्यात जास्त दाबले जाते, Older क्वचित
+_first_pages = TTLCache(maxsize=USER_CACHE_SIZE, ttl=HISTORY_CACHE_TTL)
+
+
+def invalidate(user_id: int):
+    """Order / balance बदलला की त्या user चे cached पहिले pages काढा."""
+    _first_pages.pop((user_id, ORDERS))
+    _first_pages.pop((user_id, TRANSACTIONS))
+
+
+def callback_data(kind: str, before_ts: int = None, before_id: int = None) -> str:
+    return callbacks.encode(callbacks.HISTORY, _KINDS.index(kind), before_ts or 0, before_id or 0)
+
+
+def parse_callback(kind: int, before_ts: int, before_id: int):
+    """Decoded HISTORY fields -> (kind, before_ts, before_id); 0 cursor = पहिला page."""
+    kind = _KINDS[kind] if kind < len(_KINDS) else ORDERS
+    if before_ts and before_id:
+        return kind, before_ts, before_id
+    return kind, None, None
+
+
+async def get_page(user_id: int, kind: str = ORDERS, before_ts: int = None, before_id: int = None):
+    """(text, markup) – पहिला page cache मधून, बाकी थेट keyset query."""
+    key = (user_id, kind)
+    if before_ts is None:
+        page = _first_pages.get(key)
+        if page is not None:
+            return page
+
+    fetch = db.get_order_history if kind == ORDERS else db.get_transaction_history
+    # एक जास्त row मागवा – पुढचा page आहे का ते COUNT(*) शिवाय कळते
+    rows = await db.run(fetch, user_id, before_ts, before_id, HISTORY_PAGE_SIZE + 1)
+    has_more = len(rows) > HISTORY_PAGE_SIZE
+    rows = rows[:HISTORY_PAGE_SIZE]
+
+    page = (_render(kind, rows, first=before_ts is None), _markup(kind, rows, has_more, before_ts is not None))
+    if before_ts is None:
+        _first_pages.set(key, page)
+    return page
+
+
+def _date(ts):
+    return time.strftime("%d %b %H:%M", time.localtime(int(ts)))
+
+
+def _render(kind, rows, first):
+    title = _TITLES[kind]
+    if not rows:
+        return f"{title}\n\nNo {'orders' if kind == ORDERS else 'transactions'} yet." if first \
+            else f"{title}\n\nNo older entries."
+
+    lines = [title, ""]
+    if kind == ORDERS:
+        for r in rows:
+            line = f"#{r['id']} {r['service_name']} – ₹{float(r['price'] or 0):.2f} – {r['status']}\n   🕒 {_date(r['ts'])}"
+            if r["otp"]:
+                line += f" 🔢 {r['otp']}"
+            lines.append(line)
+    else:
+        for r in rows:
+            sign = "➖" if r["type"] == "DEBIT" else "➕"
+            lines.append(f"{sign} ₹{abs(float(r['amount'])):.2f} – {r['description'] or r['type']}\n   🕒 {_date(r['ts'])}")
+    return "\n".join(lines)
+
+
+def _markup(kind, rows, has_more, paged):
+    nav = []
+    if paged:
+        nav.append(InlineKeyboardButton("⏮ Latest", callback_data=callback_data(kind)))
+    if has_more:
+        last = rows[-1]
+        nav.append(InlineKeyboardButton("Older ➡️", callback_data=callback_data(kind, int(last["ts"]), last["id"])))
+
+    other = TRANSACTIONS if kind == ORDERS else ORDERS
+    keyboard = [nav] if nav else []
+    keyboard.append([InlineKeyboardButton(_TITLES[other], callback_data=callback_data(other))])
+    return InlineKeyboardMarkup(keyboard)
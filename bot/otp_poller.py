@@ -0,0 +1,267 @@
+# bot/otp_poller.py
+# सर्व active activations साठी एकच poller – प्रत्येक order साठी वेगळा task नाही
+import asyncio
+import logging
+from dataclasses import dataclass
+
+import db
+import dispatcher
+import history
+import sharding
+import telemetry
+import users
+from config import OTP_POLL_TICK, OTP_POLL_CONCURRENCY
+from otp_schedule import ArrivalStats, PollSchedule
+from providers import registry
+from providers.router import router as default_router
+
+logger = logging.getLogger(__name__)
+
+OTP_SECONDS = telemetry.histogram(
+    "otp_delivery_seconds", "Number received to OTP detected, per service", ("service",),
+    buckets=(5, 10, 15, 20, 30, 45, 60, 90, 120, 180, 300, 600)
+)
+ORDERS_FINISHED = telemetry.counter("orders_finished_total", "Orders reaching a final state", ("outcome",))
+FINISH_RETRIES = telemetry.counter("otp_finish_retries_total", "OTP deliveries / timeout refunds that failed and were retried",
+                                   ("step",))
+
+# deliver / expire fail झाला तर activation registry मध्ये परत, इतक्या backoff ने पुन्हा
+RETRY_BASE = 2.0
+RETRY_MAX = 60.0
+
+
+@dataclass
+class Activation:
+    activation_id: str
+    user_id: int
+    order_id: int
+    price: float
+    service_name: str
+    service_code: str
+    server_id: int
+    provider: str
+    started: float
+    deadline: float
+    next_poll: float
+    otp: str = None  # OTP मिळाला पण deliver fail – retry वेळी फक्त deliver (पुन्हा poll नाही)
+    failures: int = 0
+
+
+class OtpPoller:
+    """
+    Registry of in-flight activations, checked in bulk once per tick.
+
+    One getActiveActivations call per provider covers every open order; if
+    a provider does not support it, getStatus is fanned out with bounded
+    concurrency. Provider calls therefore grow with ticks, not with open
+    orders. Activations are keyed by (provider, activation id) since ids
+    are only unique within one provider.
+
+    Each activation has its own next-poll time from PollSchedule (learned
+    per service/server arrival times); a tick with nothing due makes no
+    provider call at all. A delivery or timeout refund that raises is
+    logged and the activation goes back into the registry with backoff,
+    so it is retried instead of waiting for the next restart's recover().
+    """
+
+    def __init__(self, dispatcher, interval=OTP_POLL_TICK, concurrency=OTP_POLL_CONCURRENCY,
+                 stats=None, router=None):
+        self.dispatcher = dispatcher
+        self.router = router or default_router
+        self.interval = interval
+        self.stats = stats or ArrivalStats()
+        self.schedule = PollSchedule(self.stats)
+        self._active = {}
+        self._sem = asyncio.Semaphore(concurrency)
+        self._no_bulk = set()  # getActiveActivations नसलेले providers
+        self._task = None
+
+    def timeout_for(self, service_code, server_id):
+        return self.schedule.give_up_after(service_code, server_id)
+
+    def register(self, activation_id, user_id, order_id, price, service_name, service_code, server_id,
+                 provider="herosms", elapsed=0.0, remaining=None):
+        now = asyncio.get_running_loop().time()
+        if remaining is None:
+            remaining = self.timeout_for(service_code, server_id) - elapsed
+        self._active[(provider, str(activation_id))] = Activation(
+            str(activation_id), user_id, order_id, price, service_name, service_code, server_id, provider,
+            started=now - elapsed,
+            deadline=now + remaining,
+            next_poll=now + self.schedule.next_delay(service_code, server_id, elapsed)
+        )
+
+    async def recover(self):
+        """
+        Restart नंतर: DB मधले सर्व in-flight orders पुन्हा registry मध्ये – multi-worker
+        mode मध्ये फक्त या shard च्या users चे (एक activation एकाच worker कडून poll).
+        NUMBER_RECEIVED पुढच्या tick ला bulk check होतात; PENDING (getNumber चा
+        result माहीत नाही) refund करून FAILED.
+        """
+        rows = [o for o in await db.run(db.get_active_orders) if sharding.owns(o["user_id"])]
+        now = asyncio.get_running_loop().time()
+        pending = []
+        for o in rows:
+            if o["status"] == db.NUMBER_RECEIVED and o["activation_id"]:
+                self.register(
+                    o["activation_id"], o["user_id"], o["id"], float(o["price"]), o["service_name"],
+                    o["provider_service_code"], o["server_id"], provider=o["provider"],
+                    elapsed=float(o["elapsed"] or 0), remaining=float(o["remaining"] or 0)
+                )
+                self._active[(o["provider"], str(o["activation_id"]))].next_poll = now  # लगेच bulk re-check
+            else:
+                pending.append(o)
+
+        for o in pending:
+            if await users.refund_order(o["id"], o["user_id"], float(o["price"]), db.FAILED, "Refund - Interrupted"):
+                ORDERS_FINISHED.inc(outcome="interrupted")
+                self.dispatcher.send(o["user_id"], "⚠️ Order interrupted. Refunded.", priority=dispatcher.REFUND)
+
+        logger.info(f"Recovered {len(rows) - len(pending)} activations, refunded {len(pending)} pending orders")
+
+    async def load_history(self):
+        """Startup ला अलीकडच्या orders मधून arrival distribution भरतो."""
+        self.stats.load(await db.run(db.get_otp_arrival_samples))
+
+    def __len__(self):
+        return len(self._active)
+
+    # ================= LIFECYCLE =================
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.tick()
+            except Exception:
+                logger.exception("OTP poll tick failed")
+
+    # ================= POLLING =================
+    async def tick(self):
+        if not self._active:
+            return
+
+        now = asyncio.get_running_loop().time()
+        # retry backoff मध्ये असलेले (failures) deadline गेली तरी next_poll पर्यंत थांबतात
+        due = [a for a in self._active.values() if a.next_poll <= now or (a.deadline <= now and not a.failures)]
+        if not due:
+            return
+
+        statuses = await self._fetch_statuses([a for a in due if a.otp is None])
+        now = asyncio.get_running_loop().time()
+
+        # bulk response मध्ये due नसलेल्यांचे OTP पण आले असतील – तेही लगेच द्या
+        due_keys = {(a.provider, a.activation_id) for a in due}
+        jobs = []
+        for key, act in list(self._active.items()):
+            if act.otp is not None:
+                if key not in due_keys:
+                    continue
+                status = f"STATUS_OK:{act.otp}"
+            else:
+                status = statuses.get(key) or ""
+                if key not in due_keys and not status.startswith("STATUS_OK"):
+                    continue
+            if status.startswith("STATUS_OK"):
+                del self._active[key]
+                otp = status.split(":", 1)[1]
+                jobs.append((key, act, otp, self._deliver(act, otp, now - act.started)))
+            elif now >= act.deadline:
+                del self._active[key]
+                jobs.append((key, act, None, self._expire(act)))
+            else:
+                act.next_poll = now + self.schedule.next_delay(act.service_code, act.server_id, now - act.started)
+
+        if jobs:
+            results = await asyncio.gather(*(job for *_, job in jobs), return_exceptions=True)
+            for (key, act, otp, _), res in zip(jobs, results):
+                if isinstance(res, Exception):
+                    self._retry(key, act, otp, res)
+
+    def _retry(self, key, act, otp, error):
+        """Fail झालेला deliver / expire – log करून registry मध्ये परत, exponential backoff ने."""
+        step = "deliver" if otp is not None else "expire"
+        act.failures += 1
+        act.otp = otp
+        delay = min(RETRY_MAX, RETRY_BASE * 2 ** (act.failures - 1))
+        act.next_poll = asyncio.get_running_loop().time() + delay
+        self._active.setdefault(key, act)
+        FINISH_RETRIES.inc(step=step)
+        logger.error(f"OTP {step} for order {act.order_id} failed (attempt {act.failures}), retrying in {delay:.0f}s",
+                     exc_info=error)
+
+    async def _fetch_statuses(self, due):
+        """{(provider, activation_id): status} – provider प्रति एक bulk call."""
+        statuses = {}
+        for provider in {a.provider for a in due}:
+            if provider in self._no_bulk or registry.get(provider) is None:
+                continue
+            try:
+                bulk = await registry.get(provider).get_active_activations()
+            except Exception as e:
+                # network / अनपेक्षित reply – फक्त या tick साठी per-id getStatus
+                logger.warning(f"Bulk status from {provider} failed: {e}")
+                bulk = {}
+            if bulk is None:
+                logger.info(f"{provider} has no getActiveActivations, using per-id getStatus")
+                self._no_bulk.add(provider)
+            else:
+                statuses.update(((provider, i), st) for i, st in bulk.items())
+
+        # bulk list मध्ये नसलेले (finished / unsupported) वेगळे check करा
+        missing = [(a.provider, a.activation_id) for a in due if (a.provider, a.activation_id) not in statuses]
+        if missing:
+            results = await asyncio.gather(
+                *(self._get_status(*key) for key in missing), return_exceptions=True
+            )
+            for key, res in zip(missing, results):
+                if isinstance(res, str):
+                    statuses[key] = res
+        return statuses
+
+    async def _get_status(self, provider, activation_id):
+        client = registry.get(provider)
+        if client is None:
+            return None
+        async with self._sem:
+            return await client.get_status(activation_id)
+
+    # ================= RESULTS =================
+    async def _deliver(self, act, otp, elapsed):
+        # आधी persist – इथे fail झाला तर काहीच पाठवलेले / मोजलेले नाही, retry सुरक्षित
+        db.queue_otp(act.order_id, otp, round(elapsed))  # write-behind (order_writes)
+        self.stats.record(act.service_code, act.server_id, elapsed)
+        self.router.record_otp(act.server_id, True)
+        OTP_SECONDS.observe(elapsed, service=act.service_code)
+        ORDERS_FINISHED.inc(outcome="otp")
+        telemetry.tracer.mark(act.order_id, "otp")
+        sent = self.dispatcher.send(
+            act.user_id,
+            f"✅ OTP RECEIVED!\n🔢 `{otp}`\n📱 {act.service_name}",
+            priority=dispatcher.OTP,
+            parse_mode="Markdown"
+        )
+        sent.add_done_callback(lambda _: telemetry.tracer.finish(act.order_id, "otp", stage="sent"))
+        history.invalidate(act.user_id)
+
+    async def _expire(self, act):
+        self.router.record_otp(act.server_id, False)
+        client = registry.get(act.provider)
+        if client is not None:
+            await client.cancel(act.activation_id)
+        if await users.refund_order(act.order_id, act.user_id, act.price, db.TIMEOUT, "Refund - Timeout"):
+            ORDERS_FINISHED.inc(outcome="timeout")
+            telemetry.tracer.finish(act.order_id, "timeout", stage="refund")
+            self.dispatcher.send(act.user_id, "⏳ OTP Timeout. Refunded.", priority=dispatcher.REFUND)
@@ -0,0 +1,86 @@
+# bot/otp_schedule.py
+# Service / server नुसार OTP किती वेळात येतो – त्यावरून polling schedule
+from collections import defaultdict, deque
+
+from config import (
+    OTP_POLL_INTERVAL,
+    OTP_TIMEOUT,
+    OTP_POLL_DENSE,
+    OTP_POLL_SPARSE,
+    OTP_POLL_WINDOW_STEPS,
+    OTP_STATS_WINDOW,
+    OTP_STATS_MIN_SAMPLES
+)
+
+
+def _quantile(sorted_samples, q):
+    idx = min(len(sorted_samples) - 1, int(q * len(sorted_samples)))
+    return sorted_samples[idx]
+
+
+class ArrivalStats:
+    """Rolling time-to-OTP samples per (service_code, server_id) and per service_code."""
+
+    def __init__(self, window=OTP_STATS_WINDOW, min_samples=OTP_STATS_MIN_SAMPLES):
+        self.window = window
+        self.min_samples = min_samples
+        self._samples = defaultdict(lambda: deque(maxlen=self.window))
+        self._cache = {}
+
+    def record(self, service_code, server_id, seconds):
+        for key in ((service_code, server_id), (service_code, None)):
+            self._samples[key].append(seconds)
+            self._cache.pop(key, None)
+
+    def load(self, rows):
+        """rows = [(service_code, server_id, seconds), ...] जुने आधी."""
+        for service_code, server_id, seconds in rows:
+            self.record(service_code, server_id, float(seconds))
+
+    def window_for(self, service_code, server_id):
+        """(p10, p90, p99) – पुरेसे samples नसतील तर None."""
+        for key in ((service_code, server_id), (service_code, None)):
+            samples = self._samples.get(key)
+            if samples and len(samples) >= self.min_samples:
+                if key not in self._cache:
+                    s = sorted(samples)
+                    self._cache[key] = (_quantile(s, 0.10), _quantile(s, 0.90), _quantile(s, 0.99))
+                return self._cache[key]
+        return None
+
+
+class PollSchedule:
+    """
+    Dense polling inside the usual arrival window, sparse outside it, and
+    an early give-up once arrival is unlikely. Without enough history it
+    falls back to the fixed OTP_POLL_INTERVAL / OTP_TIMEOUT schedule.
+    """
+
+    def __init__(self, stats, dense=OTP_POLL_DENSE, sparse=OTP_POLL_SPARSE,
+                 window_steps=OTP_POLL_WINDOW_STEPS, timeout=OTP_TIMEOUT):
+        self.stats = stats
+        self.dense = dense
+        self.window_steps = window_steps
+        self.sparse = sparse
+        self.timeout = timeout
+
+    def next_delay(self, service_code, server_id, elapsed):
+        window = self.stats.window_for(service_code, server_id)
+        if window is None:
+            return OTP_POLL_INTERVAL
+        p10, p90, _ = window
+        # window मध्ये साधारण OTP_POLL_WINDOW_STEPS polls – रुंद window तर step मोठी
+        step = min(max(self.dense, (p90 - p10) / self.window_steps), self.sparse)
+        if elapsed < p10:
+            # window सुरू होईपर्यंत थेट उडी, पण early outliers साठी sparse पेक्षा जास्त नाही
+            return max(step, min(p10 - elapsed, self.sparse))
+        if elapsed <= p90:
+            return step
+        return self.sparse
+
+    def give_up_after(self, service_code, server_id):
+        window = self.stats.window_for(service_code, server_id)
+        if window is None:
+            return self.timeout
+        _, p90, p99 = window
+        return min(self.timeout, max(p99 * 1.5, p90 + 30))
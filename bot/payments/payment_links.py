@@ -0,0 +1,144 @@
+# bot/payments/payment_links.py
+# Razorpay Payment Links – async (pooled httpx, timeouts), bot event loop block होत नाही.
+# प्रत्येक link wallet_requests मध्ये PENDING; त्याच user ने तीच amount परत टाकली तर
+# unexpired link परत देतो (नवीन gateway call नाही). Credit payment_worker करतो आणि
+# notes मधल्या wallet_request_id वरून नेमकी तीच row APPROVED करतो.
+import asyncio
+import logging
+import random
+import time
+import uuid
+
+import httpx
+
+import db
+import telemetry
+from config import (
+    RAZORPAY_KEY_ID,
+    RAZORPAY_KEY_SECRET,
+    RAZORPAY_API_URL,
+    PAYMENT_LINK_TTL,
+    PAYMENT_LINK_REUSE_MIN,
+    PAYMENT_LINK_TIMEOUT
+)
+
+logger = logging.getLogger(__name__)
+
+LINKS = telemetry.counter("payment_links_total", "Recharge payment link requests", ("result",))
+LINK_SECONDS = telemetry.histogram("payment_link_seconds", "Razorpay payment link API latency per attempt")
+
+# Razorpay: expire_by किमान 15 मिनिटे पुढे हवा
+MIN_TTL = 16 * 60
+
+
+class PaymentLinkError(Exception):
+    pass
+
+
+class PaymentLinkService:
+    """
+    Creates Razorpay payment links for wallet recharges.
+
+    The user id and the wallet_requests row id always go into the link
+    notes, which Razorpay copies onto the captured payment – webhook.py
+    credits the user and the worker closes exactly that row. A link is reused
+    while it stays valid for at least `reuse_min` more seconds. Updates of
+    one user are already handled one at a time (PerUserUpdateProcessor), so
+    lookup + create need no extra locking. Creation is retried only when
+    the request never reached Razorpay; the reference_id is unique per link,
+    so even that retry cannot produce a second link.
+    """
+
+    def __init__(self, key_id, key_secret, base_url, timeout=10.0, ttl=1800, reuse_min=300,
+                 retries=1, max_connections=10):
+        self.key_id = key_id
+        self.key_secret = key_secret
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.ttl = max(ttl, MIN_TTL)
+        self.reuse_min = reuse_min
+        self.retries = retries
+        self.max_connections = max_connections
+        self._client = None
+
+    def _http(self):
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                auth=(self.key_id or "", self.key_secret or ""),
+                timeout=httpx.Timeout(self.timeout, connect=min(self.timeout, 5.0)),
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                    keepalive_expiry=60
+                )
+            )
+        return self._client
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def get_link(self, user_id: int, amount: float) -> dict:
+        """{"url", "amount", "expires_at", "reused"}; gateway fail झाला तर PaymentLinkError."""
+        amount = round(float(amount), 2)
+        existing = await db.run(db.get_open_payment_link, user_id, amount, int(time.time()) + self.reuse_min)
+        if existing:
+            LINKS.inc(result="reused")
+            return {"url": existing["link_url"], "amount": amount,
+                    "expires_at": int(existing["expires_at"]), "reused": True}
+
+        expire_by = int(time.time()) + self.ttl
+        req_id = await db.run(db.create_payment_link_request, user_id, amount, expire_by)
+        try:
+            link = await self._create(user_id, amount, req_id, expire_by)
+        except PaymentLinkError:
+            await db.run(db.reject_payment_link_request, req_id)
+            raise
+        await db.run(db.attach_payment_link, req_id, link["id"], link["short_url"], link["expire_by"])
+        LINKS.inc(result="created")
+        return {"url": link["short_url"], "amount": amount, "expires_at": link["expire_by"], "reused": False}
+
+    async def _create(self, user_id, amount, req_id, expire_by):
+        body = {
+            "amount": int(round(amount * 100)),  # paise
+            "currency": "INR",
+            "description": f"Wallet recharge ₹{amount:g}",
+            "expire_by": expire_by,
+            "reference_id": f"wr_{req_id}_{uuid.uuid4().hex[:12]}",
+            "notes": {"user_id": str(user_id), "wallet_request_id": str(req_id), "purpose": "wallet_recharge"},
+        }
+        attempt = 0
+        while True:
+            started = time.perf_counter()
+            try:
+                r = await self._http().post(f"{self.base_url}/payment_links", json=body)
+            except (httpx.ConnectError, httpx.ConnectTimeout) as e:
+                if attempt >= self.retries:
+                    LINKS.inc(result="error")
+                    raise PaymentLinkError(f"Razorpay unreachable: {e!r}") from e
+                attempt += 1
+                await asyncio.sleep(random.uniform(0, 0.25 * 2 ** attempt))
+                continue
+            except httpx.TransportError as e:
+                LINKS.inc(result="error")
+                raise PaymentLinkError(f"Razorpay request failed: {e!r}") from e
+            finally:
+                LINK_SECONDS.observe(time.perf_counter() - started)
+
+            if r.status_code >= 400:
+                LINKS.inc(result="error")
+                raise PaymentLinkError(f"Razorpay HTTP {r.status_code}: {r.text[:200]}")
+            link = r.json()
+            link.setdefault("expire_by", body["expire_by"])
+            return link
+
+
+payment_links = PaymentLinkService(
+    RAZORPAY_KEY_ID,
+    RAZORPAY_KEY_SECRET,
+    RAZORPAY_API_URL,
+    timeout=PAYMENT_LINK_TIMEOUT,
+    ttl=PAYMENT_LINK_TTL,
+    reuse_min=PAYMENT_LINK_REUSE_MIN
+)
@@ -0,0 +1,33 @@
+# bot/providers/base.py
+# Number provider interface – router आणि OTP poller फक्त हेच वापरतात
+
+
+class Provider:
+    """
+    What the router and the OTP poller need from a number provider.
+
+    Responses use the SMS-activate text protocol (ACCESS_NUMBER:id:phone,
+    STATUS_OK:code, NO_NUMBERS, ...), so an adapter for a different API
+    only has to translate into those strings.
+    """
+
+    name = None
+
+    async def get_number(self, service_code, country):
+        raise NotImplementedError
+
+    async def get_status(self, activation_id):
+        raise NotImplementedError
+
+    async def cancel(self, activation_id):
+        raise NotImplementedError
+
+    async def get_active_activations(self):
+        """{activation_id: getStatus string}, bulk नसेल तर None; तात्पुरता error raise."""
+        return None
+
+    async def get_balance(self):
+        raise NotImplementedError
+
+    async def aclose(self):
+        pass
@@ -0,0 +1,137 @@
+# bot/providers/breaker.py
+# Provider आणि (provider, service code) प्रति circuit breaker – outage मध्ये debit आधीच नकार
+import time
+from collections import deque
+
+from config import (
+    BREAKER_WINDOW,
+    BREAKER_MIN_CALLS,
+    BREAKER_ERROR_RATE,
+    BREAKER_OPEN_FOR,
+    BREAKER_HALF_OPEN_CALLS
+)
+
+CLOSED = "CLOSED"
+OPEN = "OPEN"
+HALF_OPEN = "HALF_OPEN"
+
+
+class CircuitBreaker:
+    """
+    Error-rate breaker over a sliding time window.
+
+    CLOSED: calls pass; when at least `min_calls` outcomes in the last
+    `window` seconds fail at `error_rate` or more, it opens. OPEN: calls
+    are refused for `open_for` seconds. HALF_OPEN: up to `half_open_calls`
+    probes go through; one success closes it, one failure reopens it.
+    """
+
+    def __init__(self, window=BREAKER_WINDOW, min_calls=BREAKER_MIN_CALLS, error_rate=BREAKER_ERROR_RATE,
+                 open_for=BREAKER_OPEN_FOR, half_open_calls=BREAKER_HALF_OPEN_CALLS, clock=time.monotonic):
+        self.window = window
+        self.min_calls = min_calls
+        self.error_rate = error_rate
+        self.open_for = open_for
+        self.half_open_calls = half_open_calls
+        self.clock = clock
+        self._calls = deque()  # (time, ok)
+        self._failures = 0
+        self._opened_at = None
+        self._probes = 0
+
+    @property
+    def state(self):
+        if self._opened_at is None:
+            return CLOSED
+        if self.clock() - self._opened_at < self.open_for:
+            return OPEN
+        return HALF_OPEN
+
+    def retry_in(self):
+        """OPEN असेल तर किती सेकंदांनी probe शक्य."""
+        if self._opened_at is None:
+            return 0.0
+        return max(0.0, self.open_for - (self.clock() - self._opened_at))
+
+    def available(self):
+        """Call जाऊ शकेल का (probe slot न घेता) – debit आधीचा check."""
+        state = self.state
+        return state == CLOSED or (state == HALF_OPEN and self._probes < self.half_open_calls)
+
+    def allow(self):
+        """Call सुरू करण्याआधी; HALF_OPEN मध्ये probe slot घेतो."""
+        if not self.available():
+            return False
+        if self.state == HALF_OPEN:
+            self._probes += 1
+        return True
+
+    def record(self, ok):
+        now = self.clock()
+        if self._opened_at is not None:
+            # HALF_OPEN probe चा निकाल (OPEN मध्ये सुरू झालेले जुने calls पण इथेच)
+            self._probes = max(0, self._probes - 1)
+            if ok:
+                self._reset()
+            elif self.state == HALF_OPEN:
+                self._opened_at = now
+            return
+
+        self._calls.append((now, ok))
+        self._failures += not ok
+        while self._calls and now - self._calls[0][0] > self.window:
+            _, old_ok = self._calls.popleft()
+            self._failures -= not old_ok
+        if len(self._calls) >= self.min_calls and self._failures >= self.error_rate * len(self._calls):
+            self._opened_at = now
+            self._probes = 0
+
+    def _reset(self):
+        self._opened_at = None
+        self._probes = 0
+        self._calls.clear()
+        self._failures = 0
+
+
+class BreakerBoard:
+    """
+    Breakers for a provider as a whole and for each (provider, service
+    code): a dead provider trips every code at once, a single broken
+    service code does not take the provider's other codes down.
+    """
+
+    def __init__(self, factory=CircuitBreaker):
+        self.factory = factory
+        self._breakers = {}
+
+    def get(self, provider, service_code=None):
+        key = (provider, service_code)
+        b = self._breakers.get(key)
+        if b is None:
+            b = self._breakers[key] = self.factory()
+        return b
+
+    def _pair(self, provider, service_code):
+        return self.get(provider), self.get(provider, service_code)
+
+    def available(self, provider, service_code):
+        return all(b.available() for b in self._pair(provider, service_code))
+
+    def allow(self, provider, service_code):
+        pair = self._pair(provider, service_code)
+        if not all(b.available() for b in pair):
+            return False
+        for b in pair:
+            b.allow()
+        return True
+
+    def record(self, provider, service_code, ok):
+        for b in self._pair(provider, service_code):
+            b.record(ok)
+
+    def retry_in(self, provider, service_code):
+        return max(b.retry_in() for b in self._pair(provider, service_code))
+
+    def snapshot(self):
+        """{(provider, code): state} – OPEN / HALF_OPEN फक्त."""
+        return {k: b.state for k, b in self._breakers.items() if b.state != CLOSED}
@@ -0,0 +1,59 @@
+# bot/providers/registry.py
+# Number providers: name -> client. नवीन API = register_kind() + .env मध्ये <NAME>_* settings
+import logging
+
+from config import SMS_PROVIDERS, provider_settings
+from providers.sms_activate import SmsActivateClient
+
+logger = logging.getLogger(__name__)
+
+
+# kind -> factory(name, settings)
+KINDS = {
+    "sms_activate": lambda name, s: SmsActivateClient(
+        name, s["api_key"], s["base_url"], s["timeout"], s["retries"], s["max_connections"]
+    ),
+}
+
+_clients = {}
+_loaded = False
+
+
+def register_kind(kind, factory):
+    KINDS[kind] = factory
+
+
+def register(client):
+    _clients[client.name] = client
+    return client
+
+
+def _load():
+    global _loaded
+    _loaded = True
+    for name in SMS_PROVIDERS:
+        if name in _clients:
+            continue
+        settings = provider_settings(name)
+        factory = KINDS.get(settings["kind"])
+        if factory is None or not settings["base_url"]:
+            logger.error(f"Provider {name}: unknown kind {settings['kind']!r} or no base URL, skipped")
+            continue
+        register(factory(name, settings))
+
+
+def get(name):
+    if not _loaded:
+        _load()
+    return _clients.get(name)
+
+
+def names():
+    if not _loaded:
+        _load()
+    return list(_clients)
+
+
+async def aclose_all():
+    for client in _clients.values():
+        await client.aclose()
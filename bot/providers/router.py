@@ -0,0 +1,165 @@
+# bot/providers/router.py
+# प्रत्येक getNumber साठी route निवड (latency / availability / OTP success / cost) + failover
+import logging
+import time
+from dataclasses import dataclass
+
+from config import (
+    ROUTER_ALPHA,
+    ROUTER_MAX_ATTEMPTS,
+    ROUTER_EMPTY_COOLDOWN,
+    ROUTER_DOWN_COOLDOWN,
+    ROUTER_LATENCY_COST,
+    BREAKER_SLOW_CALL
+)
+from providers import registry
+from providers.breaker import BreakerBoard
+from providers.sms_activate import NETWORK_ERROR
+
+logger = logging.getLogger(__name__)
+
+# Provider-wide failures – त्या provider चे सगळे routes बाजूला
+PROVIDER_DOWN = ("NO_BALANCE", "BAD_KEY", "ACCOUNT_INACTIVE", "BANNED")
+
+
+@dataclass
+class RouteStats:
+    latency: float = None     # getNumber seconds (EWMA); None = अजून माहीत नाही
+    number_rate: float = 1.0  # getNumber ने नंबर दिला (EWMA)
+    otp_rate: float = 1.0     # नंबर -> OTP आला (EWMA)
+    empty_until: float = 0.0  # NO_NUMBERS cooldown
+
+
+@dataclass
+class Purchase:
+    route: dict
+    activation_id: str
+    phone: str
+
+
+class ProviderRouter:
+    """
+    Chooses a route for each purchase and fails over within it.
+
+    A route is one servers row: provider + service code + country + cost.
+    Each route keeps rolling (EWMA) getNumber latency, number availability
+    and number-to-OTP success; the score is the expected cost of one
+    delivered OTP plus a latency penalty, so a cheap route that rarely
+    delivers loses to a slightly dearer reliable one. Routes that just
+    answered NO_NUMBERS, and providers that reported NO_BALANCE / BAD_KEY,
+    are tried only after everything else.
+
+    Every call also feeds a circuit breaker per provider and per (provider,
+    service code); network errors, timeouts, calls slower than `slow_call`
+    and account-level errors count as failures. Routes behind an open
+    breaker are not tried at all, and usable() lets the purchase path
+    refuse before debiting when nothing is left.
+    """
+
+    def __init__(self, alpha=ROUTER_ALPHA, max_attempts=ROUTER_MAX_ATTEMPTS,
+                 empty_cooldown=ROUTER_EMPTY_COOLDOWN, down_cooldown=ROUTER_DOWN_COOLDOWN,
+                 latency_cost=ROUTER_LATENCY_COST, slow_call=BREAKER_SLOW_CALL, breakers=None,
+                 clock=time.monotonic):
+        self.alpha = alpha
+        self.max_attempts = max_attempts
+        self.empty_cooldown = empty_cooldown
+        self.down_cooldown = down_cooldown
+        self.latency_cost = latency_cost
+        self.slow_call = slow_call
+        self.breakers = breakers or BreakerBoard()
+        self.clock = clock
+        self._routes = {}
+        self._down_until = {}
+
+    def stats(self, server_id):
+        s = self._routes.get(server_id)
+        if s is None:
+            s = self._routes[server_id] = RouteStats()
+        return s
+
+    def _ewma(self, old, sample):
+        return sample if old is None else old + self.alpha * (sample - old)
+
+    # ================= SCORING =================
+    def available(self, route, now=None):
+        now = self.clock() if now is None else now
+        return (self.stats(route["id"]).empty_until <= now
+                and self._down_until.get(route["provider"], 0) <= now)
+
+    def score(self, route):
+        """Lower is better: ₹ per delivered OTP + latency penalty."""
+        s = self.stats(route["id"])
+        success = max(s.number_rate * s.otp_rate, 0.05)
+        return float(route["price"]) / success + self.latency_cost * (s.latency or 0.0)
+
+    def usable(self, routes):
+        """Configured provider आणि breaker बंद नाही असे routes."""
+        return [r for r in routes
+                if registry.get(r["provider"]) is not None
+                and self.breakers.available(r["provider"], r["service_code"])]
+
+    def retry_in(self, routes):
+        """सगळे routes breaker मागे असतील तर पहिला किती सेकंदांनी उघडेल."""
+        return min((self.breakers.retry_in(r["provider"], r["service_code"]) for r in routes), default=0.0)
+
+    def rank(self, routes):
+        """Usable routes; उपलब्ध आधी, प्रत्येक गटात score नुसार."""
+        now = self.clock()
+        return sorted(self.usable(routes), key=lambda r: (not self.available(r, now), self.score(r)))
+
+    # ================= PURCHASE =================
+    async def get_number(self, routes):
+        """
+        Ranked routes वर getNumber, पहिला नंबर मिळेपर्यंत (max_attempts).
+        -> (Purchase | None, last provider response)
+        """
+        last = "NO_ROUTES"
+        attempts = 0
+        down = set()
+        for route in self.rank(routes):
+            if attempts >= self.max_attempts:
+                break
+            if route["provider"] in down:
+                continue  # ह्याच purchase मध्ये NO_BALANCE / BAD_KEY – त्याचे बाकीचे routes पण तसेच
+            # rank नंतर दुसऱ्या purchase ने breaker उघडला / half-open probes संपले असतील
+            if not self.breakers.allow(route["provider"], route["service_code"]):
+                continue
+            attempts += 1
+            client = registry.get(route["provider"])
+            started = self.clock()
+            try:
+                res = await client.get_number(route["service_code"], route["country"])
+            except Exception:
+                self.breakers.record(route["provider"], route["service_code"], False)
+                raise
+            elapsed = self.clock() - started
+            failed = res == NETWORK_ERROR or res.startswith(PROVIDER_DOWN) or elapsed > self.slow_call
+            self.breakers.record(route["provider"], route["service_code"], not failed)
+            if "ACCESS_NUMBER" in res:
+                _, act_id, phone = res.split(":")[:3]
+                self.record_number(route, True, elapsed)
+                return Purchase(route, act_id, phone), res
+            self.record_number(route, False, elapsed, res)
+            if res.startswith(PROVIDER_DOWN):
+                down.add(route["provider"])
+            logger.warning(f"getNumber {route['provider']}/server {route['id']} failed: {res}, failing over")
+            last = res
+        return None, last
+
+    # ================= FEEDBACK =================
+    def record_number(self, route, ok, latency, response=""):
+        s = self.stats(route["id"])
+        s.latency = self._ewma(s.latency, latency)
+        s.number_rate = self._ewma(s.number_rate, 1.0 if ok else 0.0)
+        if response.startswith("NO_NUMBERS"):
+            s.empty_until = self.clock() + self.empty_cooldown
+        elif response.startswith(PROVIDER_DOWN):
+            self._down_until[route["provider"]] = self.clock() + self.down_cooldown
+
+    def record_otp(self, server_id, delivered):
+        """OTP poller कडून: नंबर मिळाल्यावर OTP आला की timeout."""
+        s = self.stats(server_id)
+        s.otp_rate = self._ewma(s.otp_rate, 1.0 if delivered else 0.0)
+
+
+router = ProviderRouter()
@@ -0,0 +1,145 @@
+# bot/providers/sms_activate.py
+# SMS-activate protocol (handler_api.php) client – HeroSMS आणि बाकी compatible providers
+import asyncio
+import json
+import logging
+import random
+import time
+
+import httpx
+
+import telemetry
+from providers.base import Provider
+
+logger = logging.getLogger(__name__)
+
+CALL_SECONDS = telemetry.histogram(
+    "provider_call_seconds", "Provider API latency per HTTP attempt", ("provider", "action")
+)
+CALL_ERRORS = telemetry.counter(
+    "provider_call_errors_total", "Provider HTTP attempts that failed (network / 5xx)", ("provider", "action")
+)
+
+# network error नंतर handlers ला मिळणारा response
+NETWORK_ERROR = "NETWORK_ERROR"
+
+# getActiveActivations माहीत नसलेल्या providers चे replies – फक्त यावरच bulk बंद
+UNSUPPORTED = ("BAD_ACTION", "WRONG_ACTION")
+
+
+class SmsActivateClient(Provider):
+    """
+    Async SMS-activate compatible client over one pooled keep-alive connection.
+
+    Every call has a timeout; idempotent actions are retried with jittered
+    exponential backoff. getNumber is only retried when the request never
+    reached the provider (connect errors), so a retry cannot buy twice.
+    """
+
+    def __init__(self, name, api_key, base_url, timeout=10.0, retries=2, max_connections=20):
+        self.name = name
+        self.api_key = api_key
+        self.base_url = base_url
+        self.timeout = timeout
+        self.retries = retries
+        self.max_connections = max_connections
+        self._client = None
+
+    def _http(self):
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(self.timeout, connect=min(self.timeout, 5.0)),
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                    keepalive_expiry=60
+                )
+            )
+        return self._client
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _call(self, action, idempotent=True, timeout=None, **params):
+        params = {"api_key": self.api_key, "action": action, **params}
+        attempt = 0
+        while True:
+            started = time.perf_counter()
+            try:
+                r = await self._http().get(self.base_url, params=params, timeout=timeout or httpx.USE_CLIENT_DEFAULT)
+                if r.status_code >= 500 and idempotent:
+                    raise httpx.HTTPStatusError(f"HTTP {r.status_code}", request=r.request, response=r)
+                return r.text.strip()
+            except (httpx.TransportError, httpx.HTTPStatusError) as e:
+                CALL_ERRORS.inc(provider=self.name, action=action)
+                retryable = idempotent or isinstance(e, (httpx.ConnectError, httpx.ConnectTimeout))
+                if not retryable or attempt >= self.retries:
+                    raise
+                delay = random.uniform(0, 0.25 * 2 ** attempt)  # full jitter
+                logger.warning(f"{self.name} {action} failed ({e!r}), retry {attempt + 1} in {delay:.2f}s")
+                attempt += 1
+                await asyncio.sleep(delay)
+            finally:
+                CALL_SECONDS.observe(time.perf_counter() - started, provider=self.name, action=action)
+
+    async def _call_text(self, action, idempotent=True, **params):
+        try:
+            return await self._call(action, idempotent=idempotent, **params)
+        except (httpx.TransportError, httpx.HTTPStatusError) as e:
+            logger.error(f"{self.name} {action} failed: {e!r}")
+            return NETWORK_ERROR
+
+    async def get_balance(self):
+        """Provider कडे किती balance आहे ते सांगतो"""
+        return await self._call_text("getBalance")
+
+    async def get_number(self, service_code, country=22):
+        """
+        नवीन नंबर घेतो
+        service_code उदाहरण: "wa" (WhatsApp), "tg" (Telegram)
+        """
+        return await self._call_text("getNumber", idempotent=False, service=service_code, country=country)
+
+    async def get_status(self, order_id):
+        """नंबरचा स्टेटस + OTP मिळतो"""
+        return await self._call_text("getStatus", id=order_id)
+
+    async def cancel(self, order_id):
+        """नंबर कॅन्सल करतो (refund साठी)"""
+        return await self._call_text("setStatus", id=order_id, status=8)  # 8 = cancel
+
+    async def get_active_activations(self):
+        """
+        सर्व active activations एकाच call मध्ये.
+        {activation_id: getStatus सारखा string} परत करतो,
+        provider ला action माहित नसेल (BAD_ACTION) तर None. Network error आणि
+        बाकी अनपेक्षित replies (HTML error page, ERROR_SQL, ...) raise होतात.
+        """
+        return parse_active_activations(await self._call("getActiveActivations"))
+
+
+def parse_active_activations(text):
+    if "NO_ACTIVATIONS" in text:
+        return {}
+    if text.startswith(UNSUPPORTED):
+        return None
+    try:
+        data = json.loads(text)
+    except ValueError:
+        data = None
+    if not isinstance(data, dict) or data.get("status") != "success":
+        # तात्पुरता error – poller हा tick per-id getStatus वापरतो, bulk बंद करत नाही
+        raise ValueError(f"unexpected getActiveActivations reply: {text[:100]!r}")
+
+    result = {}
+    for a in data.get("activeActivations") or []:
+        code = a.get("smsCode")
+        if isinstance(code, list):
+            code = code[-1] if code else None
+        if code:
+            result[str(a["activationId"])] = f"STATUS_OK:{code}"
+        else:
+            result[str(a["activationId"])] = "STATUS_WAIT_CODE"
+    return result
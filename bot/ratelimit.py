@@ -0,0 +1,112 @@
+# bot/ratelimit.py
+# Per-user, per-action token buckets + buy_ callback idempotency – scripted / double taps
+# DB, provider quota आणि admission slots खाण्याआधीच थांबतात
+import time
+from collections import OrderedDict
+
+import telemetry
+from cache import TTLCache
+from config import (
+    RATE_BUY_PER_SEC,
+    RATE_BUY_BURST,
+    RATE_CALLBACK_PER_SEC,
+    RATE_CALLBACK_BURST,
+    RATE_MESSAGE_PER_SEC,
+    RATE_MESSAGE_BURST,
+    RATE_LIMIT_KEYS,
+    CALLBACK_DEDUP_TTL
+)
+
+BUY = "buy"
+CALLBACK = "callback"
+MESSAGE = "message"
+
+LIMITED = telemetry.counter("rate_limited_total", "Updates refused by the per-user rate limiter", ("action",))
+DUPLICATES = telemetry.counter("callback_duplicates_total", "Repeated buy_ callbacks answered from cache")
+
+
+class RateLimiter:
+    """
+    Token bucket per (user_id, action): `rate` tokens per second, at most `burst`.
+
+    Buckets live in an LRU dict capped at `maxsize` keys. A bucket that has
+    been idle long enough to refill completely is the same as a new one, so
+    idle buckets at the LRU end are dropped as traffic moves on – memory
+    follows the number of currently active users, not all users ever seen.
+    Not thread-safe; owned by the event loop.
+    """
+
+    def __init__(self, limits, maxsize=RATE_LIMIT_KEYS):
+        self.limits = limits  # action -> (rate, burst)
+        self.maxsize = maxsize
+        self._buckets = OrderedDict()  # (user_id, action) -> [tokens, updated_at]
+
+    def allow(self, user_id, action, cost=1.0) -> float:
+        """0 = allowed (token घेतला); नाहीतर पुढचा token मिळायला किती seconds."""
+        rate, burst = self.limits[action]
+        now = time.monotonic()
+        key = (user_id, action)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            self._evict(now)
+            bucket = self._buckets[key] = [float(burst), now]
+        else:
+            bucket[0] = min(burst, bucket[0] + (now - bucket[1]) * rate)
+            bucket[1] = now
+            self._buckets.move_to_end(key)
+        if bucket[0] >= cost:
+            bucket[0] -= cost
+            return 0.0
+        LIMITED.inc(action=action)
+        return (cost - bucket[0]) / rate
+
+    def _evict(self, now):
+        # LRU टोकाला: पूर्ण refill झालेले (idle) buckets नेहमी, आणि cap वर असल्यास सगळ्यात जुना
+        while self._buckets:
+            (user_id, action), (tokens, updated_at) = next(iter(self._buckets.items()))
+            rate, burst = self.limits[action]
+            if len(self._buckets) < self.maxsize and tokens + (now - updated_at) * rate < burst:
+                break
+            self._buckets.popitem(last=False)
+
+    def __len__(self):
+        return len(self._buckets)
+
+
+class CallbackResults:
+    """
+    Idempotency for callbacks keyed on (user, message, data), kept `ttl` seconds.
+
+    begin() returns None for the first tap (caller runs the action) or the
+    cached answer for a repeat – "still processing" while the first one runs,
+    then whatever finish() stored. forget() re-opens the key when the first
+    tap changed nothing, so a real retry is not swallowed.
+    """
+
+    PROCESSING = "⏳ Already processing…"
+
+    def __init__(self, ttl=CALLBACK_DEDUP_TTL, maxsize=RATE_LIMIT_KEYS):
+        self._results = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    def begin(self, key):
+        answer = self._results.get(key)
+        if answer is not None:
+            DUPLICATES.inc()
+            return answer
+        self._results.set(key, self.PROCESSING)
+        return None
+
+    def finish(self, key, answer):
+        self._results.set(key, answer)
+
+    def forget(self, key):
+        """काहीच झाले नाही (overload / low balance / error) – पुढचा tap परत चालू दे."""
+        self._results.pop(key)
+
+
+limiter = RateLimiter({
+    BUY: (RATE_BUY_PER_SEC, RATE_BUY_BURST),
+    CALLBACK: (RATE_CALLBACK_PER_SEC, RATE_CALLBACK_BURST),
+    MESSAGE: (RATE_MESSAGE_PER_SEC, RATE_MESSAGE_BURST),
+})
+callback_results = CallbackResults()
@@ -0,0 +1,232 @@
+# bot/shard_front.py
+# Multi-worker mode चा front: Telegram webhook घेतो आणि प्रत्येक update user_id % N नुसार
+# त्या user च्या worker (BOT_MODE=worker bot.py) कडे पाठवतो. Worker ने update_queue मध्ये
+# घेतल्यावरच Telegram ला 200; worker बंद / timeout असेल तर 503 – Telegram तोच update परत पाठवतो.
+# Timeout वेळी worker ने तो आधीच घेतलेला असू शकतो – worker update_id वरून duplicate skip करून ack देतो.
+#
+#   SHARD_COUNT=4 WEBHOOK_URL=https://bot.example.com python bot/shard_front.py
+#   python bot/shard_front.py --no-spawn   # workers दुसरीकडे (SHARD_WORKERS=host:port,...)
+import argparse
+import asyncio
+import hmac
+import json
+import logging
+import os
+import signal
+import sys
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _ROOT not in sys.path:
+    sys.path.append(_ROOT)
+
+from telegram import Bot, Update  # noqa: E402
+
+import telemetry  # noqa: E402
+from config import (  # noqa: E402
+    BOT_TOKEN,
+    TELEGRAM_BASE_URL,
+    WEBHOOK_URL,
+    WEBHOOK_PATH,
+    WEBHOOK_LISTEN,
+    WEBHOOK_PORT,
+    WEBHOOK_SECRET,
+    METRICS_PORT,
+    METRICS_HOST,
+    SHARD_COUNT,
+    SHARD_HOST,
+    SHARD_BASE_PORT,
+    SHARD_WORKERS,
+    SHARD_FORWARD_TIMEOUT
+)
+from sharding import MAX_FRAME, frame, shard_of, update_user_id  # noqa: E402
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+FORWARDED = telemetry.counter("shard_updates_total", "Webhook updates by worker shard and result",
+                              ("shard", "result"))
+
+RECONNECT_DELAY = 1.0  # worker connect fail नंतर इतका वेळ सरळ 503
+RESPAWN_DELAY = 2.0
+
+
+class WorkerLink:
+    """
+    One persistent connection to a worker. Frames go out in order and the
+    worker acks each one in order, so a deque of futures is enough to match
+    acks to requests. A dropped link fails everything in flight (→ 503).
+    """
+
+    def __init__(self, index, host, port):
+        self.index = index
+        self.host = host
+        self.port = port
+        self._writer = None
+        self._pending = asyncio.Queue()  # FIFO futures, ack क्रमाने
+        self._lock = asyncio.Lock()
+        self._retry_at = 0.0
+
+    async def send(self, body: bytes) -> bool:
+        loop = asyncio.get_running_loop()
+        async with self._lock:
+            if self._writer is None and not await self._connect():
+                return False
+            fut = loop.create_future()
+            self._pending.put_nowait(fut)
+            self._writer.write(frame(body))
+        try:
+            await asyncio.wait_for(asyncio.shield(fut), SHARD_FORWARD_TIMEOUT)
+            return True
+        except (asyncio.TimeoutError, ConnectionError):
+            return False
+
+    async def _connect(self) -> bool:
+        loop = asyncio.get_running_loop()
+        if loop.time() < self._retry_at:
+            return False
+        try:
+            reader, writer = await asyncio.wait_for(asyncio.open_connection(self.host, self.port), 2)
+        except (OSError, asyncio.TimeoutError):
+            self._retry_at = loop.time() + RECONNECT_DELAY
+            return False
+        self._writer = writer
+        asyncio.create_task(self._read_acks(reader, writer))
+        logger.info(f"Connected to shard {self.index} at {self.host}:{self.port}")
+        return True
+
+    async def _read_acks(self, reader, writer):
+        try:
+            while True:
+                acks = await reader.read(4096)
+                if not acks:
+                    break
+                for _ in acks:
+                    fut = self._pending.get_nowait()
+                    if not fut.done():
+                        fut.set_result(True)
+        except ConnectionError:
+            pass
+        if self._writer is writer:
+            self._writer = None
+        writer.close()
+        logger.warning(f"Lost shard {self.index}; failing {self._pending.qsize()} in-flight updates")
+        while not self._pending.empty():
+            fut = self._pending.get_nowait()
+            if not fut.done():
+                fut.set_exception(ConnectionError(f"shard {self.index} gone"))
+
+
+class ShardFront:
+    def __init__(self, links, path=WEBHOOK_PATH, secret=WEBHOOK_SECRET):
+        self.links = links
+        self.path = "/" + path.strip("/")
+        self.secret = secret
+
+    async def _route(self, method, path, headers, body):
+        if method != "POST" or path.split("?")[0] != self.path:
+            return "404 Not Found"
+        if self.secret and not hmac.compare_digest(
+                headers.get("x-telegram-bot-api-secret-token", ""), self.secret):
+            return "403 Forbidden"
+        try:
+            update = json.loads(body)
+        except ValueError:
+            return "400 Bad Request"
+        shard = shard_of(update_user_id(update), len(self.links))
+        if await self.links[shard].send(body):
+            FORWARDED.inc(shard=str(shard), result="ok")
+            return "200 OK"
+        FORWARDED.inc(shard=str(shard), result="unavailable")
+        return "503 Service Unavailable"
+
+    async def handle(self, reader, writer):
+        """Minimal HTTP/1.1 (keep-alive) – Telegram फक्त Content-Length सह POST करतो."""
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                request_line, *lines = head.decode("latin-1").split("\r\n")
+                method, path, _ = request_line.split(" ", 2)
+                headers = {}
+                for line in lines:
+                    name, _, value = line.partition(":")
+                    if value:
+                        headers[name.strip().lower()] = value.strip()
+                size = int(headers.get("content-length") or 0)
+                if size > MAX_FRAME:
+                    writer.write(b"HTTP/1.1 413 Payload Too Large\r\nContent-Length: 0\r\nConnection: close\r\n\r\n")
+                    break
+                status = await self._route(method, path, headers, await reader.readexactly(size))
+                writer.write(f"HTTP/1.1 {status}\r\nContent-Length: 0\r\n\r\n".encode())
+                await writer.drain()
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+
+# ================= WORKERS =================
+def worker_addresses(count):
+    if SHARD_WORKERS:
+        return [(host, int(port)) for host, port in (a.strip().rsplit(":", 1) for a in SHARD_WORKERS.split(","))]
+    return [(SHARD_HOST, SHARD_BASE_PORT + i) for i in range(count)]
+
+
+async def supervise(index, count):
+    """Local worker process चालू ठेवतो; पडला तर RESPAWN_DELAY नंतर परत."""
+    env = dict(os.environ, BOT_MODE="worker", SHARD_INDEX=str(index), SHARD_COUNT=str(count))
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bot.py")
+    while True:
+        proc = await asyncio.create_subprocess_exec(sys.executable, script, env=env)
+        try:
+            code = await proc.wait()
+        except asyncio.CancelledError:
+            proc.terminate()
+            await proc.wait()
+            raise
+        logger.error(f"Shard {index} worker exited with {code}; restarting in {RESPAWN_DELAY}s")
+        await asyncio.sleep(RESPAWN_DELAY)
+
+
+async def set_webhook(max_connections):
+    async with Bot(BOT_TOKEN, base_url=TELEGRAM_BASE_URL) as bot:
+        await bot.set_webhook(
+            url=f"{WEBHOOK_URL.rstrip('/')}/{WEBHOOK_PATH}",
+            secret_token=WEBHOOK_SECRET,
+            allowed_updates=Update.ALL_TYPES,
+            max_connections=max_connections
+        )
+
+
+async def main(count, spawn, register):
+    addresses = worker_addresses(count)
+    workers = [asyncio.create_task(supervise(i, len(addresses))) for i in range(len(addresses))] if spawn else []
+    front = ShardFront([WorkerLink(i, host, port) for i, (host, port) in enumerate(addresses)])
+    server = await asyncio.start_server(front.handle, WEBHOOK_LISTEN, WEBHOOK_PORT)
+    if register and WEBHOOK_URL:
+        await set_webhook(max_connections=min(100, 40 * len(addresses)))
+    metrics = telemetry.serve(METRICS_PORT + len(addresses), METRICS_HOST) if METRICS_PORT else None
+    print(f"🚀 24HoursOTP shard front :{WEBHOOK_PORT}/{WEBHOOK_PATH} -> {len(addresses)} workers")
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+    await stop.wait()
+
+    server.close()
+    for task in workers:
+        task.cancel()
+    await asyncio.gather(*workers, return_exceptions=True)
+    if metrics:
+        metrics.shutdown()
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--workers", type=int, default=SHARD_COUNT)
+    ap.add_argument("--no-spawn", action="store_true", help="workers वेगळे चालवलेले (systemd / दुसरे hosts)")
+    ap.add_argument("--no-set-webhook", action="store_true")
+    args = ap.parse_args()
+    asyncio.run(main(args.workers, not args.no_spawn, not args.no_set_webhook))
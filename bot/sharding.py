@@ -0,0 +1,101 @@
+# bot/sharding.py
+# Multi-worker mode: एक user नेहमी एकाच worker process वर (user_id % SHARD_COUNT) –
+# context.user_data, users / history caches, rate limit buckets आणि त्याच्या OTP activations
+# त्या worker मध्येच. shard_front.py → worker: persistent TCP, length-prefixed update JSON,
+# प्रत्येक frame update_queue मध्ये गेल्यावर 1 byte ack (in order). Ack न मिळाल्याने (timeout)
+# Telegram ने परत पाठवलेला update worker update_id वरून ओळखतो – दुसऱ्यांदा चालत नाही.
+import asyncio
+import json
+import logging
+import struct
+
+from telegram import Update
+
+import telemetry
+from cache import TTLCache
+from config import SHARD_COUNT, SHARD_INDEX, SHARD_DEDUP_TTL, SHARD_DEDUP_SIZE
+
+logger = logging.getLogger(__name__)
+
+FRAME = struct.Struct(">I")
+ACK = b"\x01"
+MAX_FRAME = 1 << 20  # Telegram update कधीच इतका मोठा नसतो
+
+DUPLICATES = telemetry.counter("shard_duplicate_updates_total", "Redelivered updates skipped by update_id")
+
+
+def shard_of(user_id, count=SHARD_COUNT) -> int:
+    """User नसलेले updates (channel posts वगैरे) shard 0 वर."""
+    return user_id % count if user_id else 0
+
+
+def owns(user_id) -> bool:
+    return shard_of(user_id) == SHARD_INDEX
+
+
+def update_user_id(update: dict):
+    """Raw update JSON मधला user id – message / callback_query / ... चा "from" (नाहीतर chat)."""
+    for key, value in update.items():
+        if key == "update_id" or not isinstance(value, dict):
+            continue
+        user = value.get("from") or value.get("user")
+        if user:
+            return user.get("id")
+        chat = value.get("chat")
+        if chat:
+            return chat.get("id")
+    return None
+
+
+def frame(body: bytes) -> bytes:
+    return FRAME.pack(len(body)) + body
+
+
+class UpdateReceiver:
+    """Worker side: front कडून आलेले updates app.update_queue मध्ये (PTB Updater ऐवजी)."""
+
+    def __init__(self, app, dedup_ttl=SHARD_DEDUP_TTL, dedup_size=SHARD_DEDUP_SIZE):
+        self.app = app
+        self._server = None
+        self._links = set()
+        self._seen = TTLCache(maxsize=dedup_size, ttl=dedup_ttl)  # update_id -> True
+
+    async def start(self, host, port):
+        self._server = await asyncio.start_server(self._handle, host, port)
+        logger.info(f"Shard {SHARD_INDEX}/{SHARD_COUNT} receiving updates on {host}:{port}")
+
+    def close(self):
+        # नवीन frames बंद; front चे in-flight (ack न मिळालेले) updates 503 → Telegram retry
+        if self._server:
+            self._server.close()
+        for writer in list(self._links):
+            writer.close()
+
+    async def _handle(self, reader, writer):
+        self._links.add(writer)
+        try:
+            while True:
+                (size,) = FRAME.unpack(await reader.readexactly(FRAME.size))
+                if size > MAX_FRAME:
+                    logger.warning(f"Shard {SHARD_INDEX}: oversized frame ({size} bytes), dropping link")
+                    break
+                data = json.loads(await reader.readexactly(size))
+                uid = update_user_id(data)
+                if uid and not owns(uid):
+                    # SHARD_COUNT front आणि worker मध्ये वेगळा – तरी process करतो, पण log
+                    logger.warning(f"Shard {SHARD_INDEX}/{SHARD_COUNT}: update for user {uid} belongs to shard {shard_of(uid)}")
+                update_id = data.get("update_id")
+                if update_id is not None and self._seen.get(update_id):
+                    DUPLICATES.inc()  # आधीच queue मध्ये / चालला – फक्त ack, म्हणजे front 200 देतो
+                else:
+                    if update_id is not None:
+                        self._seen.set(update_id, True)
+                    await self.app.update_queue.put(Update.de_json(data, self.app.bot))
+                writer.write(ACK)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        except ValueError:
+            logger.exception(f"Shard {SHARD_INDEX}: bad update frame, dropping link")
+        finally:
+            self._links.discard(writer)
+            writer.close()
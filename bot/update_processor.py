@@ -0,0 +1,76 @@
+# bot/update_processor.py
+import asyncio
+import time
+from collections import defaultdict
+
+from telegram.ext import BaseUpdateProcessor
+
+import telemetry
+
+HANDLER_SECONDS = telemetry.histogram(
+    "bot_handler_seconds", "Time to handle one update (all handler groups)", ("handler",)
+)
+HANDLER_WAIT = telemetry.histogram(
+    "bot_update_wait_seconds", "Time an update waited behind the same user's earlier updates"
+)
+
+
+class PerUserUpdateProcessor(BaseUpdateProcessor):
+    """
+    Processes updates concurrently (up to `max_concurrent_updates`) while
+    keeping updates from the same user strictly in arrival order.
+
+    One slow handler – e.g. a purchase waiting on HeroSMS – only delays that
+    user's later updates, never anyone else's. Updates queued behind the
+    same user wait before taking a concurrency slot, so one user's burst
+    cannot use up the slots either.
+
+    `label(update)` names the handler for bot_handler_seconds; keep its
+    result set small (command / callback prefix / menu button).
+    """
+
+    def __init__(self, max_concurrent_updates, label=None):
+        super().__init__(max_concurrent_updates)
+        self.label = label or (lambda update: "update")
+        self._locks = defaultdict(asyncio.Lock)
+        self._waiting = defaultdict(int)
+
+    @staticmethod
+    def _key(update):
+        user = getattr(update, "effective_user", None)
+        if user:
+            return user.id
+        chat = getattr(update, "effective_chat", None)
+        return chat.id if chat else None
+
+    async def process_update(self, update, coroutine):
+        # Per-user lock आधी, global slot नंतर – एका user च्या रांगेतले updates
+        # MAX_CONCURRENT_UPDATES slots अडवत नाहीत (BaseUpdateProcessor उलट क्रमाने घेतो)
+        key = self._key(update)
+        if key is None:
+            async with self._semaphore:
+                await self.do_process_update(update, coroutine)
+            return
+
+        self._waiting[key] += 1
+        arrived = time.perf_counter()
+        try:
+            async with self._locks[key]:
+                HANDLER_WAIT.observe(time.perf_counter() - arrived)
+                async with self._semaphore:
+                    await self.do_process_update(update, coroutine)
+        finally:
+            self._waiting[key] -= 1
+            if not self._waiting[key]:  # idle users साठी lock ठेवू नका
+                del self._waiting[key]
+                del self._locks[key]
+
+    async def do_process_update(self, update, coroutine):
+        with HANDLER_SECONDS.time(handler=self.label(update)):
+            await coroutine
+
+    async def initialize(self):
+        pass
+
+    async def shutdown(self):
+        pass
@@ -0,0 +1,80 @@
+# bot/users.py
+# User state (blocked / balance / referral) – TTL cache + DB
+import db
+import history
+import telemetry
+from cache import TTLCache
+from config import USER_CACHE_SIZE, USER_CACHE_TTL
+
+_cache = TTLCache(maxsize=USER_CACHE_SIZE, ttl=USER_CACHE_TTL)
+
+REFUNDS = telemetry.counter("refunds_total", "Refunded orders, by final status", ("status",))
+
+
+async def get_state(user_id: int, referred_by: int = None) -> dict:
+    """
+    {user_id, balance, is_blocked, referred_by} – steady state मध्ये DB trip नाही.
+    नवीन user असेल तर तयार करतो.
+    """
+    state = _cache.get(user_id)
+    if state is None:
+        state = await db.run(db.upsert_user, user_id, referred_by)
+        _cache.set(user_id, state)
+    return state
+
+
+def forget(user_id: int):
+    _cache.pop(user_id)
+
+
+async def set_blocked(user_id: int, block: bool):
+    await db.run(db.set_user_block, user_id, block)
+    state = _cache.get(user_id)
+    if state is not None:
+        _cache.set(user_id, dict(state, is_blocked=bool(block)))
+
+
+async def get_balance(user_id: int) -> float:
+    # पैसे दाखवताना नेहमी DB मधून – webhook credits दुसऱ्या process मधून येतात
+    balance = await db.run(db.get_user_balance, user_id)
+    state = _cache.get(user_id)
+    if state is not None:
+        _cache.set(user_id, dict(state, balance=balance))
+    return balance
+
+
+def adjust_balance(user_id: int, delta: float):
+    """DB मध्ये balance बदलल्यावर cached copy तेवढीच बदला."""
+    history.invalidate(user_id)
+    state = _cache.get(user_id)
+    if state is not None:
+        _cache.set(user_id, dict(state, balance=state["balance"] + delta))
+
+
+async def update_balance(user_id: int, amount: float, trans_type: str, description: str,
+                         op_key: str = None) -> bool:
+    ok = await db.run(db.update_balance, user_id, amount, trans_type, description, op_key)
+    if ok:
+        adjust_balance(user_id, -abs(amount) if trans_type == "DEBIT" else abs(amount))
+    else:
+        forget(user_id)
+    return ok
+
+
+async def place_order(user_id: int, service_id: int, server_id: int, price: float, op_key: str = None):
+    """
+    Debit + PENDING order (db.place_order); low balance असेल तर None.
+    op_key आधीच वापरली असेल तर db.DuplicateOperation.
+    """
+    order_id = await db.run(db.place_order, user_id, service_id, server_id, price, op_key)
+    if order_id:
+        adjust_balance(user_id, -price)
+    return order_id
+
+
+async def refund_order(order_id: int, user_id: int, price: float, status: str, description: str) -> bool:
+    ok = await db.run(db.refund_order, order_id, status, description)
+    if ok:
+        REFUNDS.inc(status=status)
+        adjust_balance(user_id, price)
+    return ok
@@ -32,6 +32,29 @@ DB_NAME = os.getenv("DB_NAME", "db_24hoursotp")
 MINIMUM_RECHARGE = float(os.getenv("MINIMUM_RECHARGE", "30.0"))
 REFERRAL_BONUS = float(os.getenv("REFERRAL_BONUS", "10.0"))
 
+# Prometheus /metrics: payment_worker चा port (0 = बंद); webhook.py Flask app मध्येच /metrics देतो
+WORKER_METRICS_PORT = int(os.getenv("WORKER_METRICS_PORT", "0"))
+# Metrics ला auth नाही: worker listener आणि webhook /metrics default फक्त loopback साठी
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+
+# Credit notices (payment_worker): crediting loop पासून वेगळ्या thread मधून, bot च्या
+# TG_GLOBAL_RATE मधला छोटा वाटा; 429 ला retry_after पाळतो
+TELEGRAM_BASE_URL = os.getenv("TELEGRAM_BASE_URL", "https://api.telegram.org/bot")
+PAYMENT_NOTIFY_RATE = float(os.getenv("PAYMENT_NOTIFY_RATE", "5"))
+PAYMENT_NOTIFY_RETRIES = int(os.getenv("PAYMENT_NOTIFY_RETRIES", "5"))
+
+# Admin stats rollups: payment_worker किती वेळाने बंद झालेले तास seal करतो (sec)
+STATS_SEAL_INTERVAL = float(os.getenv("STATS_SEAL_INTERVAL", "60"))
+
+# OTP feed API (api/app.py): page size, in-memory tail, SSE
+API_PAGE_SIZE = int(os.getenv("API_PAGE_SIZE", "50"))
+API_MAX_PAGE_SIZE = int(os.getenv("API_MAX_PAGE_SIZE", "200"))
+API_FEED_BUFFER = int(os.getenv("API_FEED_BUFFER", "1000"))       # memory मधील नवीनतम rows
+API_FEED_POLL_INTERVAL = float(os.getenv("API_FEED_POLL_INTERVAL", "1.0"))  # DB वर tail query (sec)
+API_PAGE_CACHE_TTL = float(os.getenv("API_PAGE_CACHE_TTL", "60"))  # जुनी cursor pages
+API_SSE_HEARTBEAT = float(os.getenv("API_SSE_HEARTBEAT", "15"))
+API_SSE_MAX_CLIENTS = int(os.getenv("API_SSE_MAX_CLIENTS", "200"))
+
 # Print to check (deploy logs साठी उपयुक्त – production मध्ये काढून टाका)
 if __name__ == "__main__":
     print("Config loaded successfully:")
@@ -0,0 +1,589 @@
+# migrations.py (रूट फोल्डरमध्ये)
+# Versioned schema migrations – import वेळी DDL नाही, deploy करताना एकदा चालवा:
+#
+#   python migrations.py            # pending migrations apply
+#   python migrations.py --status   # current / latest version
+#
+# प्रत्येक migration idempotent आहे (MySQL DDL auto-commit करतो, मध्येच crash
+# झाला तर पुन्हा चालवता यावा) – जुन्या installs वर version 0 पासून सुरक्षित.
+import argparse
+import logging
+import sys
+
+import db
+
+logger = logging.getLogger(__name__)
+
+LOCK_NAME = "otp_schema_migrations"
+PG_LOCK_ID = 240240  # pg_advisory_lock key
+
+
+# ================= HELPERS =================
+def _pg():
+    return db.DB_TYPE == "postgres"
+
+def _sqlite():
+    return db.DB_TYPE == "sqlite"
+
+def _table_exists(cur, table):
+    if _sqlite():
+        cur.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", (table,))
+    elif _pg():
+        cur.execute("SELECT 1 FROM information_schema.tables WHERE table_schema = current_schema() AND table_name = %s", (table,))
+    else:
+        cur.execute("SELECT 1 FROM information_schema.TABLES WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s", (table,))
+    return cur.fetchone() is not None
+
+def _create_table(cur, table, mysql_sql, pg_sql):
+    # IF NOT EXISTS MySQL वर note देतो (raise_on_warnings) – आधी check करा
+    if _table_exists(cur, table):
+        return
+    if _sqlite():
+        # SQLite: Postgres DDL, फक्त auto-increment id वेगळा
+        cur.execute(pg_sql.replace("SERIAL PRIMARY KEY", "INTEGER PRIMARY KEY AUTOINCREMENT"))
+    else:
+        cur.execute(pg_sql if _pg() else mysql_sql)
+
+def _add_column(cur, table, column, mysql_def, pg_def):
+    if _pg():
+        cur.execute(f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS {column} {pg_def}")
+        return
+    if _sqlite():
+        cur.execute(f"PRAGMA table_info({table})")
+        if column not in {r[1] for r in cur.fetchall()}:
+            cur.execute(f"ALTER TABLE {table} ADD COLUMN {column} {pg_def}")
+        return
+    cur.execute("""
+        SELECT 1 FROM information_schema.COLUMNS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND COLUMN_NAME = %s
+    """, (table, column))
+    if not cur.fetchone():
+        cur.execute(f"ALTER TABLE {table} ADD COLUMN {column} {mysql_def}")
+
+def _add_index(cur, table, index, columns, unique=False):
+    kind = "UNIQUE INDEX" if unique else "INDEX"
+    if _pg() or _sqlite():
+        # Postgres / SQLite मध्ये index names schema-wide unique असतात
+        cur.execute(f"CREATE {kind} IF NOT EXISTS {table}_{index} ON {table} {columns}")
+        return
+    cur.execute("""
+        SELECT 1 FROM information_schema.STATISTICS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND INDEX_NAME = %s
+    """, (table, index))
+    if not cur.fetchone():
+        cur.execute(f"ALTER TABLE {table} ADD {kind} {index} {columns}")
+
+
+# ================= MIGRATIONS =================
+def m001_baseline(cur):
+    """users, services, servers, orders, transactions, wallet_requests"""
+    _create_table(cur, "users", """
+        CREATE TABLE users (
+            user_id BIGINT PRIMARY KEY,
+            balance DECIMAL(12,2) DEFAULT 0.00,
+            is_blocked TINYINT(1) DEFAULT 0,
+            referred_by BIGINT DEFAULT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+    """, """
+        CREATE TABLE users (
+            user_id BIGINT PRIMARY KEY,
+            balance DECIMAL(12,2) DEFAULT 0.00,
+            is_blocked BOOLEAN DEFAULT FALSE,
+            referred_by BIGINT DEFAULT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+    _create_table(cur, "services", """
+        CREATE TABLE services (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            service_name VARCHAR(100) NOT NULL,
+            provider_service_code VARCHAR(50) NOT NULL,
+            country_id INT DEFAULT 22,
+            is_active TINYINT(1) DEFAULT 1,
+            UNIQUE KEY unique_service (service_name)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+    """, """
+        CREATE TABLE services (
+            id SERIAL PRIMARY KEY,
+            service_name VARCHAR(100) NOT NULL,
+            provider_service_code VARCHAR(50) NOT NULL,
+            country_id INTEGER DEFAULT 22,
+            is_active BOOLEAN DEFAULT TRUE,
+            UNIQUE (service_name)
+        )
+    """)
+
+    _create_table(cur, "servers", """
+        CREATE TABLE servers (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            service_id INT NOT NULL,
+            server_number INT NOT NULL,
+            price DECIMAL(10,2) NOT NULL,
+            is_active TINYINT(1) DEFAULT 1,
+            FOREIGN KEY (service_id) REFERENCES services(id) ON DELETE CASCADE,
+            UNIQUE KEY unique_server (service_id, server_number)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+    """, """
+        CREATE TABLE servers (
+            id SERIAL PRIMARY KEY,
+            service_id INTEGER NOT NULL,
+            server_number INTEGER NOT NULL,
+            price DECIMAL(10,2) NOT NULL,
+            is_active BOOLEAN DEFAULT TRUE,
+            FOREIGN KEY (service_id) REFERENCES services(id) ON DELETE CASCADE,
+            UNIQUE (service_id, server_number)
+        )
+    """)
+
+    _create_table(cur, "orders", """
+        CREATE TABLE orders (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            user_id BIGINT NOT NULL,
+            service_id INT NOT NULL,
+            server_id INT NOT NULL,
+            phone_number VARCHAR(20),
+            activation_id VARCHAR(100),
+            status ENUM('PENDING', 'NUMBER_RECEIVED', 'OTP_RECEIVED', 'CANCELLED', 'TIMEOUT', 'FAILED') DEFAULT 'PENDING',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users(user_id),
+            FOREIGN KEY (service_id) REFERENCES services(id),
+            FOREIGN KEY (server_id) REFERENCES servers(id)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+    """, """
+        CREATE TABLE orders (
+            id SERIAL PRIMARY KEY,
+            user_id BIGINT NOT NULL,
+            service_id INTEGER NOT NULL,
+            server_id INTEGER NOT NULL,
+            phone_number VARCHAR(20),
+            activation_id VARCHAR(100),
+            status VARCHAR(50) DEFAULT 'PENDING',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users(user_id),
+            FOREIGN KEY (service_id) REFERENCES services(id),
+            FOREIGN KEY (server_id) REFERENCES servers(id)
+        )
+    """)
+
+    _create_table(cur, "transactions", """
+        CREATE TABLE transactions (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            user_id BIGINT NOT NULL,
+            amount DECIMAL(12,2) NOT NULL,
+            type ENUM('CREDIT', 'DEBIT') NOT NULL,
+            description VARCHAR(255),
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users(user_id)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+    """, """
+        CREATE TABLE transactions (
+            id SERIAL PRIMARY KEY,
+            user_id BIGINT NOT NULL,
+            amount DECIMAL(12,2) NOT NULL,
+            type VARCHAR(10) NOT NULL,
+            description VARCHAR(255),
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users(user_id)
+        )
+    """)
+
+    _create_table(cur, "wallet_requests", """
+        CREATE TABLE wallet_requests (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            user_id BIGINT NOT NULL,
+            amount DECIMAL(12,2) NOT NULL,
+            screenshot_url VARCHAR(255),
+            status ENUM('PENDING', 'APPROVED', 'REJECTED') DEFAULT 'PENDING',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users(user_id)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+    """, """
+        CREATE TABLE wallet_requests (
+            id SERIAL PRIMARY KEY,
+            user_id BIGINT NOT NULL,
+            amount DECIMAL(12,2) NOT NULL,
+            screenshot_url VARCHAR(255),
+            status VARCHAR(50) DEFAULT 'PENDING',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users(user_id)
+        )
+    """)
+
+def m002_order_tracking(cur):
+    """OTP / price / deadline on orders, bot_blocked on users"""
+    _add_column(cur, "users", "bot_blocked", "TINYINT(1) DEFAULT 0 AFTER is_blocked", "BOOLEAN DEFAULT FALSE")
+    _add_column(cur, "orders", "otp", "VARCHAR(32) DEFAULT NULL AFTER status", "VARCHAR(32) DEFAULT NULL")
+    _add_column(cur, "orders", "otp_seconds", "INT DEFAULT NULL AFTER otp", "INTEGER DEFAULT NULL")
+    _add_column(cur, "orders", "price", "DECIMAL(10,2) NOT NULL DEFAULT 0.00 AFTER otp_seconds", "DECIMAL(10,2) NOT NULL DEFAULT 0.00")
+    _add_column(cur, "orders", "deadline_at", "TIMESTAMP NULL DEFAULT NULL AFTER price", "TIMESTAMP NULL DEFAULT NULL")
+    _add_index(cur, "orders", "idx_status_deadline", "(status, deadline_at)")
+
+def m003_payment_events(cur):
+    """Razorpay webhook dedupe / outbox"""
+    _create_table(cur, "payment_events", """
+        CREATE TABLE payment_events (
+            payment_id VARCHAR(64) PRIMARY KEY,
+            event VARCHAR(64) NOT NULL,
+            user_id BIGINT NOT NULL DEFAULT 0,
+            amount DECIMAL(12,2) NOT NULL,
+            payload MEDIUMTEXT,
+            status ENUM('PENDING', 'APPLIED', 'SKIPPED') DEFAULT 'PENDING',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            applied_at TIMESTAMP NULL,
+            KEY idx_status (status, created_at)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+    """, """
+        CREATE TABLE payment_events (
+            payment_id VARCHAR(64) PRIMARY KEY,
+            event VARCHAR(64) NOT NULL,
+            user_id BIGINT NOT NULL DEFAULT 0,
+            amount DECIMAL(12,2) NOT NULL,
+            payload TEXT,
+            status VARCHAR(10) DEFAULT 'PENDING',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            applied_at TIMESTAMP NULL
+        )
+    """)
+    if _pg() or _sqlite():
+        # जुन्या setup_database() ने हेच नाव वापरले होते
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_payment_events_status ON payment_events (status, created_at)")
+
+def m004_broadcasts(cur):
+    """Admin broadcasts – keyset cursor + per-recipient log for resume"""
+    _create_table(cur, "broadcasts", """
+        CREATE TABLE broadcasts (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            admin_id BIGINT NOT NULL,
+            message TEXT NOT NULL,
+            status ENUM('RUNNING', 'DONE', 'CANCELLED') DEFAULT 'RUNNING',
+            last_user_id BIGINT NOT NULL DEFAULT 0,
+            total INT NOT NULL DEFAULT 0,
+            sent INT NOT NULL DEFAULT 0,
+            failed INT NOT NULL DEFAULT 0,
+            skipped INT NOT NULL DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+            KEY idx_status (status)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+    """, """
+        CREATE TABLE broadcasts (
+            id SERIAL PRIMARY KEY,
+            admin_id BIGINT NOT NULL,
+            message TEXT NOT NULL,
+            status VARCHAR(10) DEFAULT 'RUNNING',
+            last_user_id BIGINT NOT NULL DEFAULT 0,
+            total INTEGER NOT NULL DEFAULT 0,
+            sent INTEGER NOT NULL DEFAULT 0,
+            failed INTEGER NOT NULL DEFAULT 0,
+            skipped INTEGER NOT NULL DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    if _pg() or _sqlite():
+        _add_index(cur, "broadcasts", "idx_status", "(status)")
+
+    _create_table(cur, "broadcast_deliveries", """
+        CREATE TABLE broadcast_deliveries (
+            broadcast_id INT NOT NULL,
+            user_id BIGINT NOT NULL,
+            status ENUM('SENT', 'FAILED', 'BOT_BLOCKED') NOT NULL,
+            PRIMARY KEY (broadcast_id, user_id)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+    """, """
+        CREATE TABLE broadcast_deliveries (
+            broadcast_id INTEGER NOT NULL,
+            user_id BIGINT NOT NULL,
+            status VARCHAR(12) NOT NULL,
+            PRIMARY KEY (broadcast_id, user_id)
+        )
+    """)
+
+def m005_history_indexes(cur):
+    """(user_id, created_at, id) for keyset history pages"""
+    _add_index(cur, "orders", "idx_user_created", "(user_id, created_at, id)")
+    _add_index(cur, "transactions", "idx_user_created", "(user_id, created_at, id)")
+
+def m006_wallet_ledger(cur):
+    """transactions = append-only ledger: settled flag, idempotency key, opening balances"""
+    _add_column(cur, "transactions", "settled", "TINYINT(1) NOT NULL DEFAULT 1", "BOOLEAN NOT NULL DEFAULT TRUE")
+    _add_column(cur, "transactions", "op_key", "VARCHAR(64) DEFAULT NULL", "VARCHAR(64) DEFAULT NULL")
+    _add_index(cur, "transactions", "uniq_op_key", "(op_key)", unique=True)
+    _add_index(cur, "transactions", "idx_settled", "(settled, id)")
+
+    # जुन्या installs मध्ये balance आणि transactions जुळत नसतील (manual edits,
+    # जुने DEBIT sign bug) – फरक एक "Opening balance" row म्हणून, म्हणजे reconcile शून्यावरून सुरू
+    after = 0
+    while True:
+        cur.execute("""
+            SELECT u.user_id, u.balance,
+                   COALESCE(SUM(CASE WHEN t.type = 'CREDIT' THEN t.amount ELSE -t.amount END), 0)
+            FROM users u LEFT JOIN transactions t ON t.user_id = u.user_id
+            WHERE u.user_id > %s
+            GROUP BY u.user_id, u.balance
+            ORDER BY u.user_id
+            LIMIT 1000
+        """, (after,))
+        rows = cur.fetchall()
+        if not rows:
+            break
+        fixes = [(uid, abs(float(bal) - float(ledger)), "CREDIT" if bal > ledger else "DEBIT", f"opening:{uid}")
+                 for uid, bal, ledger in rows if abs(float(bal) - float(ledger)) >= 0.005]
+        if fixes:
+            cur.executemany(
+                "INSERT INTO transactions (user_id, amount, type, description, op_key) VALUES (%s, %s, %s, 'Opening balance', %s)",
+                fixes
+            )
+        after = rows[-1][0]
+
+def m007_provider_routes(cur):
+    """servers = provider routes (provider + optional code / country override); orders.provider"""
+    _add_column(cur, "servers", "provider", "VARCHAR(32) NOT NULL DEFAULT 'herosms'", "VARCHAR(32) NOT NULL DEFAULT 'herosms'")
+    _add_column(cur, "servers", "provider_service_code", "VARCHAR(50) DEFAULT NULL", "VARCHAR(50) DEFAULT NULL")
+    _add_column(cur, "servers", "country_id", "INT DEFAULT NULL", "INTEGER DEFAULT NULL")
+    _add_column(cur, "orders", "provider", "VARCHAR(32) NOT NULL DEFAULT 'herosms'", "VARCHAR(32) NOT NULL DEFAULT 'herosms'")
+
+def m008_otp_logs(cur):
+    """otp_logs = append-only OTP feed (api/), (created_at, id) keyset index, backfill from orders"""
+    _create_table(cur, "otp_logs", """
+        CREATE TABLE otp_logs (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            order_id INT NOT NULL,
+            user_id BIGINT NOT NULL,
+            service_name VARCHAR(100),
+            phone_number VARCHAR(20),
+            otp VARCHAR(32),
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE KEY uniq_order (order_id)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+    """, """
+        CREATE TABLE otp_logs (
+            id SERIAL PRIMARY KEY,
+            order_id INTEGER NOT NULL,
+            user_id BIGINT NOT NULL,
+            service_name VARCHAR(100),
+            phone_number VARCHAR(20),
+            otp VARCHAR(32),
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE (order_id)
+        )
+    """)
+    _add_index(cur, "otp_logs", "idx_created", "(created_at, id)")
+    # आधीचे delivered OTPs – order id क्रमाने, म्हणजे feed ids आणि वेळ एकाच दिशेने
+    cur.execute("""
+        INSERT INTO otp_logs (order_id, user_id, service_name, phone_number, otp, created_at)
+        SELECT o.id, o.user_id, s.service_name, o.phone_number, o.otp, o.created_at
+        FROM orders o JOIN services s ON s.id = o.service_id
+        WHERE o.status = 'OTP_RECEIVED' AND o.otp IS NOT NULL
+          AND NOT EXISTS (SELECT 1 FROM otp_logs l WHERE l.order_id = o.id)
+        ORDER BY o.id
+    """)
+
+def m009_payment_links(cur):
+    """wallet_requests वर Razorpay payment link (id, url, expiry, payment id) + open link lookup index"""
+    _add_column(cur, "wallet_requests", "link_id", "VARCHAR(64) DEFAULT NULL", "VARCHAR(64) DEFAULT NULL")
+    _add_column(cur, "wallet_requests", "link_url", "VARCHAR(255) DEFAULT NULL", "VARCHAR(255) DEFAULT NULL")
+    _add_column(cur, "wallet_requests", "expires_at", "TIMESTAMP NULL DEFAULT NULL", "TIMESTAMP NULL DEFAULT NULL")
+    _add_column(cur, "wallet_requests", "payment_id", "VARCHAR(64) DEFAULT NULL", "VARCHAR(64) DEFAULT NULL")
+    _add_index(cur, "wallet_requests", "idx_user_status", "(user_id, status, amount)")
+
+# stats_hourly / stats_daily / stats_totals मध्ये सारखेच counters
+_STATS_COLUMNS = """
+            orders INT NOT NULL DEFAULT 0,
+            otps INT NOT NULL DEFAULT 0,
+            refunds INT NOT NULL DEFAULT 0,
+            revenue DECIMAL(14,2) NOT NULL DEFAULT 0,
+            refunded DECIMAL(14,2) NOT NULL DEFAULT 0,
+            credits DECIMAL(14,2) NOT NULL DEFAULT 0,
+            debits DECIMAL(14,2) NOT NULL DEFAULT 0,
+            recharges DECIMAL(14,2) NOT NULL DEFAULT 0,
+            new_users INT NOT NULL DEFAULT 0,"""
+
+def m010_admin_stats(cur):
+    """Admin dashboard rollups (hour / day / all-time × service × server), seal watermarks, created_at indexes"""
+    for table, key, pk in (("stats_hourly", "bucket BIGINT NOT NULL,", "bucket, service_id, server_id"),
+                           ("stats_daily", "day BIGINT NOT NULL,", "day, service_id, server_id"),
+                           ("stats_totals", "", "service_id, server_id")):
+        body = f"""
+            {key}
+            service_id INT NOT NULL DEFAULT 0,
+            server_id INT NOT NULL DEFAULT 0,{_STATS_COLUMNS}
+            PRIMARY KEY ({pk})
+        )"""
+        _create_table(cur, table, f"CREATE TABLE {table} ({body} ENGINE=InnoDB DEFAULT CHARSET=utf8mb4",
+                      f"CREATE TABLE {table} ({body}")
+    _create_table(cur, "stats_state", """
+        CREATE TABLE stats_state (
+            name VARCHAR(32) PRIMARY KEY,
+            value BIGINT NOT NULL
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+    """, """
+        CREATE TABLE stats_state (
+            name VARCHAR(32) PRIMARY KEY,
+            value BIGINT NOT NULL
+        )
+    """)
+    # seal_stats() बंद झालेला तास base tables मधून range scan ने पुन्हा मोजतो
+    _add_index(cur, "orders", "idx_created", "(created_at)")
+    _add_index(cur, "transactions", "idx_created", "(created_at)")
+    _add_index(cur, "users", "idx_created", "(created_at)")
+
+def m011_second_keyset_indexes(cur):
+    """Keyset pages whole_seconds(created_at), id वर – Postgres / SQLite मध्ये expression indexes"""
+    if not (_pg() or _sqlite()):
+        return  # MySQL TIMESTAMP आधीच पूर्ण seconds – idx_user_created / idx_created पुरेसे
+    second = db.dialect.whole_seconds("created_at")
+    _add_index(cur, "orders", "idx_user_second", f"(user_id, {second}, id)")
+    _add_index(cur, "transactions", "idx_user_second", f"(user_id, {second}, id)")
+    _add_index(cur, "otp_logs", "idx_second", f"({second}, id)")
+
+def m012_payment_link_requests(cur):
+    """Payment link चा wallet_requests.id webhook event वर (नेमकी link बंद), EXPIRED status + expiry sweep index"""
+    _add_column(cur, "payment_events", "request_id", "INT DEFAULT NULL", "INT DEFAULT NULL")
+    if not (_pg() or _sqlite()):
+        cur.execute("""
+            ALTER TABLE wallet_requests
+            MODIFY status ENUM('PENDING', 'APPROVED', 'REJECTED', 'EXPIRED') DEFAULT 'PENDING'
+        """)
+    _add_index(cur, "wallet_requests", "idx_status_expires", "(status, expires_at)")
+
+def m013_catalog_version(cur):
+    """Catalog version row – services / servers बदलले की bump, प्रत्येक process चा catalog तो पाहून reload"""
+    _create_table(cur, "catalog_version", """
+        CREATE TABLE catalog_version (
+            id INT PRIMARY KEY,
+            version BIGINT NOT NULL DEFAULT 0
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+    """, """
+        CREATE TABLE catalog_version (
+            id INT PRIMARY KEY,
+            version BIGINT NOT NULL DEFAULT 0
+        )
+    """)
+    cur.execute(f"INSERT INTO catalog_version (id, version) VALUES (1, 0) {db.dialect.insert_ignore('id')}")
+
+def m014_transactions_user_settled(cur):
+    """Balance reads (upsert_user / get_user_balance / _settle_user) user चे unsettled credits – full ledger scan नको"""
+    _add_index(cur, "transactions", "idx_user_settled", "(user_id, settled)")
+
+# (version, function) – नवीन migration नेहमी शेवटी, जुने कधीही बदलू नका
+MIGRATIONS = [
+    (1, m001_baseline),
+    (2, m002_order_tracking),
+    (3, m003_payment_events),
+    (4, m004_broadcasts),
+    (5, m005_history_indexes),
+    (6, m006_wallet_ledger),
+    (7, m007_provider_routes),
+    (8, m008_otp_logs),
+    (9, m009_payment_links),
+    (10, m010_admin_stats),
+    (11, m011_second_keyset_indexes),
+    (12, m012_payment_link_requests),
+    (13, m013_catalog_version),
+    (14, m014_transactions_user_settled),
+]
+
+LATEST = MIGRATIONS[-1][0]
+
+
+# ================= RUNNER =================
+def _ensure_version_table(cur):
+    _create_table(cur, "schema_migrations", """
+        CREATE TABLE schema_migrations (
+            version INT PRIMARY KEY,
+            name VARCHAR(100) NOT NULL,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+    """, """
+        CREATE TABLE schema_migrations (
+            version INTEGER PRIMARY KEY,
+            name VARCHAR(100) NOT NULL,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+def _applied_version(cur):
+    if not _table_exists(cur, "schema_migrations"):
+        return 0
+    cur.execute("SELECT COALESCE(MAX(version), 0) FROM schema_migrations")
+    return cur.fetchone()[0]
+
+def current_version() -> int:
+    conn = db.get_db_connection()
+    try:
+        return _applied_version(conn.cursor())
+    finally:
+        conn.close()
+
+def _lock(cur):
+    # दोन deploys एकाच वेळी migrate करू नयेत (SQLite: local फाईल, lock नाही)
+    if _sqlite():
+        return
+    if _pg():
+        cur.execute("SELECT pg_advisory_lock(%s)", (PG_LOCK_ID,))
+    else:
+        cur.execute("SELECT GET_LOCK(%s, 60)", (LOCK_NAME,))
+        if cur.fetchone()[0] != 1:
+            raise RuntimeError("Another migration run holds the lock")
+
+def _unlock(cur):
+    if _sqlite():
+        return
+    if _pg():
+        cur.execute("SELECT pg_advisory_unlock(%s)", (PG_LOCK_ID,))
+    else:
+        cur.execute("SELECT RELEASE_LOCK(%s)", (LOCK_NAME,))
+    cur.fetchall()
+
+def migrate(target: int = None) -> list:
+    """Pending migrations (target पर्यंत) apply करतो; applied versions परत."""
+    target = LATEST if target is None else target
+    applied = []
+    conn = db.get_db_connection()
+    try:
+        cur = conn.cursor()
+        _lock(cur)
+        try:
+            _ensure_version_table(cur)
+            conn.commit()
+            version = _applied_version(cur)
+            for number, fn in MIGRATIONS:
+                if number <= version or number > target:
+                    continue
+                logger.info(f"Applying migration {number}: {fn.__name__}")
+                fn(cur)
+                cur.execute("INSERT INTO schema_migrations (version, name) VALUES (%s, %s)", (number, fn.__name__))
+                conn.commit()
+                applied.append(number)
+        finally:
+            _unlock(cur)
+    finally:
+        conn.close()
+    return applied
+
+def main():
+    logging.basicConfig(level=logging.INFO)
+    ap = argparse.ArgumentParser(description="Apply database schema migrations")
+    ap.add_argument("--status", action="store_true", help="current / latest version दाखवा")
+    ap.add_argument("--target", type=int, help="इथपर्यंतच migrate करा")
+    args = ap.parse_args()
+
+    if args.status:
+        version = current_version()
+        print(f"schema version {version} / {LATEST} ({db.DB_TYPE})")
+        return 0 if version >= LATEST else 1
+
+    applied = migrate(args.target)
+    print(f"Applied {applied}" if applied else "Schema already up to date")
+    print(f"schema version {current_version()} / {LATEST}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
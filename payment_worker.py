@@ -0,0 +1,170 @@
+# payment_worker.py (रूट फोल्डरमध्ये)
+# payment_events outbox मधले Razorpay credits batches मध्ये apply करतो + user ला Telegram message,
+# आणि pending wallet credits users.balance snapshot मध्ये settle करतो; admin stats rollups चा catch-up (seal);
+# expire झालेल्या payment links EXPIRED
+#
+#   python payment_worker.py
+import logging
+import queue
+import threading
+import time
+
+import requests
+
+from config import (
+    BOT_TOKEN,
+    TELEGRAM_BASE_URL,
+    PAYMENT_NOTIFY_RATE,
+    PAYMENT_NOTIFY_RETRIES,
+    WORKER_METRICS_PORT,
+    METRICS_HOST,
+    STATS_SEAL_INTERVAL
+)
+import db
+import telemetry
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 500
+SETTLE_BATCH = 5000  # pending ledger credits -> users.balance snapshot
+SEAL_BATCH = 48  # एका call मध्ये seal होणारे तास (पहिला backfill अनेक calls मध्ये)
+IDLE_SLEEP = 1.0
+EXPIRE_INTERVAL = 60.0
+
+CREDITED = telemetry.counter("payments_credited_total", "Razorpay payments credited to wallets")
+NOTICES = telemetry.counter("credit_notices_total", "Wallet credit Telegram notices", ("result",))
+SETTLED = telemetry.counter("wallet_credits_settled_total", "Pending ledger credits folded into balances")
+SEALED = telemetry.counter("stats_hours_sealed_total", "Admin stats hours recomputed from base tables")
+EXPIRED = telemetry.counter("payment_links_expired_total", "Unpaid payment links marked EXPIRED")
+
+_next_seal = 0.0
+_next_expire = 0.0
+
+class Notifier:
+    """
+    Credit notices off the crediting loop. run_once() only enqueues; one
+    thread sends at most `rate` messages/s. A 429 pauses sending for the
+    given retry_after and retries the same message; network errors / 5xx
+    retry with backoff up to `retries` times. Best effort: a queue still
+    pending when the process dies is lost (the credit itself is not).
+    """
+
+    def __init__(self, rate=PAYMENT_NOTIFY_RATE, retries=PAYMENT_NOTIFY_RETRIES):
+        self.interval = 1 / rate
+        self.retries = retries
+        self._queue = queue.Queue()
+        self._session = requests.Session()
+        self._thread = None
+
+    def send(self, user_id: int, amount: float):
+        self._queue.put((user_id, amount, 0))
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="credit-notices", daemon=True)
+            self._thread.start()
+
+    def __len__(self):
+        return self._queue.qsize()
+
+    def _run(self):
+        while True:
+            user_id, amount, attempt = self._queue.get()
+            wait = self._post(user_id, amount)
+            if wait is not None:
+                if attempt < self.retries:
+                    NOTICES.inc(result="retry")
+                    time.sleep(wait)
+                    self._queue.put((user_id, amount, attempt + 1))
+                else:
+                    NOTICES.inc(result="dropped")
+                    logger.warning(f"Credit notice to {user_id} dropped after {attempt + 1} attempts")
+            time.sleep(self.interval)
+
+    def _post(self, user_id, amount):
+        """None = झाले (किंवा retry करून उपयोग नाही – blocked / bad chat); नाहीतर retry आधी किती seconds."""
+        try:
+            r = self._session.post(
+                f"{TELEGRAM_BASE_URL}{BOT_TOKEN}/sendMessage",
+                data={"chat_id": user_id, "text": f"✅ ₹{amount:.2f} added to your wallet."},
+                timeout=10
+            )
+        except requests.RequestException as e:
+            logger.warning(f"Credit notice to {user_id} failed: {e}")
+            return 2.0
+        if r.status_code == 429:
+            try:
+                return float(r.json()["parameters"]["retry_after"])
+            except (ValueError, KeyError, TypeError):
+                return 5.0
+        if r.status_code >= 500:
+            return 2.0
+        if r.status_code != 200:
+            NOTICES.inc(result="failed")
+            logger.warning(f"Credit notice to {user_id} rejected: {r.status_code} {r.text[:200]}")
+            return None
+        NOTICES.inc(result="sent")
+        return None
+
+
+notifier = Notifier()
+
+def notify(user_id: int, amount: float):
+    notifier.send(user_id, amount)
+
+def run_once(limit: int = BATCH_SIZE) -> int:
+    credited = db.apply_payment_events(limit)
+    for user_id, amount, payment_id in credited:
+        logger.info(f"[Worker] Credited ₹{amount} to {user_id} ({payment_id})")
+        notify(user_id, amount)
+    CREDITED.inc(len(credited))
+    return len(credited)
+
+def settle_once(limit: int = SETTLE_BATCH) -> int:
+    # refunds / webhook credits फक्त ledger मध्ये जातात – इथे snapshot मध्ये batch fold
+    settled = db.settle_credits(limit)
+    SETTLED.inc(settled)
+    return settled
+
+def seal_once(limit: int = SEAL_BATCH) -> int:
+    # बंद झालेले तास base tables मधून अचूक; backlog असेल तर लगेच पुढचा batch
+    global _next_seal
+    if time.monotonic() < _next_seal:
+        return 0
+    sealed = db.seal_stats(max_hours=limit)
+    SEALED.inc(sealed)
+    if sealed < limit:
+        _next_seal = time.monotonic() + STATS_SEAL_INTERVAL
+    return sealed
+
+def expire_once() -> int:
+    global _next_expire
+    if time.monotonic() < _next_expire:
+        return 0
+    _next_expire = time.monotonic() + EXPIRE_INTERVAL
+    expired = db.expire_payment_links()
+    EXPIRED.inc(expired)
+    return expired
+
+def main():
+    print("💳 Payment worker running...")
+    notifier.start()
+    telemetry.gauge("credit_notices_pending", "Credit notices waiting to be sent").set_function(
+        lambda: len(notifier))
+    if WORKER_METRICS_PORT:
+        telemetry.serve(WORKER_METRICS_PORT, METRICS_HOST)
+    while True:
+        try:
+            busy = run_once() >= BATCH_SIZE
+            busy = settle_once() >= SETTLE_BATCH or busy
+            busy = seal_once() >= SEAL_BATCH or busy
+            expire_once()
+            if not busy:
+                time.sleep(IDLE_SLEEP)
+        except Exception:
+            logger.exception("Payment batch failed")
+            time.sleep(5)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+# reconcile.py (रूट फोल्डरमध्ये)
+# Wallet reconciliation: users.balance snapshot विरुद्ध ledger (transactions) sum – cron मधून
+#
+#   python reconcile.py              # फक्त report (mismatch असेल तर exit 1)
+#   python reconcile.py --fix        # ledger authoritative: snapshot दुरुस्त
+import argparse
+import logging
+import sys
+
+import db
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def main():
+    ap = argparse.ArgumentParser(description="Check wallet snapshots against the ledger")
+    ap.add_argument("--fix", action="store_true", help="mismatch असलेले snapshots ledger sum ने बदला")
+    ap.add_argument("--page", type=int, default=1000)
+    args = ap.parse_args()
+
+    # आधी pending credits fold करा – नाहीतर settled sum आणि snapshot दोन्ही मागे असतात
+    while db.settle_credits() > 0:
+        pass
+
+    checked = mismatched = 0
+    after = 0
+    while True:
+        mismatches, last, count = db.reconcile(after, args.page)
+        if last is None:
+            break
+        checked += count
+        for user_id, snapshot, ledger in mismatches:
+            mismatched += 1
+            logger.warning(f"User {user_id}: snapshot ₹{snapshot:.2f} != ledger ₹{ledger:.2f}")
+            if args.fix:
+                logger.info(f"User {user_id}: snapshot set to ₹{db.repair_snapshot(user_id):.2f}")
+        after = last
+
+    print(f"Reconciled {checked} users, {mismatched} mismatches{' fixed' if args.fix and mismatched else ''}")
+    return 1 if mismatched and not args.fix else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,37 @@
+# storage/ – bot, webhook, workers आणि migrations साठी एकच data-access layer
+#
+# DB_TYPE=mysql | postgres | sqlite (.env) नुसार dialect निवडतो; queries एकदाच
+# लिहिलेल्या आहेत. जुने `import db` (रूट db.py / bot/db.py) हेच re-export करतात.
+from .pool import (  # noqa: F401
+    DB_TYPE,
+    dialect,
+    get_pool,
+    get_db_connection,
+    health_check,
+    run,
+    PoolExhausted
+)
+from .wallet import (  # noqa: F401
+    DuplicateOperation,
+    get_user_balance,
+    credit,
+    credit_many,
+    debit,
+    update_balance,
+    settle_credits,
+    reconcile,
+    repair_snapshot
+)
+from .stats import (  # noqa: F401
+    stats_writes,
+    seal_stats,
+    get_admin_stats
+)
+from .queries import *  # noqa: F401,F403
+
+# Metrics: package मधून घेतलेले functions (db.get_services, ...) timed wrappers;
+# queries / wallet मधले आपापसातले calls मोजले जात नाहीत
+from . import queries as _queries, stats as _stats, wallet as _wallet  # noqa: E402
+from .instrument import instrument as _instrument  # noqa: E402
+
+_instrument(globals(), (_queries, _wallet, _stats))
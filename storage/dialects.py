@@ -0,0 +1,143 @@
+# storage/dialects.py
+# MySQL / PostgreSQL / SQLite मधले SQL फरक एकाच ठिकाणी
+from functools import lru_cache
+
+
+class Dialect:
+    """
+    SQL fragments that differ between backends.
+
+    Queries are written once with %s placeholders and these fragments;
+    statement() renders the final text for the backend and caches it, so
+    each distinct statement is translated only once per process.
+    """
+
+    name = None
+    placeholder = "%s"
+    for_update = " FOR UPDATE"
+    skip_locked = " FOR UPDATE SKIP LOCKED"
+    greatest = "GREATEST"
+    returning_id = False  # INSERT ... RETURNING id (lastrowid नसेल तर)
+
+    def statement(self, sql):
+        return sql
+
+    def insert_ignore(self, key):
+        """INSERT ... <हे> – key आधीच असेल तर काहीच नाही, rowcount 0."""
+        return f"ON CONFLICT ({key}) DO NOTHING"
+
+    def add_seconds(self, expr):
+        """CURRENT_TIMESTAMP + expr seconds"""
+        raise NotImplementedError
+
+    def days_ago(self, expr):
+        """CURRENT_TIMESTAMP - expr days"""
+        raise NotImplementedError
+
+    def seconds_between(self, start, end):
+        raise NotImplementedError
+
+    def unix_ts(self, col):
+        """Epoch seconds, floor – keyset cursors मध्ये from_unix() ने परत जातात"""
+        raise NotImplementedError
+
+    def whole_seconds(self, col):
+        """col पूर्ण second पर्यंत truncate – keyset order / cursor याच key वर (unix_ts शी जुळतो)"""
+        return col
+
+    def from_unix(self, expr):
+        raise NotImplementedError
+
+
+class MySQL(Dialect):
+    name = "mysql"
+
+    def insert_ignore(self, key):
+        # INSERT IGNORE / VALUES() warnings देतात (raise_on_warnings) – no-op update वापरा
+        # (composite key असेल तर पहिला column पुरेसा)
+        col = key.split(",")[0].strip()
+        return f"ON DUPLICATE KEY UPDATE {col} = {col}"
+
+    def add_seconds(self, expr):
+        return f"CURRENT_TIMESTAMP + INTERVAL {expr} SECOND"
+
+    def days_ago(self, expr):
+        return f"CURRENT_TIMESTAMP - INTERVAL {expr} DAY"
+
+    def seconds_between(self, start, end):
+        return f"TIMESTAMPDIFF(SECOND, {start}, {end})"
+
+    def unix_ts(self, col):
+        return f"UNIX_TIMESTAMP({col})"
+
+    def from_unix(self, expr):
+        return f"FROM_UNIXTIME({expr})"
+
+
+class Postgres(Dialect):
+    name = "postgres"
+    returning_id = True
+
+    def add_seconds(self, expr):
+        return f"CURRENT_TIMESTAMP + {expr} * INTERVAL '1 second'"
+
+    def days_ago(self, expr):
+        return f"CURRENT_TIMESTAMP - {expr} * INTERVAL '1 day'"
+
+    def seconds_between(self, start, end):
+        return f"CAST(EXTRACT(EPOCH FROM ({end} - {start})) AS INTEGER)"
+
+    def unix_ts(self, col):
+        # TIMESTAMP (tz शिवाय) चा epoch nominal UTC म्हणून – from_unix त्याचाच उलटा.
+        # Microseconds असतात: CAST round करतो, FLOOR हवा (whole_seconds शी जुळायला)
+        return f"CAST(FLOOR(EXTRACT(EPOCH FROM {col})) AS BIGINT)"
+
+    def whole_seconds(self, col):
+        return f"date_trunc('second', {col})"
+
+    def from_unix(self, expr):
+        return f"(TO_TIMESTAMP({expr}) AT TIME ZONE 'UTC')"
+
+
+class SQLite(Dialect):
+    """Local / benchmark stand-in – एकच writer, row locks नाहीत."""
+
+    name = "sqlite"
+    placeholder = "?"
+    for_update = ""
+    skip_locked = ""
+    greatest = "MAX"
+
+    @lru_cache(maxsize=1024)
+    def statement(self, sql):
+        return sql.replace("%s", "?")
+
+    def add_seconds(self, expr):
+        return f"datetime('now', '+' || {expr} || ' seconds')"
+
+    def days_ago(self, expr):
+        return f"datetime('now', '-' || {expr} || ' days')"
+
+    # strftime('%s') नको – statement() %s placeholders बदलते
+    def seconds_between(self, start, end):
+        return f"CAST(ROUND((julianday({end}) - julianday({start})) * 86400) AS INTEGER)"
+
+    def unix_ts(self, col):
+        # ROUND(.., 3) फक्त julianday चा float noise काढतो; CAST fraction truncate करतो (floor)
+        return f"CAST(ROUND((julianday({col}) - 2440587.5) * 86400, 3) AS INTEGER)"
+
+    def whole_seconds(self, col):
+        return f"datetime({col})"
+
+    def from_unix(self, expr):
+        return f"datetime({expr}, 'unixepoch')"
+
+
+DIALECTS = {d.name: d for d in (MySQL, Postgres, SQLite)}
+
+
+def get_dialect(name):
+    try:
+        return DIALECTS[name]()
+    except KeyError:
+        raise ValueError(f"Unsupported DB_TYPE {name!r} (expected one of {', '.join(DIALECTS)})")
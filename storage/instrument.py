@@ -0,0 +1,39 @@
+# storage/instrument.py
+# प्रत्येक public DB function चा latency / errors – db.run() आणि direct calls दोन्ही मोजले जातात
+import functools
+import inspect
+import time
+
+import telemetry
+
+from . import pool
+
+DB_SECONDS = telemetry.histogram("db_query_seconds", "Latency of storage functions", ("function",))
+DB_ERRORS = telemetry.counter("db_errors_total", "Storage functions that raised", ("function",))
+telemetry.gauge(
+    "db_executor_backlog", "DB calls waiting for a db.run() executor thread"
+).set_function(pool.executor_backlog)
+
+
+def timed(name, fn):
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        except Exception:
+            DB_ERRORS.inc(function=name)
+            raise
+        finally:
+            DB_SECONDS.observe(time.perf_counter() - started, function=name)
+    return wrapper
+
+
+def instrument(namespace, modules):
+    """namespace मधले modules चे public functions timed wrappers ने बदलतो."""
+    for module in modules:
+        for name, fn in vars(module).items():
+            if name.startswith("_") or not inspect.isfunction(fn) or fn.__module__ != module.__name__:
+                continue
+            if namespace.get(name) is fn:
+                namespace[name] = timed(name, fn)
@@ -0,0 +1,275 @@
+# storage/pool.py
+# Connection pool + async bridge – तीनही backends साठी एकच API
+import asyncio
+import functools
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from dotenv import load_dotenv
+
+from .dialects import get_dialect
+
+load_dotenv()  # .env फाईल लोड करतो (लोकल टेस्टिंगसाठी)
+
+logger = logging.getLogger(__name__)
+
+# ================= DATABASE CONFIG =================
+DB_TYPE = os.getenv("DB_TYPE", "mysql")  # Render वर "postgres", लोकल "mysql", benchmark साठी "sqlite"
+
+DB_HOST = os.getenv("DB_HOST", "localhost")
+DB_PORT = os.getenv("DB_PORT", "5432" if DB_TYPE == "postgres" else "3306")
+DB_NAME = os.getenv("DB_NAME", "db_24hoursotp")
+DB_USER = os.getenv("DB_USER", "root")
+DB_PASSWORD = os.getenv("DB_PASSWORD", "")
+DB_PATH = os.getenv("DB_PATH", f"{DB_NAME}.sqlite3")  # फक्त sqlite
+
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "5"))
+
+dialect = get_dialect(DB_TYPE)
+
+# ================= CONNECTION / CURSOR =================
+class Cursor:
+    """
+    Driver cursor wrapper: dialect नुसार cached statement text आणि सगळ्या
+    backends साठी एकच row mapping (dictionary=True -> dict, नाहीतर tuple).
+    """
+
+    __slots__ = ("_cur", "_dictionary", "connection")
+
+    def __init__(self, cur, dictionary=False, connection=None):
+        self._cur = cur
+        self._dictionary = dictionary
+        self.connection = connection  # Connection – after_commit() साठी
+
+    def execute(self, sql, params=()):
+        self._cur.execute(dialect.statement(sql), params)
+
+    def executemany(self, sql, seq):
+        self._cur.executemany(dialect.statement(sql), seq)
+
+    def insert(self, sql, params=()) -> int:
+        """INSERT चालवून नवीन id परत देतो (Postgres: RETURNING id)."""
+        if dialect.returning_id:
+            self._cur.execute(dialect.statement(sql + " RETURNING id"), params)
+            return self._cur.fetchone()[0]
+        self._cur.execute(dialect.statement(sql), params)
+        return self._cur.lastrowid
+
+    def _columns(self):
+        return [d[0] for d in self._cur.description]
+
+    def fetchone(self):
+        row = self._cur.fetchone()
+        if row is None or not self._dictionary:
+            return None if row is None else tuple(row)
+        return dict(zip(self._columns(), row))
+
+    def fetchall(self):
+        rows = self._cur.fetchall()
+        if not self._dictionary:
+            return [tuple(r) for r in rows]
+        cols = self._columns()
+        return [dict(zip(cols, r)) for r in rows]
+
+    @property
+    def rowcount(self):
+        return self._cur.rowcount
+
+    @property
+    def lastrowid(self):
+        return self._cur.lastrowid
+
+
+class Connection:
+    """Pooled connection; close() connection pool मध्ये परत देतो."""
+
+    __slots__ = ("_conn", "_release", "_after_commit")
+
+    def __init__(self, conn, release):
+        self._conn = conn
+        self._release = release
+        self._after_commit = []
+
+    def cursor(self, dictionary=False):
+        return Cursor(self._conn.cursor(), dictionary, self)
+
+    def after_commit(self, fn):
+        """fn() हा transaction commit झाल्यावरच चालतो; rollback / close वर टाकला जातो."""
+        self._after_commit.append(fn)
+
+    def commit(self):
+        self._conn.commit()
+        if self._after_commit:
+            callbacks, self._after_commit = self._after_commit, []
+            for fn in callbacks:
+                fn()
+
+    def rollback(self):
+        self._after_commit = []
+        self._conn.rollback()
+
+    def close(self):
+        self._after_commit = []
+        if self._conn is None:
+            return
+        conn, self._conn = self._conn, None
+        self._release(conn)
+
+
+# ================= POOLS =================
+class PoolExhausted(Exception):
+    pass
+
+
+class _MySQLPool:
+    def __init__(self):
+        from mysql.connector import pooling
+        self._errors = (pooling.PoolError,)
+        self._pool = pooling.MySQLConnectionPool(
+            pool_name="otp_db",
+            pool_size=DB_POOL_SIZE,
+            pool_reset_session=True,
+            host=DB_HOST,
+            port=int(DB_PORT),
+            user=DB_USER,
+            password=DB_PASSWORD,
+            database=DB_NAME,
+            raise_on_warnings=True
+        )
+
+    def acquire(self):
+        # MySQL pool borrow वेळी स्वतः ping + reconnect करतो
+        try:
+            return self._pool.get_connection()
+        except self._errors:
+            raise PoolExhausted()
+
+    def release(self, conn):
+        conn.close()  # PooledMySQLConnection – pool मध्ये परत (rollback सकट)
+
+
+class _PostgresPool:
+    def __init__(self):
+        from psycopg2.pool import ThreadedConnectionPool, PoolError
+        self._errors = (PoolError,)
+        self._pool = ThreadedConnectionPool(
+            1, DB_POOL_SIZE,
+            host=DB_HOST,
+            port=DB_PORT,
+            database=DB_NAME,
+            user=DB_USER,
+            password=DB_PASSWORD
+        )
+
+    def acquire(self):
+        try:
+            conn = self._pool.getconn()
+        except self._errors:
+            raise PoolExhausted()
+        if conn.closed:  # server ने बंद केलेले connection टाकून नवीन घ्या
+            self._pool.putconn(conn, close=True)
+            conn = self._pool.getconn()
+        return conn
+
+    def release(self, conn):
+        if not conn.closed:
+            conn.rollback()  # uncommitted काहीही pool मध्ये जाऊ नये
+        self._pool.putconn(conn, close=bool(conn.closed))
+
+
+class _SQLitePool:
+    def __init__(self):
+        import sqlite3
+        self._sqlite3 = sqlite3
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._opened = 0
+
+    def _open(self):
+        conn = self._sqlite3.connect(DB_PATH, timeout=DB_POOL_TIMEOUT, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA foreign_keys=ON")
+        return conn
+
+    def acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._opened < DB_POOL_SIZE:
+                self._opened += 1
+                return self._open()
+        raise PoolExhausted()
+
+    def release(self, conn):
+        conn.rollback()
+        self._idle.put(conn)
+
+
+_POOLS = {"mysql": _MySQLPool, "postgres": _PostgresPool, "sqlite": _SQLitePool}
+
+_pool = None
+_pool_lock = threading.Lock()
+_executor = None
+
+def get_pool():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = _POOLS[dialect.name]()
+    return _pool
+
+def get_db_connection():
+    """Pool मधून connection देतो; conn.close() ते परत pool मध्ये टाकतो."""
+    pool = get_pool()
+    deadline = time.monotonic() + DB_POOL_TIMEOUT
+    while True:
+        try:
+            return Connection(pool.acquire(), pool.release)
+        except PoolExhausted:
+            # सर्व connections busy – थोडा वेळ थांबून परत प्रयत्न
+            if time.monotonic() >= deadline:
+                logger.error("Database pool exhausted")
+                raise
+            time.sleep(0.01)
+        except Exception as err:
+            logger.error(f"Database connection failed: {err}")
+            raise
+
+def health_check() -> bool:
+    try:
+        conn = get_db_connection()
+        try:
+            cur = conn.cursor()
+            cur.execute("SELECT 1")
+            cur.fetchall()
+            return True
+        finally:
+            conn.close()
+    except Exception as err:
+        logger.error(f"Database health check failed: {err}")
+        return False
+
+# ================= ASYNC API =================
+def _get_executor():
+    global _executor
+    if _executor is None:
+        # pool इतकेच threads – executor कधीच pool पेक्षा जास्त connections मागत नाही
+        _executor = ThreadPoolExecutor(max_workers=DB_POOL_SIZE, thread_name_prefix="db")
+    return _executor
+
+def executor_backlog() -> int:
+    """db.run() calls जे executor thread ची वाट पाहत आहेत."""
+    return _executor._work_queue.qsize() if _executor is not None else 0
+
+async def run(fn, *args, **kwargs):
+    """Blocking DB function event loop बाहेर चालवतो: await db.run(db.get_services)"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_executor(), functools.partial(fn, *args, **kwargs))
@@ -0,0 +1,865 @@
+# storage/queries.py
+# Bot, webhook आणि workers वापरतात ती सगळी DB functions (dialect-neutral SQL)
+import logging
+
+from .pool import dialect, get_db_connection
+from .wallet import (
+    APPLIED,
+    REPLAYED,
+    DuplicateOperation,
+    _credit,
+    _debit,
+    _PENDING_SUM
+)
+from .stats import record as _stat
+from .writebehind import WriteBehind
+
+logger = logging.getLogger(__name__)
+
+def _marks(n):
+    return ", ".join(["%s"] * n)
+
+# ================= USER FUNCTIONS =================
+def add_or_get_user(user_id: int, referred_by: int = None):
+    conn = get_db_connection()
+    try:
+        cur = conn.cursor()
+        cur.execute(
+            f"INSERT INTO users (user_id, referred_by) VALUES (%s, %s) {dialect.insert_ignore('user_id')}",
+            (user_id, referred_by)
+        )
+        if cur.rowcount == 1:
+            _stat(cur, new_users=1)
+        conn.commit()
+    finally:
+        conn.close()
+
+def upsert_user(user_id: int, referred_by: int = None) -> dict:
+    """
+    User तयार करतो (नसेल तर) आणि state परत देतो.
+    Postgres: एकच INSERT ... RETURNING. MySQL / SQLite: एकच upsert (rowcount 1 = नवीन user,
+    MySQL no-op ON DUPLICATE KEY UPDATE = 0) आणि state साठी SELECT – RETURNING नाही.
+    Pending credits दोन्हीकडे त्याच statement मध्ये (_PENDING_SUM subquery) – ledger साठी वेगळी query नाही.
+    User परत आला म्हणजे bot unblock केला – broadcast ने लावलेला bot_blocked इथेच FALSE.
+    """
+    if referred_by == user_id:
+        referred_by = None
+    conn = get_db_connection()
+    try:
+        cur = conn.cursor(dictionary=True)
+        if dialect.name == "postgres":
+            cur.execute(f"""
+                INSERT INTO users (user_id, referred_by) VALUES (%s, %s)
+                ON CONFLICT (user_id) DO UPDATE SET bot_blocked = FALSE
+                RETURNING user_id, balance + {_PENDING_SUM} AS balance, is_blocked, referred_by, (xmax = 0) AS inserted
+            """, (user_id, referred_by))
+            row = cur.fetchone()
+            if row["inserted"]:
+                _stat(cur, new_users=1)
+        else:
+            cur.execute(
+                f"INSERT INTO users (user_id, referred_by) VALUES (%s, %s) {dialect.insert_ignore('user_id')}",
+                (user_id, referred_by)
+            )
+            if cur.rowcount == 1:
+                _stat(cur, new_users=1)
+            cur.execute(f"SELECT user_id, balance + {_PENDING_SUM} AS balance, is_blocked, referred_by, bot_blocked "
+                        "FROM users WHERE user_id = %s", (user_id,))
+            row = cur.fetchone()
+            if row["bot_blocked"]:
+                cur.execute("UPDATE users SET bot_blocked = FALSE WHERE user_id = %s", (user_id,))
+        conn.commit()
+    finally:
+        conn.close()
+    return {
+        "user_id": row["user_id"],
+        "balance": float(row["balance"]),
+        "is_blocked": bool(row["is_blocked"]),
+        "referred_by": row["referred_by"]
+    }
+
+def is_user_blocked(user_id: int) -> bool:
+    conn = get_db_connection()
+    try:
+        cur = conn.cursor(dictionary=True)
+        cur.execute("SELECT is_blocked FROM users WHERE user_id = %s", (user_id,))
+        row = cur.fetchone()
+    finally:
+        conn.close()
+    return bool(row and row['is_blocked'])
+
+def set_user_block(user_id: int, block: bool):
+    conn = get_db_connection()
+    try:
+        cur = conn.cursor()
+        cur.execute("UPDATE users SET is_blocked = %s WHERE user_id = %s", (bool(block), user_id))
+        conn.commit()
+    finally:
+        conn.close()
+
+# ================= SERVICES & SERVERS =================
+def get_services():
+    conn = get_db_connection()
+    try:
+        cur = conn.cursor(dictionary=True)
+        cur.execute("SELECT id, service_name, provider_service_code, country_id FROM services WHERE is_active = TRUE")
+        rows = cur.fetchall()
+    finally:
+        conn.close()
+    return rows
+
+def get_service_by_id(service_id: int):
+    conn = get_db_connection()
+    try:
+        cur = conn.cursor(dictionary=True)
+        cur.execute("SELECT id, service_name, provider_service_code, country_id FROM services WHERE id = %s", (service_id,))
+        row = cur.fetchone()
+    finally:
+        conn.close()
+    return row
+
+def get_active_servers(service_id: int):
+    conn = get_db_connection()
+    try:
+        cur = conn.cursor(dictionary=True)
+        cur.execute("SELECT id, server_number, price FROM servers WHERE service_id = %s AND is_active = TRUE", (service_id,))
+        rows = cur.fetchall()
+    finally:
+        conn.close()
+    return rows
+
+def get_all_active_servers():
+    conn = get_db_connection()
+    try:
+        cur = conn.cursor(dictionary=True)
+        cur.execute("""
+            SELECT id, service_id, server_number, price, provider, provider_service_code, country_id
+            FROM servers WHERE is_active = TRUE
+        """)
+        rows = cur.fetchall()
+    finally:
+        conn.close()
+    return rows
+
+def get_all_servers_for_admin(service_id: int):
+    conn = get_db_connection()
+    try:
+        cur = conn.cursor(dictionary=True)
+        cur.execute("SELECT id, server_number, price, provider, is_active FROM servers WHERE service_id = %s", (service_id,))
+        rows = cur.fetchall()
+    finally:
+        conn.close()
+    return rows
+
+def get_catalog_version() -> int:
+    conn = get_db_connection()
+    try:
+        cur = conn.cursor()
+        cur.execute("SELECT version FROM catalog_version WHERE id = 1")
+        row = cur.fetchone()
+    finally:
+        conn.close()
+    return row[0] if row else 0
+
+def _bump_catalog_version(cur):
+    """Services / servers बदलणाऱ्या प्रत्येक write सोबत (त्याच transaction मध्ये) – सगळ्या processes चे
+    catalogs पुढच्या version check ला reload होतात. हाताने SQL बदलले तर हेच UPDATE चालवा."""
+    cur.execute("UPDATE catalog_version SET version = version + 1 WHERE id = 1")
+
+def toggle_server(server_id: int):
+    conn = get_db_connection()
+    try:
+        cur = conn.cursor()
+        cur.execute("UPDATE servers SET is_active = NOT is_active WHERE id = %s", (server_id,))
+        _bump_catalog_version(cur)
+        conn.commit()
+    finally:
+        conn.close()
+
+# ================= ORDERS =================
+# State machine:
+#   PENDING -> NUMBER_RECEIVED -> OTP_RECEIVED | TIMEOUT | CANCELLED
+#   PENDING -> FAILED | CANCELLED
+# प्रत्येक transition "WHERE status IN (allowed)" ने guard केलेला – restart /
+# दोन workers असले तरी एकच transition जिंकतो, refund दोनदा होत नाही.
+PENDING = "PENDING"
+NUMBER_RECEIVED = "NUMBER_RECEIVED"
+OTP_RECEIVED = "OTP_RECEIVED"
+TIMEOUT = "TIMEOUT"
+CANCELLED = "CANCELLED"
+FAILED = "FAILED"
+
+ORDER_TRANSITIONS = {
+    NUMBER_RECEIVED: (PENDING,),
+    OTP_RECEIVED: (NUMBER_RECEIVED,),
+    TIMEOUT: (NUMBER_RECEIVED,),
+    CANCELLED: (PENDING, NUMBER_RECEIVED),
+    FAILED: (PENDING,),
+}
+ACTIVE_ORDER_STATES = (PENDING, NUMBER_RECEIVED)
+
+def create_order(user_id: int, service_id: int, server_id: int, price: float = 0,
+                 phone: str = None, activation_id: str = None):
+    """Provider call आधी PENDING order – crash झाला तरी debit चा record राहतो."""
+    conn = get_db_connection()
+    try:
+        cur = conn.cursor()
+        order_id = cur.insert("""
+            INSERT INTO orders (user_id, service_id, server_id, price, phone_number, activation_id, status)
+            VALUES (%s, %s, %s, %s, %s, %s, 'PENDING')
+        """, (user_id, service_id, server_id, price, phone, activation_id))
+        _stat(cur, service_id, server_id, orders=1, revenue=price)
+        conn.commit()
+    finally:
+        conn.close()
+    return order_id
+
+def place_order(user_id: int, service_id: int, server_id: int, price: float, op_key: str = None):
+    """
+    Ledger debit + PENDING order एकाच transaction मध्ये.
+    Balance कमी असेल तर None. Crash कुठेही झाला तरी पैसे order शिवाय कापले जात नाहीत.
+    op_key आधीच वापरली असेल (double tap / retry) तर DuplicateOperation.
+    """
+    conn = get_db_connection()
+    try:
+        cur = conn.cursor()
+        result = _debit(cur, user_id, price, "Number Purchase", op_key)
+        if result != APPLIED:
+            conn.rollback()
+            if result == REPLAYED:
+                raise DuplicateOperation(op_key)
+            return None
+        order_id = cur.insert("""
+            INSERT INTO orders (user_id, service_id, server_id, price, status)
+            VALUES (%s, %s, %s, %s, 'PENDING')
+        """, (user_id, service_id, server_id, price))
+        _stat(cur, service_id, server_id, orders=1, revenue=price)
+        conn.commit()
+        return order_id
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+def _transition(cur, order_id, status, **fields):
+    allowed = ORDER_TRANSITIONS[status]
+    sets = ", ".join(["status = %s"] + [f"{k} = %s" for k in fields])
+    cur.execute(
+        f"UPDATE orders SET {sets} WHERE id = %s AND status IN ({_marks(len(allowed))})",
+        (status, *fields.values(), order_id, *allowed)
+    )
+    return cur.rowcount > 0
+
+def transition_order(order_id: int, status: str, **fields) -> bool:
+    """Guarded transition; order आधीच पुढे गेला असेल तर False."""
+    conn = get_db_connection()
+    try:
+        ok = _transition(conn.cursor(), order_id, status, **fields)
+        conn.commit()
+    finally:
+        conn.close()
+    return ok
+
+def record_otp(order_id: int, otp: str, otp_seconds: int) -> bool:
+    """OTP_RECEIVED transition + otp_logs feed row एकाच transaction मध्ये."""
+    conn = get_db_connection()
+    try:
+        cur = conn.cursor()
+        ok = _transition(cur, order_id, OTP_RECEIVED, otp=otp, otp_seconds=otp_seconds)
+        if ok:
+            cur.execute("""
+                INSERT INTO otp_logs (order_id, user_id, service_name, phone_number, otp)
+                SELECT o.id, o.user_id, s.service_name, o.phone_number, o.otp
+                FROM orders o JOIN services s ON s.id = o.service_id
+                WHERE o.id = %s
+            """, (order_id,))
+            _stat_otps(cur, [order_id])
+        conn.commit()
+    finally:
+        conn.close()
+    return ok
+
+def mark_number_received(order_id: int, activation_id: str, phone: str, timeout_seconds: int,
+                         provider: str, server_id: int) -> bool:
+    """provider / server_id = router ने प्रत्यक्ष वापरलेला route (failover नंतर वेगळा असू शकतो)."""
+    conn = get_db_connection()
+    try:
+        cur = conn.cursor()
+        ok = _transition(cur, order_id, NUMBER_RECEIVED, activation_id=activation_id, phone_number=phone,
+                         provider=provider, server_id=server_id)
+        if ok:
+            cur.execute(
+                f"UPDATE orders SET deadline_at = {dialect.add_seconds('%s')} WHERE id = %s",
+                (int(timeout_seconds), order_id)
+            )
+        conn.commit()
+    finally:
+        conn.close()
+    return ok
+
+def refund_order(order_id: int, status: str, description: str) -> bool:
+    """
+    Terminal transition + order.price ledger credit एकाच transaction मध्ये.
+    Transition आधीच झाला असेल तर refund नाही (False). त्या order चे buffered
+    writes (OTP_RECEIVED) याच transaction मध्ये आधी लिहिले जातात,
+    म्हणजे guard ला खरी status दिसते.
+    """
+    with order_writes.claim(order_id) as ops:
+        conn = get_db_connection()
+        try:
+            cur = conn.cursor()
+            if ops:
+                _apply_order_ops(cur, ops)
+            cur.execute(
+                f"SELECT user_id, price, service_id, server_id FROM orders WHERE id = %s{dialect.for_update}",
+                (order_id,)
+            )
+            row = cur.fetchone()
+            if not row or not _transition(cur, order_id, status):
+                conn.commit()  # claimed ops तरी commit – refund नाही
+                return False
+            user_id, price, service_id, server_id = row
+            if price > 0:
+                # ledger credit – user row lock नाही; op_key मुळे दुसरा refund अशक्य
+                if _credit(cur, user_id, price, description, f"refund:{order_id}"):
+                    _stat(cur, service_id, server_id, refunds=1, refunded=price)
+            conn.commit()
+            return True
+        finally:
+            conn.close()
+
+# ================= ORDER WRITE-BEHIND =================
+# OTP_RECEIVED transitions (+ otp_logs row) hot path वर commit करत नाहीत:
+# order_writes मध्ये जमा होऊन एका transaction मध्ये multi-row UPDATE / INSERT होतात.
+# Debit / refund synchronous राहतात; refund_order त्या order चे buffered writes स्वतःच्या transaction मध्ये लिहितो.
+# NUMBER_RECEIVED (activation_id) synchronous – crash नंतर recover() ला live number दिसला पाहिजे,
+# नाहीतर PENDING order "Interrupted" म्हणून refund होतो आणि provider कडचा number तसाच राहतो.
+_STATUS_RANK = {s: i for i, s in enumerate((PENDING, NUMBER_RECEIVED, OTP_RECEIVED, TIMEOUT, CANCELLED, FAILED))}
+_BATCH_CHUNK = 500  # एका statement मधले orders
+
+def _transition_many(cur, status, names, rows):
+    """rows = [(order_id, fields)] – सगळ्यांचे fields सारखे; per-row values CASE id WHEN ... मधून."""
+    allowed = ORDER_TRANSITIONS[status]
+    sets, params = ["status = %s"], [status]
+    for name in names:
+        sets.append(f"{name} = CASE id " + " ".join(["WHEN %s THEN %s"] * len(rows)) + " END")
+        for order_id, fields in rows:
+            params += [order_id, fields[name]]
+    ids = [order_id for order_id, _ in rows]
+    cur.execute(
+        f"UPDATE orders SET {', '.join(sets)} WHERE id IN ({_marks(len(ids))}) AND status IN ({_marks(len(allowed))})",
+        params + ids + list(allowed)
+    )
+
+def _apply_order_ops(cur, ops):
+    """ops = [(order_id, status, fields), ...] – status क्रमाने गट."""
+    groups = {}
+    for order_id, status, fields in ops:
+        groups.setdefault((status, tuple(fields)), {}).setdefault(order_id, fields)
+    otp_ids = sorted({order_id for order_id, status, _ in ops if status == OTP_RECEIVED})
+
+    for (status, names), rows in sorted(groups.items(), key=lambda g: _STATUS_RANK[g[0][0]]):
+        rows = list(rows.items())
+        for i in range(0, len(rows), _BATCH_CHUNK):
+            _transition_many(cur, status, names, rows[i:i + _BATCH_CHUNK])
+    for i in range(0, len(otp_ids), _BATCH_CHUNK):
+        chunk = otp_ids[i:i + _BATCH_CHUNK]
+        cur.execute(f"""
+            INSERT INTO otp_logs (order_id, user_id, service_name, phone_number, otp)
+            SELECT o.id, o.user_id, s.service_name, o.phone_number, o.otp
+            FROM orders o JOIN services s ON s.id = o.service_id
+            WHERE o.id IN ({_marks(len(chunk))}) AND o.status = 'OTP_RECEIVED'
+            ORDER BY o.id
+            {dialect.insert_ignore('order_id')}
+        """, chunk)
+        _stat_otps(cur, chunk)
+
+def _stat_otps(cur, order_ids):
+    """OTP_RECEIVED झालेले orders – (service, server) नुसार stats deltas."""
+    cur.execute(f"""
+        SELECT service_id, server_id, COUNT(*) FROM orders
+        WHERE id IN ({_marks(len(order_ids))}) AND status = 'OTP_RECEIVED'
+        GROUP BY service_id, server_id
+    """, order_ids)
+    for service_id, server_id, otps in cur.fetchall():
+        _stat(cur, service_id, server_id, otps=otps)
+
+def apply_order_writes(ops):
+    """order_writes चा flush – सगळे ops एकाच transaction मध्ये."""
+    conn = get_db_connection()
+    try:
+        _apply_order_ops(conn.cursor(), ops)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+order_writes = WriteBehind("orders", apply_order_writes)
+
+def queue_otp(order_id: int, otp: str, otp_seconds: int):
+    """record_otp ची write-behind आवृत्ती (OTP_RECEIVED + otp_logs feed row)."""
+    order_writes.add(order_id, (order_id, OTP_RECEIVED, {"otp": otp, "otp_seconds": otp_seconds}))
+
+def get_active_orders():
+    """Restart recovery: सर्व non-terminal orders, idx_status_deadline वरून एकच query."""
+    conn = get_db_connection()
+    try:
+        cur = conn.cursor(dictionary=True)
+        cur.execute(f"""
+            SELECT o.id, o.user_id, o.server_id, o.provider, o.activation_id, o.price, o.status,
+                   s.service_name, COALESCE(r.provider_service_code, s.provider_service_code) AS provider_service_code,
+                   {dialect.seconds_between('o.created_at', 'CURRENT_TIMESTAMP')} AS elapsed,
+                   {dialect.seconds_between('CURRENT_TIMESTAMP', 'o.deadline_at')} AS remaining
+            FROM orders o
+            JOIN services s ON s.id = o.service_id
+            LEFT JOIN servers r ON r.id = o.server_id
+            WHERE o.status IN ('PENDING', 'NUMBER_RECEIVED')
+        """)
+        rows = cur.fetchall()
+    finally:
+        conn.close()
+    return rows
+
+def update_order_status(order_id: int, status: str, otp: str = None, otp_seconds: int = None):
+    conn = get_db_connection()
+    try:
+        cur = conn.cursor()
+        if otp:
+            cur.execute(
+                "UPDATE orders SET status = %s, otp = %s, otp_seconds = %s WHERE id = %s",
+                (status, otp, otp_seconds, order_id)
+            )
+        else:
+            cur.execute("UPDATE orders SET status = %s WHERE id = %s", (status, order_id))
+        conn.commit()
+    finally:
+        conn.close()
+
+def get_otp_arrival_samples(days: int = 7, limit: int = 20000):
+    """[(provider_service_code, server_id, otp_seconds), ...] – जुने आधी."""
+    conn = get_db_connection()
+    try:
+        cur = conn.cursor()
+        cur.execute(f"""
+            SELECT s.provider_service_code, o.server_id, o.otp_seconds
+            FROM orders o JOIN services s ON s.id = o.service_id
+            WHERE o.status = 'OTP_RECEIVED' AND o.otp_seconds IS NOT NULL
+              AND o.created_at > {dialect.days_ago('%s')}
+            ORDER BY o.id DESC
+            LIMIT %s
+        """, (days, limit))
+        rows = cur.fetchall()
+    finally:
+        conn.close()
+    rows.reverse()
+    return rows
+
+# ================= HISTORY =================
+# Keyset pagination (created_at second, id) DESC – idx_user_created / idx_user_second
+# वरून फक्त page एवढ्या ids वाचतो (covering), मग त्या rows PK ने. OFFSET / full sort नाही.
+# Cursor ts पूर्ण seconds मध्ये आहे, म्हणून order आणि तुलना सुद्धा whole_seconds(created_at) वर –
+# Postgres च्या microseconds मुळे एकाच second मधले rows repeat / skip होत नाहीत.
+def _history_ids(cur, table, user_id, before_ts, before_id, limit):
+    second = dialect.whole_seconds("created_at")
+    if before_ts is None:
+        cur.execute(f"""
+            SELECT id FROM {table} WHERE user_id = %s
+            ORDER BY {second} DESC, id DESC LIMIT %s
+        """, (user_id, limit))
+    else:
+        cursor_ts = dialect.from_unix("%s")
+        cur.execute(f"""
+            SELECT id FROM {table}
+            WHERE user_id = %s
+              AND ({second} < {cursor_ts} OR ({second} = {cursor_ts} AND id < %s))
+            ORDER BY {second} DESC, id DESC LIMIT %s
+        """, (user_id, before_ts, before_ts, before_id, limit))
+    return [r["id"] for r in cur.fetchall()]
+
+def get_order_history(user_id: int, before_ts: int = None, before_id: int = None, limit: int = 10):
+    order_writes.flush_if()  # नुकतेच आलेले number / OTP history मध्ये दिसावेत
+    conn = get_db_connection()
+    try:
+        cur = conn.cursor(dictionary=True)
+        ids = _history_ids(cur, "orders", user_id, before_ts, before_id, limit)
+        if not ids:
+            return []
+        cur.execute(f"""
+            SELECT o.id, {dialect.unix_ts('o.created_at')} AS ts, o.status, o.price, o.otp,
+                   o.phone_number, s.service_name
+            FROM orders o JOIN services s ON s.id = o.service_id
+            WHERE o.id IN ({_marks(len(ids))})
+            ORDER BY {dialect.whole_seconds('o.created_at')} DESC, o.id DESC
+        """, ids)
+        rows = cur.fetchall()
+    finally:
+        conn.close()
+    return rows
+
+def get_transaction_history(user_id: int, before_ts: int = None, before_id: int = None, limit: int = 10):
+    conn = get_db_connection()
+    try:
+        cur = conn.cursor(dictionary=True)
+        ids = _history_ids(cur, "transactions", user_id, before_ts, before_id, limit)
+        if not ids:
+            return []
+        cur.execute(f"""
+            SELECT id, {dialect.unix_ts('created_at')} AS ts, amount, type, description
+            FROM transactions WHERE id IN ({_marks(len(ids))})
+            ORDER BY {dialect.whole_seconds('created_at')} DESC, id DESC
+        """, ids)
+        rows = cur.fetchall()
+    finally:
+        conn.close()
+    return rows
+
+# ================= OTP FEED =================
+# otp_logs append-only आहे: (created_at, id) DESC keyset pages (idx_created), आणि
+# live tail साठी id > X (PK range). Explicit columns – user_id API मध्ये जात नाही.
+def _feed_columns():
+    return f"id, order_id, service_name, phone_number, otp, created_at, {dialect.unix_ts('created_at')} AS ts"
+
+def get_otp_feed(before_ts: int = None, before_id: int = None, limit: int = 50):
+    second = dialect.whole_seconds("created_at")  # _history_ids सारखे – cursor ts पूर्ण seconds
+    conn = get_db_connection()
+    try:
+        cur = conn.cursor(dictionary=True)
+        if before_ts is None:
+            cur.execute(f"""
+                SELECT {_feed_columns()} FROM otp_logs
+                ORDER BY {second} DESC, id DESC LIMIT %s
+            """, (limit,))
+        else:
+            cursor_ts = dialect.from_unix("%s")
+            cur.execute(f"""
+                SELECT {_feed_columns()} FROM otp_logs
+                WHERE {second} < {cursor_ts} OR ({second} = {cursor_ts} AND id < %s)
+                ORDER BY {second} DESC, id DESC LIMIT %s
+            """, (before_ts, before_ts, before_id, limit))
+        rows = cur.fetchall()
+    finally:
+        conn.close()
+    return rows
+
+def get_otp_feed_since(after_id: int, limit: int = 500):
+    """id > after_id, जुने आधी – live tail / SSE."""
+    conn = get_db_connection()
+    try:
+        cur = conn.cursor(dictionary=True)
+        cur.execute(f"SELECT {_feed_columns()} FROM otp_logs WHERE id > %s ORDER BY id LIMIT %s", (after_id, limit))
+        rows = cur.fetchall()
+    finally:
+        conn.close()
+    return rows
+
+# ================= WALLET REQUESTS =================
+def create_recharge_request(user_id: int, amount: float, screenshot_url: str = None):
+    conn = get_db_connection()
+    try:
+        cur = conn.cursor()
+        req_id = cur.insert("""
+            INSERT INTO wallet_requests (user_id, amount, screenshot_url)
+            VALUES (%s, %s, %s)
+        """, (user_id, amount, screenshot_url))
+        conn.commit()
+    finally:
+        conn.close()
+    return req_id
+
+def get_open_payment_link(user_id: int, amount: float, valid_until: int):
+    """त्याच user + amount ची PENDING link जी valid_until (unix) नंतरही चालू राहील."""
+    conn = get_db_connection()
+    try:
+        cur = conn.cursor(dictionary=True)
+        cur.execute(f"""
+            SELECT id, link_id, link_url, {dialect.unix_ts('expires_at')} AS expires_at
+            FROM wallet_requests
+            WHERE user_id = %s AND status = 'PENDING' AND amount = %s
+              AND link_id IS NOT NULL AND expires_at > {dialect.from_unix('%s')}
+            ORDER BY id DESC LIMIT 1
+        """, (user_id, amount, valid_until))
+        row = cur.fetchone()
+    finally:
+        conn.close()
+    return row
+
+def create_payment_link_request(user_id: int, amount: float, expires_at: int) -> int:
+    """Link तयार करण्याआधीची PENDING row – तिचा id link च्या reference_id / notes मध्ये जातो."""
+    conn = get_db_connection()
+    try:
+        cur = conn.cursor()
+        req_id = cur.insert(f"""
+            INSERT INTO wallet_requests (user_id, amount, expires_at)
+            VALUES (%s, %s, {dialect.from_unix('%s')})
+        """, (user_id, amount, expires_at))
+        conn.commit()
+    finally:
+        conn.close()
+    return req_id
+
+def attach_payment_link(req_id: int, link_id: str, link_url: str, expires_at: int):
+    conn = get_db_connection()
+    try:
+        cur = conn.cursor()
+        cur.execute(f"""
+            UPDATE wallet_requests SET link_id = %s, link_url = %s, expires_at = {dialect.from_unix('%s')},
+                   updated_at = CURRENT_TIMESTAMP
+            WHERE id = %s
+        """, (link_id, link_url, expires_at, req_id))
+        conn.commit()
+    finally:
+        conn.close()
+
+def reject_payment_link_request(req_id: int):
+    """Gateway ने link दिलीच नाही – row बंद (open link lookup / expiry sweep मध्ये नको)."""
+    conn = get_db_connection()
+    try:
+        cur = conn.cursor()
+        cur.execute(
+            "UPDATE wallet_requests SET status = 'REJECTED', updated_at = CURRENT_TIMESTAMP WHERE id = %s AND status = 'PENDING'",
+            (req_id,)
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+def expire_payment_links() -> int:
+    """expires_at गेलेल्या PENDING links EXPIRED – reuse / जुन्या webhooks च्या matching मध्ये येत नाहीत."""
+    conn = get_db_connection()
+    try:
+        cur = conn.cursor()
+        cur.execute("""
+            UPDATE wallet_requests SET status = 'EXPIRED', updated_at = CURRENT_TIMESTAMP
+            WHERE status = 'PENDING' AND expires_at IS NOT NULL AND expires_at <= CURRENT_TIMESTAMP
+        """)
+        expired = cur.rowcount
+        conn.commit()
+    finally:
+        conn.close()
+    return expired
+
+def _close_payment_links(cur, applied):
+    """
+    Credit झालेल्या payments ची link APPROVED (पुन्हा reuse नको). Link notes मधला
+    wallet_request_id असेल तर नेमकी तीच row (expire झाल्यावर आलेला late capture सुद्धा);
+    तो नसलेले (जुन्या links चे) payments त्याच user + amount च्या unexpired PENDING link वर.
+    """
+    exact = [(pid, req_id, uid) for pid, uid, _, req_id in applied if req_id]
+    if exact:
+        cur.executemany("""
+            UPDATE wallet_requests SET status = 'APPROVED', payment_id = %s, updated_at = CURRENT_TIMESTAMP
+            WHERE id = %s AND user_id = %s AND status IN ('PENDING', 'EXPIRED')
+        """, exact)
+    legacy = [(pid, uid, amount) for pid, uid, amount, req_id in applied if not req_id]
+    if not legacy:
+        return
+    user_ids = sorted({uid for _, uid, _ in legacy})
+    cur.execute(f"""
+        SELECT id, user_id, amount FROM wallet_requests
+        WHERE user_id IN ({_marks(len(user_ids))}) AND status = 'PENDING' AND link_id IS NOT NULL
+          AND expires_at > CURRENT_TIMESTAMP
+        ORDER BY id
+    """, user_ids)
+    open_links = cur.fetchall()
+    closed = []
+    for pid, uid, amount in legacy:
+        for row in open_links:
+            if row[1] == uid and float(row[2]) == float(amount):
+                open_links.remove(row)
+                closed.append((pid, row[0]))
+                break
+    if closed:
+        cur.executemany(
+            "UPDATE wallet_requests SET status = 'APPROVED', payment_id = %s, updated_at = CURRENT_TIMESTAMP WHERE id = %s",
+            closed
+        )
+
+# ================= PAYMENT EVENTS =================
+def record_payment_event(payment_id: str, event: str, user_id: int, amount: float, payload: str,
+                         request_id: int = None) -> bool:
+    """
+    Verified webhook event outbox मध्ये टाकतो (request_id = payment link notes मधला
+    wallet_requests.id). Razorpay retry (same payment_id) असेल तर काहीच करत नाही आणि False परत देतो.
+    """
+    conn = get_db_connection()
+    try:
+        cur = conn.cursor()
+        cur.execute(f"""
+            INSERT INTO payment_events (payment_id, event, user_id, amount, payload, request_id)
+            VALUES (%s, %s, %s, %s, %s, %s)
+            {dialect.insert_ignore('payment_id')}
+        """, (payment_id, event, user_id, amount, payload, request_id))
+        inserted = cur.rowcount == 1
+        conn.commit()
+    finally:
+        conn.close()
+    return inserted
+
+def apply_payment_events(limit: int = 500):
+    """
+    PENDING events चा एक batch एकाच transaction मध्ये credit करतो.
+    SKIP LOCKED मुळे अनेक workers एकमेकांना block करत नाहीत.
+    Credit झालेले [(user_id, amount, payment_id), ...] परत देतो.
+    """
+    conn = get_db_connection()
+    try:
+        cur = conn.cursor()
+        cur.execute(f"""
+            SELECT payment_id, user_id, amount, request_id FROM payment_events
+            WHERE status = 'PENDING'
+            ORDER BY created_at
+            LIMIT %s{dialect.skip_locked}
+        """, (limit,))
+        events = cur.fetchall()
+        if not events:
+            conn.commit()
+            return []
+
+        user_ids = sorted({e[1] for e in events if e[1] > 0})
+        existing = set()
+        if user_ids:
+            cur.execute(f"SELECT user_id FROM users WHERE user_id IN ({_marks(len(user_ids))})", user_ids)
+            existing = {r[0] for r in cur.fetchall()}
+
+        applied = [e for e in events if e[1] in existing]
+        skipped = [e for e in events if e[1] not in existing]
+
+        # Ledger credits (payment_id = op_key) – users rows lock होत नाहीत;
+        # snapshot मध्ये settle_credits() / पुढचा debit fold करतो
+        if applied:
+            cur.executemany(f"""
+                INSERT INTO transactions (user_id, amount, type, description, settled, op_key)
+                VALUES (%s, %s, 'CREDIT', %s, FALSE, %s)
+                {dialect.insert_ignore('op_key')}
+            """, [(uid, amount, f"Razorpay Recharge {pid}", pid) for pid, uid, amount, _ in applied])
+            total = sum(float(amount) for _, _, amount, _ in applied)
+            _stat(cur, credits=total, recharges=total)
+
+            _close_payment_links(cur, applied)
+
+        for status, rows in (("APPLIED", applied), ("SKIPPED", skipped)):
+            if rows:
+                cur.execute(
+                    f"UPDATE payment_events SET status = %s, applied_at = CURRENT_TIMESTAMP WHERE payment_id IN ({_marks(len(rows))})",
+                    [status] + [r[0] for r in rows]
+                )
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+    for pid, uid, _, _ in skipped:
+        logger.warning(f"Payment {pid} skipped: unknown user {uid}")
+    return [(uid, float(amount), pid) for pid, uid, amount, _ in applied]
+
+# ================= BROADCASTS =================
+def create_broadcast(admin_id: int, message: str) -> int:
+    conn = get_db_connection()
+    try:
+        cur = conn.cursor()
+        cur.execute("SELECT COUNT(*) FROM users WHERE is_blocked = FALSE AND bot_blocked = FALSE")
+        total = cur.fetchone()[0]
+        broadcast_id = cur.insert(
+            "INSERT INTO broadcasts (admin_id, message, total) VALUES (%s, %s, %s)",
+            (admin_id, message, total)
+        )
+        conn.commit()
+    finally:
+        conn.close()
+    return broadcast_id
+
+def get_broadcast(broadcast_id: int):
+    conn = get_db_connection()
+    try:
+        cur = conn.cursor(dictionary=True)
+        cur.execute("SELECT * FROM broadcasts WHERE id = %s", (broadcast_id,))
+        row = cur.fetchone()
+    finally:
+        conn.close()
+    return row
+
+def get_running_broadcasts():
+    conn = get_db_connection()
+    try:
+        cur = conn.cursor(dictionary=True)
+        cur.execute("SELECT * FROM broadcasts WHERE status = 'RUNNING' ORDER BY id")
+        rows = cur.fetchall()
+    finally:
+        conn.close()
+    return rows
+
+def get_broadcast_recipients(after_user_id: int, limit: int):
+    """Keyset page: PRIMARY KEY वर range scan, OFFSET नाही."""
+    conn = get_db_connection()
+    try:
+        cur = conn.cursor()
+        cur.execute("""
+            SELECT user_id FROM users
+            WHERE user_id > %s AND is_blocked = FALSE AND bot_blocked = FALSE
+            ORDER BY user_id
+            LIMIT %s
+        """, (after_user_id, limit))
+        rows = [r[0] for r in cur.fetchall()]
+    finally:
+        conn.close()
+    return rows
+
+def get_broadcast_done_after(broadcast_id: int, after_user_id: int):
+    """Resume: cursor नंतर आधीच process झालेले recipients."""
+    conn = get_db_connection()
+    try:
+        cur = conn.cursor()
+        cur.execute(
+            "SELECT user_id FROM broadcast_deliveries WHERE broadcast_id = %s AND user_id > %s",
+            (broadcast_id, after_user_id)
+        )
+        rows = {r[0] for r in cur.fetchall()}
+    finally:
+        conn.close()
+    return rows
+
+def record_broadcast_results(broadcast_id: int, results, last_user_id: int = None):
+    """
+    results = [(user_id, 'SENT' | 'FAILED' | 'BOT_BLOCKED'), ...] – एकाच transaction मध्ये.
+    last_user_id दिला तर page पूर्ण झाला म्हणून cursor पुढे सरकतो.
+    """
+    conn = get_db_connection()
+    try:
+        cur = conn.cursor()
+        if results:
+            # resume आधीच process झालेले skip करतो, त्यामुळे duplicate येत नाहीत
+            cur.executemany(
+                "INSERT INTO broadcast_deliveries (broadcast_id, user_id, status) VALUES (%s, %s, %s)",
+                [(broadcast_id, uid, status) for uid, status in results]
+            )
+
+            blocked = [uid for uid, status in results if status == "BOT_BLOCKED"]
+            if blocked:
+                cur.execute(f"UPDATE users SET bot_blocked = TRUE WHERE user_id IN ({_marks(len(blocked))})", blocked)
+
+        counts = {s: sum(1 for _, st in results if st == s) for s in ("SENT", "FAILED", "BOT_BLOCKED")}
+        cur.execute(f"""
+            UPDATE broadcasts
+            SET sent = sent + %s, failed = failed + %s, skipped = skipped + %s,
+                last_user_id = {dialect.greatest}(last_user_id, %s)
+            WHERE id = %s
+        """, (counts["SENT"], counts["FAILED"], counts["BOT_BLOCKED"], last_user_id or 0, broadcast_id))
+        conn.commit()
+    finally:
+        conn.close()
+
+def finish_broadcast(broadcast_id: int, status: str = "DONE"):
+    conn = get_db_connection()
+    try:
+        cur = conn.cursor()
+        cur.execute("UPDATE broadcasts SET status = %s WHERE id = %s", (status, broadcast_id))
+        # resume साठीचा log आता लागत नाही
+        cur.execute("DELETE FROM broadcast_deliveries WHERE broadcast_id = %s", (broadcast_id,))
+        conn.commit()
+    finally:
+        conn.close()
@@ -0,0 +1,291 @@
+# storage/stats.py
+# Admin dashboard (👥 Users) rollups – tap वर users / orders / transactions चे full-table aggregates नाहीत:
+#
+#   stats_hourly      : local तास × service × server counters. Orders / refunds / OTPs / ledger writes
+#                       commit नंतर record() ने deltas देतात; "stats" write-behind buffer ते काही
+#                       seconds नी multi-row upsert म्हणून लिहितो (hot path वर extra statement नाही).
+#   seal_stats()      : periodic catch-up (payment_worker). Grace संपलेला तास base tables च्या
+#                       created_at range मधून पुन्हा मोजून overwrite – lost deltas / crash / जुना data
+#                       इथे अचूक होतो. दिवस पूर्ण झाला की stats_daily + stats_totals मध्ये fold.
+#   get_admin_stats() : फक्त rollup rows (daily_until नंतरचे तास + 30 दिवस + totals) – base tables
+#                       कितीही मोठे असले तरी तितकाच खर्च.
+import logging
+import os
+import time
+
+from .pool import dialect, get_db_connection
+from .writebehind import WriteBehind
+
+logger = logging.getLogger(__name__)
+
+STATS_TZ_OFFSET = int(os.getenv("STATS_TZ_OFFSET_MINUTES", "330")) * 60  # तास / दिवस local (IST) नुसार
+STATS_FLUSH_DELAY = float(os.getenv("STATS_FLUSH_DELAY", "2"))
+STATS_SEAL_GRACE = int(os.getenv("STATS_SEAL_GRACE", "600"))  # तास संपल्यावर इतके seconds थांबून seal
+STATS_HOURLY_DAYS = int(os.getenv("STATS_HOURLY_DAYS", "35"))  # जुने hourly rows daily मध्ये आहेतच
+
+HOUR = 3600
+DAY = 86400
+COLUMNS = ("orders", "otps", "refunds", "revenue", "refunded", "credits", "debits", "recharges", "new_users")
+_COUNTS = {"orders", "otps", "refunds", "new_users"}
+
+PERIODS = ("today", "7d", "30d", "all")
+
+
+def _marks(n):
+    return ", ".join(["%s"] * n)
+
+def hour_start(ts) -> int:
+    return (int(ts) + STATS_TZ_OFFSET) // HOUR * HOUR - STATS_TZ_OFFSET
+
+def day_start(ts) -> int:
+    return (int(ts) + STATS_TZ_OFFSET) // DAY * DAY - STATS_TZ_OFFSET
+
+def _add(row, values):
+    for col, value in values.items():
+        row[col] += int(value) if col in _COUNTS else float(value)
+
+def _state(cur, name):
+    cur.execute("SELECT value FROM stats_state WHERE name = %s", (name,))
+    row = cur.fetchone()
+    return None if row is None else int(row[0])
+
+# ================= LIVE DELTAS =================
+def record(cur, service_id=0, server_id=0, **deltas):
+    """
+    Caller च्या transaction मधून: record(cur, service_id, server_id, orders=1, revenue=price).
+    Commit झाल्यावरच चालू तासाच्या row वर जातो – rollback झाला तर काहीच नाही.
+    """
+    key = (hour_start(time.time()), service_id or 0, server_id or 0)
+    cur.connection.after_commit(lambda: stats_writes.add(key, (key, deltas)))
+
+def apply_stats_deltas(ops):
+    """stats_writes चा flush – same (तास, service, server) deltas एकत्र, प्रत्येक row एकदाच upsert."""
+    rows = {}
+    for key, deltas in ops:
+        _add(rows.setdefault(key, dict.fromkeys(COLUMNS, 0)), deltas)
+    conn = get_db_connection()
+    try:
+        cur = conn.cursor()
+        # seal झालेला तास base tables मधून आधीच अचूक – उशिरा आलेले deltas त्यावर नकोत
+        sealed = _state(cur, "sealed_until") or 0
+        keys = sorted(k for k in rows if k[0] >= sealed)  # एकाच क्रमाने lock – दोन processes deadlock नाहीत
+        if keys:
+            cur.executemany(f"""
+                INSERT INTO stats_hourly (bucket, service_id, server_id) VALUES (%s, %s, %s)
+                {dialect.insert_ignore('bucket, service_id, server_id')}
+            """, keys)
+            sets = ", ".join(f"{c} = {c} + %s" for c in COLUMNS)
+            cur.executemany(
+                f"UPDATE stats_hourly SET {sets} WHERE bucket = %s AND service_id = %s AND server_id = %s",
+                [[rows[k][c] for c in COLUMNS] + list(k) for k in keys]
+            )
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+stats_writes = WriteBehind("stats", apply_stats_deltas, max_delay=STATS_FLUSH_DELAY)
+
+# ================= SEAL (catch-up) =================
+def _between(col):
+    return f"{col} >= {dialect.from_unix('%s')} AND {col} < {dialect.from_unix('%s')}"
+
+def _first_hour(cur):
+    """सगळ्यात जुन्या row चा तास – पहिला run पूर्ण इतिहास backfill करतो. Data नसेल तर चालू तास."""
+    first = []
+    for table in ("users", "orders", "transactions"):
+        cur.execute(f"SELECT {dialect.unix_ts('MIN(created_at)')} FROM {table}")
+        ts = cur.fetchone()[0]
+        if ts is not None:
+            first.append(int(ts))
+    return hour_start(min(first) if first else time.time())
+
+def _hour_rows(cur, start):
+    """[start, start + 1h) चे counters base tables मधून: {(service_id, server_id): {column: value}}"""
+    span = (start, start + HOUR)
+    rows = {}
+
+    def add(service_id, server_id, **values):
+        _add(rows.setdefault((service_id or 0, server_id or 0), dict.fromkeys(COLUMNS, 0)), values)
+
+    cur.execute(f"""
+        SELECT service_id, server_id, COUNT(*), COALESCE(SUM(price), 0) FROM orders
+        WHERE {_between('created_at')} GROUP BY service_id, server_id
+    """, span)
+    for service_id, server_id, orders, revenue in cur.fetchall():
+        add(service_id, server_id, orders=orders, revenue=revenue)
+
+    cur.execute(f"""
+        SELECT o.service_id, o.server_id, COUNT(*) FROM otp_logs l JOIN orders o ON o.id = l.order_id
+        WHERE {_between('l.created_at')} GROUP BY o.service_id, o.server_id
+    """, span)
+    for service_id, server_id, otps in cur.fetchall():
+        add(service_id, server_id, otps=otps)
+
+    # Refund = op_key "refund:<order id>" असलेला ledger credit; service / server order मधून
+    cur.execute(f"""
+        SELECT op_key, amount FROM transactions
+        WHERE {_between('created_at')} AND type = 'CREDIT' AND op_key LIKE %s
+    """, span + ("refund:%",))
+    refunds = {int(key.split(":", 1)[1]): amount for key, amount in cur.fetchall()}
+    ids = sorted(refunds)
+    for i in range(0, len(ids), 500):
+        chunk = ids[i:i + 500]
+        cur.execute(f"SELECT id, service_id, server_id FROM orders WHERE id IN ({_marks(len(chunk))})", chunk)
+        for order_id, service_id, server_id in cur.fetchall():
+            add(service_id, server_id, refunds=1, refunded=refunds[order_id])
+
+    # Ledger / users counters एकूण (service 0, server 0); recharge = Razorpay payment id op_key
+    cur.execute(f"""
+        SELECT COALESCE(SUM(CASE WHEN type = 'CREDIT' THEN amount ELSE 0 END), 0),
+               COALESCE(SUM(CASE WHEN type = 'DEBIT' THEN amount ELSE 0 END), 0),
+               COALESCE(SUM(CASE WHEN type = 'CREDIT' AND op_key LIKE %s THEN amount ELSE 0 END), 0),
+               COUNT(*)
+        FROM transactions WHERE {_between('created_at')}
+    """, ("pay%",) + span)
+    credits, debits, recharges, entries = cur.fetchone()
+    cur.execute(f"SELECT COUNT(*) FROM users WHERE {_between('created_at')}", span)
+    new_users = cur.fetchone()[0]
+    if entries or new_users:
+        add(0, 0, credits=credits, debits=debits, recharges=recharges, new_users=new_users)
+    return rows
+
+def _seal_hour(cur, start) -> bool:
+    # Watermark आधी: दुसरा worker याच row वर थांबतो आणि नंतर 0 rows पाहून मागे फिरतो
+    cur.execute("UPDATE stats_state SET value = %s WHERE name = 'sealed_until' AND value = %s", (start + HOUR, start))
+    if cur.rowcount == 0:
+        return False
+    rows = _hour_rows(cur, start)
+    cur.execute("DELETE FROM stats_hourly WHERE bucket = %s", (start,))
+    if rows:
+        cur.executemany(
+            f"INSERT INTO stats_hourly (bucket, service_id, server_id, {', '.join(COLUMNS)}) "
+            f"VALUES ({_marks(3 + len(COLUMNS))})",
+            [(start, *key, *(row[c] for c in COLUMNS)) for key, row in sorted(rows.items())]
+        )
+    return True
+
+def _seal_day(cur, day) -> bool:
+    """Sealed तासांचा एक दिवस stats_daily मध्ये आणि stats_totals वर; खूप जुने hourly rows काढतो."""
+    cur.execute("UPDATE stats_state SET value = %s WHERE name = 'daily_until' AND value = %s", (day + DAY, day))
+    if cur.rowcount == 0:
+        return False
+    cur.execute(f"""
+        SELECT service_id, server_id, {', '.join(f'SUM({c})' for c in COLUMNS)} FROM stats_hourly
+        WHERE bucket >= %s AND bucket < %s GROUP BY service_id, server_id
+    """, (day, day + DAY))
+    rows = cur.fetchall()
+    cur.execute("DELETE FROM stats_daily WHERE day = %s", (day,))
+    if rows:
+        cur.executemany(
+            f"INSERT INTO stats_daily (day, service_id, server_id, {', '.join(COLUMNS)}) "
+            f"VALUES ({_marks(3 + len(COLUMNS))})",
+            [(day, *r) for r in rows]
+        )
+        cur.executemany(f"""
+            INSERT INTO stats_totals (service_id, server_id) VALUES (%s, %s)
+            {dialect.insert_ignore('service_id, server_id')}
+        """, [r[:2] for r in rows])
+        sets = ", ".join(f"{c} = {c} + %s" for c in COLUMNS)
+        cur.executemany(
+            f"UPDATE stats_totals SET {sets} WHERE service_id = %s AND server_id = %s",
+            [(*r[2:], *r[:2]) for r in rows]
+        )
+    cur.execute("DELETE FROM stats_hourly WHERE bucket < %s", (day - STATS_HOURLY_DAYS * DAY,))
+    return True
+
+def seal_stats(now: float = None, max_hours: int = 48) -> int:
+    """
+    Grace संपलेले तास (एका call मध्ये max_hours पर्यंत) base tables मधून seal करतो, प्रत्येकी
+    एक transaction; पूर्ण झालेला दिवस त्याच transaction मध्ये daily / totals मध्ये.
+    पहिला call सगळ्यात जुन्या row पासून सुरू होतो. Sealed तासांची संख्या परत.
+    """
+    now = time.time() if now is None else now
+    limit = hour_start(now - STATS_SEAL_GRACE)
+    sealed = 0
+    conn = get_db_connection()
+    try:
+        cur = conn.cursor()
+        start = _state(cur, "sealed_until")
+        if start is None:
+            first = _first_hour(cur)
+            cur.executemany(f"""
+                INSERT INTO stats_state (name, value) VALUES (%s, %s)
+                {dialect.insert_ignore('name')}
+            """, [("sealed_until", first), ("daily_until", day_start(first))])
+            conn.commit()
+            start = _state(cur, "sealed_until")
+        while start < limit and sealed < max_hours:
+            if not _seal_hour(cur, start):
+                conn.rollback()
+                break  # दुसरा worker हा तास seal करतोय
+            end = start + HOUR
+            daily = _state(cur, "daily_until")
+            if daily + DAY <= end:
+                _seal_day(cur, daily)
+            conn.commit()
+            sealed += 1
+            start = end
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+    return sealed
+
+# ================= ADMIN PANEL READ =================
+def get_admin_stats(now: float = None) -> dict:
+    """
+    👥 panel: periods (today / 7d / 30d / all) चे counters + 7 दिवसांचे per-service counters.
+    वाचतो फक्त: daily_until नंतरचे hourly rows, 30 daily rows × servers, totals, services.
+    """
+    now = time.time() if now is None else now
+    today = day_start(now)
+    starts = {"today": today, "7d": today - 6 * DAY, "30d": today - 29 * DAY}
+    periods = {p: dict.fromkeys(COLUMNS, 0) for p in PERIODS}
+    services = {}
+    cols = ", ".join(COLUMNS)
+    conn = get_db_connection()
+    try:
+        cur = conn.cursor()
+        sealed = _state(cur, "sealed_until")
+        daily = _state(cur, "daily_until") or 0  # seal अजून चालला नाही: सगळे (live) hourly rows
+        cur.execute(f"SELECT bucket, service_id, server_id, {cols} FROM stats_hourly WHERE bucket >= %s", (daily,))
+        recent = cur.fetchall()
+        cur.execute(f"""
+            SELECT day, service_id, server_id, {cols} FROM stats_daily
+            WHERE day >= %s AND day < %s
+        """, (starts["30d"], daily))
+        days = cur.fetchall()
+        cur.execute(f"SELECT 0, service_id, server_id, {cols} FROM stats_totals")
+        totals = cur.fetchall()
+        cur.execute("SELECT id, service_name FROM services")
+        names = dict(cur.fetchall())
+    finally:
+        conn.close()
+
+    for rows, in_all in ((recent, True), (days, False), (totals, True)):
+        for ts, service_id, _, *values in rows:
+            values = dict(zip(COLUMNS, values))
+            if in_all:
+                _add(periods["all"], values)
+            if rows is totals:
+                continue
+            for period, start in starts.items():
+                if ts >= start:
+                    _add(periods[period], values)
+            if service_id and ts >= starts["7d"]:
+                svc = services.setdefault(service_id, dict.fromkeys(COLUMNS, 0))
+                _add(svc, values)
+
+    return {
+        "periods": periods,
+        "services": sorted(
+            ({"service_id": sid, "service_name": names.get(sid, f"#{sid}"), **row} for sid, row in services.items()),
+            key=lambda s: (-s["orders"], s["service_id"])
+        ),
+        "sealed_until": sealed,
+        "generated_at": int(now),
+    }
@@ -0,0 +1,262 @@
+# storage/wallet.py
+# Wallet = append-only ledger (transactions) + users.balance snapshot
+#
+#   Credits  : फक्त ledger INSERT (settled = FALSE) – users row lock नाही, त्यामुळे
+#              refunds / webhook credits / referral bonus एकमेकांना block करत नाहीत.
+#   Debits   : त्याच user चा row lock, pending credits snapshot मध्ये fold, मग
+#              conditional UPDATE (balance >= amount) – double-spend शक्य नाही.
+#   op_key   : client ने दिलेली idempotency key (UNIQUE) – retry / double tap दुसऱ्यांदा apply होत नाही.
+#   Balance  : snapshot + unsettled credits.
+#   settle_credits() pending credits batch मध्ये snapshot मध्ये fold करतो;
+#   reconcile() snapshot विरुद्ध settled ledger sum तपासतो.
+import logging
+
+from .pool import dialect, get_db_connection
+from .stats import record as _stat
+
+logger = logging.getLogger(__name__)
+
+CREDIT = "CREDIT"
+DEBIT = "DEBIT"
+
+# _debit() results
+APPLIED = "APPLIED"
+REPLAYED = "REPLAYED"
+INSUFFICIENT = "INSUFFICIENT"
+
+_SIGNED = "CASE WHEN type = 'CREDIT' THEN amount ELSE -amount END"
+# users row वाचणाऱ्या SELECT / RETURNING मध्येच unsettled credits – वेगळा round trip नाही (idx_user_settled)
+_PENDING_SUM = f"(SELECT COALESCE(SUM({_SIGNED}), 0) FROM transactions t WHERE t.user_id = users.user_id AND t.settled = FALSE)"
+
+
+class DuplicateOperation(Exception):
+    """op_key आधीच वापरलेली आहे – operation आधीच झाले (किंवा चालू आहे)."""
+
+    def __init__(self, op_key):
+        super().__init__(op_key)
+        self.op_key = op_key
+
+
+def _marks(n):
+    return ", ".join(["%s"] * n)
+
+# ================= LEDGER PRIMITIVES (caller's transaction) =================
+def _credit(cur, user_id, amount, description, op_key=None) -> bool:
+    """Pending credit row; op_key आधीच असेल तर False."""
+    cur.execute(f"""
+        INSERT INTO transactions (user_id, amount, type, description, settled, op_key)
+        VALUES (%s, %s, 'CREDIT', %s, FALSE, %s)
+        {dialect.insert_ignore('op_key')}
+    """, (user_id, abs(amount), description, op_key))
+    if cur.rowcount != 1:
+        return False
+    _stat(cur, credits=abs(amount))
+    return True
+
+def _settle_user(cur, user_id) -> bool:
+    """
+    User row lock करून त्याचे pending credits snapshot मध्ये fold करतो.
+    settle_credits() ने lock केलेले rows SKIP होतात (तो ते स्वतः apply करेल) –
+    त्यामुळे दोघे एकमेकांची वाट पाहून deadlock होत नाहीत. User नसेल तर False.
+    """
+    if dialect.name == "sqlite":
+        # FOR UPDATE नाही – no-op UPDATE ने write lock आधी घ्या, नाहीतर stale read वरून दोनदा fold
+        cur.execute("UPDATE users SET balance = balance WHERE user_id = %s", (user_id,))
+        if cur.rowcount == 0:
+            return False
+    else:
+        cur.execute(f"SELECT balance FROM users WHERE user_id = %s{dialect.for_update}", (user_id,))
+        if cur.fetchone() is None:
+            return False
+    cur.execute(
+        f"SELECT id, {_SIGNED} FROM transactions WHERE settled = FALSE AND user_id = %s{dialect.skip_locked}",
+        (user_id,)
+    )
+    pending = cur.fetchall()
+    if pending:
+        cur.execute("UPDATE users SET balance = balance + %s WHERE user_id = %s",
+                    (sum(p[1] for p in pending), user_id))
+        cur.execute(f"UPDATE transactions SET settled = TRUE WHERE id IN ({_marks(len(pending))})",
+                    [p[0] for p in pending])
+    return True
+
+def _debit(cur, user_id, amount, description, op_key=None) -> str:
+    """
+    APPLIED / REPLAYED (op_key आधीच) / INSUFFICIENT.
+    INSUFFICIENT वर caller ने rollback करावा (op_key row पण जाते).
+    """
+    amount = abs(amount)
+    if op_key is not None:
+        # UNIQUE op_key: दुसरा same-key debit पहिल्याचा commit / rollback होईपर्यंत इथे थांबतो
+        cur.execute(f"""
+            INSERT INTO transactions (user_id, amount, type, description, settled, op_key)
+            VALUES (%s, %s, 'DEBIT', %s, TRUE, %s)
+            {dialect.insert_ignore('op_key')}
+        """, (user_id, amount, description, op_key))
+        if cur.rowcount == 0:
+            return REPLAYED
+    if not _settle_user(cur, user_id):
+        return INSUFFICIENT
+    cur.execute(
+        "UPDATE users SET balance = balance - %s WHERE user_id = %s AND balance >= %s",
+        (amount, user_id, amount)
+    )
+    if cur.rowcount == 0:
+        return INSUFFICIENT
+    if op_key is None:
+        cur.execute(
+            "INSERT INTO transactions (user_id, amount, type, description, settled) VALUES (%s, %s, 'DEBIT', %s, TRUE)",
+            (user_id, amount, description)
+        )
+    _stat(cur, debits=amount)
+    return APPLIED
+
+# ================= PUBLIC API =================
+def get_user_balance(user_id: int) -> float:
+    conn = get_db_connection()
+    try:
+        cur = conn.cursor()
+        cur.execute(f"SELECT balance + {_PENDING_SUM} FROM users WHERE user_id = %s", (user_id,))
+        row = cur.fetchone()
+        return float(row[0]) if row else 0.0
+    finally:
+        conn.close()
+
+def credit(user_id: int, amount: float, description: str, op_key: str = None) -> bool:
+    """Ledger credit; same op_key दुसऱ्यांदा आली तर False (काहीच बदल नाही)."""
+    conn = get_db_connection()
+    try:
+        ok = _credit(conn.cursor(), user_id, amount, description, op_key)
+        conn.commit()
+    finally:
+        conn.close()
+    return ok
+
+def credit_many(entries):
+    """entries = [(user_id, amount, description, op_key), ...] – एकच multi-row INSERT."""
+    if not entries:
+        return
+    conn = get_db_connection()
+    try:
+        cur = conn.cursor()
+        cur.executemany(f"""
+            INSERT INTO transactions (user_id, amount, type, description, settled, op_key)
+            VALUES (%s, %s, 'CREDIT', %s, FALSE, %s)
+            {dialect.insert_ignore('op_key')}
+        """, [(uid, abs(amount), desc, key) for uid, amount, desc, key in entries])
+        _stat(cur, credits=sum(abs(e[1]) for e in entries))  # duplicate keys असतील तर seal_stats() तास अचूक करतो
+        conn.commit()
+    finally:
+        conn.close()
+
+def debit(user_id: int, amount: float, description: str, op_key: str = None) -> bool:
+    """
+    Atomic debit. Balance कमी असेल तर False. op_key दिली असेल तर retry
+    (आधीच झालेला debit) पुन्हा कापत नाही आणि True परत देतो.
+    """
+    conn = get_db_connection()
+    try:
+        result = _debit(conn.cursor(), user_id, amount, description, op_key)
+        if result == INSUFFICIENT:
+            conn.rollback()
+            return False
+        conn.commit()
+        return True
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+def update_balance(user_id: int, amount: float, trans_type: str, description: str, op_key: str = None) -> bool:
+    """जुना API: DEBIT -> debit(), CREDIT -> credit() (replay सुद्धा True)."""
+    try:
+        if trans_type == DEBIT:
+            return debit(user_id, amount, description, op_key)
+        credit(user_id, amount, description, op_key)
+        return True
+    except Exception as e:
+        logger.error(f"Balance update failed: {e}")
+        return False
+
+def settle_credits(limit: int = 5000) -> int:
+    """
+    Pending credits चा एक batch snapshot मध्ये fold करतो (user प्रति एकच UPDATE,
+    user_id order मध्ये). SKIP LOCKED – अनेक workers चालू शकतात. Settled rows count परत.
+    """
+    conn = get_db_connection()
+    try:
+        cur = conn.cursor()
+        cur.execute(f"""
+            SELECT id, user_id, {_SIGNED} FROM transactions
+            WHERE settled = FALSE
+            ORDER BY id
+            LIMIT %s{dialect.skip_locked}
+        """, (limit,))
+        rows = cur.fetchall()
+        if not rows:
+            conn.commit()
+            return 0
+        # आधी guarded flip: दुसऱ्या worker ने (lock नसलेल्या SQLite वर) आधीच settle केले असेल तर सोडा
+        cur.execute(f"UPDATE transactions SET settled = TRUE WHERE id IN ({_marks(len(rows))}) AND settled = FALSE",
+                    [r[0] for r in rows])
+        if cur.rowcount != len(rows):
+            conn.rollback()
+            return 0
+        totals = {}
+        for _, uid, amount in rows:
+            totals[uid] = totals.get(uid, 0) + amount
+        for uid in sorted(totals):
+            cur.execute("UPDATE users SET balance = balance + %s WHERE user_id = %s", (totals[uid], uid))
+        conn.commit()
+        return len(rows)
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+def reconcile(after_user_id: int = 0, limit: int = 1000):
+    """
+    Keyset page: snapshot विरुद्ध settled ledger sum (एकाच statement मध्ये –
+    consistent snapshot). -> (mismatches [(user_id, snapshot, ledger), ...],
+    last user_id | None, checked users)
+    """
+    conn = get_db_connection()
+    try:
+        cur = conn.cursor()
+        cur.execute("""
+            SELECT u.user_id, u.balance,
+                   COALESCE(SUM(CASE WHEN t.type = 'CREDIT' THEN t.amount ELSE -t.amount END), 0)
+            FROM users u
+            LEFT JOIN transactions t ON t.user_id = u.user_id AND t.settled = TRUE
+            WHERE u.user_id > %s
+            GROUP BY u.user_id, u.balance
+            ORDER BY u.user_id
+            LIMIT %s
+        """, (after_user_id, limit))
+        rows = cur.fetchall()
+    finally:
+        conn.close()
+    if not rows:
+        return [], None, 0
+    mismatches = [(uid, float(snap), float(ledger)) for uid, snap, ledger in rows
+                  if abs(float(snap) - float(ledger)) >= 0.005]
+    return mismatches, rows[-1][0], len(rows)
+
+def repair_snapshot(user_id: int) -> float:
+    """Ledger authoritative: snapshot = settled ledger sum (pending आधी fold करून)."""
+    conn = get_db_connection()
+    try:
+        cur = conn.cursor()
+        _settle_user(cur, user_id)
+        cur.execute(f"SELECT COALESCE(SUM({_SIGNED}), 0) FROM transactions WHERE user_id = %s AND settled = TRUE", (user_id,))
+        ledger = cur.fetchone()[0]
+        cur.execute("UPDATE users SET balance = %s WHERE user_id = %s", (ledger, user_id))
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+    return float(ledger)
@@ -0,0 +1,245 @@
+# storage/writebehind.py
+# Write-behind buffer: non-critical writes (order status transitions, otp_logs feed rows)
+# memory मध्ये जमा होतात आणि size / time trigger वर एकाच transaction मध्ये multi-row
+# statements म्हणून flush होतात. पैसे हलवणारे writes (debit / credit / refund) इथे येत नाहीत.
+import atexit
+import collections
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+import telemetry
+
+logger = logging.getLogger(__name__)
+
+WRITE_BEHIND = os.getenv("WRITE_BEHIND", "1") == "1"  # 0 = जुनं वर्तन (प्रत्येक write लगेच commit)
+WRITE_BEHIND_BATCH = int(os.getenv("WRITE_BEHIND_BATCH", "500"))
+WRITE_BEHIND_DELAY = float(os.getenv("WRITE_BEHIND_DELAY", "0.2"))  # seconds, सर्वात जुना write
+WRITE_BEHIND_MAX_ATTEMPTS = int(os.getenv("WRITE_BEHIND_MAX_ATTEMPTS", "3"))  # एकट्याने इतक्यांदा fail = dead letter
+
+# PEP 249 / pool errors – DB / connection / lock चा प्रश्न, op चा नाही: सगळे ops जसेच्या तसे पुन्हा
+TRANSIENT_ERRORS = ("OperationalError", "InterfaceError", "PoolError", "PoolExhausted")
+
+FLUSH_SECONDS = telemetry.histogram(
+    "writebehind_flush_seconds", "Write-behind flush latency (one transaction)", ("buffer",)
+)
+FLUSH_ROWS = telemetry.histogram(
+    "writebehind_flush_rows", "Buffered writes per flush", ("buffer",),
+    buckets=(1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+)
+LAG_SECONDS = telemetry.histogram(
+    "writebehind_lag_seconds", "Time from enqueue to commit per write", ("buffer",)
+)
+FLUSH_ERRORS = telemetry.counter(
+    "writebehind_flush_errors_total", "Failed write-behind flushes (ops kept and retried)", ("buffer",)
+)
+DEAD_LETTERS = telemetry.counter(
+    "writebehind_dead_letters_total", "Buffered writes dropped after failing on their own", ("buffer",)
+)
+PENDING = telemetry.gauge("writebehind_pending", "Buffered writes not yet committed", ("buffer",))
+
+
+def _transient(exc):
+    return isinstance(exc, OSError) or any(c.__name__ in TRANSIENT_ERRORS for c in type(exc).__mro__)
+
+
+class WriteBehind:
+    """
+    Thread-safe buffer in front of a batch write function.
+
+    add() only appends, so it is safe to call straight from the event loop.
+    A daemon thread calls flush_fn(ops) once max_batch ops are waiting or
+    the oldest has waited max_delay seconds. flush() / flush_if() do the
+    same synchronously – on shutdown and before reads that must see the
+    buffered state (a key stays pending until its flush has committed).
+    claim(key) hands one key's ops to a caller that writes them in its own
+    transaction (refunds), so a barrier costs no extra commit. A flush
+    that fails on a connection / lock error keeps its ops and retries them
+    on the next trigger. Any other error is treated as a bad op: the batch
+    is retried one op at a time, the rest commit, and an op that fails on
+    its own max_attempts times is dead-lettered (logged, counted, kept in
+    dead_letters) instead of blocking everything behind it. With
+    enabled=False every add() is written at once.
+    """
+
+    def __init__(self, name, flush_fn, max_batch=WRITE_BEHIND_BATCH, max_delay=WRITE_BEHIND_DELAY,
+                 enabled=WRITE_BEHIND, max_attempts=WRITE_BEHIND_MAX_ATTEMPTS):
+        self.name = name
+        self.flush_fn = flush_fn
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.enabled = enabled
+        self.max_attempts = max_attempts
+        self.dead_letters = collections.deque(maxlen=1000)  # (key, op, error) – तपासणीसाठी
+        self._ops = []    # (enqueued_at, key, op), जुने आधी
+        self._keys = {}   # key -> buffered / flushing ops
+        self._attempts = {}  # id(entry) -> एकट्याने fail झाल्याची संख्या
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()  # एका वेळी एकच flush (क्रम टिकतो)
+        self._wake = threading.Event()
+        self._thread = None
+        self._stopped = False
+        PENDING.set_function(lambda: len(self._ops), buffer=name)
+
+    def add(self, key, op):
+        entry = (time.monotonic(), key, op)
+        with self._lock:
+            self._keys[key] = self._keys.get(key, 0) + 1
+            if not self.enabled or self._stopped:
+                batch = [entry]
+            else:
+                self._ops.append(entry)
+                batch = None
+                wake = len(self._ops) == 1 or len(self._ops) >= self.max_batch
+        if batch:
+            self._write(batch)  # buffer बंद: caller च्या thread मध्ये लगेच, जुन्यासारखं
+            return
+        self._start()
+        if wake:
+            self._wake.set()
+
+    def pending(self, key=None):
+        return bool(self._keys) if key is None else key in self._keys
+
+    def flush_if(self, key=None):
+        """key चे (key None: कोणतेही) writes अजून commit झाले नसतील तर flush."""
+        if self.pending(key):
+            self.flush()
+
+    def flush(self) -> int:
+        with self._flush_lock:
+            with self._lock:
+                batch, self._ops = self._ops, []
+            if batch:
+                self._write(batch)
+            return len(batch)
+
+    @contextmanager
+    def claim(self, key):
+        """
+        with buf.claim(key) as ops: – key चे buffered ops buffer मधून काढून देतो.
+        Block मधला transaction commit झाला तर ते done; exception आली तर परत buffer मध्ये.
+        """
+        with self._flush_lock:  # चालू flush मध्ये हा key असेल तर तो commit होईपर्यंत थांबा
+            with self._lock:
+                mine = [e for e in self._ops if e[1] == key]
+                if mine:
+                    self._ops = [e for e in self._ops if e[1] != key]
+        try:
+            yield [op for _, _, op in mine]
+        except BaseException:
+            with self._lock:
+                self._ops[:0] = mine
+            raise
+        self._done(mine)
+
+    def _write(self, batch):
+        started = time.perf_counter()
+        try:
+            self.flush_fn([op for _, _, op in batch])
+        except Exception as e:
+            FLUSH_ERRORS.inc(buffer=self.name)
+            # DB गेला: सगळे परत. नाहीतर एखादा op दोषी (FK / constraint) – एकेक करून बाकीचे पुढे
+            retry = batch if _transient(e) else self._isolate(batch, e)
+            if retry:
+                self._requeue(retry)
+                raise
+            return
+        FLUSH_SECONDS.observe(time.perf_counter() - started, buffer=self.name)
+        FLUSH_ROWS.observe(len(batch), buffer=self.name)
+        self._done(batch)
+
+    def _isolate(self, batch, error):
+        """Fail झालेला batch एकेक op ने; परत देतो ते पुन्हा करायचे (dead letter झालेले सोडून)."""
+        if len(batch) == 1:
+            return [] if self._failed(batch[0], error) else batch
+        retry = []
+        for i, entry in enumerate(batch):
+            try:
+                self.flush_fn([entry[2]])
+            except Exception as e:
+                if _transient(e):
+                    return retry + batch[i:]
+                if not self._failed(entry, e):
+                    retry.append(entry)
+            else:
+                self._done([entry])
+        return retry
+
+    def _failed(self, entry, error) -> bool:
+        """एकट्या op चा failure मोजतो; max_attempts झाले तर dead letter (True)."""
+        attempts = self._attempts.get(id(entry), 0) + 1
+        if attempts < self.max_attempts:
+            self._attempts[id(entry)] = attempts
+            return False
+        _, key, op = entry
+        DEAD_LETTERS.inc(buffer=self.name)
+        self.dead_letters.append((key, op, repr(error)))
+        logger.error(f"Write-behind {self.name}: dropping {op!r} after {attempts} failed attempts: {error!r}")
+        with self._lock:
+            self._forget([entry])
+        return True
+
+    def _requeue(self, batch):
+        with self._lock:
+            if self.enabled and not self._stopped:
+                self._ops[:0] = batch  # पुढच्या trigger ला पुन्हा, त्याच क्रमाने
+            else:
+                self._forget(batch)
+
+    def _done(self, batch):
+        now = time.monotonic()
+        for enqueued_at, _, _ in batch:
+            LAG_SECONDS.observe(now - enqueued_at, buffer=self.name)
+        with self._lock:
+            self._forget(batch)
+
+    def _forget(self, batch):
+        for entry in batch:
+            self._attempts.pop(id(entry), None)
+            key = entry[1]
+            left = self._keys.get(key, 0) - 1
+            if left > 0:
+                self._keys[key] = left
+            else:
+                self._keys.pop(key, None)
+
+    # ================= FLUSHER THREAD =================
+    def _start(self):
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name=f"writebehind-{self.name}", daemon=True)
+                    self._thread.start()
+                    atexit.register(self.stop)
+
+    def _run(self):
+        while not self._stopped:
+            with self._lock:
+                oldest = self._ops[0][0] if self._ops else None
+                full = len(self._ops) >= self.max_batch
+            if oldest is None:
+                self._wake.wait()
+            elif not full:
+                self._wake.wait(max(0.0, oldest + self.max_delay - time.monotonic()))
+            self._wake.clear()
+            with self._lock:
+                due = self._ops and (len(self._ops) >= self.max_batch
+                                     or self._ops[0][0] + self.max_delay <= time.monotonic())
+            if not due or self._stopped:
+                continue
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Write-behind {self.name} flush failed, retrying: {e}")
+                time.sleep(min(1.0, self.max_delay * 5))
+
+    def stop(self):
+        """Shutdown: thread थांबवून उरलेले writes flush (atexit सुद्धा हेच करतो)."""
+        self._stopped = True
+        self._wake.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=5)
+        self.flush()
@@ -0,0 +1,17 @@
+# telemetry/ – Prometheus-style metrics + per-order tracing (bot, webhook, workers, storage)
+#
+#   HIST = telemetry.histogram("x_seconds", "help", ("label",))
+#   with HIST.time(label="a"): ...
+#   telemetry.serve(9100)          # GET /metrics (127.0.0.1; host= दिल्यास तिथे)
+from .metrics import (  # noqa: F401
+    CONTENT_TYPE,
+    Counter,
+    Gauge,
+    Histogram,
+    counter,
+    gauge,
+    histogram,
+    render
+)
+from .server import serve  # noqa: F401
+from .trace import Trace, Tracer, tracer  # noqa: F401
@@ -0,0 +1,81 @@
+# telemetry/trace.py
+# Per-order trace: tap -> debit -> number -> otp -> sent (purchase p99 कुठे जातो ते)
+import logging
+import time
+from collections import OrderedDict
+
+from .metrics import histogram
+
+logger = logging.getLogger(__name__)
+
+STAGE_SECONDS = histogram(
+    "order_stage_seconds", "Time between consecutive purchase stages", ("stage",)
+)
+ORDER_SECONDS = histogram(
+    "order_total_seconds", "Tap to final stage, by outcome", ("outcome",)
+)
+
+
+class Trace:
+    __slots__ = ("order_id", "marks")
+
+    def __init__(self):
+        self.order_id = None
+        self.marks = [("tap", time.monotonic())]
+
+    def mark(self, stage):
+        self.marks.append((stage, time.monotonic()))
+
+    def spans(self):
+        """[("tap->debit", seconds), ...]"""
+        return [(f"{a}->{b}", tb - ta) for (a, ta), (b, tb) in zip(self.marks, self.marks[1:])]
+
+
+class Tracer:
+    """
+    Open traces keyed by order id. A trace starts when the buy_ callback
+    arrives (before the order exists), is attached to the order after the
+    debit, and is finished by whichever component ends the order – the OTP
+    message being sent, a timeout, or a failed purchase. Finished traces
+    become order_stage_seconds / order_total_seconds samples and one log
+    line. Orders recovered after a restart have no trace; the map is
+    capped so abandoned traces cannot grow without bound.
+    """
+
+    def __init__(self, maxsize=10000):
+        self.maxsize = maxsize
+        self._open = OrderedDict()
+
+    def begin(self):
+        return Trace()
+
+    def attach(self, order_id, trace):
+        trace.order_id = order_id
+        self._open[order_id] = trace
+        while len(self._open) > self.maxsize:
+            self._open.popitem(last=False)
+
+    def mark(self, order_id, stage):
+        trace = self._open.get(order_id)
+        if trace is not None:
+            trace.mark(stage)
+
+    def finish(self, order_id, outcome, stage=None):
+        """order_id किंवा (attach न झालेला) Trace object."""
+        trace = order_id if isinstance(order_id, Trace) else self._open.pop(order_id, None)
+        if trace is None:
+            return
+        if stage:
+            trace.mark(stage)
+        spans = trace.spans()
+        for name, seconds in spans:
+            STAGE_SECONDS.observe(seconds, stage=name)
+        total = trace.marks[-1][1] - trace.marks[0][1]
+        ORDER_SECONDS.observe(total, outcome=outcome)
+        logger.info(
+            f"trace order={trace.order_id} outcome={outcome} total={total * 1000:.0f}ms "
+            + " ".join(f"{name}={seconds * 1000:.0f}ms" for name, seconds in spans)
+        )
+
+
+tracer = Tracer()
@@ -0,0 +1,13 @@
+# tests/conftest.py
+# bot/ modules एकमेकांना top-level नावाने import करतात (bot.py सारखे), storage/ / telemetry/ रूट मधून
+import os
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "bot"))
+sys.path.append(ROOT)
+os.environ.setdefault("ADMIN_USER_ID", "1")
+os.environ.setdefault("BOT_TOKEN", "123:test")
+os.environ.setdefault("DB_TYPE", "sqlite")
+os.environ.setdefault("DB_PATH", os.path.join(tempfile.mkdtemp(), "test.sqlite3"))
@@ -0,0 +1,128 @@
+# tests/test_breaker.py
+# CLOSED -> OPEN -> HALF_OPEN -> CLOSED / OPEN, provider-wide vs service-code breakers, admission gate
+import asyncio
+
+import pytest
+
+from admission import AdmissionGate, Overloaded
+from providers.breaker import CLOSED, HALF_OPEN, OPEN, BreakerBoard, CircuitBreaker
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _breaker(clock, **kwargs):
+    opts = dict(window=60, min_calls=4, error_rate=0.5, open_for=30, half_open_calls=1, clock=clock)
+    opts.update(kwargs)
+    return CircuitBreaker(**opts)
+
+
+def test_opens_only_after_min_calls_at_error_rate():
+    clock = Clock()
+    b = _breaker(clock)
+    for ok in (False, False, True):
+        b.record(ok)
+    assert b.state == CLOSED  # 3 < min_calls
+    b.record(False)
+    assert b.state == OPEN and not b.available() and not b.allow()
+    assert b.retry_in() == 30
+
+
+def test_old_failures_leave_the_window():
+    clock = Clock()
+    b = _breaker(clock)
+    for _ in range(3):
+        b.record(False)
+    clock.now += 61
+    b.record(False)
+    assert b.state == CLOSED
+
+
+def test_half_open_probe_success_closes():
+    clock = Clock()
+    b = _breaker(clock)
+    for _ in range(4):
+        b.record(False)
+    clock.now += 30
+    assert b.state == HALF_OPEN
+    assert b.allow()
+    assert not b.allow()  # half_open_calls = 1 – दुसरा probe नाही
+    b.record(True)
+    assert b.state == CLOSED and b.allow()
+
+
+def test_half_open_probe_failure_reopens():
+    clock = Clock()
+    b = _breaker(clock)
+    for _ in range(4):
+        b.record(False)
+    clock.now += 30
+    assert b.allow()
+    b.record(False)
+    assert b.state == OPEN and b.retry_in() == 30
+
+
+def test_board_provider_breaker_trips_every_code():
+    clock = Clock()
+    board = BreakerBoard(factory=lambda: _breaker(clock))
+    for _ in range(4):
+        board.record("hero", "tg", False)
+    assert not board.available("hero", "tg")
+    assert not board.available("hero", "wa")  # provider-wide breaker उघडा
+    assert board.snapshot() == {("hero", None): OPEN, ("hero", "tg"): OPEN}
+
+
+def test_board_code_breaker_leaves_other_codes():
+    clock = Clock()
+    board = BreakerBoard(factory=lambda: _breaker(clock, min_calls=8, error_rate=0.6))
+    board.get("hero", "tg").min_calls = 4
+    for _ in range(4):
+        board.record("hero", "tg", False)
+    for _ in range(4):
+        board.record("hero", "wa", True)
+    assert not board.available("hero", "tg")
+    assert board.available("hero", "wa")
+
+
+def test_admission_gate_rejects_beyond_queue():
+    async def run():
+        gate = AdmissionGate(max_inflight=1, max_queue=1, max_wait=5)
+        release = asyncio.Event()
+
+        async def hold():
+            async with gate:
+                await release.wait()
+
+        async def until(cond):
+            while not cond():
+                await asyncio.sleep(0)
+
+        holder = asyncio.create_task(hold())
+        await until(lambda: gate.inflight == 1)
+        waiter = asyncio.create_task(hold())
+        await until(lambda: gate.waiting == 1)
+        with pytest.raises(Overloaded):
+            async with gate:
+                pass
+        release.set()
+        await asyncio.gather(holder, waiter)
+        assert gate.rejected == 1 and gate.inflight == 0
+
+    asyncio.run(run())
+
+
+def test_admission_gate_times_out_waiters():
+    async def run():
+        gate = AdmissionGate(max_inflight=1, max_queue=5, max_wait=0.01)
+        async with gate:
+            with pytest.raises(Overloaded):
+                async with gate:
+                    pass
+        assert gate.waiting == 0
+
+    asyncio.run(run())
@@ -0,0 +1,63 @@
+# tests/test_broadcast.py
+# Page मध्येच cancel – आधी गेलेल्या messages चे results + पूर्ण prefix cursor लिहूनच थांबतो
+import asyncio
+
+import broadcast
+from broadcast import BroadcastEngine
+
+
+class FakeOutbox:
+    def __init__(self):
+        self.futures = {}
+
+    def send(self, chat_id, text, **kwargs):
+        fut = asyncio.get_running_loop().create_future()
+        self.futures[chat_id] = fut
+        return fut
+
+
+def test_cancelled_page_flushes_sent_results_and_prefix_cursor(monkeypatch):
+    recorded = []
+    monkeypatch.setattr(broadcast.db, "record_broadcast_results",
+                        lambda bid, rows, last_user_id=None: recorded.append((bid, list(rows), last_user_id)))
+
+    async def run():
+        outbox = FakeOutbox()
+        engine = BroadcastEngine(outbox, flush_every=100)
+        task = asyncio.create_task(engine._send_page(9, "hi", [10, 20, 30, 40], 45))
+        await asyncio.sleep(0)
+        for uid in (10, 20, 40):
+            outbox.futures[uid].set_result(None)
+        await asyncio.sleep(0.01)
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        return outbox
+
+    outbox = asyncio.run(run())
+    assert len(recorded) == 1
+    bid, rows, cursor = recorded[0]
+    assert (bid, cursor) == (9, 20)
+    assert sorted(rows) == [(10, "SENT"), (20, "SENT"), (40, "SENT")]
+    assert outbox.futures[30].cancelled()
+
+
+def test_completed_page_advances_cursor_to_page_end(monkeypatch):
+    recorded = []
+    monkeypatch.setattr(broadcast.db, "record_broadcast_results",
+                        lambda bid, rows, last_user_id=None: recorded.append((list(rows), last_user_id)))
+
+    async def run():
+        outbox = FakeOutbox()
+        engine = BroadcastEngine(outbox, flush_every=1)
+        task = asyncio.create_task(engine._send_page(9, "hi", [10, 20], 25))
+        await asyncio.sleep(0)
+        for fut in outbox.futures.values():
+            fut.set_result(None)
+        await task
+
+    asyncio.run(run())
+    assert recorded[-1][1] == 25
+    assert sorted(r for rows, _ in recorded for r in rows) == [(10, "SENT"), (20, "SENT")]
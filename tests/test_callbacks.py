@@ -0,0 +1,63 @@
+# tests/test_callbacks.py
+# callback_data round trip, 64-byte limit आणि client ने बदललेला data decode() वर None
+import base64
+
+import pytest
+
+import callbacks
+
+
+@pytest.mark.parametrize("action, fields", [
+    (callbacks.RECHARGE, ()),
+    (callbacks.HISTORY, (1, 1_700_000_000, 2**40)),
+    (callbacks.SERVICE, (0,)),
+    (callbacks.BUY, (12345, callbacks.paise(199.99))),
+])
+def test_round_trip(action, fields):
+    data = callbacks.encode(action, *fields)
+    assert len(data) <= callbacks.MAX_LEN
+    assert callbacks.decode(data) == (action, fields)
+
+
+def test_encode_rejects_bad_arity_and_negative_fields():
+    with pytest.raises(ValueError):
+        callbacks.encode(callbacks.BUY, 1)
+    with pytest.raises(ValueError):
+        callbacks.encode(callbacks.SERVICE, -1)
+
+
+def _raw(data):
+    return bytearray(base64.urlsafe_b64decode(data + "=" * (-len(data) % 4)))
+
+
+def _pack(raw):
+    return base64.urlsafe_b64encode(bytes(raw)).rstrip(b"=").decode()
+
+
+def test_tampered_price_is_rejected():
+    raw = _raw(callbacks.encode(callbacks.BUY, 7, 500))
+    raw[3] ^= 0x01  # quoted price चा पहिला byte
+    assert callbacks.decode(_pack(raw)) is None
+
+
+def test_tampered_tag_version_and_action_are_rejected():
+    data = callbacks.encode(callbacks.SERVICE, 3)
+    for i in (0, 1, -1):
+        raw = _raw(data)
+        raw[i] ^= 0x02
+        assert callbacks.decode(_pack(raw)) is None
+
+
+def test_garbage_and_legacy_data_is_rejected():
+    for data in (None, "", "buy_7", "svc_3", "!!!", "A" * (callbacks.MAX_LEN + 1)):
+        assert callbacks.decode(data) is None
+
+
+def test_non_canonical_padding_bits_are_rejected():
+    data = callbacks.encode(callbacks.SERVICE, 3)
+    alphabet = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_"
+    if len(data) % 4 == 0:
+        pytest.skip("no padding bits in this length")
+    last = alphabet.index(data[-1])
+    twin = data[:-1] + alphabet[last ^ 1]  # शेवटचा unused bit बदलला – same bytes, वेगळी string
+    assert callbacks.decode(twin) is None
@@ -0,0 +1,48 @@
+# tests/test_catalog.py
+# एका process मधला toggle_server दुसऱ्या process च्या catalog ला TTL न थांबता दिसतो (catalog_version row)
+import asyncio
+import uuid
+
+import pytest
+
+import db
+import migrations
+from catalog import Catalog
+
+
+@pytest.fixture
+def server_id():
+    migrations.migrate()
+    conn = db.get_db_connection()
+    try:
+        cur = conn.cursor()
+        cur.execute("INSERT INTO services (service_name, provider_service_code) VALUES (%s, %s)",
+                    (f"svc_{uuid.uuid4().hex[:8]}", "tg"))
+        cur.execute("SELECT MAX(id) FROM services")
+        service_id = cur.fetchone()[0]
+        cur.execute("INSERT INTO servers (service_id, server_number, price) VALUES (%s, 1, 10)", (service_id,))
+        cur.execute("SELECT MAX(id) FROM servers")
+        sid = cur.fetchone()[0]
+        conn.commit()
+    finally:
+        conn.close()
+    return sid
+
+
+def test_toggle_in_another_process_reloads_before_ttl(server_id):
+    other = Catalog(ttl=3600, check_every=0)
+    asyncio.run(other.ensure())
+    assert server_id in other.servers
+
+    db.toggle_server(server_id)  # दुसरा process (admin / API) – other.invalidate() कोणी call करत नाही
+    asyncio.run(other.ensure())
+    assert server_id not in other.servers
+
+
+def test_unchanged_version_skips_reload(server_id, monkeypatch):
+    cat = Catalog(ttl=3600, check_every=0)
+    asyncio.run(cat.ensure())
+    loads = []
+    monkeypatch.setattr(cat, "_build", lambda *a: loads.append(a))
+    asyncio.run(cat.ensure())
+    assert loads == []
@@ -0,0 +1,57 @@
+# tests/test_dispatcher.py
+# Outbound dispatcher: OTP broadcast च्या पुढे, एका chat चे messages एकत्र, 429 नंतर पुन्हा, Forbidden future वर
+import asyncio
+
+from telegram.error import Forbidden, RetryAfter
+
+from dispatcher import BROADCAST, OTP, MessageDispatcher
+
+
+class FakeBot:
+    def __init__(self, errors=()):
+        self.sent = []
+        self.errors = list(errors)
+
+    async def send_message(self, chat_id, text, **kwargs):
+        if self.errors:
+            raise self.errors.pop(0)
+        self.sent.append((chat_id, text))
+        return len(self.sent)
+
+
+async def _dispatch(bot, sends):
+    d = MessageDispatcher(bot, global_rate=1000, chat_rate=1000, broadcast_share=0.5, max_inflight=1)
+    futures = [d.send(chat_id, text, priority=priority) for chat_id, text, priority in sends]
+    d.start()
+    results = await asyncio.wait_for(asyncio.gather(*futures, return_exceptions=True), 5)
+    await d.stop()
+    return d, results
+
+
+def test_otp_goes_before_queued_broadcasts():
+    bot = FakeBot()
+    sends = [(100 + i, f"news {i}", BROADCAST) for i in range(3)] + [(1, "OTP 1234", OTP)]
+    asyncio.run(_dispatch(bot, sends))
+    assert bot.sent[0] == (1, "OTP 1234")
+
+
+def test_pending_texts_for_one_chat_are_merged():
+    bot = FakeBot()
+    d, results = asyncio.run(_dispatch(bot, [(1, "a", OTP), (1, "b", OTP), (2, "c", OTP)]))
+    assert sorted(bot.sent) == [(1, "a\n\nb"), (2, "c")]
+    assert results[0] == results[1]  # दोघांना एकच sent Message
+    assert d.sent == 2
+
+
+def test_retry_after_requeues_and_delivers():
+    bot = FakeBot([RetryAfter(0.05)])
+    d, results = asyncio.run(_dispatch(bot, [(1, "OTP 1", OTP)]))
+    assert bot.sent == [(1, "OTP 1")]
+    assert d.rate_limited == 1 and results == [1]
+
+
+def test_forbidden_fails_only_that_message():
+    bot = FakeBot([Forbidden("bot was blocked by the user")])
+    _, results = asyncio.run(_dispatch(bot, [(1, "x", OTP), (2, "y", OTP)]))
+    assert isinstance(results[0], Forbidden)
+    assert results[1] == 1 and bot.sent == [(2, "y")]
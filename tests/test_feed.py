@@ -0,0 +1,75 @@
+# tests/test_feed.py
+# OTP feed tail: उशिरा commit झालेली लहान id सुद्धा push होते, SSE position, PageCache TTL / LRU
+import importlib.util
+import os
+from types import SimpleNamespace
+
+import pytest
+
+_spec = importlib.util.spec_from_file_location(
+    "api_feed", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "api", "feed.py"))
+feed = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(feed)
+
+
+class FakeDB:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def get_otp_feed(self, limit):
+        return sorted(self.rows, key=lambda r: r["id"], reverse=True)[:limit]
+
+    def get_otp_feed_since(self, after_id, limit):
+        return sorted((r for r in self.rows if r["id"] > after_id), key=lambda r: r["id"])[:limit]
+
+
+def _row(i, ts=None):
+    return {"id": i, "ts": ts or 1000 + i, "otp": str(i)}
+
+
+@pytest.fixture
+def fake_db(monkeypatch):
+    fake = FakeDB([_row(1), _row(2), _row(4)])
+    monkeypatch.setattr(feed, "db", fake)
+    return fake
+
+
+def _loaded(size=10):
+    f = feed.OtpFeed(size=size)
+    f._load()
+    return f
+
+
+def test_late_commit_with_smaller_id_is_pushed(fake_db):
+    f = _loaded()
+    seq = f.version
+    fake_db.rows.append(_row(3))  # id 3 हा 4 नंतर commit झाला
+    assert f.poll() == 1
+    assert f.poll() == 0  # overlap मध्ये पुन्हा दिसला तरी duplicate नाही
+    assert [r["id"] for _, r in f.wait(seq, 0)] == [3]
+    assert [r["id"] for r in f.latest(2)[1]] == [4, 3]
+
+
+def test_position_resumes_after_last_event_id(fake_db):
+    f = _loaded()
+    assert [r["id"] for _, r in f.wait(f.position(1), 0)] == [2, 4]
+    assert f.wait(f.position(), 0) == []
+
+
+def test_buffer_drops_oldest_ids(fake_db):
+    f = _loaded(size=2)
+    assert [r["id"] for r in f.latest(10)[1]] == [4, 2]
+    assert f._ids == {2, 4}
+
+
+def test_page_cache_ttl_and_lru(monkeypatch):
+    clock = SimpleNamespace(now=0.0)
+    monkeypatch.setattr(feed, "time", SimpleNamespace(monotonic=lambda: clock.now))
+    cache = feed.PageCache(ttl=10, maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1  # a आता नवीन
+    cache.put("c", 3)
+    assert cache.get("b") is None and cache.get("a") == 1
+    clock.now = 11
+    assert cache.get("a") is None
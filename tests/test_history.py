@@ -0,0 +1,67 @@
+# tests/test_history.py
+# History pages: "Older ➡️" button चा signed cursor सगळ्या rows मधून एकदाच जातो, पहिला page cache
+import asyncio
+
+import pytest
+
+import callbacks
+import db
+import history
+import migrations
+from config import HISTORY_PAGE_SIZE
+
+USER = 880000501
+COUNT = HISTORY_PAGE_SIZE * 2 + 3
+
+
+@pytest.fixture(scope="module", autouse=True)
+def ledger():
+    migrations.migrate()
+    db.add_or_get_user(USER)
+    conn = db.get_db_connection()
+    try:
+        cur = conn.cursor()
+        cur.execute("DELETE FROM transactions WHERE user_id = %s", (USER,))
+        conn.commit()
+    finally:
+        conn.close()
+    for i in range(COUNT):
+        db.credit(USER, 1, f"entry {i}")
+
+
+def _button(markup, label):
+    for row in markup.inline_keyboard:
+        for button in row:
+            if button.text.startswith(label):
+                return button.callback_data
+    return None
+
+
+def test_older_button_walks_every_row_once():
+    history.invalidate(USER)
+    seen, cursor = [], (None, None)
+    for _ in range(COUNT):
+        text, markup = asyncio.run(history.get_page(USER, history.TRANSACTIONS, *cursor))
+        seen += [line.split("– ")[1] for line in text.splitlines() if line.startswith("➕")]
+        data = _button(markup, "Older")
+        if data is None:
+            break
+        action, fields = callbacks.decode(data)
+        assert action == callbacks.HISTORY
+        kind, *cursor = history.parse_callback(*fields)
+        assert kind == history.TRANSACTIONS
+    assert seen == [f"entry {i}" for i in reversed(range(COUNT))]
+
+
+def test_first_page_is_cached_until_invalidated():
+    history.invalidate(USER)
+    first = asyncio.run(history.get_page(USER, history.TRANSACTIONS))
+    db.credit(USER, 1, "newest")
+    assert asyncio.run(history.get_page(USER, history.TRANSACTIONS)) is first
+    history.invalidate(USER)
+    assert "newest" in asyncio.run(history.get_page(USER, history.TRANSACTIONS))[0]
+
+
+def test_zero_cursor_means_first_page():
+    assert history.parse_callback(1, 0, 0) == (history.TRANSACTIONS, None, None)
+    assert history.parse_callback(9, 5, 6) == (history.ORDERS, 5, 6)
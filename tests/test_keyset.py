@@ -0,0 +1,82 @@
+# tests/test_keyset.py
+# (ts, id) keyset pages – sub-second created_at (Postgres TIMESTAMP सारखे) असतानाही
+# प्रत्येक row एकदाच, (second, id) DESC क्रमाने
+import pytest
+
+import db
+import migrations
+from storage.dialects import Postgres
+
+USER = 880000001
+# एकाच second मध्ये created_at चा क्रम id च्या उलट – round / exact तुलना इथे चुकते
+STAMPS = ["2026-01-01 00:00:09.700", "2026-01-01 00:00:10.900", "2026-01-01 00:00:10.100",
+          "2026-01-01 00:00:10.500", "2026-01-01 00:00:10.000", "2026-01-01 00:00:11.000",
+          "2026-01-01 00:00:10.999", "2026-01-01 00:00:08.400"]
+
+
+@pytest.fixture(scope="module")
+def rows():
+    migrations.migrate()
+    db.add_or_get_user(USER)
+    conn = db.get_db_connection()
+    try:
+        cur = conn.cursor()
+        cur.execute("DELETE FROM transactions WHERE user_id = %s", (USER,))
+        cur.execute("DELETE FROM otp_logs WHERE user_id = %s", (USER,))
+        tx, feed = [], []
+        for i, stamp in enumerate(STAMPS):
+            tx.append((cur.insert("""
+                INSERT INTO transactions (user_id, amount, type, description, created_at)
+                VALUES (%s, 1, 'CREDIT', 'test', %s)
+            """, (USER, stamp)), stamp))
+            feed.append((cur.insert("""
+                INSERT INTO otp_logs (order_id, user_id, service_name, otp, created_at)
+                VALUES (%s, %s, 'test', '1234', %s)
+            """, (USER * 10 + i, USER, stamp)), stamp))
+        conn.commit()
+    finally:
+        conn.close()
+    return tx, feed
+
+
+def _expected(inserted):
+    return [i for i, _ in sorted(inserted, key=lambda r: (r[1][:19], r[0]), reverse=True)]
+
+
+def _walk(fetch, limit):
+    seen, cursor = [], (None, None)
+    for _ in range(len(STAMPS) + 2):  # cursor अडकला तर loop नको, fail
+        page = fetch(*cursor, limit)
+        seen += [r["id"] for r in page]
+        if len(page) < limit:
+            return seen
+        cursor = (int(page[-1]["ts"]), page[-1]["id"])
+    return seen
+
+
+@pytest.mark.parametrize("limit", [1, 2, 3])
+def test_history_pages_fractional_seconds(rows, limit):
+    tx, _ = rows
+    seen = _walk(lambda ts, rid, n: db.get_transaction_history(USER, ts, rid, n), limit)
+    assert seen == _expected(tx)
+
+
+@pytest.mark.parametrize("limit", [1, 2, 3])
+def test_otp_feed_pages_fractional_seconds(rows, limit):
+    _, feed = rows
+    ours = {i for i, _ in feed}
+    seen = [i for i in _walk(db.get_otp_feed, limit) if i in ours]
+    assert seen == _expected(feed)
+
+
+def test_ts_is_floor_of_created_at(rows):
+    _, feed = rows
+    by_id = {r["id"]: r["ts"] for r in db.get_otp_feed(limit=100)}
+    assert {by_id[i] for i, stamp in feed if stamp.startswith("2026-01-01 00:00:10")} == {1767225610}
+
+
+def test_postgres_dialect_truncates_microseconds():
+    pg = Postgres()
+    # CAST(EXTRACT(EPOCH ..) AS BIGINT) round करतो (10.9 -> 11) – cursor second पुढे जातो
+    assert pg.unix_ts("created_at") == "CAST(FLOOR(EXTRACT(EPOCH FROM created_at)) AS BIGINT)"
+    assert pg.whole_seconds("created_at") == "date_trunc('second', created_at)"
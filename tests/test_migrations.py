@@ -0,0 +1,43 @@
+# tests/test_migrations.py
+# नवीन DB वर सगळे migrations क्रमाने, दुसऱ्यांदा काहीच नाही, target नंतर उरलेले; helpers idempotent
+import pytest
+
+import db
+import migrations
+from storage import pool
+
+
+@pytest.fixture
+def fresh_db(tmp_path, monkeypatch):
+    monkeypatch.setattr(pool, "DB_PATH", str(tmp_path / "fresh.sqlite3"))
+    monkeypatch.setattr(pool, "_pool", None)
+
+
+def test_fresh_database_starts_at_version_zero(fresh_db):
+    assert migrations.current_version() == 0
+
+
+def test_migrate_applies_everything_once(fresh_db):
+    assert migrations.migrate() == [n for n, _ in migrations.MIGRATIONS]
+    assert migrations.current_version() == migrations.LATEST
+    assert migrations.migrate() == []
+
+
+def test_target_then_rest(fresh_db):
+    assert migrations.migrate(target=3) == [1, 2, 3]
+    assert migrations.current_version() == 3
+    assert migrations.migrate()[0] == 4
+
+
+def test_migration_bodies_are_rerunnable(fresh_db):
+    # अर्ध्यात crash (DDL झाले, schema_migrations row नाही) नंतर पुन्हा चालले तरी चालले पाहिजे
+    migrations.migrate()
+    conn = db.get_db_connection()
+    try:
+        cur = conn.cursor()
+        for _, fn in migrations.MIGRATIONS:
+            fn(cur)
+        conn.commit()
+    finally:
+        conn.close()
+    assert migrations.current_version() == migrations.LATEST
@@ -0,0 +1,95 @@
+# tests/test_orders.py
+# Order state machine: guarded transitions, terminal states पुढे जात नाहीत, refund एकदाच
+import uuid
+
+import pytest
+
+import db
+import migrations
+
+USER = 880000401
+
+
+def _status(order_id):
+    conn = db.get_db_connection()
+    try:
+        cur = conn.cursor()
+        cur.execute("SELECT status FROM orders WHERE id = %s", (order_id,))
+        return cur.fetchone()[0]
+    finally:
+        conn.close()
+
+
+@pytest.fixture(scope="module")
+def server():
+    migrations.migrate()
+    conn = db.get_db_connection()
+    try:
+        cur = conn.cursor()
+        cur.execute("INSERT INTO services (service_name, provider_service_code) VALUES (%s, %s)",
+                    (f"svc_{uuid.uuid4().hex[:8]}", "tg"))
+        cur.execute("SELECT MAX(id) FROM services")
+        service_id = cur.fetchone()[0]
+        cur.execute("INSERT INTO servers (service_id, server_number, price) VALUES (%s, 1, 10)", (service_id,))
+        cur.execute("SELECT MAX(id) FROM servers")
+        return service_id, cur.fetchone()[0]
+    finally:
+        conn.commit()
+        conn.close()
+
+
+@pytest.fixture
+def order(server):
+    db.add_or_get_user(USER)
+    db.credit(USER, 10, "top up")
+    return db.place_order(USER, *server, 10)
+
+
+def _number(order_id, server):
+    return db.mark_number_received(order_id, "act1", "919999", 600, "hero", server[1])
+
+
+def test_happy_path(order, server):
+    assert _status(order) == db.PENDING
+    assert _number(order, server)
+    assert db.record_otp(order, "123456", 12)
+    assert _status(order) == db.OTP_RECEIVED
+
+
+def test_number_received_only_once(order, server):
+    assert _number(order, server)
+    assert not _number(order, server)
+
+
+def test_terminal_states_do_not_move(order, server):
+    _number(order, server)
+    db.record_otp(order, "123456", 12)
+    balance = db.get_user_balance(USER)
+    for status in (db.TIMEOUT, db.CANCELLED, db.FAILED):
+        assert not db.refund_order(order, status, "late refund")
+    assert not db.transition_order(order, db.NUMBER_RECEIVED)
+    assert _status(order) == db.OTP_RECEIVED
+    assert db.get_user_balance(USER) == pytest.approx(balance)
+
+
+def test_refund_happens_once(order, server):
+    _number(order, server)
+    balance = db.get_user_balance(USER)
+    assert db.refund_order(order, db.TIMEOUT, "timeout")
+    assert not db.refund_order(order, db.CANCELLED, "cancel")
+    assert not db.record_otp(order, "123456", 12)  # timeout नंतर आलेला OTP
+    assert db.get_user_balance(USER) == pytest.approx(balance + 10)
+
+
+def test_failed_only_from_pending(order, server):
+    _number(order, server)
+    assert not db.transition_order(order, db.FAILED)
+    assert _status(order) == db.NUMBER_RECEIVED
+
+
+def test_active_orders_are_pending_or_number_received(order, server):
+    done = db.place_order(USER, *server, 0)
+    db.refund_order(done, db.FAILED, "failed")
+    active = {row["id"]: row["status"] for row in db.get_active_orders()}
+    assert active.get(order) == db.PENDING
+    assert done not in active
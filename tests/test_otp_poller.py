@@ -0,0 +1,128 @@
+# tests/test_otp_poller.py
+# Deliver / timeout refund fail झाला तर activation हरवत नाही – backoff नंतर पुन्हा
+import asyncio
+from types import SimpleNamespace
+
+import otp_poller
+from otp_poller import OtpPoller
+
+
+class FakeDispatcher:
+    def __init__(self):
+        self.sent = []
+
+    def send(self, chat_id, text, **kwargs):
+        self.sent.append((chat_id, text))
+        fut = asyncio.get_running_loop().create_future()
+        fut.set_result(None)
+        return fut
+
+
+class FakeProvider:
+    def __init__(self, bulk):
+        self.bulk = bulk
+        self.bulk_calls = 0
+        self.cancelled = []
+
+    async def get_active_activations(self):
+        self.bulk_calls += 1
+        return self.bulk
+
+    async def get_status(self, activation_id):
+        return "STATUS_WAIT_CODE"
+
+    async def cancel(self, activation_id):
+        self.cancelled.append(activation_id)
+        return "ACCESS_CANCEL"
+
+
+def _poller(monkeypatch, provider):
+    monkeypatch.setattr(otp_poller.registry, "get", lambda name: provider)
+    router = SimpleNamespace(record_otp=lambda server_id, ok: None)
+    return OtpPoller(FakeDispatcher(), router=router)
+
+
+def _flaky(calls, fail_times, result=None):
+    def fn(*args):
+        calls.append(args)
+        if len(calls) <= fail_times:
+            raise RuntimeError("db down")
+        return result
+    return fn
+
+
+def test_failed_delivery_is_retried_without_polling_again(monkeypatch):
+    async def run():
+        provider = FakeProvider({"77": "STATUS_OK:4321"})
+        poller = _poller(monkeypatch, provider)
+        queued = []
+        monkeypatch.setattr(otp_poller.db, "queue_otp", _flaky(queued, 1))
+        poller.register("77", 5, 900, 10.0, "Svc", "svc", 1)
+        poller._active[("herosms", "77")].next_poll = 0
+
+        await poller.tick()
+        act = poller._active[("herosms", "77")]
+        assert (act.otp, act.failures) == ("4321", 1)
+        assert poller.dispatcher.sent == []
+
+        await poller.tick()  # backoff मध्ये – काहीच नाही
+        assert len(queued) == 1
+
+        act.next_poll = 0
+        await poller.tick()
+        assert len(poller) == 0
+        assert queued[-1][:2] == (900, "4321")
+        assert provider.bulk_calls == 1
+        assert len(poller.dispatcher.sent) == 1
+
+    asyncio.run(run())
+
+
+def test_failed_timeout_refund_is_retried(monkeypatch):
+    async def run():
+        provider = FakeProvider({"78": "STATUS_WAIT_CODE"})
+        poller = _poller(monkeypatch, provider)
+        refunds = []
+
+        async def refund_order(*args):
+            refunds.append(args)
+            if len(refunds) == 1:
+                raise RuntimeError("db down")
+            return True
+
+        monkeypatch.setattr(otp_poller.users, "refund_order", refund_order)
+        poller.register("78", 6, 901, 10.0, "Svc", "svc", 1, remaining=0)
+
+        await poller.tick()
+        assert poller._active[("herosms", "78")].failures == 1
+        await poller.tick()  # deadline गेली तरी backoff पाळतो
+        assert len(refunds) == 1
+
+        poller._active[("herosms", "78")].next_poll = 0
+        await poller.tick()
+        assert len(poller) == 0
+        assert len(refunds) == 2
+        assert poller.dispatcher.sent == [(6, "⏳ OTP Timeout. Refunded.")]
+
+    asyncio.run(run())
+
+
+def test_transient_bulk_error_keeps_bulk_enabled(monkeypatch):
+    class Flaky(FakeProvider):
+        async def get_active_activations(self):
+            self.bulk_calls += 1
+            if self.bulk_calls == 1:
+                raise ValueError("unexpected getActiveActivations reply: 'ERROR_SQL'")
+            return self.bulk
+
+    async def run():
+        provider = Flaky({"79": "STATUS_WAIT_CODE"})
+        poller = _poller(monkeypatch, provider)
+        poller.register("79", 7, 902, 10.0, "Svc", "svc", 1)
+        for _ in range(2):
+            poller._active[("herosms", "79")].next_poll = 0
+            await poller.tick()
+        assert provider.bulk_calls == 2
+        assert not poller._no_bulk
+
+    asyncio.run(run())
@@ -0,0 +1,37 @@
+# tests/test_otp_schedule.py
+# History नसेल तर fixed schedule; असेल तर window मध्ये dense, बाहेर sparse, लवकर give-up
+import pytest
+
+from config import OTP_POLL_INTERVAL
+from otp_schedule import ArrivalStats, PollSchedule
+
+
+def _schedule(samples, server_id=7, min_samples=10):
+    stats = ArrivalStats(window=100, min_samples=min_samples)
+    stats.load([("tg", server_id, s) for s in samples])
+    return PollSchedule(stats, dense=2, sparse=15, window_steps=10, timeout=600)
+
+
+def test_falls_back_without_enough_samples():
+    sched = _schedule([20] * 9)
+    assert sched.next_delay("tg", 7, 0) == OTP_POLL_INTERVAL
+    assert sched.give_up_after("tg", 7) == 600
+
+
+def test_dense_inside_window_sparse_outside():
+    sched = _schedule(range(20, 60, 2))  # p10 = 24, p90 = 56
+    assert sched.next_delay("tg", 7, 0) == 15     # window पर्यंत उडी, sparse cap
+    assert sched.next_delay("tg", 7, 20) == 4     # p10 आधी 4s बाकी
+    assert sched.next_delay("tg", 7, 30) == pytest.approx(3.2)  # (56 - 24) / 10
+    assert sched.next_delay("tg", 7, 57) == 15
+
+
+def test_give_up_follows_p99_and_timeout_cap():
+    assert _schedule(range(20, 60, 2)).give_up_after("tg", 7) == pytest.approx(58 * 1.5)
+    assert _schedule([500] * 20).give_up_after("tg", 7) == 600
+
+
+def test_service_level_stats_cover_a_new_server():
+    sched = _schedule(range(20, 60, 2))
+    assert sched.give_up_after("tg", 99) == pytest.approx(58 * 1.5)
+    assert sched.give_up_after("wa", 7) == 600
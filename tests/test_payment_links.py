@@ -0,0 +1,82 @@
+# tests/test_payment_links.py
+# Credit झालेल्या payment ची नेमकी तीच link बंद होते – expire झालेली जुनी same-amount link नाही
+import time
+import uuid
+
+import pytest
+
+import db
+import migrations
+
+USER = 880000201
+
+
+def _link(amount, expires_in):
+    req_id = db.create_payment_link_request(USER, amount, int(time.time()) + expires_in)
+    db.attach_payment_link(req_id, f"plink_{uuid.uuid4().hex[:12]}", "https://rzp.io/x", int(time.time()) + expires_in)
+    return req_id
+
+
+def _status(req_id):
+    conn = db.get_db_connection()
+    try:
+        cur = conn.cursor()
+        cur.execute("SELECT status, payment_id FROM wallet_requests WHERE id = %s", (req_id,))
+        return tuple(cur.fetchone())
+    finally:
+        conn.close()
+
+
+@pytest.fixture(autouse=True)
+def clean():
+    migrations.migrate()
+    db.add_or_get_user(USER)
+    conn = db.get_db_connection()
+    try:
+        cur = conn.cursor()
+        cur.execute("DELETE FROM wallet_requests WHERE user_id = %s", (USER,))
+        cur.execute("DELETE FROM payment_events WHERE user_id = %s", (USER,))
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def test_paid_link_is_closed_by_request_id_not_oldest_same_amount():
+    expired = _link(100, -60)
+    paid = _link(100, 1800)
+    assert db.expire_payment_links() >= 1
+    assert _status(expired) == ("EXPIRED", None)
+
+    pid = f"pay_{uuid.uuid4().hex[:12]}"
+    assert db.record_payment_event(pid, "payment.captured", USER, 100, "{}", paid)
+    assert (USER, 100.0, pid) in db.apply_payment_events()
+    assert _status(paid) == ("APPROVED", pid)
+    assert _status(expired) == ("EXPIRED", None)
+    assert db.get_open_payment_link(USER, 100, int(time.time())) is None
+
+
+def test_late_capture_on_expired_link_still_closes_it():
+    req_id = _link(50, -60)
+    db.expire_payment_links()
+    pid = f"pay_{uuid.uuid4().hex[:12]}"
+    db.record_payment_event(pid, "payment.captured", USER, 50, "{}", req_id)
+    db.apply_payment_events()
+    assert _status(req_id) == ("APPROVED", pid)
+
+
+def test_event_without_request_id_skips_expired_links():
+    """जुन्या links (notes मध्ये wallet_request_id नाही) – unexpired PENDING link वर match."""
+    expired = _link(100, -60)
+    open_link = _link(100, 1800)
+    pid = f"pay_{uuid.uuid4().hex[:12]}"
+    db.record_payment_event(pid, "payment.captured", USER, 100, "{}")
+    db.apply_payment_events()
+    assert _status(open_link) == ("APPROVED", pid)
+    assert _status(expired)[0] == "PENDING"
+
+
+def test_failed_link_creation_rejects_placeholder_row():
+    req_id = db.create_payment_link_request(USER, 10, int(time.time()) + 1800)
+    db.reject_payment_link_request(req_id)
+    assert _status(req_id) == ("REJECTED", None)
+    assert db.get_open_payment_link(USER, 10, int(time.time())) is None
@@ -0,0 +1,84 @@
+# tests/test_pool.py
+# Pooled connections: close() pool मध्ये परत, uncommitted rollback, after_commit फक्त commit वर, db.run off-loop
+import asyncio
+import threading
+
+import pytest
+
+import db
+from storage import pool
+
+
+@pytest.fixture
+def fresh_pool(tmp_path, monkeypatch):
+    monkeypatch.setattr(pool, "DB_PATH", str(tmp_path / "pool.sqlite3"))
+    monkeypatch.setattr(pool, "_pool", None)
+    conn = db.get_db_connection()
+    try:
+        conn.cursor().execute("CREATE TABLE t (id INTEGER PRIMARY KEY AUTOINCREMENT, v TEXT)")
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def _count():
+    conn = db.get_db_connection()
+    try:
+        cur = conn.cursor()
+        cur.execute("SELECT COUNT(*) FROM t")
+        return cur.fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_connections_are_reused(fresh_pool):
+    first = db.get_db_connection()
+    raw = first._conn
+    first.close()
+    first.close()  # दुसरा close no-op – तेच connection दोनदा pool मध्ये नाही
+    again = db.get_db_connection()
+    assert again._conn is raw
+    again.close()
+    assert pool.get_pool()._idle.qsize() == 1
+
+
+def test_uncommitted_work_is_rolled_back_on_release(fresh_pool):
+    conn = db.get_db_connection()
+    conn.cursor().execute("INSERT INTO t (v) VALUES (%s)", ("x",))
+    conn.close()
+    assert _count() == 0
+
+
+def test_after_commit_runs_only_on_commit(fresh_pool):
+    ran = []
+    conn = db.get_db_connection()
+    try:
+        conn.after_commit(lambda: ran.append("rolled back"))
+        conn.rollback()
+        cur = conn.cursor()
+        assert cur.insert("INSERT INTO t (v) VALUES (%s)", ("y",)) == 1
+        conn.after_commit(lambda: ran.append("committed"))
+        conn.commit()
+    finally:
+        conn.close()
+    assert ran == ["committed"]
+
+
+def test_dictionary_cursor_maps_columns(fresh_pool):
+    conn = db.get_db_connection()
+    try:
+        cur = conn.cursor(dictionary=True)
+        cur.insert("INSERT INTO t (v) VALUES (%s)", ("z",))
+        cur.execute("SELECT id, v FROM t")
+        assert cur.fetchall() == [{"id": 1, "v": "z"}]
+    finally:
+        conn.close()
+
+
+def test_run_executes_off_the_event_loop_thread(fresh_pool):
+    async def main():
+        loop_thread = threading.get_ident()
+        thread, count = await db.run(lambda: (threading.get_ident(), _count()))
+        return loop_thread != thread, count
+
+    assert asyncio.run(main()) == (True, 0)
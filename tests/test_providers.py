@@ -0,0 +1,18 @@
+# tests/test_providers.py
+import pytest
+
+from providers.sms_activate import parse_active_activations
+
+
+def test_bulk_reply_parsing():
+    body = ('{"status": "success", "activeActivations": ['
+            '{"activationId": 1, "smsCode": ["111", "222"]}, {"activationId": 2, "smsCode": null}]}')
+    assert parse_active_activations(body) == {"1": "STATUS_OK:222", "2": "STATUS_WAIT_CODE"}
+    assert parse_active_activations("NO_ACTIVATIONS") == {}
+    assert parse_active_activations("BAD_ACTION") is None
+
+
+@pytest.mark.parametrize("body", ["<html>502 Bad Gateway</html>", "ERROR_SQL", '{"status": "error"}'])
+def test_transient_bulk_reply_raises_instead_of_disabling_bulk(body):
+    with pytest.raises(ValueError):
+        parse_active_activations(body)
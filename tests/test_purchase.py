@@ -0,0 +1,92 @@
+# tests/test_purchase.py
+# Debit झाल्यानंतर provider / DB error – त्याच handler मध्ये refund + user ला उत्तर
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+import bot
+import telemetry
+from providers.router import Purchase
+
+ROUTE = {"id": 3, "provider": "herosms", "service_code": "svc", "country": 22, "price": 10}
+SERVICE = {"id": 1, "service_name": "Svc"}
+
+
+class FakeQuery:
+    def __init__(self):
+        self.message = SimpleNamespace(message_id=11)
+        self.edits = []
+        self.answers = []
+
+    async def edit_message_text(self, text, **kwargs):
+        self.edits.append(text)
+
+    async def answer(self, text=None, **kwargs):
+        self.answers.append(text)
+
+
+@pytest.fixture
+def refunds(monkeypatch):
+    calls = []
+
+    async def place_order(*args):
+        return 55
+
+    async def refund_order(order_id, user_id, price, status, description):
+        calls.append((order_id, status))
+        return True
+
+    monkeypatch.setattr(bot.users, "place_order", place_order)
+    monkeypatch.setattr(bot.users, "refund_order", refund_order)
+    return calls
+
+
+def _purchase(query):
+    context = SimpleNamespace(bot_data={"otp_poller": SimpleNamespace(timeout_for=lambda code, sid: 600)})
+    return asyncio.run(bot._purchase(query, context, 7, 3, 10.0, SERVICE, [ROUTE], telemetry.tracer.begin()))
+
+
+def test_provider_exception_refunds_in_process(monkeypatch, refunds):
+    async def get_number(routes):
+        raise RuntimeError("client bug")
+
+    monkeypatch.setattr(bot.router, "get_number", get_number)
+    query = FakeQuery()
+    assert _purchase(query) == "❌ Failed. Refunded."
+    assert refunds == [(55, bot.db.FAILED)]
+    assert query.edits == ["❌ Failed. Refunded."]
+
+
+def test_failed_number_save_cancels_activation_and_refunds(monkeypatch, refunds):
+    cancelled = []
+
+    async def get_number(routes):
+        return Purchase(ROUTE, "act9", "+910000000000"), "ACCESS_NUMBER:act9:+910000000000"
+
+    async def cancel(activation_id):
+        cancelled.append(activation_id)
+        return "ACCESS_CANCEL"
+
+    def mark_number_received(*args):
+        raise RuntimeError("db down")
+
+    monkeypatch.setattr(bot.router, "get_number", get_number)
+    monkeypatch.setattr(bot.db, "mark_number_received", mark_number_received)
+    monkeypatch.setattr(bot.registry, "get", lambda name: SimpleNamespace(cancel=cancel))
+    query = FakeQuery()
+    assert _purchase(query) == "❌ Failed. Refunded."
+    assert cancelled == ["act9"]
+    assert refunds == [(55, bot.db.CANCELLED)]
+    assert query.edits == ["❌ Failed. Refunded."]
+
+
+def test_low_balance_is_shown_in_the_message_not_a_second_answer(monkeypatch):
+    async def place_order(*args):
+        return None
+
+    monkeypatch.setattr(bot.users, "place_order", place_order)
+    query = FakeQuery()
+    assert _purchase(query) is None
+    assert query.answers == []  # handle_callback आधीच answer करतो
+    assert query.edits == ["❌ Low balance! Svc costs ₹10.00."]
@@ -0,0 +1,62 @@
+# tests/test_ratelimit.py
+# Token buckets (burst, refill, LRU eviction) आणि buy_ callback de-duplication
+from types import SimpleNamespace
+
+import pytest
+
+import ratelimit
+from ratelimit import CallbackResults, RateLimiter
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = SimpleNamespace(now=100.0)
+    monkeypatch.setattr(ratelimit, "time", SimpleNamespace(monotonic=lambda: clock.now))
+    return clock
+
+
+def test_burst_then_refill(clock):
+    limiter = RateLimiter({"buy": (0.5, 2)})
+    assert limiter.allow(1, "buy") == 0
+    assert limiter.allow(1, "buy") == 0
+    assert limiter.allow(1, "buy") == pytest.approx(2.0)  # 1 token / 0.5 per sec
+    clock.now += 2
+    assert limiter.allow(1, "buy") == 0
+    assert limiter.allow(1, "buy") > 0
+
+
+def test_buckets_are_per_user_and_action(clock):
+    limiter = RateLimiter({"buy": (1, 1), "message": (1, 1)})
+    assert limiter.allow(1, "buy") == 0
+    assert limiter.allow(1, "buy") > 0
+    assert limiter.allow(2, "buy") == 0
+    assert limiter.allow(1, "message") == 0
+
+
+def test_idle_and_overflow_buckets_are_evicted(clock):
+    limiter = RateLimiter({"buy": (1, 1)}, maxsize=2)
+    limiter.allow(1, "buy")
+    limiter.allow(2, "buy")
+    limiter.allow(3, "buy")  # cap – सगळ्यात जुना (1) गेला
+    assert len(limiter) == 2
+    clock.now += 5
+    limiter.allow(4, "buy")  # 2 आणि 3 पूर्ण refill – नवीन bucket सारखेच, drop
+    assert len(limiter) == 1
+
+
+def test_repeat_tap_gets_processing_then_cached_answer():
+    results = CallbackResults(ttl=60, maxsize=100)
+    key = (1, 10, "buy")
+    assert results.begin(key) is None
+    assert results.begin(key) == CallbackResults.PROCESSING
+    results.finish(key, "✅ Number: 919999")
+    assert results.begin(key) == "✅ Number: 919999"
+    assert results.begin((1, 11, "buy")) is None  # दुसरा message – वेगळा key
+
+
+def test_forget_lets_a_real_retry_through():
+    results = CallbackResults(ttl=60, maxsize=100)
+    key = (1, 10, "buy")
+    assert results.begin(key) is None
+    results.forget(key)
+    assert results.begin(key) is None
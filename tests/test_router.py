@@ -0,0 +1,103 @@
+# tests/test_router.py
+# Router failover: NO_NUMBERS / provider-down वर पुढचा route, breaker उघडा असलेला route वगळला
+import asyncio
+
+import pytest
+
+from providers import router as router_mod
+from providers.breaker import BreakerBoard, CircuitBreaker
+from providers.router import ProviderRouter
+
+
+class FakeClient:
+    def __init__(self, replies):
+        self.replies = list(replies)
+        self.calls = []
+
+    async def get_number(self, code, country):
+        self.calls.append((code, country))
+        reply = self.replies.pop(0)
+        if isinstance(reply, Exception):
+            raise reply
+        return reply
+
+
+def _route(server_id, provider, price):
+    return {"id": server_id, "provider": provider, "service_code": "tg", "country": 22, "price": price}
+
+
+@pytest.fixture
+def clients(monkeypatch):
+    clients = {}
+    monkeypatch.setattr(router_mod.registry, "get", clients.get)
+    return clients
+
+
+def _router(**kwargs):
+    breakers = BreakerBoard(factory=lambda: CircuitBreaker(window=60, min_calls=2, error_rate=0.5,
+                                                           open_for=30, half_open_calls=1))
+    opts = dict(alpha=0.5, max_attempts=3, empty_cooldown=60, down_cooldown=60, latency_cost=0.0,
+                slow_call=30, breakers=breakers)
+    opts.update(kwargs)
+    return ProviderRouter(**opts)
+
+
+def test_cheapest_route_first_then_failover_on_no_numbers(clients):
+    clients["a"] = FakeClient(["NO_NUMBERS"])
+    clients["b"] = FakeClient(["ACCESS_NUMBER:777:919999999999"])
+    router = _router()
+    routes = [_route(2, "b", 12), _route(1, "a", 10)]
+    purchase, res = asyncio.run(router.get_number(routes))
+    assert purchase.route["id"] == 2 and purchase.activation_id == "777"
+    assert purchase.phone == "919999999999"
+    assert len(clients["a"].calls) == 1
+    # NO_NUMBERS cooldown: a आता उपलब्ध routes च्या मागे
+    assert [r["id"] for r in router.rank(routes)] == [2, 1]
+
+
+def test_provider_down_demotes_every_route_of_that_provider(clients):
+    clients["a"] = FakeClient(["NO_BALANCE"])
+    clients["b"] = FakeClient(["ACCESS_NUMBER:1:91000"])
+    router = _router()
+    routes = [_route(1, "a", 10), _route(3, "a", 11), _route(2, "b", 50)]
+    purchase, _ = asyncio.run(router.get_number(routes))
+    assert purchase.route["id"] == 2
+    assert len(clients["a"].calls) == 1  # route 3 (same provider) वर attempt वाया नाही
+    assert [r["id"] for r in router.rank(routes)][0] == 2
+
+
+def test_open_breaker_route_is_not_tried(clients):
+    clients["a"] = FakeClient([])
+    clients["b"] = FakeClient(["ACCESS_NUMBER:5:91000"])
+    router = _router()
+    for _ in range(2):
+        router.breakers.record("a", "tg", False)
+    routes = [_route(1, "a", 10), _route(2, "b", 20)]
+    assert [r["id"] for r in router.usable(routes)] == [2]
+    purchase, _ = asyncio.run(router.get_number(routes))
+    assert purchase.route["id"] == 2 and clients["a"].calls == []
+
+
+def test_all_routes_fail_returns_last_response_within_max_attempts(clients):
+    clients["a"] = FakeClient(["NO_NUMBERS"] * 3)
+    router = _router(max_attempts=2)
+    routes = [_route(i, "a", 10 + i) for i in range(1, 4)]
+    purchase, res = asyncio.run(router.get_number(routes))
+    assert purchase is None and res == "NO_NUMBERS"
+    assert len(clients["a"].calls) == 2
+
+
+def test_client_exception_counts_as_breaker_failure(clients):
+    clients["a"] = FakeClient([RuntimeError("boom"), RuntimeError("boom")])
+    router = _router()
+    routes = [_route(1, "a", 10)]
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            asyncio.run(router.get_number(routes))
+    assert router.usable(routes) == []
+    assert router.retry_in(routes) == pytest.approx(30, abs=1)
+
+
+def test_unconfigured_provider_is_not_usable(clients):
+    clients["b"] = FakeClient([])
+    assert _router().usable([_route(1, "missing", 1), _route(2, "b", 2)]) == [_route(2, "b", 2)]
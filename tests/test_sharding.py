@@ -0,0 +1,32 @@
+# tests/test_sharding.py
+import asyncio
+import json
+from types import SimpleNamespace
+
+from sharding import ACK, UpdateReceiver, frame
+
+
+def test_redelivered_update_is_acked_but_not_processed_twice():
+    """Front timeout नंतर Telegram तोच update परत पाठवतो – ack मिळतो, update_queue मध्ये एकदाच."""
+    async def run():
+        app = SimpleNamespace(update_queue=asyncio.Queue(), bot=None)
+        receiver = UpdateReceiver(app)
+        await receiver.start("127.0.0.1", 0)
+        port = receiver._server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        body = json.dumps({"update_id": 42, "message": {
+            "message_id": 1, "date": 0, "chat": {"id": 7, "type": "private"},
+            "from": {"id": 7, "is_bot": False, "first_name": "t"}, "text": "hi"}}).encode()
+        other = json.dumps({"update_id": 43}).encode()
+        writer.write(frame(body) + frame(body) + frame(other))
+        acks = await asyncio.wait_for(reader.readexactly(3), 5)
+        writer.close()
+        receiver.close()
+        queued = []
+        while not app.update_queue.empty():
+            queued.append(app.update_queue.get_nowait().update_id)
+        return acks, queued
+
+    acks, queued = asyncio.run(run())
+    assert acks == ACK * 3
+    assert queued == [42, 43]
@@ -0,0 +1,64 @@
+# tests/test_stats.py
+# Admin stats rollups: seal base tables मधून मोजतो, दुसऱ्यांदा काही नाही, sealed तासावर उशिरा deltas नाहीत
+import time
+
+import pytest
+
+import db
+import migrations
+from storage import pool, stats
+
+NOW = time.time()
+THEN = NOW - 3 * stats.HOUR
+
+
+def _stamp(ts):
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(ts))
+
+
+@pytest.fixture
+def service_id(tmp_path, monkeypatch):
+    stats.stats_writes.flush()  # आधीच्या tests चे deltas जुन्या DB मध्येच
+    monkeypatch.setattr(pool, "DB_PATH", str(tmp_path / "stats.sqlite3"))
+    monkeypatch.setattr(pool, "_pool", None)
+    migrations.migrate()
+    conn = db.get_db_connection()
+    try:
+        cur = conn.cursor()
+        then = _stamp(THEN)
+        service_id = cur.insert("INSERT INTO services (service_name, provider_service_code) VALUES ('tg', 'tg')")
+        server_id = cur.insert("INSERT INTO servers (service_id, server_number, price) VALUES (%s, 1, 10)",
+                               (service_id,))
+        cur.execute("INSERT INTO users (user_id, created_at) VALUES (1, %s)", (then,))
+        order_ids = [cur.insert("""
+            INSERT INTO orders (user_id, service_id, server_id, price, status, created_at)
+            VALUES (1, %s, %s, 10, 'TIMEOUT', %s)
+        """, (service_id, server_id, then)) for _ in range(2)]
+        cur.executemany("""
+            INSERT INTO transactions (user_id, amount, type, description, op_key, created_at)
+            VALUES (1, %s, %s, 'x', %s, %s)
+        """, [(100, "CREDIT", "pay_abc", then), (20, "DEBIT", None, then),
+              (10, "CREDIT", f"refund:{order_ids[0]}", then)])
+        conn.commit()
+    finally:
+        conn.close()
+    return service_id
+
+
+def test_seal_counts_base_tables_once(service_id):
+    assert stats.seal_stats(NOW) >= 3
+    assert stats.seal_stats(NOW) == 0
+    s = stats.get_admin_stats(NOW)
+    everything = s["periods"]["all"]
+    assert (everything["orders"], everything["refunds"], everything["new_users"]) == (2, 1, 1)
+    assert (everything["revenue"], everything["recharges"], everything["debits"]) == (20.0, 100.0, 20.0)
+    assert [(svc["service_id"], svc["orders"]) for svc in s["services"]] == [(service_id, 2)]
+
+
+def test_live_deltas_skip_sealed_hours(service_id):
+    stats.seal_stats(NOW)
+    stats.apply_stats_deltas([
+        ((stats.hour_start(NOW), service_id, 0), {"orders": 1}),
+        ((stats.hour_start(THEN), service_id, 0), {"orders": 5}),  # आधीच sealed
+    ])
+    assert stats.get_admin_stats(NOW)["periods"]["all"]["orders"] == 3
@@ -0,0 +1,78 @@
+# tests/test_telemetry.py
+# Prometheus text format (labels, cumulative buckets, gauge functions) आणि per-order traces
+import pytest
+
+import telemetry
+from telemetry.metrics import Counter, Gauge, Histogram, Registry
+from telemetry.trace import ORDER_SECONDS, Tracer
+
+
+def test_counter_render_and_label_escaping():
+    c = Counter("x_total", "help", ("reason",))
+    c.inc(reason='bad "key"\n')
+    c.inc(2, reason="ok")
+    assert c.render().splitlines() == [
+        "# HELP x_total help",
+        "# TYPE x_total counter",
+        'x_total{reason="bad \\"key\\"\\n"} 1',
+        'x_total{reason="ok"} 2',
+    ]
+    with pytest.raises(ValueError):
+        c.inc(other="x")
+
+
+def test_histogram_buckets_are_cumulative():
+    h = Histogram("lat_seconds", "help", buckets=(0.1, 1))
+    for v in (0.05, 0.5, 0.7, 5):
+        h.observe(v)
+    lines = h.render().splitlines()[2:]
+    assert lines == [
+        'lat_seconds_bucket{le="0.1"} 1',
+        'lat_seconds_bucket{le="1.0"} 3',
+        'lat_seconds_bucket{le="+Inf"} 4',
+        "lat_seconds_sum 6.25",
+        "lat_seconds_count 4",
+    ]
+
+
+def test_gauge_function_errors_do_not_break_scrape():
+    g = Gauge("depth", "help", ("queue",))
+    g.set(3, queue="a")
+    g.set_function(lambda: 7, queue="b")
+    g.set_function(lambda: 1 / 0, queue="c")
+    assert g.render().splitlines()[2:] == ['depth{queue="a"} 3', 'depth{queue="b"} 7']
+
+
+def test_registry_returns_same_metric_and_rejects_conflicts():
+    reg = Registry()
+    assert reg._get_or_create(Counter, "a_total", "h", ("x",)) is reg._get_or_create(Counter, "a_total", "h", ("x",))
+    with pytest.raises(ValueError):
+        reg._get_or_create(Gauge, "a_total", "h", ("x",))
+    with pytest.raises(ValueError):
+        reg._get_or_create(Counter, "a_total", "h", ("y",))
+
+
+def test_process_registry_renders_module_metrics():
+    telemetry.counter("test_render_total", "h").inc()
+    assert "test_render_total 1" in telemetry.render()
+
+
+def test_tracer_finish_records_once_and_caps_open_traces():
+    tracer = Tracer(maxsize=2)
+
+    def finished():
+        return ORDER_SECONDS._values.get(("ok",), [None, 0.0, 0])[2]
+
+    before = finished()
+    trace = tracer.begin()
+    trace.mark("debit")
+    tracer.attach(1, trace)
+    tracer.mark(1, "number")
+    tracer.finish(1, "ok", stage="otp")
+    tracer.finish(1, "ok")  # आधीच संपला – दुसरा sample नाही
+    assert finished() == before + 1
+    assert [name for name, _ in trace.spans()] == ["tap->debit", "debit->number", "number->otp"]
+
+    for order_id in (2, 3, 4):
+        tracer.attach(order_id, tracer.begin())
+    assert list(tracer._open) == [3, 4]
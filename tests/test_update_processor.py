@@ -0,0 +1,54 @@
+# tests/test_update_processor.py
+import asyncio
+import time
+from types import SimpleNamespace
+
+from update_processor import PerUserUpdateProcessor
+
+
+def _update(user_id):
+    return SimpleNamespace(effective_user=SimpleNamespace(id=user_id), effective_chat=None)
+
+
+def test_user_backlog_does_not_hold_concurrency_slots():
+    """User A चे 8 slow updates, 4 slots – user B लगेच चालला पाहिजे."""
+    async def run():
+        processor = PerUserUpdateProcessor(4)
+        order = []
+
+        async def handler(name, seconds):
+            await asyncio.sleep(seconds)
+            order.append(name)
+
+        tasks = [asyncio.create_task(processor.process_update(_update(1), handler(f"a{i}", 0.2)))
+                 for i in range(8)]
+        await asyncio.sleep(0.01)
+        started = time.perf_counter()
+        await processor.process_update(_update(2), handler("b", 0))
+        waited = time.perf_counter() - started
+        await asyncio.gather(*tasks)
+        return waited, order
+
+    waited, order = asyncio.run(run())
+    assert waited < 0.1
+    assert [n for n in order if n.startswith("a")] == [f"a{i}" for i in range(8)]
+
+
+def test_slots_still_cap_distinct_users():
+    async def run():
+        processor = PerUserUpdateProcessor(2)
+        running = peak = 0
+
+        async def handler():
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.02)
+            running -= 1
+
+        await asyncio.gather(*(processor.process_update(_update(uid), handler()) for uid in range(10)))
+        return peak, processor
+
+    peak, processor = asyncio.run(run())
+    assert peak == 2
+    assert not processor._locks and not processor._waiting
@@ -0,0 +1,80 @@
+# tests/test_users.py
+# upsert_user: नवीन user एकदाच मोजला जातो; MySQL वर create/existing दोन्हीसाठी एकच INSERT ... ON DUPLICATE KEY UPDATE
+import db
+import migrations
+from storage import queries
+from storage.dialects import MySQL
+
+USER = 880000101
+
+
+def test_upsert_user_counts_new_user_once(monkeypatch):
+    migrations.migrate()
+    stats = []
+    monkeypatch.setattr(queries, "_stat", lambda cur, **deltas: stats.append(deltas))
+    first = db.upsert_user(USER, referred_by=42)
+    again = db.upsert_user(USER, referred_by=7)
+    db.add_or_get_user(USER)
+    assert stats == [{"new_users": 1}]
+    assert first == again == {"user_id": USER, "balance": 0.0, "is_blocked": False, "referred_by": 42}
+
+
+class _FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+        self.rowcount = -1
+        self._row = None
+
+    def execute(self, sql, params=()):
+        sql = " ".join(sql.split())
+        self.conn.statements.append(sql)
+        if sql.startswith("INSERT INTO users"):
+            self.rowcount = self.conn.inserts  # MySQL: 1 = inserted, no-op duplicate = 0
+        elif sql.startswith("SELECT user_id"):  # balance आधीच pending credits सह
+            self._row = {"user_id": params[0], "balance": 5, "is_blocked": 0, "referred_by": None,
+                         "bot_blocked": 0}
+        else:
+            self._row = (0,)
+
+    def fetchone(self):
+        return self._row
+
+
+class _FakeConn:
+    def __init__(self, inserts):
+        self.inserts = inserts
+        self.statements = []
+
+    def cursor(self, dictionary=False):
+        return _FakeCursor(self)
+
+    def commit(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def test_mysql_upsert_user_is_one_insert(monkeypatch):
+    stats = []
+    monkeypatch.setattr(queries, "dialect", MySQL())
+    monkeypatch.setattr(queries, "_stat", lambda cur, **deltas: stats.append(deltas))
+    for inserts in (1, 0):
+        conn = _FakeConn(inserts)
+        monkeypatch.setattr(queries, "get_db_connection", lambda: conn)
+        assert queries.upsert_user(USER)["balance"] == 5.0
+        users = [s for s in conn.statements if "FROM users" in s or "INTO users" in s]
+        assert users[0].startswith("INSERT INTO users") and "ON DUPLICATE KEY UPDATE" in users[0]
+        assert len(users) == 2  # upsert + state SELECT (MySQL ला RETURNING नाही)
+        assert "SUM(" in users[1]  # pending credits त्याच SELECT मध्ये
+        assert len(conn.statements) == 2
+    assert stats == [{"new_users": 1}]
+
+
+def test_returning_user_is_broadcast_eligible_again():
+    migrations.migrate()
+    db.upsert_user(USER + 1)
+    db.record_broadcast_results(db.create_broadcast(1, "hi"), [(USER + 1, "BOT_BLOCKED")])
+    assert USER + 1 not in db.get_broadcast_recipients(USER, 10)
+    db.upsert_user(USER + 1)
+    assert USER + 1 in db.get_broadcast_recipients(USER, 10)
@@ -0,0 +1,92 @@
+# tests/test_wallet.py
+# Ledger: replay झालेली op_key दुसऱ्यांदा कापत नाही, credits settle होतात, reconcile mismatch शोधतो
+import uuid
+
+import pytest
+
+import db
+import migrations
+
+USER = 880000301
+
+
+def _key():
+    return f"test_{uuid.uuid4().hex[:16]}"
+
+
+def _ledger_rows(op_key):
+    conn = db.get_db_connection()
+    try:
+        cur = conn.cursor()
+        cur.execute("SELECT COUNT(*) FROM transactions WHERE op_key = %s", (op_key,))
+        return cur.fetchone()[0]
+    finally:
+        conn.close()
+
+
+def _set_snapshot(balance):
+    conn = db.get_db_connection()
+    try:
+        cur = conn.cursor()
+        cur.execute("UPDATE users SET balance = %s WHERE user_id = %s", (balance, USER))
+        conn.commit()
+    finally:
+        conn.close()
+
+
+@pytest.fixture(autouse=True)
+def user():
+    migrations.migrate()
+    db.add_or_get_user(USER)
+    conn = db.get_db_connection()
+    try:
+        cur = conn.cursor()
+        cur.execute("DELETE FROM transactions WHERE user_id = %s", (USER,))
+        cur.execute("UPDATE users SET balance = 0 WHERE user_id = %s", (USER,))
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def test_replayed_debit_op_key_is_charged_once():
+    db.credit(USER, 100, "top up", _key())
+    key = _key()
+    assert db.debit(USER, 30, "order", key)
+    assert db.debit(USER, 30, "order", key)  # retry / double tap – True, पण दुसरा debit नाही
+    assert db.get_user_balance(USER) == pytest.approx(70)
+    assert _ledger_rows(key) == 1
+
+
+def test_insufficient_debit_rolls_back_its_op_key():
+    key = _key()
+    assert not db.debit(USER, 10, "order", key)
+    assert _ledger_rows(key) == 0
+    db.credit(USER, 10, "top up")
+    assert db.debit(USER, 10, "order", key)  # rollback झाल्याने same key परत वापरता येते
+    assert db.get_user_balance(USER) == pytest.approx(0)
+
+
+def test_replayed_credit_op_key_is_ignored():
+    key = _key()
+    assert db.credit(USER, 25, "refund", key)
+    assert not db.credit(USER, 25, "refund", key)
+    assert db.get_user_balance(USER) == pytest.approx(25)
+
+
+def test_settle_folds_pending_credits_into_snapshot():
+    db.credit(USER, 40, "top up", _key())
+    while db.settle_credits():
+        pass
+    assert db.get_user_balance(USER) == pytest.approx(40)
+    mismatches, _, _ = db.reconcile(USER - 1, 1)
+    assert mismatches == []
+
+
+def test_reconcile_flags_and_repair_fixes_drifted_snapshot():
+    db.credit(USER, 40, "top up", _key())
+    db.repair_snapshot(USER)
+    _set_snapshot(55)  # manual edit – ledger शी जुळत नाही
+    mismatches, last, checked = db.reconcile(USER - 1, 1)
+    assert (mismatches, last, checked) == ([(USER, 55.0, 40.0)], USER, 1)
+    assert db.repair_snapshot(USER) == pytest.approx(40)
+    assert db.reconcile(USER - 1, 1)[0] == []
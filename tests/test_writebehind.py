@@ -0,0 +1,67 @@
+# tests/test_writebehind.py
+# एक poison op बाकीच्या writes ना अडवत नाही; DB outage मध्ये मात्र काहीच drop होत नाही
+import pytest
+
+from storage.writebehind import WriteBehind
+
+
+class IntegrityError(Exception):
+    pass
+
+
+class OperationalError(Exception):
+    pass
+
+
+class Sink:
+    def __init__(self, poison=(), down=False):
+        self.poison = set(poison)
+        self.down = down
+        self.committed = []
+
+    def __call__(self, ops):
+        if self.down:
+            raise OperationalError("server has gone away")
+        if self.poison & set(ops):
+            raise IntegrityError("foreign key constraint fails")
+        self.committed += ops
+
+
+def _buffer(sink):
+    return WriteBehind("test", sink, max_delay=3600, max_attempts=3)
+
+
+def test_poison_op_is_dead_lettered_and_others_commit():
+    sink = Sink(poison={"bad"})
+    buf = _buffer(sink)
+    for op in ("a", "bad", "b"):
+        buf.add(op, op)
+
+    with pytest.raises(IntegrityError):
+        buf.flush()
+    assert sink.committed == ["a", "b"]
+    assert buf.pending("bad") and not buf.pending("a")
+
+    buf.add("c", "c")
+    with pytest.raises(IntegrityError):
+        buf.flush()
+    buf.flush()  # तिसरा failure – dead letter, raise नाही
+    assert sink.committed == ["a", "b", "c"]
+    assert not buf.pending()
+    assert [(key, op) for key, op, _ in buf.dead_letters] == [("bad", "bad")]
+    buf.stop()
+
+
+def test_outage_keeps_every_op_without_counting_attempts():
+    sink = Sink(down=True)
+    buf = _buffer(sink)
+    buf.add(1, "x")
+    buf.add(2, "y")
+    for _ in range(5):
+        with pytest.raises(OperationalError):
+            buf.flush()
+    sink.down = False
+    buf.flush()
+    assert sink.committed == ["x", "y"]
+    assert not buf.dead_letters
+    buf.stop()
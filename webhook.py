@@ -1,38 +1,73 @@
 # webhook.py (रूट फोल्डरमध्ये)
-from flask import Flask, request, jsonify
+# Razorpay webhook फक्त verify + outbox मध्ये record करतो; credit payment_worker.py करतो
+from flask import Flask, Response, request, jsonify
 import hmac
 import hashlib
-from config import RAZORPAY_KEY_SECRET
+import logging
+from config import RAZORPAY_KEY_SECRET, RAZORPAY_WEBHOOK_SECRET, METRICS_HOST
 import db  # तुझा DB फंक्शन import कर
+import telemetry
+
+logger = logging.getLogger(__name__)
 
 app = Flask(__name__)
 
+WEBHOOKS = telemetry.counter("payment_webhooks_total", "Razorpay webhook deliveries", ("result",))
+WEBHOOK_SECONDS = telemetry.histogram("payment_webhook_seconds", "Razorpay webhook handling time")
+
+# Razorpay webhooks dashboard मधल्या webhook secret ने sign होतात
+WEBHOOK_SECRET = RAZORPAY_WEBHOOK_SECRET or RAZORPAY_KEY_SECRET
+
+def verify_signature(payload: bytes, signature: str) -> bool:
+    if not signature or not WEBHOOK_SECRET:
+        return False
+    expected = hmac.new(WEBHOOK_SECRET.encode(), payload, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, signature)
+
 @app.route('/webhook', methods=['POST'])
+@WEBHOOK_SECONDS.time()
 def razorpay_webhook():
     payload = request.data
     signature = request.headers.get('X-Razorpay-Signature')
 
     # Signature verify (सुरक्षिततेसाठी)
-    expected = hmac.new(
-        RAZORPAY_KEY_SECRET.encode(),
-        payload,
-        hashlib.sha256
-    ).hexdigest()
-
-    if not hmac.compare_digest(expected, signature):
+    if not verify_signature(payload, signature):
+        WEBHOOKS.inc(result="invalid_signature")
         return jsonify({"status": "invalid signature"}), 400
 
-    data = request.json
-    if data['event'] == 'payment.captured':
-        amount = data['payload']['payment']['entity']['amount'] / 100  # paise to rupees
-        user_id = int(data['payload']['payment']['entity']['notes'].get('user_id', 0))
-        
-        if user_id > 0:
-            db.update_balance(user_id, amount, "CREDIT", "Razorpay Recharge")
-            print(f"[Webhook] Balance credited ₹{amount} to user {user_id}")
-            # Telegram bot ने user ला मेसेज पाठवायचा असेल तर context/bot instance हवं (पुढे जोडू)
+    data = request.get_json(silent=True) or {}
+    if data.get('event') == 'payment.captured':
+        entity = data['payload']['payment']['entity']
+        amount = entity['amount'] / 100  # paise to rupees
+        notes = entity.get('notes') or {}
+        try:
+            user_id = int(notes.get('user_id', 0))
+        except (TypeError, ValueError):
+            user_id = 0
+        try:
+            # payment link ची wallet_requests row – worker नेमकी तीच बंद करतो
+            request_id = int(notes['wallet_request_id'])
+        except (KeyError, TypeError, ValueError):
+            request_id = None
+
+        # payment_id वर dedupe – Razorpay retries दुसऱ्यांदा credit करत नाहीत
+        if db.record_payment_event(entity['id'], data['event'], user_id, amount, payload.decode(), request_id):
+            WEBHOOKS.inc(result="queued")
+            logger.info(f"[Webhook] Queued ₹{amount} for user {user_id} ({entity['id']})")
+        else:
+            WEBHOOKS.inc(result="duplicate")
+            logger.info(f"[Webhook] Duplicate delivery for {entity['id']} ignored")
+    else:
+        WEBHOOKS.inc(result="ignored")
 
     return jsonify({"status": "ok"}), 200
 
+@app.route('/metrics')
+def metrics():
+    # हा app public आहे – METRICS_HOST loopback असेल (default) तर फक्त localhost scrape
+    if METRICS_HOST in ("127.0.0.1", "localhost", "::1") and request.remote_addr not in ("127.0.0.1", "::1"):
+        return Response(status=404)
+    return Response(telemetry.render(), content_type=telemetry.CONTENT_TYPE)
+
 if __name__ == "__main__":
-    app.run(host="0.0.0.0", port=10000)  # Render साठी port 10000
\ No newline at end of file
+    app.run(host="0.0.0.0", port=10000)  # Render साठी port 10000